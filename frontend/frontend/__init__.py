@@ -1,2 +1,29 @@
-from application.Views.classes.page_views.page_connection_view import (
-    PageConnectionView)
+import importlib
+import importlib.util
+
+
+def __getattr__(name: str):
+    """
+    Resolve the subpackages and the views of the pages on first access,
+    e.g. classes.storage or classes.PageConnectionView, so importing the
+    package does not import any page.
+
+    :param name: Name of a subpackage or of the class of a view
+    :type name: str
+    :raises AttributeError: if no subpackage or registered view has that
+                            name
+    :return: The subpackage or the class of the view
+    :rtype: module or type
+    """
+    # Private names, e.g. __all__ asked for by the import system, are
+    # never views
+    if name.startswith("_"):
+        raise AttributeError(name)
+    # Subpackages and modules are imported, not looked up in the views, so
+    # importing page_views itself does not resolve to this function again
+    if importlib.util.find_spec(f"{__name__}.{name}") is not None:
+        return importlib.import_module(f"{__name__}.{name}")
+    page_views = importlib.import_module(f"{__name__}.page_views")
+    # page_views only resolves the registered views and raises
+    # AttributeError for any other name
+    return getattr(page_views, name)
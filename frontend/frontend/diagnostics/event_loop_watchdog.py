@@ -0,0 +1,335 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
+# Environment variable with the path the blocking report is written to when
+# the application exits. The watchdog only runs when it is set, e.g.
+# EVENT_LOOP_WATCHDOG=freezes.json
+EVENT_LOOP_WATCHDOG_VARIABLE: str = "EVENT_LOOP_WATCHDOG"
+# Interval of the heartbeat timer in the event loop in milliseconds
+HEARTBEAT_INTERVAL: int = 50
+# Interval in seconds at which the watchdog thread checks the heartbeat, and
+# samples the stack of the main thread while it is blocked
+SAMPLE_INTERVAL: float = 0.02
+# Time in seconds without heartbeat after which the event loop is blocked
+LAG_THRESHOLD: float = 0.2
+# Prefix of the modules of the application, the culprit of a freeze is the
+# innermost frame in one of these modules
+APPLICATION_MODULE_PREFIX: str = "application."
+# Number of frames of the application kept as an example stack
+MAX_STACK_DEPTH: int = 12
+
+
+class BlockingSite:
+    """
+    A call site that blocked the event loop, aggregated over all freezes.
+
+    Attributes
+    ----------
+    site : str
+        "module.function (file:line)" of the call site
+    blocked_time : float
+        Time in seconds the site was found on the stack of a blocked event
+        loop
+    number_of_freezes : int
+        Number of freezes in which the site was the culprit
+    longest_freeze : float
+        Longest freeze in seconds in which the site was the culprit
+    pages : Counter
+        Number of samples per active page and sub page
+    example_stack : List[str]
+        The frames of the application of the first sample
+    """
+
+    def __init__(self, site: str, example_stack: List[str]) -> None:
+        self.site = site
+        self.blocked_time = 0.0
+        self.number_of_freezes = 0
+        self.longest_freeze = 0.0
+        self.pages = Counter()
+        self.example_stack = example_stack
+
+    def to_dict(self) -> dict:
+        """
+        :return: The site in a JSON friendly form
+        :rtype: dict
+        """
+        return {"site": self.site, "blocked_time": self.blocked_time,
+                "number_of_freezes": self.number_of_freezes,
+                "longest_freeze": self.longest_freeze,
+                "pages": dict(self.pages),
+                "example_stack": self.example_stack}
+
+
+class EventLoopWatchdog(QObject):
+    """
+    Detects when the Qt event loop is blocked, and finds the code that
+    blocked it.
+
+    A heartbeat timer in the event loop stores the time it last ran. A
+    watchdog thread checks that time, and when the heartbeat is late by
+    more than the threshold it samples the Python stack of the main thread
+    every SAMPLE_INTERVAL. When the event loop runs again, the freeze is
+    logged with the call site that was sampled most often and the active
+    page, and the samples are added to the ranking of blocking call sites.
+
+    Attributes
+    ----------
+    lag_threshold : float
+        Time in seconds without heartbeat after which the event loop is
+        blocked
+    report_path : str or None
+        Path the report is written to when the application exits
+    sites : Dict[str, BlockingSite]
+        The call sites that blocked the event loop
+    active_page : str or None
+        Name of the page that is shown
+    active_sub_page : str or None
+        Name of the sub page that is shown
+    """
+
+    def __init__(self, lag_threshold: float = LAG_THRESHOLD,
+                 report_path: Optional[str] = None) -> None:
+        super().__init__()
+        self.lag_threshold = lag_threshold
+        self.report_path = report_path
+        self.sites: Dict[str, BlockingSite] = {}
+        self.active_page: Optional[str] = None
+        self.active_sub_page: Optional[str] = None
+        self.last_heartbeat = time.monotonic()
+        self.heartbeat_timer: Optional[QTimer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+
+    def start(self) -> None:
+        """
+        Start the heartbeat timer and the watchdog thread. Must be called
+        from the thread of the event loop.
+        """
+        if self.is_running():
+            return
+        self.last_heartbeat = time.monotonic()
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(HEARTBEAT_INTERVAL)
+        self.heartbeat_timer.timeout.connect(self._on_heartbeat)
+        self.heartbeat_timer.start()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch,
+                                        name="EventLoopWatchdog",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the heartbeat timer and the watchdog thread.
+        """
+        if self.heartbeat_timer is not None:
+            self.heartbeat_timer.stop()
+            self.heartbeat_timer.deleteLater()
+            self.heartbeat_timer = None
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """
+        :return: Whether the watchdog thread runs
+        :rtype: bool
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_active_page(self, page_type, sub_page_type=None) -> None:
+        """
+        :param page_type: The page that is shown
+        :type page_type: PageTypeEnum
+        :param sub_page_type: The sub page that is shown, if any
+        :type sub_page_type: SubPageTypeEnum, optional
+        """
+        self.active_page = getattr(page_type, "name", str(page_type))
+        self.set_active_sub_page(sub_page_type)
+
+    def set_active_sub_page(self, sub_page_type) -> None:
+        """
+        :param sub_page_type: The sub page that is shown, None if the page
+                              has no sub pages
+        :type sub_page_type: SubPageTypeEnum or None
+        """
+        self.active_sub_page = None if sub_page_type is None else getattr(
+            sub_page_type, "name", str(sub_page_type))
+
+    def _on_heartbeat(self) -> None:
+        """
+        Store the time the event loop last ran.
+        """
+        self.last_heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        """
+        Body of the watchdog thread.
+        """
+        samples: Counter = Counter()
+        stacks: Dict[str, List[str]] = {}
+        page = None
+        freeze_start = None
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            last_heartbeat = self.last_heartbeat
+            lag = time.monotonic() - last_heartbeat
+            if lag > self.lag_threshold:
+                if freeze_start is None:
+                    freeze_start = last_heartbeat
+                    page = (self.active_page, self.active_sub_page)
+                site, stack = self._sample_main_thread()
+                if site is not None:
+                    samples[site] += 1
+                    stacks.setdefault(site, stack)
+            elif freeze_start is not None:
+                self._add_freeze(last_heartbeat - freeze_start, page,
+                                 samples, stacks)
+                samples = Counter()
+                stacks = {}
+                freeze_start = None
+
+    def _sample_main_thread(self):
+        """
+        Sample the stack of the main thread.
+
+        :return: The culprit call site and the frames of the application,
+                 None if the main thread has no stack
+        :rtype: Tuple[str, List[str]]
+        """
+        frame = sys._current_frames().get(self._main_thread_id)
+        innermost = None
+        stack = []
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            code = frame.f_code
+            description = (f"{module}.{code.co_name} "
+                           f"({os.path.basename(code.co_filename)}:"
+                           f"{frame.f_lineno})")
+            if innermost is None:
+                innermost = description
+            if (module.startswith(APPLICATION_MODULE_PREFIX)
+                    and len(stack) < MAX_STACK_DEPTH):
+                stack.append(description)
+            frame = frame.f_back
+        # The innermost frame of the application is the culprit; without
+        # application code on the stack, blame the innermost frame
+        site = stack[0] if stack else innermost
+        return site, stack
+
+    def _add_freeze(self, duration: float, page: tuple, samples: Counter,
+                    stacks: Dict[str, List[str]]) -> None:
+        """
+        Log a freeze and add its samples to the ranking.
+        """
+        page_name = " / ".join(name for name in page if name) or "no page"
+        if not samples:
+            print(f"Warning: event loop blocked for {duration:.2f} s on "
+                  f"{page_name}, no stack was sampled")
+            return
+        culprit, _ = samples.most_common(1)[0]
+        with self._lock:
+            for site, count in samples.items():
+                blocking_site = self.sites.get(site)
+                if blocking_site is None:
+                    blocking_site = self.sites[site] = BlockingSite(
+                        site, stacks[site])
+                blocking_site.blocked_time += count * SAMPLE_INTERVAL
+                blocking_site.pages[page_name] += count
+            culprit_site = self.sites[culprit]
+            culprit_site.number_of_freezes += 1
+            culprit_site.longest_freeze = max(culprit_site.longest_freeze,
+                                              duration)
+        print(f"Warning: event loop blocked for {duration:.2f} s on "
+              f"{page_name} by {culprit}")
+
+    def get_ranking(self) -> List[BlockingSite]:
+        """
+        :return: The call sites that blocked the event loop, the one that
+                 blocked it the longest first
+        :rtype: List[BlockingSite]
+        """
+        with self._lock:
+            return sorted(self.sites.values(),
+                          key=lambda site: site.blocked_time, reverse=True)
+
+    def format_report(self) -> str:
+        """
+        :return: The ranking of the blocking call sites as text
+        :rtype: str
+        """
+        lines = ["blocked s, freezes, longest s: call site [pages]"]
+        for site in self.get_ranking():
+            pages = ", ".join(page for page, _ in site.pages.most_common())
+            lines.append(f"{site.blocked_time:9.2f} "
+                         f"{site.number_of_freezes:8d} "
+                         f"{site.longest_freeze:9.2f}: {site.site} "
+                         f"[{pages}]")
+        return "\n".join(lines)
+
+    def dump(self, report_path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the ranking of the blocking call sites as JSON.
+
+        :param report_path: Path of the report, defaults to report_path
+        :type report_path: str, optional
+        :return: The path the report was written to, None if there is no
+                 path
+        :rtype: str or None
+        """
+        report_path = report_path or self.report_path
+        if report_path is None:
+            return None
+        with open(report_path, "w") as report_file:
+            json.dump([site.to_dict() for site in self.get_ranking()],
+                      report_file, indent=2)
+        return report_path
+
+
+# The report path of the watchdog of the application, None if disabled
+_report_path = os.environ.get(EVENT_LOOP_WATCHDOG_VARIABLE)
+# Created when the first page is shown, after the Qt application exists
+event_loop_watchdog: Optional[EventLoopWatchdog] = None
+
+
+def set_active_page(page_type, sub_page_type=None) -> None:
+    """
+    Tell the watchdog which page is shown. When the watchdog is enabled, it
+    is started with the first page.
+
+    :param page_type: The page that is shown
+    :type page_type: PageTypeEnum
+    :param sub_page_type: The sub page that is shown, if any
+    :type sub_page_type: SubPageTypeEnum, optional
+    """
+    global event_loop_watchdog
+    if _report_path is None:
+        return
+    if event_loop_watchdog is None:
+        if QCoreApplication.instance() is None:
+            return
+        event_loop_watchdog = EventLoopWatchdog(report_path=_report_path)
+        event_loop_watchdog.start()
+        atexit.register(event_loop_watchdog.dump)
+    event_loop_watchdog.set_active_page(page_type, sub_page_type)
+
+
+def set_active_sub_page(sub_page_type) -> None:
+    """
+    Tell the watchdog which sub page is shown.
+
+    :param sub_page_type: The sub page that is shown
+    :type sub_page_type: SubPageTypeEnum
+    """
+    if event_loop_watchdog is not None:
+        event_loop_watchdog.set_active_sub_page(sub_page_type)
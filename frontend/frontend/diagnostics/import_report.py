@@ -0,0 +1,183 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Optional
+
+from application.Views.classes.page_views.page_registry import (
+    get_page_module_paths)
+
+# Number of heaviest modules listed per page
+DEFAULT_TOP_MODULES: int = 10
+# Time in seconds after which the import of a page is aborted
+IMPORT_TIMEOUT: float = 60.0
+# Prefix of the lines written by python -X importtime
+IMPORT_TIME_PREFIX: str = "import time:"
+
+
+class ImportTimeEntry:
+    """
+    The import time of a single module, as reported by -X importtime.
+
+    Attributes
+    ----------
+    module_name : str
+        Name of the module
+    self_time : float
+        Time spent in the module itself in seconds
+    cumulative_time : float
+        Time spent in the module and the modules it imported in seconds
+    depth : int
+        Nesting level of the import, 0 for modules imported at top level
+    """
+
+    def __init__(self, module_name: str, self_time: float,
+                 cumulative_time: float, depth: int) -> None:
+        self.module_name = module_name
+        self.self_time = self_time
+        self.cumulative_time = cumulative_time
+        self.depth = depth
+
+
+class ImportTimeReport:
+    """
+    The import time of a page module and of every module it imported.
+
+    Attributes
+    ----------
+    module_name : str
+        Name of the page module
+    entries : List[ImportTimeEntry]
+        All modules that were imported, in the order they finished
+    error : str or None
+        The error if the module could not be imported
+    """
+
+    def __init__(self, module_name: str, entries: List[ImportTimeEntry],
+                 error: Optional[str] = None) -> None:
+        self.module_name = module_name
+        self.entries = entries
+        self.error = error
+
+    def get_total_time(self) -> float:
+        """
+        :return: Time in seconds it took to import the page module,
+                 including everything it imported
+        :rtype: float
+        """
+        for entry in reversed(self.entries):
+            if entry.module_name == self.module_name:
+                return entry.cumulative_time
+        return 0.0
+
+    def get_heaviest_modules(self, number_of_modules: int
+                             ) -> List[ImportTimeEntry]:
+        """
+        :param number_of_modules: Number of modules to return
+        :type number_of_modules: int
+        :return: The modules that took the most time themselves
+        :rtype: List[ImportTimeEntry]
+        """
+        return sorted(self.entries, key=lambda entry: entry.self_time,
+                      reverse=True)[:number_of_modules]
+
+
+def measure_import_time(module_name: str) -> ImportTimeReport:
+    """
+    Measure the time it takes to import a module in a fresh interpreter, so
+    every page is measured as if it were the first page that is shown.
+
+    :param module_name: Name of the module to import
+    :type module_name: str
+    :return: The import times
+    :rtype: ImportTimeReport
+    """
+    # The fresh interpreter has to find the same packages as this one
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(path for path in sys.path
+                                                if path)
+    environment.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             f"import {module_name}"],
+            capture_output=True, text=True, env=environment,
+            timeout=IMPORT_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return ImportTimeReport(module_name, [], "The import timed out")
+
+    entries = []
+    other_lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            other_lines.append(line)
+            continue
+        fields = line[len(IMPORT_TIME_PREFIX):].split("|")
+        # Skip the header line of the table
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append(ImportTimeEntry(name.strip(),
+                                       int(fields[0]) / 1e6,
+                                       int(fields[1]) / 1e6, depth))
+    error = None
+    if result.returncode != 0:
+        error = other_lines[-1] if other_lines else "The import failed"
+    return ImportTimeReport(module_name, entries, error)
+
+
+def format_report(reports: List[ImportTimeReport],
+                  top_modules: int = DEFAULT_TOP_MODULES) -> str:
+    """
+    Format the import times of the pages as text, the slowest page first.
+
+    :param reports: The import times of the pages
+    :type reports: List[ImportTimeReport]
+    :param top_modules: Number of heaviest modules listed per page
+    :type top_modules: int
+    :return: The report
+    :rtype: str
+    """
+    lines = []
+    for report in sorted(reports, key=ImportTimeReport.get_total_time,
+                         reverse=True):
+        if report.error is not None:
+            lines.append(f"{report.module_name}: {report.error}")
+            continue
+        lines.append(f"{report.module_name}: "
+                     f"{report.get_total_time() * 1000:.1f} ms")
+        for entry in report.get_heaviest_modules(top_modules):
+            lines.append(f"    {entry.self_time * 1000:8.1f} ms "
+                         f"{entry.module_name}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point: print the import time report of the pages.
+
+    :param argv: Command line arguments, defaults to sys.argv
+    :type argv: List[str], optional
+    :return: Exit code, 1 if any page could not be imported
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Report the time it takes to import every page.")
+    parser.add_argument("modules", nargs="*",
+                        help="Modules to measure, defaults to the modules "
+                             "of all registered pages")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_MODULES,
+                        help="Number of heaviest modules listed per page")
+    arguments = parser.parse_args(argv)
+
+    module_names = arguments.modules or get_page_module_paths()
+    reports = [measure_import_time(module_name)
+               for module_name in module_names]
+    print(format_report(reports, arguments.top))
+    return int(any(report.error is not None for report in reports))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
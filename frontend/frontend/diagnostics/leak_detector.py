@@ -0,0 +1,361 @@
+import argparse
+import gc
+import os
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import shiboken6
+from PySide6.QtCore import (QCoreApplication, QEvent, QMetaMethod, QObject,
+                            SIGNAL)
+from PySide6.QtWidgets import QApplication
+
+# Environment variable that enables the leak checkpoints of the pages, e.g.
+# LEAK_DETECTOR=1
+LEAK_DETECTOR_VARIABLE: str = "LEAK_DETECTOR"
+# Number of objects or connections per class that may be added between two
+# visits of the same checkpoint before it is reported as a leak
+DEFAULT_TOLERANCE: int = 0
+# Number of times every page is created and closed by the page cycle
+# harness
+DEFAULT_CYCLES: int = 10
+# Number of cycles that run before the first snapshot, so objects that are
+# created once and cached are not reported
+WARMUP_CYCLES: int = 1
+
+
+class ObjectSnapshot:
+    """
+    The live Qt objects and their signal connections at one moment.
+
+    Attributes
+    ----------
+    object_counts : Counter
+        Number of live objects per class
+    connection_counts : Counter
+        Number of connected receivers per "class.signal"
+    """
+
+    def __init__(self, object_counts: Counter,
+                 connection_counts: Counter) -> None:
+        self.object_counts = object_counts
+        self.connection_counts = connection_counts
+
+    def get_total_objects(self) -> int:
+        """
+        :return: Number of live objects
+        :rtype: int
+        """
+        return sum(self.object_counts.values())
+
+    def get_total_connections(self) -> int:
+        """
+        :return: Number of connected receivers
+        :rtype: int
+        """
+        return sum(self.connection_counts.values())
+
+    def get_growth(self, earlier: "ObjectSnapshot",
+                   tolerance: int = DEFAULT_TOLERANCE) -> "LeakReport":
+        """
+        :param earlier: The snapshot to compare with
+        :type earlier: ObjectSnapshot
+        :param tolerance: Growth per class that is not reported
+        :type tolerance: int
+        :return: The classes and signals that grew since the earlier
+                 snapshot
+        :rtype: LeakReport
+        """
+        return LeakReport(
+            get_growth(earlier.object_counts, self.object_counts, tolerance),
+            get_growth(earlier.connection_counts, self.connection_counts,
+                       tolerance))
+
+
+class LeakReport:
+    """
+    The growth of the live objects and connections between two snapshots.
+
+    Attributes
+    ----------
+    object_growth : Dict[str, int]
+        Number of objects that were added per class
+    connection_growth : Dict[str, int]
+        Number of receivers that were added per "class.signal"
+    """
+
+    def __init__(self, object_growth: Dict[str, int],
+                 connection_growth: Dict[str, int]) -> None:
+        self.object_growth = object_growth
+        self.connection_growth = connection_growth
+
+    def has_leaks(self) -> bool:
+        """
+        :return: Whether any objects or connections were added
+        :rtype: bool
+        """
+        return bool(self.object_growth or self.connection_growth)
+
+    def format(self) -> str:
+        """
+        :return: The growth as text, the largest first
+        :rtype: str
+        """
+        lines = []
+        for title, growth in (("objects", self.object_growth),
+                              ("connections", self.connection_growth)):
+            for name, count in sorted(growth.items(),
+                                      key=lambda item: item[1],
+                                      reverse=True):
+                lines.append(f"    +{count} {title[:-1]} {name}")
+        return "\n".join(lines) if lines else "    no growth"
+
+
+def get_growth(before: Counter, after: Counter,
+               tolerance: int = DEFAULT_TOLERANCE) -> Dict[str, int]:
+    """
+    :return: The keys whose count grew by more than the tolerance, with the
+             growth
+    :rtype: Dict[str, int]
+    """
+    return {key: after[key] - before[key] for key in after
+            if after[key] - before[key] > tolerance}
+
+
+def get_live_objects() -> List[QObject]:
+    """
+    Get the live Qt objects: the objects that are referenced from Python and
+    all widgets, including the widgets that only exist in C++.
+
+    :return: The objects
+    :rtype: List[QObject]
+    """
+    objects = {}
+    candidates = [item for item in gc.get_objects()
+                  if isinstance(item, QObject)]
+    if QApplication.instance() is not None:
+        candidates.extend(QApplication.allWidgets())
+    for candidate in candidates:
+        if not shiboken6.isValid(candidate):
+            continue
+        # The same C++ object can have several wrappers
+        objects[shiboken6.getCppPointer(candidate)[0]] = candidate
+    return list(objects.values())
+
+
+def count_connections(qobject: QObject) -> Counter:
+    """
+    :param qobject: The object
+    :type qobject: QObject
+    :return: Number of connected receivers per signal of the object
+    :rtype: Counter
+    """
+    connections = Counter()
+    meta_object = qobject.metaObject()
+    class_name = type(qobject).__name__
+    for index in range(meta_object.methodCount()):
+        method = meta_object.method(index)
+        if method.methodType() != QMetaMethod.MethodType.Signal:
+            continue
+        signature = bytes(method.methodSignature()).decode()
+        receivers = qobject.receivers(SIGNAL(signature))
+        if receivers:
+            connections[f"{class_name}.{signature}"] += receivers
+    return connections
+
+
+def take_snapshot() -> ObjectSnapshot:
+    """
+    Count the live Qt objects and their signal connections, after deleting
+    the objects whose deletion was scheduled with deleteLater.
+
+    :return: The snapshot
+    :rtype: ObjectSnapshot
+    """
+    collect_garbage()
+    object_counts = Counter()
+    connection_counts = Counter()
+    for qobject in get_live_objects():
+        object_counts[type(qobject).__name__] += 1
+        connection_counts.update(count_connections(qobject))
+    return ObjectSnapshot(object_counts, connection_counts)
+
+
+def collect_garbage() -> None:
+    """
+    Delete the objects whose deletion was scheduled with deleteLater, and
+    the Python objects that are only kept by reference cycles.
+    """
+    if QCoreApplication.instance() is not None:
+        QCoreApplication.sendPostedEvents(None,
+                                          QEvent.Type.DeferredDelete)
+    gc.collect()
+
+
+class LeakDetector:
+    """
+    Compares the live Qt objects and connections every time a checkpoint is
+    passed, e.g. every time a page is loaded or a base station is
+    disconnected, with the previous time the same checkpoint was passed.
+    Objects that are added on every visit are reported as a leak.
+
+    Attributes
+    ----------
+    is_enabled : bool
+        Whether checkpoints take snapshots
+    tolerance : int
+        Growth per class that is not reported
+    snapshots : Dict[str, ObjectSnapshot]
+        The last snapshot of every checkpoint
+    reports : Dict[str, List[LeakReport]]
+        The growth found at every visit of every checkpoint
+    """
+
+    def __init__(self, is_enabled: bool = False,
+                 tolerance: int = DEFAULT_TOLERANCE) -> None:
+        self.is_enabled = is_enabled
+        self.tolerance = tolerance
+        self.snapshots: Dict[str, ObjectSnapshot] = {}
+        self.reports: Dict[str, List[LeakReport]] = {}
+
+    def checkpoint(self, name: str) -> Optional[LeakReport]:
+        """
+        Take a snapshot, and report the growth since the previous visit of
+        this checkpoint.
+
+        :param name: Name of the checkpoint
+        :type name: str
+        :return: The growth, None for the first visit or if disabled
+        :rtype: LeakReport or None
+        """
+        if not self.is_enabled:
+            return None
+        snapshot = take_snapshot()
+        previous = self.snapshots.get(name)
+        self.snapshots[name] = snapshot
+        if previous is None:
+            return None
+        report = snapshot.get_growth(previous, self.tolerance)
+        self.reports.setdefault(name, []).append(report)
+        if report.has_leaks():
+            print(f"Warning: objects grew since the last {name}:\n"
+                  f"{report.format()}")
+        return report
+
+
+# The leak detector of the application, enabled by the environment variable
+leak_detector = LeakDetector(bool(os.environ.get(LEAK_DETECTOR_VARIABLE)))
+
+
+def leak_checkpoint(name: str) -> Optional[LeakReport]:
+    """
+    Pass a checkpoint of the leak detector of the application. Does nothing
+    unless LEAK_DETECTOR is set.
+
+    :param name: Name of the checkpoint, e.g. "PageConnection load"
+    :type name: str
+    :return: The growth since the previous visit, if any
+    :rtype: LeakReport or None
+    """
+    return leak_detector.checkpoint(name)
+
+
+def cycle_page(page_type) -> None:
+    """
+    Create, load, leave and close the view of a page.
+
+    :param page_type: The page type
+    :type page_type: PageTypeEnum or SubPageTypeEnum
+    """
+    from application.Views.classes.page_views.page_registry import (
+        create_page)
+    view = create_page(page_type)
+    view.show()
+    view.load_page()
+    QCoreApplication.processEvents()
+    if hasattr(view, "leave_page"):
+        view.leave_page()
+    view.close_widget()
+    view.hide()
+    view.deleteLater()
+    del view
+    collect_garbage()
+
+
+def cycle_pages(page_types: Iterable, cycles: int = DEFAULT_CYCLES,
+                tolerance: int = DEFAULT_TOLERANCE) -> LeakReport:
+    """
+    Create and close every page a number of times, and report the objects
+    and connections that were added by the cycles after the warm-up.
+
+    :param page_types: The pages to cycle
+    :type page_types: Iterable[PageTypeEnum or SubPageTypeEnum]
+    :param cycles: Number of cycles after the warm-up
+    :type cycles: int
+    :param tolerance: Growth per class that is not reported; the growth is
+                      not divided by the number of cycles, so a single
+                      object leaked per cycle is found
+    :type tolerance: int
+    :return: The growth
+    :rtype: LeakReport
+    """
+    page_types = list(page_types)
+    for _ in range(WARMUP_CYCLES):
+        for page_type in page_types:
+            cycle_page(page_type)
+    before = take_snapshot()
+    for _ in range(cycles):
+        for page_type in page_types:
+            cycle_page(page_type)
+    return take_snapshot().get_growth(before, tolerance)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point of the page cycle harness: cycle every
+    registered page and fail if objects or connections leak.
+
+    :param argv: Command line arguments, defaults to sys.argv
+    :type argv: List[str], optional
+    :return: Exit code, 1 if a leak was found
+    :rtype: int
+    """
+    from application.Views.classes.page_views.page_registry import (
+        PAGE_REGISTRY)
+    parser = argparse.ArgumentParser(
+        description="Create and close every page repeatedly, and fail if "
+                    "Qt objects or signal connections leak.")
+    parser.add_argument("pages", nargs="*",
+                        help="Names of the page types to cycle, defaults to "
+                             "all registered pages")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES,
+                        help="Number of times every page is cycled")
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE,
+                        help="Growth per class that is not reported")
+    arguments = parser.parse_args(argv)
+
+    page_types = [page_type for page_type in PAGE_REGISTRY
+                  if not arguments.pages or page_type.name in arguments.pages]
+    if not page_types:
+        parser.error("No registered page matches the given names")
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    failed = False
+    for page_type in page_types:
+        try:
+            report = cycle_pages([page_type], arguments.cycles,
+                                 arguments.tolerance)
+        except Exception as error:
+            print(f"{page_type.name}: could not be cycled: {error}")
+            failed = True
+            continue
+        print(f"{page_type.name}: "
+              f"{'leaks' if report.has_leaks() else 'no leaks'}")
+        if report.has_leaks():
+            print(report.format())
+            failed = True
+    application.processEvents()
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
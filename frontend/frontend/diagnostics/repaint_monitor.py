@@ -0,0 +1,271 @@
+import os
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import shiboken6
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import QLabel, QWidget
+
+# Environment variable that enables the repaint monitor. Its value is a
+# comma separated list of the outputs: "overlay" shows the statistics on
+# every page, "log" prints them, e.g. REPAINT_HUD=overlay,log
+REPAINT_HUD_VARIABLE: str = "REPAINT_HUD"
+# Interval in milliseconds at which the statistics are shown and reset
+REPORT_INTERVAL: int = 1000
+# Number of most repainted widgets that are shown
+TOP_WIDGETS: int = 3
+# Shortcut that shows or hides the overlays
+TOGGLE_SHORTCUT: str = "Ctrl+Shift+P"
+# Style of the overlay, readable on top of any page
+OVERLAY_STYLE_SHEET: str = ("background-color: rgba(0, 0, 0, 170);"
+                            "color: #7CFC00; font-family: monospace;"
+                            "font-size: 11px; padding: 4px;")
+
+
+class RepaintStatistics:
+    """
+    The repaints of one window during one report interval.
+
+    Attributes
+    ----------
+    frame_times : List[float]
+        Time in seconds of every repaint of the window, including the
+        widgets and graphics effects in it
+    paint_count : int
+        Number of paint events of the widgets
+    paint_time : float
+        Time in seconds the paint events of the widgets took
+    layout_count : int
+        Number of layout passes
+    widget_paints : Counter
+        Number of paint events per widget
+    widget_paint_times : Counter
+        Time in seconds of the paint events per widget
+    """
+
+    def __init__(self) -> None:
+        self.frame_times: List[float] = []
+        self.paint_count = 0
+        self.paint_time = 0.0
+        self.layout_count = 0
+        self.widget_paints = Counter()
+        self.widget_paint_times = Counter()
+
+    def format(self, interval: float) -> str:
+        """
+        :param interval: Length of the report interval in seconds
+        :type interval: float
+        :return: The statistics as text, one item per line
+        :rtype: str
+        """
+        if self.frame_times:
+            mean_frame_time = sum(self.frame_times) / len(self.frame_times)
+            frame_time = (f"frame {1000 * mean_frame_time:.1f} ms avg, "
+                          f"{1000 * max(self.frame_times):.1f} ms max, "
+                          f"{len(self.frame_times) / interval:.0f} fps")
+        else:
+            frame_time = "frame -"
+        lines = [frame_time,
+                 f"paint {self.paint_count / interval:.0f}/s, "
+                 f"{1000 * self.paint_time / interval:.1f} ms/s",
+                 f"layout {self.layout_count / interval:.0f}/s"]
+        for widget_name, count in self.widget_paints.most_common(TOP_WIDGETS):
+            lines.append(f"{count:4d}x "
+                         f"{1000 * self.widget_paint_times[widget_name]:6.1f}"
+                         f" ms {widget_name}")
+        return "\n".join(lines)
+
+
+class RepaintMonitor(QObject):
+    """
+    Measures the paint time per window, the paints per second, the layout
+    passes and the widgets that are repainted most often, to find expensive
+    repaints.
+
+    The monitor is installed as event filter on the watched pages, every
+    widget in them, and their windows. It delivers the paint events itself,
+    so it can time them. The statistics are shown in an overlay on every
+    page, toggled with TOGGLE_SHORTCUT, and passed to the log sink.
+
+    Attributes
+    ----------
+    show_overlay : bool
+        Whether the overlays are shown
+    log_sink : Callable[[str], None] or None
+        Receives the statistics of every window every report interval
+    statistics : Dict[QWidget, RepaintStatistics]
+        The statistics of the current report interval per window
+    overlays : Dict[QWidget, QLabel]
+        The overlay of every watched page
+    """
+
+    def __init__(self, show_overlay: bool = True,
+                 log_sink: Optional[Callable[[str], None]] = None) -> None:
+        super().__init__()
+        self.show_overlay = show_overlay
+        self.log_sink = log_sink
+        self.statistics: Dict[QWidget, RepaintStatistics] = {}
+        self.overlays: Dict[QWidget, QLabel] = {}
+        self.report_timer = QTimer(self)
+        self.report_timer.setInterval(REPORT_INTERVAL)
+        self.report_timer.timeout.connect(self.report)
+        self._last_report_time = time.perf_counter()
+
+    def watch_page(self, page_view: QWidget) -> None:
+        """
+        Measure the repaints of a page, and add an overlay to it.
+
+        :param page_view: The view of the page
+        :type page_view: BasePageView
+        """
+        self._watch_widget(page_view)
+        page_view.window().installEventFilter(self)
+        if page_view not in self.overlays:
+            overlay = QLabel(page_view)
+            overlay.setStyleSheet(OVERLAY_STYLE_SHEET)
+            overlay.setAttribute(
+                Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+            overlay.setVisible(self.show_overlay)
+            self.overlays[page_view] = overlay
+            shortcut = QShortcut(QKeySequence(TOGGLE_SHORTCUT), page_view)
+            shortcut.activated.connect(self.toggle_overlay)
+        if not self.report_timer.isActive():
+            self._last_report_time = time.perf_counter()
+            self.report_timer.start()
+
+    def toggle_overlay(self) -> None:
+        """
+        Show or hide the overlays.
+        """
+        self.show_overlay = not self.show_overlay
+        for overlay in self.overlays.values():
+            overlay.setVisible(self.show_overlay)
+            overlay.raise_()
+
+    def _watch_widget(self, widget: QWidget) -> None:
+        """
+        Install the event filter on a widget and all widgets in it.
+        """
+        widget.installEventFilter(self)
+        for child in widget.findChildren(QWidget):
+            child.installEventFilter(self)
+
+    def _get_statistics(self, widget: QWidget) -> RepaintStatistics:
+        """
+        :return: The statistics of the window of a widget
+        :rtype: RepaintStatistics
+        """
+        window = widget.window()
+        statistics = self.statistics.get(window)
+        if statistics is None:
+            statistics = self.statistics[window] = RepaintStatistics()
+        return statistics
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Time the paint events and the repaints of the windows, and count the
+        layout passes.
+
+        :return: True if the event was delivered by the monitor
+        :rtype: bool
+        """
+        event_type = event.type()
+        if event_type == QEvent.Type.Paint:
+            if isinstance(watched, QLabel) and watched in (
+                    self.overlays.values()):
+                return False
+            start = time.perf_counter()
+            watched.event(event)
+            duration = time.perf_counter() - start
+            statistics = self._get_statistics(watched)
+            widget_name = get_widget_name(watched)
+            statistics.paint_count += 1
+            statistics.paint_time += duration
+            statistics.widget_paints[widget_name] += 1
+            statistics.widget_paint_times[widget_name] += duration
+            return True
+        if event_type == QEvent.Type.UpdateRequest and watched.isWindow():
+            # The window repaints all its dirty widgets and their graphics
+            # effects while it handles the update request
+            start = time.perf_counter()
+            watched.event(event)
+            self._get_statistics(watched).frame_times.append(
+                time.perf_counter() - start)
+            return True
+        if event_type == QEvent.Type.LayoutRequest:
+            self._get_statistics(watched).layout_count += 1
+        elif event_type == QEvent.Type.ChildPolished:
+            child = event.child()
+            if isinstance(child, QWidget):
+                self._watch_widget(child)
+        elif (event_type == QEvent.Type.ParentChange
+              and watched in self.overlays):
+            # The page was added to another window
+            watched.window().installEventFilter(self)
+        return False
+
+    def report(self) -> None:
+        """
+        Show the statistics of the last report interval, and reset them.
+        """
+        now = time.perf_counter()
+        interval = max(now - self._last_report_time, 1e-3)
+        self._last_report_time = now
+        # Windows that were deleted during the interval are skipped
+        texts = {window: statistics.format(interval)
+                 for window, statistics in self.statistics.items()
+                 if shiboken6.isValid(window)}
+        self.statistics = {}
+        # Forget the overlays of the pages that were deleted
+        self.overlays = {page_view: overlay for page_view, overlay
+                         in self.overlays.items()
+                         if shiboken6.isValid(page_view)}
+        for page_view, overlay in self.overlays.items():
+            text = texts.get(page_view.window())
+            if text is None or not overlay.isVisible():
+                continue
+            overlay.setText(text)
+            overlay.adjustSize()
+            overlay.raise_()
+        if self.log_sink is not None:
+            for window, text in texts.items():
+                self.log_sink(f"Repaints of {get_widget_name(window)}: "
+                              f"{text.replace(chr(10), '; ')}")
+
+
+def get_widget_name(widget: QWidget) -> str:
+    """
+    :param widget: The widget
+    :type widget: QWidget
+    :return: Class and object name of the widget, e.g. QPushButton(btn_ok)
+    :rtype: str
+    """
+    return f"{type(widget).__name__}({widget.objectName()})"
+
+
+# The outputs of the repaint monitor of the application, empty if disabled
+_outputs = [output.strip() for output in
+            os.environ.get(REPAINT_HUD_VARIABLE, "").split(",")
+            if output.strip()]
+# Created when the first page is watched, after the Qt application exists
+repaint_monitor: Optional[RepaintMonitor] = None
+
+
+def watch_page_repaints(page_view: QWidget) -> None:
+    """
+    Measure the repaints of a page if the repaint monitor is enabled with
+    REPAINT_HUD.
+
+    :param page_view: The view of the page
+    :type page_view: BasePageView
+    """
+    global repaint_monitor
+    if not _outputs:
+        return
+    if repaint_monitor is None:
+        repaint_monitor = RepaintMonitor(
+            show_overlay="overlay" in _outputs,
+            log_sink=print if "log" in _outputs else None)
+    repaint_monitor.watch_page(page_view)
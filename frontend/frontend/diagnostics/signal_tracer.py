@@ -0,0 +1,464 @@
+import atexit
+import bisect
+import heapq
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Environment variable with the path the latency report is written to when
+# the application exits. Signals are only traced when it is set, e.g.
+# SIGNAL_TRACE=signals.json
+SIGNAL_TRACE_VARIABLE: str = "SIGNAL_TRACE"
+# Upper bounds of the buckets of the latency histograms in seconds, from
+# 50 us to 3.3 s; slower samples go in an extra overflow bucket
+HISTOGRAM_BUCKETS: Tuple[float, ...] = tuple(50e-6 * 2 ** index
+                                             for index in range(17))
+# Number of slowest paths that are kept
+DEFAULT_SLOWEST_PATHS: int = 20
+# Maximum number of emits that wait for a queued slot per connection, so a
+# receiver that never runs does not grow the queue without bound
+MAX_PENDING_EMITS: int = 1000
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies with logarithmic buckets.
+
+    Attributes
+    ----------
+    counts : List[int]
+        Number of samples per bucket of HISTOGRAM_BUCKETS, plus an overflow
+        bucket
+    count : int
+        Number of samples
+    total : float
+        Sum of the samples in seconds
+    maximum : float
+        Largest sample in seconds
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, latency: float) -> None:
+        """
+        :param latency: The latency in seconds
+        :type latency: float
+        """
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def get_mean(self) -> float:
+        """
+        :return: Mean latency in seconds
+        :rtype: float
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        :param percentile: The percentile, between 0 and 100
+        :type percentile: float
+        :return: Upper bound of the bucket that contains the percentile in
+                 seconds, the maximum for the overflow bucket
+        :rtype: float
+        """
+        target = self.count * percentile / 100
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                if index < len(HISTOGRAM_BUCKETS):
+                    return min(HISTOGRAM_BUCKETS[index], self.maximum)
+                break
+        return self.maximum
+
+    def to_dict(self) -> dict:
+        """
+        :return: The histogram in a JSON friendly form
+        :rtype: dict
+        """
+        return {"count": self.count, "mean": self.get_mean(),
+                "p50": self.get_percentile(50),
+                "p95": self.get_percentile(95), "max": self.maximum,
+                "buckets": list(HISTOGRAM_BUCKETS), "counts": self.counts}
+
+
+class TracedConnection:
+    """
+    A connection of a signal to a slot whose latencies are recorded.
+
+    Attributes
+    ----------
+    name : str
+        "signal -> slot", used in the report
+    signal_name : str
+        Name of the signal
+    slot : Callable
+        The slot that was connected
+    wrapper : Callable
+        The function that is connected instead of the slot
+    pending_emits : Deque[Tuple[float, float, tuple]]
+        Emit time, start time of the path and path of every emit that did
+        not reach the slot yet
+    dispatch_latency : LatencyHistogram
+        Time from the emit to the start of the slot
+    slot_duration : LatencyHistogram
+        Time the slot ran
+    """
+
+    def __init__(self, signal_name: str, slot: Callable,
+                 wrapper: Callable = None) -> None:
+        self.signal_name = signal_name
+        self.slot = slot
+        self.name = f"{signal_name} -> {get_callable_name(slot)}"
+        self.wrapper = wrapper
+        self.pending_emits: Deque[Tuple[float, float, tuple]] = deque(
+            maxlen=MAX_PENDING_EMITS)
+        self.dispatch_latency = LatencyHistogram()
+        self.slot_duration = LatencyHistogram()
+
+
+class SignalTracer:
+    """
+    Records for every traced connection the time from the emit of the signal
+    to the start of the slot, and the time the slot ran. When a slot emits
+    another traced signal, e.g. when a view propagates the signal of a sub
+    page, the connections form a path; the total time of the slowest paths
+    is kept.
+
+    Only connections made with connect_traced while the tracer is enabled
+    are traced. When the tracer is disabled, connect_traced connects the
+    slot itself, so tracing costs nothing.
+
+    The emit time is recorded by a slot that is connected directly to the
+    signal before the first traced slot, so all connections of a traced
+    signal should be made with connect_traced.
+
+    Attributes
+    ----------
+    is_enabled : bool
+        Whether new connections are traced
+    report_path : str or None
+        Path the report is written to when the application exits
+    connections : Dict[str, TracedConnection]
+        The first traced connection of every name
+    slowest_paths : List[Tuple[float, tuple]]
+        Heap of the total time and the connection names of the slowest paths
+    """
+
+    def __init__(self, report_path: Optional[str] = None) -> None:
+        self.report_path = report_path
+        self.is_enabled = report_path is not None
+        self.connections: Dict[str, TracedConnection] = {}
+        self.slowest_paths: List[Tuple[float, tuple]] = []
+        self.number_of_slowest_paths = DEFAULT_SLOWEST_PATHS
+        # Traced connections and the emit recorder of every traced signal
+        self._signal_connections: Dict[object, List[TracedConnection]] = {}
+        self._emit_recorders: Dict[object, Callable] = {}
+        # Paths of the traced slots that are running, per thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """
+        Trace the connections that are made from now on.
+        """
+        self.is_enabled = True
+
+    def connect_traced(self, signal, slot: Callable,
+                       name: Optional[str] = None) -> None:
+        """
+        Connect a slot to a signal, and trace the connection if the tracer
+        is enabled.
+
+        :param signal: The signal, e.g. self.controller.sig_folder_changed
+        :type signal: SignalInstance
+        :param slot: The slot
+        :type slot: Callable
+        :param name: Name of the signal in the report, defaults to the name
+                     of the signal
+        :type name: str, optional
+        """
+        if not self.is_enabled:
+            signal.connect(slot)
+            return
+        # Qt is imported here, so the latency histograms can be used
+        # without Qt, e.g. by the stream outlet in the acquisition worker
+        from PySide6.QtCore import Qt
+        signal_name = name or get_signal_name(signal)
+        connection = TracedConnection(signal_name, slot)
+        connection.wrapper = self._wrap_slot(connection)
+        with self._lock:
+            if signal not in self._emit_recorders:
+                emit_recorder = self._create_emit_recorder(signal)
+                self._emit_recorders[signal] = emit_recorder
+                self._signal_connections[signal] = []
+                # Connected directly, so it runs in the emitting thread even
+                # if the slots are queued
+                signal.connect(emit_recorder,
+                               Qt.ConnectionType.DirectConnection)
+            self._signal_connections[signal].append(connection)
+            self._merge_connection(connection)
+        signal.connect(connection.wrapper)
+
+    def disconnect_traced(self, signal, slot: Callable) -> None:
+        """
+        Disconnect a slot that was connected with connect_traced.
+
+        :param signal: The signal
+        :type signal: SignalInstance
+        :param slot: The slot
+        :type slot: Callable
+        """
+        with self._lock:
+            traced_connections = self._signal_connections.get(signal, [])
+            for connection in traced_connections:
+                if connection.slot == slot:
+                    traced_connections.remove(connection)
+                    break
+            else:
+                connection = None
+            if connection is not None and not traced_connections:
+                del self._signal_connections[signal]
+                signal.disconnect(self._emit_recorders.pop(signal))
+        signal.disconnect(slot if connection is None else connection.wrapper)
+
+    def _merge_connection(self, connection: TracedConnection) -> None:
+        """
+        Share the histograms of connections with the same name, e.g. of the
+        views of a page that was opened several times.
+        """
+        existing = self.connections.get(connection.name)
+        if existing is None:
+            self.connections[connection.name] = connection
+        else:
+            connection.dispatch_latency = existing.dispatch_latency
+            connection.slot_duration = existing.slot_duration
+
+    def _get_path_stack(self) -> list:
+        """
+        :return: Start time, path and whether the path was continued of the
+                 traced slots that are running in this thread
+        :rtype: list
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _create_emit_recorder(self, signal) -> Callable:
+        """
+        Create the slot that records the emits of a signal for all of its
+        traced connections.
+        """
+        def record_emit(*args) -> None:
+            now = time.perf_counter()
+            stack = self._get_path_stack()
+            # An emit from a traced slot continues the path of that slot
+            path_start, path = stack[-1][:2] if stack else (now, ())
+            for connection in self._signal_connections.get(signal, ()):
+                connection.pending_emits.append((now, path_start, path))
+        return record_emit
+
+    def _wrap_slot(self, connection: TracedConnection) -> Callable:
+        """
+        Create the function that is connected instead of the slot.
+        """
+        slot = connection.slot
+        number_of_arguments = get_number_of_arguments(slot)
+
+        def traced_slot(*args) -> None:
+            start = time.perf_counter()
+            if connection.pending_emits:
+                emit_time, path_start, path = \
+                    connection.pending_emits.popleft()
+            else:
+                emit_time, path_start, path = start, start, ()
+            path = path + (connection.name,)
+            stack = self._get_path_stack()
+            # A path is only kept when it ends, so the slot that continues
+            # the path of a running slot marks that path as continued
+            for frame in stack:
+                if frame[1] == path[:-1]:
+                    frame[2] = True
+            frame = [path_start, path, False]
+            stack.append(frame)
+            try:
+                if number_of_arguments is not None:
+                    args = args[:number_of_arguments]
+                slot(*args)
+            finally:
+                stack.pop()
+                end = time.perf_counter()
+                with self._lock:
+                    connection.dispatch_latency.add(start - emit_time)
+                    connection.slot_duration.add(end - start)
+                    if not frame[2]:
+                        self._add_path(end - path_start, path)
+        return traced_slot
+
+    def _add_path(self, duration: float, path: tuple) -> None:
+        """
+        Keep the path if it is one of the slowest paths.
+        """
+        if len(self.slowest_paths) < self.number_of_slowest_paths:
+            heapq.heappush(self.slowest_paths, (duration, path))
+        elif duration > self.slowest_paths[0][0]:
+            heapq.heapreplace(self.slowest_paths, (duration, path))
+
+    def get_slowest_paths(self) -> List[Tuple[float, tuple]]:
+        """
+        :return: Total time in seconds and connection names of the slowest
+                 paths, the slowest first
+        :rtype: List[Tuple[float, tuple]]
+        """
+        with self._lock:
+            return sorted(self.slowest_paths, reverse=True)
+
+    def get_report(self) -> dict:
+        """
+        :return: The histograms of every connection and the slowest paths
+        :rtype: dict
+        """
+        with self._lock:
+            connections = {
+                name: {"signal": connection.signal_name,
+                       "dispatch_latency":
+                           connection.dispatch_latency.to_dict(),
+                       "slot_duration": connection.slot_duration.to_dict()}
+                for name, connection in self.connections.items()}
+        return {"connections": connections,
+                "slowest_paths": [{"duration": duration, "path": list(path)}
+                                  for duration, path
+                                  in self.get_slowest_paths()]}
+
+    def format_report(self) -> str:
+        """
+        :return: The report as text, the slowest connections first
+        :rtype: str
+        """
+        lines = ["connection: count, dispatch p50/p95/max, "
+                 "slot p50/p95/max (ms)"]
+        with self._lock:
+            connections = sorted(self.connections.values(),
+                                 key=lambda item: item.slot_duration.total,
+                                 reverse=True)
+            for connection in connections:
+                dispatch = connection.dispatch_latency
+                duration = connection.slot_duration
+                lines.append(
+                    f"{connection.name}: {duration.count}, "
+                    f"{format_latencies(dispatch)}, "
+                    f"{format_latencies(duration)}")
+        lines.append("slowest paths (ms):")
+        for duration, path in self.get_slowest_paths():
+            lines.append(f"    {duration * 1000:8.2f} {' => '.join(path)}")
+        return "\n".join(lines)
+
+    def dump(self, report_path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the report as JSON.
+
+        :param report_path: Path of the report, defaults to report_path
+        :type report_path: str, optional
+        :return: The path the report was written to, None if there is no
+                 path
+        :rtype: str or None
+        """
+        report_path = report_path or self.report_path
+        if report_path is None:
+            return None
+        with open(report_path, "w") as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
+        return report_path
+
+
+def get_signal_name(signal) -> str:
+    """
+    :param signal: The signal
+    :type signal: SignalInstance
+    :return: Name of the signal, e.g. sig_folder_changed
+    :rtype: str
+    """
+    # The representation is "<PySide6.QtCore.SignalInstance name(args) ...>"
+    description = repr(signal).split(" ")
+    if len(description) > 1:
+        return description[1].split("(")[0]
+    return repr(signal)
+
+
+def get_callable_name(slot: Callable) -> str:
+    """
+    :param slot: The slot
+    :type slot: Callable
+    :return: Qualified name of the slot, e.g. PageConnectionView.load_page
+    :rtype: str
+    """
+    return getattr(slot, "__qualname__", None) or repr(slot)
+
+
+def get_number_of_arguments(slot: Callable) -> Optional[int]:
+    """
+    Get the number of positional arguments of a slot, because Qt calls a
+    slot with as many arguments of the signal as the slot accepts.
+
+    :param slot: The slot
+    :type slot: Callable
+    :return: The number of arguments, None if the slot accepts any number
+             or its signature is unknown
+    :rtype: int or None
+    """
+    try:
+        parameters = inspect.signature(slot).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    number_of_arguments = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY,
+                              parameter.POSITIONAL_OR_KEYWORD):
+            number_of_arguments += 1
+    return number_of_arguments
+
+
+def format_latencies(histogram: LatencyHistogram) -> str:
+    """
+    :return: The p50, p95 and maximum of a histogram in milliseconds
+    :rtype: str
+    """
+    return "/".join(f"{latency * 1000:.2f}" for latency in (
+        histogram.get_percentile(50), histogram.get_percentile(95),
+        histogram.maximum))
+
+
+# The tracer of the application, enabled by the environment variable
+signal_tracer = SignalTracer(os.environ.get(SIGNAL_TRACE_VARIABLE))
+if signal_tracer.is_enabled:
+    atexit.register(signal_tracer.dump)
+
+
+def connect_traced(signal, slot: Callable, name: Optional[str] = None
+                   ) -> None:
+    """
+    Connect a slot to a signal, and trace the connection if the signal
+    tracer is enabled. See SignalTracer.connect_traced.
+    """
+    signal_tracer.connect_traced(signal, slot, name)
+
+
+def disconnect_traced(signal, slot: Callable) -> None:
+    """
+    Disconnect a slot that was connected with connect_traced.
+    """
+    signal_tracer.disconnect_traced(signal, slot)
@@ -0,0 +1,324 @@
+import atexit
+import builtins
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer
+
+# Environment variable with the path of the Chrome trace file. The startup
+# is only profiled when it is set, e.g. STARTUP_TRACE=startup.json; open the
+# file in chrome://tracing or https://ui.perfetto.dev.
+STARTUP_TRACE_VARIABLE: str = "STARTUP_TRACE"
+# Categories of the phases in the timeline
+CATEGORY_IMPORT: str = "import"
+CATEGORY_SETUP_UI: str = "setupUi"
+CATEGORY_CONTROLLER: str = "controller"
+CATEGORY_PAGE: str = "page"
+CATEGORY_DEFERRED: str = "deferred"
+CATEGORY_STARTUP: str = "startup"
+# Imports that take less time than this (in seconds) are left out of the
+# timeline, to keep it readable
+MIN_IMPORT_DURATION: float = 0.0005
+
+
+class StartupProfiler:
+    """
+    Records the phases of the startup of the application as a timeline and
+    writes it as a Chrome trace.
+
+    When the profiler is disabled, profile_phase returns a shared context
+    manager that does nothing, so the instrumentation can stay in the code.
+
+    Attributes
+    ----------
+    is_enabled : bool
+        Whether phases are recorded
+    trace_path : str or None
+        Path the trace is written to
+    events : List[Dict[str, object]]
+        The recorded trace events
+    """
+
+    def __init__(self, trace_path: Optional[str] = None) -> None:
+        """
+        Initialize the profiler.
+
+        :param trace_path: Path of the trace file, None to disable the
+                           profiler
+        :type trace_path: str, optional
+        """
+        self.trace_path = trace_path
+        self.is_enabled = trace_path is not None
+        self.events: List[Dict[str, object]] = []
+        self.start_time = time.perf_counter()
+        self._original_import = None
+        self._null_context = contextlib.nullcontext()
+        self._first_page_loaded = False
+
+    def _get_timestamp(self, timestamp: float) -> float:
+        """
+        :return: Microseconds since the start of the profiler
+        :rtype: float
+        """
+        return (timestamp - self.start_time) * 1e6
+
+    def add_phase(self, name: str, category: str, start: float,
+                  end: float) -> None:
+        """
+        Record a phase that ran between two perf_counter timestamps.
+
+        :param name: Name of the phase
+        :type name: str
+        :param category: Category of the phase, e.g. CATEGORY_SETUP_UI
+        :type category: str
+        :param start: Start of the phase
+        :type start: float
+        :param end: End of the phase
+        :type end: float
+        """
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": self._get_timestamp(start), "dur": (end - start) * 1e6,
+            "pid": os.getpid(), "tid": threading.get_ident()})
+
+    def mark(self, name: str, category: str = CATEGORY_STARTUP) -> None:
+        """
+        Record a moment, e.g. that the first page is interactive.
+
+        :param name: Name of the moment
+        :type name: str
+        :param category: Category of the moment
+        :type category: str
+        """
+        if not self.is_enabled:
+            return
+        self.events.append({
+            "name": name, "cat": category, "ph": "i", "s": "g",
+            "ts": self._get_timestamp(time.perf_counter()),
+            "pid": os.getpid(), "tid": threading.get_ident()})
+
+    def profile_phase(self, name: str, category: str = CATEGORY_STARTUP):
+        """
+        Context manager that records the code it wraps as a phase.
+
+        :param name: Name of the phase
+        :type name: str
+        :param category: Category of the phase
+        :type category: str
+        :return: The context manager
+        """
+        if not self.is_enabled:
+            return self._null_context
+        return self._profile_phase(name, category)
+
+    @contextlib.contextmanager
+    def _profile_phase(self, name: str, category: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, category, start, time.perf_counter())
+
+    def instrument_page_class(self, page_class: type) -> None:
+        """
+        Record the construction, setupUi and load_page of every view of a
+        page class. The first load_page is marked as the moment the first
+        page is interactive.
+
+        :param page_class: The class of the view of a page
+        :type page_class: type
+        """
+        if not self.is_enabled or "_startup_profiled" in vars(page_class):
+            return
+        page_class._startup_profiled = True
+        class_name = page_class.__name__
+        for method_name, category in (("__init__", CATEGORY_PAGE),
+                                      ("setupUi", CATEGORY_SETUP_UI),
+                                      ("load_page", CATEGORY_PAGE)):
+            method = getattr(page_class, method_name, None)
+            if method is None:
+                continue
+            setattr(page_class, method_name, self._wrap_method(
+                method, f"{class_name}.{method_name}", category))
+
+    def _wrap_method(self, method: Callable, name: str,
+                     category: str) -> Callable:
+        """
+        Wrap a method so every call is recorded as a phase.
+        """
+        @functools.wraps(method)
+        def profiled_method(*args, **kwargs):
+            with self._profile_phase(name, category):
+                result = method(*args, **kwargs)
+            if name.endswith(".load_page") and not self._first_page_loaded:
+                self._first_page_loaded = True
+                self.mark("first page loaded")
+            return result
+        return profiled_method
+
+    def start_import_profiling(self) -> None:
+        """
+        Record every import of a module that was not imported before.
+        """
+        if not self.is_enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        original_import = self._original_import
+
+        def profiled_import(name, globals=None, locals=None, fromlist=(),
+                            level=0):
+            # Only new absolute imports take time
+            if level or name in sys.modules:
+                return original_import(name, globals, locals, fromlist,
+                                       level)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist,
+                                       level)
+            finally:
+                end = time.perf_counter()
+                if end - start >= MIN_IMPORT_DURATION:
+                    self.add_phase(name, CATEGORY_IMPORT, start, end)
+
+        builtins.__import__ = profiled_import
+
+    def stop_import_profiling(self) -> None:
+        """
+        Stop recording imports.
+        """
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def dump(self, trace_path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the timeline as a Chrome trace.
+
+        :param trace_path: Path of the trace file, defaults to trace_path
+        :type trace_path: str, optional
+        :return: The path the trace was written to, None if disabled
+        :rtype: str or None
+        """
+        trace_path = trace_path or self.trace_path
+        if not self.is_enabled or trace_path is None:
+            return None
+        with open(trace_path, "w") as trace_file:
+            json.dump({"traceEvents": self.events,
+                       "displayTimeUnit": "ms"}, trace_file)
+        return trace_path
+
+
+# The profiler of the application, enabled by the environment variable
+startup_profiler = StartupProfiler(os.environ.get(STARTUP_TRACE_VARIABLE))
+if startup_profiler.is_enabled:
+    # Imports are recorded from the moment this module is imported, so
+    # import it first in the entry point of the application
+    startup_profiler.start_import_profiling()
+    atexit.register(startup_profiler.dump)
+
+
+class DeferredInitQueue(QObject):
+    """
+    Queue of non-critical setup steps that run after the first window was
+    painted, one step per iteration of the event loop, so they do not delay
+    the first interactive page and do not block the user input.
+
+    Steps that are queued after the first paint run on the next iteration
+    of the event loop. Without a Qt application (e.g. headless), steps run
+    immediately.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.steps: Deque[Tuple[str, Callable[[], None]]] = deque()
+        self.is_first_paint_done = False
+        self._is_filter_installed = False
+        self._is_run_scheduled = False
+
+    def defer(self, name: str, step: Callable[[], None]) -> None:
+        """
+        Run a setup step after the first paint.
+
+        :param name: Name of the step, shown in the startup timeline
+        :type name: str
+        :param step: The step
+        :type step: Callable[[], None]
+        """
+        application = QCoreApplication.instance()
+        if application is None:
+            with startup_profiler.profile_phase(name, CATEGORY_DEFERRED):
+                step()
+            return
+        self.steps.append((name, step))
+        if self.is_first_paint_done:
+            self._schedule_next_step()
+        elif not self._is_filter_installed:
+            application.installEventFilter(self)
+            self._is_filter_installed = True
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Start running the steps once the first widget was painted.
+
+        :return: False, the event is never consumed
+        :rtype: bool
+        """
+        if event.type() == QEvent.Type.Paint and not self.is_first_paint_done:
+            self.is_first_paint_done = True
+            startup_profiler.mark("first paint")
+            QCoreApplication.instance().removeEventFilter(self)
+            self._is_filter_installed = False
+            self._schedule_next_step()
+        return False
+
+    def _schedule_next_step(self) -> None:
+        """
+        Run the next step on the next iteration of the event loop.
+        """
+        if self.steps and not self._is_run_scheduled:
+            self._is_run_scheduled = True
+            QTimer.singleShot(0, self._run_next_step)
+
+    def _run_next_step(self) -> None:
+        """
+        Run the oldest step, and schedule the step after it.
+        """
+        self._is_run_scheduled = False
+        if not self.steps:
+            return
+        name, step = self.steps.popleft()
+        try:
+            with startup_profiler.profile_phase(name, CATEGORY_DEFERRED):
+                step()
+        except Exception as error:
+            print(f"Warning: deferred setup step {name} failed: {error}")
+        if self.steps:
+            self._schedule_next_step()
+        else:
+            startup_profiler.mark("deferred setup finished")
+
+
+# Lazily created, as a QObject should be created after the Qt application
+_deferred_init_queue: Optional[DeferredInitQueue] = None
+
+
+def defer_until_first_paint(name: str, step: Callable[[], None]) -> None:
+    """
+    Run a non-critical setup step after the first window was painted.
+
+    :param name: Name of the step, shown in the startup timeline
+    :type name: str
+    :param step: The step
+    :type step: Callable[[], None]
+    """
+    global _deferred_init_queue
+    if _deferred_init_queue is None:
+        _deferred_init_queue = DeferredInitQueue()
+    _deferred_init_queue.defer(name, step)
@@ -0,0 +1,457 @@
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPixmap
+from PySide6.QtWidgets import (QApplication, QGraphicsDropShadowEffect,
+                               QGraphicsPathItem, QGraphicsScene,
+                               QPushButton, QVBoxLayout, QWidget)
+
+# Width of the stretched middle of the nine-patch in pixels
+NINE_PATCH_CENTER = 1
+# Number of buttons and repaints used by the benchmark
+BENCHMARK_WIDGETS = 12
+BENCHMARK_REPAINTS = 200
+
+
+class ShadowStyle:
+    """
+    The look of a shadow, with the parameters of QGraphicsDropShadowEffect.
+
+    Attributes
+    ----------
+    blur_radius : float
+        Blur radius of the shadow in pixels
+    x_offset : float
+        Horizontal offset of the shadow in pixels
+    y_offset : float
+        Vertical offset of the shadow in pixels
+    color : Tuple[int, int, int, int]
+        RGBA color of the shadow
+    corner_radius : float
+        Corner radius of the widget that casts the shadow in pixels
+    """
+
+    def __init__(self, blur_radius: float, x_offset: float,
+                 y_offset: float, color: Tuple[int, int, int, int],
+                 corner_radius: float = 0.0) -> None:
+        self.blur_radius = blur_radius
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.color = color
+        self.corner_radius = corner_radius
+
+    def get_key(self) -> tuple:
+        """
+        :return: Key of the shadow in the cache of pre-rendered shadows
+        :rtype: tuple
+        """
+        return (self.blur_radius, self.x_offset, self.y_offset, self.color,
+                self.corner_radius)
+
+    def get_margin(self) -> int:
+        """
+        :return: Distance in pixels the shadow extends beyond the widget
+        :rtype: int
+        """
+        return int(self.blur_radius + 0.5) + 1
+
+    def create_effect(self) -> QGraphicsDropShadowEffect:
+        """
+        :return: The graphics effect that draws the same shadow
+        :rtype: QGraphicsDropShadowEffect
+        """
+        effect = QGraphicsDropShadowEffect()
+        effect.setBlurRadius(self.blur_radius)
+        effect.setOffset(self.x_offset, self.y_offset)
+        effect.setColor(QColor(*self.color))
+        return effect
+
+    @classmethod
+    def from_effect(cls, effect: QGraphicsDropShadowEffect,
+                    corner_radius: float) -> "ShadowStyle":
+        """
+        :param effect: The graphics effect to draw the same shadow as
+        :type effect: QGraphicsDropShadowEffect
+        :param corner_radius: Corner radius of the widget that casts the
+                              shadow, which the effect does not know
+        :type corner_radius: float
+        :return: The shadow drawn by the effect
+        :rtype: ShadowStyle
+        """
+        color = effect.color()
+        return cls(effect.blurRadius(), effect.xOffset(), effect.yOffset(),
+                   (color.red(), color.green(), color.blue(), color.alpha()),
+                   corner_radius)
+
+
+# Fallback shadows, used when the shadow of the style class cannot be read.
+# GeneralStyleElements is not part of this package, so these values are
+# assumed, not taken from add_shadow_frame and add_shadow_pushbutton; use
+# get_style_class_shadow to get the shadow the style class actually adds.
+# The corner radii are assumed to match the stylesheet of the visible
+# frames and the push buttons.
+FRAME_SHADOW = ShadowStyle(blur_radius=20, x_offset=0, y_offset=2,
+                           color=(0, 0, 0, 60), corner_radius=10)
+BUTTON_SHADOW = ShadowStyle(blur_radius=12, x_offset=0, y_offset=2,
+                            color=(0, 0, 0, 80), corner_radius=5)
+
+
+def get_style_class_shadow(add_shadow: Callable[[QWidget, QWidget], None],
+                           fallback: ShadowStyle) -> ShadowStyle:
+    """
+    Get the shadow a method of the style class adds, e.g.
+    add_shadow_frame, by adding it to a probe widget and reading the
+    graphics effect back.
+
+    :param add_shadow: Adds a shadow effect to a widget, called with the
+                       parent and the widget
+    :type add_shadow: Callable[[QWidget, QWidget], None]
+    :param fallback: The shadow used if no drop shadow effect is added; its
+                     corner radius is used in any case
+    :type fallback: ShadowStyle
+    :return: The shadow
+    :rtype: ShadowStyle
+    """
+    parent = QWidget()
+    probe = QWidget(parent)
+    add_shadow(parent, probe)
+    effect = probe.graphicsEffect()
+    if isinstance(effect, QGraphicsDropShadowEffect):
+        style = ShadowStyle.from_effect(effect, fallback.corner_radius)
+    else:
+        print("Warning: the style class added no drop shadow, the fallback "
+              "shadow is used")
+        style = fallback
+    parent.deleteLater()
+    return style
+
+# Cache of the pre-rendered nine-patches by shadow and device pixel ratio
+_nine_patches: Dict[tuple, QPixmap] = {}
+# Cache of the shadows composed from a nine-patch by shadow, size and device
+# pixel ratio. Widgets of the same size class, e.g. the buttons of a page,
+# share one pixmap.
+_shadow_pixmaps: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+# Number of composed shadows that are kept
+MAX_SHADOW_PIXMAPS = 64
+
+
+def render_nine_patch(style: ShadowStyle,
+                      device_pixel_ratio: float = 1.0) -> QImage:
+    """
+    Render the shadow of a rounded rectangle that is just large enough to
+    contain the corners and a flat middle, with the same blur as
+    QGraphicsDropShadowEffect.
+
+    :param style: The shadow
+    :type style: ShadowStyle
+    :param device_pixel_ratio: Device pixel ratio of the screen
+    :type device_pixel_ratio: float
+    :return: The nine-patch, with a margin of style.get_margin() around a
+             rectangle of 2 * (corner radius + margin) + NINE_PATCH_CENTER
+    :rtype: QImage
+    """
+    margin = style.get_margin()
+    # The middle of the rectangle has to be far enough from the corners
+    # that the blur is flat there
+    inner_size = 2 * (style.corner_radius + margin) + NINE_PATCH_CENTER
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, inner_size, inner_size),
+                        style.corner_radius, style.corner_radius)
+
+    # Render the shadow with the graphics effect itself, so it looks the
+    # same as the effect it replaces. The shadow is moved away from the
+    # rectangle and copied, as the rectangle would cover part of it; the
+    # widget covers that part, except where the shadow is offset.
+    size = int(inner_size + 2 * margin)
+    scene = QGraphicsScene()
+    item = QGraphicsPathItem(path)
+    item.setPen(Qt.PenStyle.NoPen)
+    item.setBrush(QColor(0, 0, 0))
+    effect = QGraphicsDropShadowEffect()
+    effect.setBlurRadius(style.blur_radius)
+    effect.setOffset(2 * size, 0)
+    effect.setColor(QColor(*style.color))
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+    pixel_size = int(size * device_pixel_ratio)
+    image = QImage(3 * pixel_size, pixel_size,
+                   QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    scene.render(painter, QRectF(0, 0, image.width(), image.height()),
+                 QRectF(-margin, -margin, 3 * size, size))
+    painter.end()
+    image = image.copy(2 * pixel_size, 0, pixel_size, pixel_size)
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+def get_nine_patch(style: ShadowStyle,
+                   device_pixel_ratio: float = 1.0) -> QPixmap:
+    """
+    Get the pre-rendered nine-patch of a shadow, and render it on the first
+    request.
+
+    :param style: The shadow
+    :type style: ShadowStyle
+    :param device_pixel_ratio: Device pixel ratio of the screen
+    :type device_pixel_ratio: float
+    :return: The nine-patch
+    :rtype: QPixmap
+    """
+    key = (style.get_key(), device_pixel_ratio)
+    pixmap = _nine_patches.get(key)
+    if pixmap is None:
+        pixmap = QPixmap.fromImage(render_nine_patch(style,
+                                                     device_pixel_ratio))
+        _nine_patches[key] = pixmap
+    return pixmap
+
+
+def paint_nine_patch(painter: QPainter, target: QRectF, pixmap: QPixmap,
+                     border: float) -> None:
+    """
+    Paint a nine-patch: the corners as they are, the edges stretched, and
+    the middle not at all.
+
+    :param painter: The painter
+    :type painter: QPainter
+    :param target: The rectangle to fill
+    :type target: QRectF
+    :param pixmap: The nine-patch
+    :type pixmap: QPixmap
+    :param border: Size of the corners in logical pixels
+    :type border: float
+    """
+    ratio = pixmap.devicePixelRatio()
+    size = pixmap.width() / ratio
+    # Columns and rows of the target and of the source in logical pixels
+    target_x = (target.left(), target.left() + border,
+                target.right() - border, target.right())
+    target_y = (target.top(), target.top() + border,
+                target.bottom() - border, target.bottom())
+    source = (0.0, border, size - border, size)
+    for row in range(3):
+        for column in range(3):
+            if row == 1 and column == 1:
+                continue
+            target_rect = QRectF(
+                QPointF(target_x[column], target_y[row]),
+                QPointF(target_x[column + 1], target_y[row + 1]))
+            if target_rect.width() <= 0 or target_rect.height() <= 0:
+                continue
+            source_rect = QRectF(
+                QPointF(source[column] * ratio, source[row] * ratio),
+                QPointF(source[column + 1] * ratio,
+                        source[row + 1] * ratio))
+            painter.drawPixmap(target_rect, pixmap, source_rect)
+
+
+def get_shadow_pixmap(style: ShadowStyle, width: int, height: int,
+                      device_pixel_ratio: float = 1.0) -> QPixmap:
+    """
+    Get the shadow of a widget of a size, composed from the nine-patch of
+    the shadow on the first request.
+
+    :param style: The shadow
+    :type style: ShadowStyle
+    :param width: Width of the shadow, including its margins
+    :type width: int
+    :param height: Height of the shadow, including its margins
+    :type height: int
+    :param device_pixel_ratio: Device pixel ratio of the screen
+    :type device_pixel_ratio: float
+    :return: The shadow
+    :rtype: QPixmap
+    """
+    key = (style.get_key(), width, height, device_pixel_ratio)
+    pixmap = _shadow_pixmaps.get(key)
+    if pixmap is not None:
+        _shadow_pixmaps.move_to_end(key)
+        return pixmap
+    pixmap = QPixmap(int(width * device_pixel_ratio),
+                     int(height * device_pixel_ratio))
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    paint_nine_patch(painter, QRectF(0, 0, width, height),
+                     get_nine_patch(style, device_pixel_ratio),
+                     style.get_margin() * 2 + style.corner_radius)
+    painter.end()
+    _shadow_pixmaps[key] = pixmap
+    if len(_shadow_pixmaps) > MAX_SHADOW_PIXMAPS:
+        _shadow_pixmaps.popitem(last=False)
+    return pixmap
+
+
+class CachedShadow(QWidget):
+    """
+    Paints a pre-rendered shadow beneath a widget, instead of a
+    QGraphicsDropShadowEffect. The effect renders the widget offscreen and
+    blurs it whenever the widget changes; the cached shadow only draws a
+    pixmap that is shared by all widgets of the same size.
+
+    The shadow is a sibling of the widget, stacked under it, that follows
+    the geometry and the visibility of the widget.
+
+    Attributes
+    ----------
+    target : QWidget
+        The widget that casts the shadow
+    style : ShadowStyle
+        The shadow
+    """
+
+    def __init__(self, target: QWidget, style: ShadowStyle) -> None:
+        """
+        :param target: The widget that casts the shadow, must have a parent
+        :type target: QWidget
+        :param style: The shadow
+        :type style: ShadowStyle
+        """
+        super().__init__(target.parentWidget())
+        self.target = target
+        self.style = style
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        target.installEventFilter(self)
+        self.update_geometry()
+        self.setVisible(target.isVisibleTo(target.parentWidget()))
+
+    def update_geometry(self) -> None:
+        """
+        Cover the widget and the margin of the shadow around it.
+        """
+        margin = self.style.get_margin()
+        geometry = self.target.geometry().adjusted(-margin, -margin,
+                                                   margin, margin)
+        geometry.translate(int(self.style.x_offset),
+                           int(self.style.y_offset))
+        self.setGeometry(geometry)
+        self.stackUnder(self.target)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Follow the geometry and the visibility of the widget.
+
+        :return: False, the event is never consumed
+        :rtype: bool
+        """
+        event_type = event.type()
+        if event_type in (QEvent.Type.Move, QEvent.Type.Resize,
+                          QEvent.Type.ZOrderChange):
+            self.update_geometry()
+        elif event_type == QEvent.Type.Show:
+            self.update_geometry()
+            self.show()
+        elif event_type == QEvent.Type.Hide:
+            self.hide()
+        return False
+
+    def paintEvent(self, event) -> None:
+        """
+        Paint the shadow of the size of the widget.
+        """
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, get_shadow_pixmap(
+            self.style, self.width(), self.height(),
+            self.devicePixelRatioF()))
+        painter.end()
+
+
+def add_cached_shadow(widget: QWidget, style: ShadowStyle) -> CachedShadow:
+    """
+    Add a pre-rendered shadow beneath a widget.
+
+    :param widget: The widget, must have a parent
+    :type widget: QWidget
+    :param style: The shadow, e.g. from get_style_class_shadow
+    :type style: ShadowStyle
+    :return: The shadow
+    :rtype: CachedShadow
+    """
+    return CachedShadow(widget, style)
+
+
+def benchmark_shadows(number_of_widgets: int = BENCHMARK_WIDGETS,
+                      repaints: int = BENCHMARK_REPAINTS
+                      ) -> Dict[str, float]:
+    """
+    Measure the time it takes to repaint a page of buttons with the
+    graphics effect and with the cached shadow.
+
+    :param number_of_widgets: Number of buttons on the page
+    :type number_of_widgets: int
+    :param repaints: Number of repaints measured
+    :type repaints: int
+    :return: Mean time of a repaint in seconds per kind of shadow
+    :rtype: Dict[str, float]
+    """
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    for name in ("none", "effect", "cached"):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setSpacing(BUTTON_SHADOW.get_margin() * 2)
+        for index in range(number_of_widgets):
+            button = QPushButton(f"Button {index}")
+            layout.addWidget(button)
+        page.resize(300, number_of_widgets * 60)
+        page.show()
+        # Keep a reference to the effects, or they are deleted
+        shadows = []
+        for button in page.findChildren(QPushButton):
+            if name == "effect":
+                shadows.append(BUTTON_SHADOW.create_effect())
+                button.setGraphicsEffect(shadows[-1])
+            elif name == "cached":
+                shadows.append(add_cached_shadow(button, BUTTON_SHADOW))
+        application.processEvents()
+        # The first repaint renders the cached nine-patch
+        page.repaint()
+        buttons = page.findChildren(QPushButton)
+        start = time.perf_counter()
+        for repaint in range(repaints):
+            # A changed button invalidates the pixmap the effect caches,
+            # as when the mouse hovers over it
+            for button in buttons:
+                button.setDown(repaint % 2 == 0)
+            page.repaint()
+        results[name] = (time.perf_counter() - start) / repaints
+        page.close()
+        page.deleteLater()
+        application.processEvents()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point: print the repaint time with each kind of
+    shadow.
+
+    :param argv: Command line arguments, defaults to sys.argv
+    :type argv: List[str], optional
+    :return: Exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the repaint time of graphics effect shadows "
+                    "and cached shadows.")
+    parser.add_argument("--widgets", type=int, default=BENCHMARK_WIDGETS,
+                        help="Number of buttons on the page")
+    parser.add_argument("--repaints", type=int, default=BENCHMARK_REPAINTS,
+                        help="Number of repaints measured")
+    arguments = parser.parse_args(argv)
+    results = benchmark_shadows(arguments.widgets, arguments.repaints)
+    for name, duration in results.items():
+        print(f"{name:>8}: {duration * 1000:.3f} ms per repaint")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
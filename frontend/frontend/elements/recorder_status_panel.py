@@ -0,0 +1,100 @@
+from typing import Dict
+
+from PySide6.QtWidgets import QGridLayout, QLabel, QSizePolicy, QWidget
+from PySide6.QtCore import Qt
+
+from application.Views.classes.pipeline.recorder_status_feed import (
+    FIELD_BATTERY, FIELD_PACKET_LOSS, FIELD_RSSI, FIELD_SYNC, STATUS_FIELDS)
+
+# Text shown for a field that was not reported yet
+UNKNOWN_VALUE_TEXT: str = "-"
+
+
+class RecorderStatusPanel(QWidget):
+    """
+    Shows the battery level, signal strength, packet loss and
+    synchronization of a recorder.
+
+    The panel is updated with the changed fields only, so a snapshot of the
+    status feed only touches the labels whose text changed.
+
+    Attributes
+    ----------
+    value_labels : Dict[str, QLabel]
+        The label that shows the value of every status field
+    is_stale : bool
+        Whether the recorder stopped reporting its status
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self.value_labels: Dict[str, QLabel] = {}
+        self.is_stale = False
+        self.setup_local_ui_elements()
+
+    def setup_local_ui_elements(self) -> None:
+        """
+        Add a name and a value label for every status field.
+        """
+        names = {FIELD_BATTERY: self.tr("Battery"),
+                 FIELD_RSSI: self.tr("Signal"),
+                 FIELD_PACKET_LOSS: self.tr("Packet loss"),
+                 FIELD_SYNC: self.tr("Sync")}
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setHorizontalSpacing(10)
+        layout.setVerticalSpacing(2)
+        for column, field in enumerate(STATUS_FIELDS):
+            lbl_name = QLabel(names[field], self)
+            lbl_name.setAlignment(Qt.AlignCenter)
+            lbl_value = QLabel(UNKNOWN_VALUE_TEXT, self)
+            lbl_value.setAlignment(Qt.AlignCenter)
+            layout.addWidget(lbl_name, 0, column)
+            layout.addWidget(lbl_value, 1, column)
+            self.value_labels[field] = lbl_value
+        self.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Preferred,
+                                       QSizePolicy.Policy.Maximum))
+
+    def update_status(self, fields: Dict[str, object]) -> None:
+        """
+        Show the fields of the recorder that changed.
+
+        :param fields: The changed fields, as delivered by the status feed
+        :type fields: Dict[str, object]
+        """
+        for field, value in fields.items():
+            if field == "stale":
+                self.is_stale = bool(value)
+                # Grey out the values while they are outdated
+                self.setEnabled(not self.is_stale)
+                continue
+            lbl_value = self.value_labels.get(field)
+            if lbl_value is None:
+                continue
+            text = self.format_value(field, value)
+            if lbl_value.text() != text:
+                lbl_value.setText(text)
+
+    def format_value(self, field: str, value: object) -> str:
+        """
+        :param field: Name of the status field
+        :type field: str
+        :param value: Value of the field
+        :type value: object
+        :return: The value as it is shown, e.g. "80 %" for the battery
+        :rtype: str
+        """
+        if value is None:
+            return UNKNOWN_VALUE_TEXT
+        if field == FIELD_BATTERY:
+            return f"{value:.0f} %"
+        if field == FIELD_RSSI:
+            return f"{value:.0f} dBm"
+        if field == FIELD_PACKET_LOSS:
+            # The packet loss is reported as a fraction
+            return f"{100 * value:.1f} %"
+        if field == FIELD_SYNC:
+            if isinstance(value, bool):
+                return self.tr("In sync") if value else self.tr("Lost")
+            return str(value)
+        return str(value)
@@ -0,0 +1,60 @@
+import numpy as np
+from PySide6.QtGui import QColor, QImage
+
+
+def rasterize_columns(x: np.ndarray, y_top: np.ndarray,
+                      y_bottom: np.ndarray, width: int, height: int,
+                      color: QColor, background_color: QColor
+                      ) -> np.ndarray:
+    """
+    Rasterize vertical lines, e.g. the min/max line of every pixel column of
+    every channel, into 32-bit RGB pixels.
+
+    All lines are drawn at once: the top and the bottom of every line are
+    marked in a difference image, and the cumulative sum over the rows fills
+    the lines in between. The cost depends on the size of the image, not on
+    the number of lines.
+
+    :param x: Pixel column of every line
+    :type x: np.ndarray
+    :param y_top: Top of every line in pixels
+    :type y_top: np.ndarray
+    :param y_bottom: Bottom of every line in pixels
+    :type y_bottom: np.ndarray
+    :param width: Width of the image in pixels
+    :type width: int
+    :param height: Height of the image in pixels
+    :type height: int
+    :param color: Color of the lines
+    :type color: QColor
+    :param background_color: Color of the pixels without a line
+    :type background_color: QColor
+    :return: The pixels, of shape (height, width)
+    :rtype: np.ndarray
+    """
+    x = np.asarray(x, dtype=int)
+    top = np.clip(np.floor(y_top), 0, height - 1).astype(int)
+    bottom = np.clip(np.ceil(y_bottom), top, height - 1).astype(int)
+    size = (height + 1) * width
+    difference = (np.bincount(top * width + x, minlength=size) -
+                  np.bincount((bottom + 1) * width + x, minlength=size))
+    is_line = np.cumsum(difference.reshape(height + 1, width),
+                        axis=0)[:height] > 0
+    return np.where(is_line, np.uint32(color.rgb()),
+                    np.uint32(background_color.rgb()))
+
+
+def create_image(pixels: np.ndarray) -> QImage:
+    """
+    Wrap the pixels of rasterize_columns in an image, without copying them.
+    The image refers to the pixel array, which must be kept alive until the
+    image is drawn.
+
+    :param pixels: The pixels, of shape (height, width)
+    :type pixels: np.ndarray
+    :return: The image
+    :rtype: QImage
+    """
+    height, width = pixels.shape
+    return QImage(pixels.data, width, height, width * 4,
+                  QImage.Format.Format_RGB32)
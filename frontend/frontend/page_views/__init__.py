@@ -1,2 +1,20 @@
-from application.Views.classes.page_views.page_connection_view import (
-    PageConnectionView)
+import importlib
+
+from application.Views.classes.page_views.page_registry import (
+    get_class_module_path)
+
+
+def __getattr__(name: str):
+    """
+    Resolve the views of the pages on first access, e.g.
+    page_views.PageConnectionView, so importing the package does not import
+    any page.
+
+    :param name: Name of the class of a view
+    :type name: str
+    :raises AttributeError: if no view with that class name is registered
+    :return: The class of the view
+    :rtype: type
+    """
+    return getattr(importlib.import_module(get_class_module_path(name)),
+                   name)
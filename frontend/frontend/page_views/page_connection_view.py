@@ -3,10 +3,19 @@ from PySide6.QtWidgets import QStackedWidget
 from application.Views.designer._page_connection_mainUI import (
     Ui_page_connection_mainUI)
 from application.Views.classes.base_page_view import BasePageView
-
-from application.Controllers.page_controllers import PageConnectionController
-
-from application.Factories.sub_page_view_factory import SubPageViewFactory
+from application.Views.classes.diagnostics.event_loop_watchdog import (
+    set_active_page, set_active_sub_page)
+from application.Views.classes.diagnostics.leak_detector import (
+    leak_checkpoint)
+from application.Views.classes.diagnostics.signal_tracer import (
+    connect_traced, disconnect_traced)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_CONTROLLER, startup_profiler)
+from application.Views.classes.pipeline.acquisition_session import (
+    acquisition_session)
+
+from application.Views.classes.page_views.page_registry import (
+    create_page)
 
 from application.Enums.workflow_enums import PageTypeEnum
 from application.Enums.sub_page_enums import (SubPageTypeEnum,
@@ -24,8 +33,8 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
 
     Attributes
     ---------------
-    connection_pages: dictionary with all (sub)pages (view classes) that
-        belong to the connection page.
+    connection_pages: dictionary with the (sub)pages (view classes) that
+        belong to the connection page and were visited so far.
     """
 
     def __init__(self):
@@ -40,7 +49,13 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
         super().__init__(page_type=PageTypeEnum.PageConnection)
         self.setupUi(self)
         # Define attributes
-        self.controller = PageConnectionController(parent=self)
+        # Import the controller on first use, so importing the page does not
+        # import the controllers of pages that are not shown yet
+        from application.Controllers.page_controllers import (
+            PageConnectionController)
+        with startup_profiler.profile_phase("PageConnectionController",
+                                            CATEGORY_CONTROLLER):
+            self.controller = PageConnectionController(parent=self)
         self.connection_pages: dict[PageTypeEnum, BasePageView] = {}
         # Additional graphics for this view
         self.setup_local_ui_elements()
@@ -78,6 +93,13 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
              SubPageTypeEnum.PageConnectionBaseStation),
             (self.tr("Recorders"), SubPageTypeEnum.PageConnectionRecorders)
         ]
+        # Add the impedance check if it is a sub page of this page
+        impedance_page = getattr(SubPageTypeEnum, "PageConnectionImpedance",
+                                 None)
+        if (impedance_page is not None and
+                impedance_page in SUB_PAGE_MAP.get(self.page_type, [])):
+            self.topbar_buttons_information.append(
+                (self.tr("Impedance"), impedance_page))
         # Add stacked widget to the dynamic layout
         self.add_stacked_widget()
         # Add pages to the stacked widget
@@ -97,10 +119,10 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
         """
         if not isinstance(page_view, BasePageView):
             return None
-        page_view.sig_show_splash_screen_requested.connect(
-            self.propagate_sig_show_splash_screen_requested)
-        page_view.sig_stop_splash_screen_requested.connect(
-            self.propagate_sig_stop_splash_screen_requested)
+        connect_traced(page_view.sig_show_splash_screen_requested,
+                       self.propagate_sig_show_splash_screen_requested)
+        connect_traced(page_view.sig_stop_splash_screen_requested,
+                       self.propagate_sig_stop_splash_screen_requested)
 
     def disconnect_signals_from_actions(self):
         """Disconnects signals received by the class from their
@@ -125,10 +147,10 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
             if not isinstance(page_view, BasePageView):
                 break
             # Disconnect the signals from their actions for this entry
-            page_view.sig_show_splash_screen_requested.disconnect(
-                self.propagate_sig_show_splash_screen_requested)
-            page_view.sig_stop_splash_screen_requested.disconnect(
-                self.propagate_sig_stop_splash_screen_requested)
+            disconnect_traced(page_view.sig_show_splash_screen_requested,
+                              self.propagate_sig_show_splash_screen_requested)
+            disconnect_traced(page_view.sig_stop_splash_screen_requested,
+                              self.propagate_sig_stop_splash_screen_requested)
 
     def propagate_sig_show_splash_screen_requested(self, text_to_display: str):
         """ Propagate the sig_show_splash_screen_requested of one of the child
@@ -171,12 +193,18 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
         the information and current page selected as emitted by the signal.
         Emits the sig_visible_frame_update_requested(True) to update other
         classes that the frame around the page needs to be shown.
+        Stops the acquisition, so the recorders can be paired again and
+        their impedances can be checked.
         """
+        acquisition_session.stop()
         self.sig_full_screen_mode_changed.emit(False)
         self.sig_topbar_update_requested.emit(
             True, self.topbar_buttons_information,
             self.stackedWidget.currentWidget().page_type)
         self.sig_visible_frame_update_requested.emit(True)
+        # Tell the event loop watchdog which page a freeze happens on
+        set_active_page(self.page_type,
+                        self.stackedWidget.currentWidget().page_type)
 
     def add_stacked_widget(self):
         """ Create a stacked widget and add it to the dynamic layout
@@ -190,53 +218,63 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
         self.layout_page_connection_main_dynamic.addWidget(self.stackedWidget)
 
     def add_sub_pages_to_stacked_widget(self):
-        """ Add subpages to the stacked widget and add them to the
-        self.connection_pages dictionairy. Shows the overview page.
+        """ Add the overview subpage to the stacked widget and show it. The
+        other subpages defined in SUB_PAGE_MAP are only created (and their
+        modules imported) when they are visited for the first time.
         """
-        # Find the subpages defined for the connection page
+        # Check the subpages defined for the connection page
         for sub_page_type in SUB_PAGE_MAP[self.page_type]:
-            # Check if subpage is not None, and of the correct input type
-            if sub_page_type is not None:
-                if isinstance(sub_page_type, SubPageTypeEnum):
-                    try:
-                        # Initialize the view
-                        view = SubPageViewFactory.create_view(sub_page_type)
-                        # Connect to the signals of this view
-                        self.connect_sub_page_signals_to_actions(view)
-                        # Add view to the dictionary
-                        self.connection_pages[sub_page_type] = view
-                        # Add widget to the stacked widget
-                        self.stackedWidget.addWidget(view)
-                    except Exception:
-                        raise Exception(self.tr('Connection sub pages could '
-                                                'not be added to stacked '
-                                                'widget'))
-                else:
-                    raise TypeError(self.tr('Received type '
-                                            f'{type(sub_page_type)} '
-                                            'where SubPageTypeEnum was '
-                                            'expected'))
-            else:
-                # If there are no sub pages defined in SUB_PAGE_MAP
-                # for this page type, return empty
+            # If there are no sub pages defined in SUB_PAGE_MAP
+            # for this page type, return empty
+            if sub_page_type is None:
                 return None
+            if not isinstance(sub_page_type, SubPageTypeEnum):
+                raise TypeError(self.tr('Received type '
+                                        f'{type(sub_page_type)} '
+                                        'where SubPageTypeEnum was '
+                                        'expected'))
 
         try:
-            # Set the overview page to be the visible page
-            if self.connection_pages:
-                # Retrieve the widget of the overview subpage
-                start_page = self.connection_pages[
-                    SubPageTypeEnum.PageConnectionOverview]
-                # Show the overview subpage
-                self.stackedWidget.setCurrentWidget(start_page)
-                # Store the overview subpage as current page to the controller
-                self.controller.update_current_sub_page(
-                    SubPageTypeEnum.PageConnectionOverview
-                )
+            # Retrieve the widget of the overview subpage
+            start_page = self.get_sub_page(
+                SubPageTypeEnum.PageConnectionOverview)
+            # Show the overview subpage
+            self.stackedWidget.setCurrentWidget(start_page)
+            # Store the overview subpage as current page to the controller
+            self.controller.update_current_sub_page(
+                SubPageTypeEnum.PageConnectionOverview
+            )
         except Exception:
             raise Exception(self.tr('Connection Overview subpage could not be '
                                     'set as visible page'))
 
+    def get_sub_page(self, sub_page_type: SubPageTypeEnum) -> BasePageView:
+        """ Get the view of a subpage, and create it from the page registry
+        if it is visited for the first time.
+
+        :param sub_page_type: the subpage to get
+        :type sub_page_type: SubPageTypeEnum
+        :return: the view of the subpage
+        :rtype: BasePageView
+        """
+        view = self.connection_pages.get(sub_page_type)
+        if view is not None:
+            return view
+        try:
+            # Initialize the view
+            view = create_page(sub_page_type)
+            # Connect to the signals of this view
+            self.connect_sub_page_signals_to_actions(view)
+            # Add view to the dictionary
+            self.connection_pages[sub_page_type] = view
+            # Add widget to the stacked widget
+            self.stackedWidget.addWidget(view)
+        except Exception:
+            raise Exception(self.tr('Connection sub pages could '
+                                    'not be added to stacked '
+                                    'widget'))
+        return view
+
     def switch_sub_page(self, page: SubPageTypeEnum):
         """ Switch the subpage displayed by the stacked widget
 
@@ -251,13 +289,22 @@ class PageConnectionView(BasePageView, Ui_page_connection_mainUI):
                 # TO DO - inform controller current page needs to be closed
                 # down
                 self.controller.leave_current_sub_page()
+                # Get the page to display based on the page input. It is
+                # created on the first visit, before the controller loads
+                # the page, so the view receives what the controller sends.
+                is_first_visit = page not in self.connection_pages
+                page_to_display = self.get_sub_page(page)
                 # Load the new page selected by the user
                 self.controller.load_sub_page(sub_page_type=page)
-                # Get the page to display based on the page input
-                page_to_display = self.connection_pages[page]
                 if page_to_display is not None:
                     # Let stacked widget display the page_to_display
                     self.stackedWidget.setCurrentWidget(page_to_display)
+                    # A view that was just created missed the changes
+                    # before it existed, so it fetches the current state
+                    if is_first_visit:
+                        page_to_display.load_page()
+                    set_active_sub_page(page)
+                    leak_checkpoint(f"{page.name} load")
                 else:
                     # Raise error that page_to_display is not defined
                     raise AttributeError(
@@ -1,16 +1,73 @@
+import os
 from functools import partial
 
-from PySide6.QtWidgets import QFileDialog
+from PySide6.QtWidgets import (QComboBox, QDoubleSpinBox, QFileDialog,
+                               QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                               QSpinBox, QWidget)
+from PySide6.QtCore import Qt, QThreadPool, QTimer, Signal
 
 from application.Enums.workflow_enums import PageTypeEnum
+from application.Constants.device_constants import (
+    MAX_BASE_STATIONS_SUPPORTED, MAX_RECORDERS_PER_BASE_STATION)
 from application.Views.designer._file_management_pageUI import (
     Ui_file_management_page)
 from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.diagnostics.event_loop_watchdog import (
+    set_active_page)
+from application.Views.classes.diagnostics.leak_detector import (
+    leak_checkpoint)
+from application.Views.classes.diagnostics.signal_tracer import (
+    connect_traced, disconnect_traced)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_CONTROLLER, defer_until_first_paint, startup_profiler)
+from application.Views.classes.recording_catalog_view import (
+    RecordingCatalogView)
+from application.Views.classes.recording_preview_view import (
+    RecordingPreviewView)
 
-from application.Controllers.page_controllers.page_file_management_controller \
-    import PageFileManagementController
-
+from application.Views.classes.storage.batch_converter import (
+    FILE_FORMAT_CODECS, BatchConverter, ConversionResult,
+    register_file_formats)
+from application.Views.classes.storage.settings_store import SettingsStore
+from application.Views.classes.storage.filename_template import (
+    FilenameAllocator, FilenameTemplate, FilenameTemplateError)
+from application.Views.classes.storage.disk_preflight import (
+    DiskPreflight, DiskPreflightResult, RecordingConfiguration,
+    format_duration)
+from application.Views.classes.pipeline.acquisition_engine import (
+    EVENT_ERROR, EVENT_RECORDING_STOPPED, EVENT_STOPPED, AcquisitionEngine,
+    add_engine_start_listener, get_active_engine,
+    remove_engine_start_listener)
+from application.Views.classes.pipeline.acquisition_session import (
+    SETTING_RECORDER_FILTERS, acquisition_session)
+from application.Views.classes.pipeline.filter_bank import FilterSettings
+from application.Views.classes.pipeline.stream_outlet import (
+    OUTLET_STATE_FAILED, OUTLET_STATE_STREAMING, OutletSettings,
+    TRANSPORT_LSL, TRANSPORT_SHARED_MEMORY, get_available_transports)
 
+# Interval in milliseconds at which the progress of a batch conversion is
+# checked
+CONVERSION_POLL_INTERVAL: int = 250
+# Interval in milliseconds at which the statistics of the stream outlet are
+# shown
+OUTLET_STATUS_INTERVAL: int = 1000
+# Interval in milliseconds at which the events of the engine that records
+# are polled
+ENGINE_EVENT_POLL_INTERVAL: int = 250
+# Range of the number of samples per chunk of the stream outlet
+MIN_OUTLET_CHUNK_SIZE: int = 1
+MAX_OUTLET_CHUNK_SIZE: int = 1024
+# Highest cut-off frequency of the recorder filters in Hz; a frequency of 0
+# disables the filter
+MAX_FILTER_FREQUENCY: float = 10000.0
+# Names of the file management settings in the settings store
+SETTING_FOLDER: str = "folder"
+SETTING_FILENAME: str = "filename"
+SETTING_FILE_FORMAT: str = "file_format"
+SETTING_AUTOMATIC_SAVE: str = "automatic_save"
+# Maps the extension of every file format to the import paths of its
+# "reader" and "writer", used to save and to convert recordings
+SETTING_FILE_FORMAT_CODECS: str = "file_format_codecs"
 
 
 class PageFileManagementView(BasePageView, Ui_file_management_page):
@@ -22,8 +79,32 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
 
     Attributes:
         - page_widget: The widget that contains the file management UI elements
+        - disk_preflight: Checks the speed and free space of the selected
+          storage folder and caches the results per volume
+        - storage_preflight_pool: Runs the storage preflight outside the GUI
+          thread, one preflight at a time
+        - recording_configuration: The channel/rate/recorder configuration
+          the storage folder is checked against
+        - outlet_settings: Configuration of the stream outlet the engine
+          publishes the samples to other applications on this machine with
+        - settings_store: Keeps the file management settings of every
+          profile in memory and saves them in the background
+        - recording_engine: The engine that records to a file of this
+          page, whose events are polled until it stopped
+        - recording_subjects: Subject of every recording of the engine that
+          was not saved yet, stored in the catalog when it is saved
+        - recorder filter fields: The high-pass, low-pass and notch
+          frequencies of the selected recorder, applied to the saved and
+          the displayed samples
+
+    Signals:
+        - sig_storage_preflight_finished(int, DiskPreflightResult): Emitted
+          from the preflight thread with the number of the request and its
+          result
     """
 
+    sig_storage_preflight_finished = Signal(int, object)
+
     def __init__(self, parent=None):
         """
         Initialize the PageFileManagementView.
@@ -36,8 +117,65 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
             parent=parent
         )
         self.setupUi(self)
-        # Define attributes
-        self.controller = PageFileManagementController(parent=self)
+        # Define attributes. The controller is imported here rather than at
+        # the top, so it is only imported once the page is shown.
+        from application.Controllers.page_controllers. \
+            page_file_management_controller import (
+                PageFileManagementController)
+        with startup_profiler.profile_phase("PageFileManagementController",
+                                            CATEGORY_CONTROLLER):
+            self.controller = PageFileManagementController(parent=self)
+        # The settings of the controller are the defaults of profiles that
+        # do not set them. The saved settings of the active profile are
+        # restored before the UI elements are set up.
+        self.settings_store = SettingsStore(
+            defaults=self._get_controller_settings())
+        self._apply_settings_to_controller(self.settings_store.get_all())
+        # Saved settings that were skipped, e.g. a folder that was removed,
+        # are replaced by the ones the controller kept
+        self.settings_store.update(self._get_controller_settings())
+        # The writers of the file formats are needed by the acquisition
+        # engine and the batch converter
+        register_file_formats(
+            self.settings_store.get(SETTING_FILE_FORMAT_CODECS, {}))
+        # The acquisition page starts the engine with the device source,
+        # the channels and the sample rate of the active profile
+        acquisition_session.apply_settings(self.settings_store.get_all())
+        self.disk_preflight = DiskPreflight()
+        self.storage_preflight_pool = QThreadPool(self)
+        self.storage_preflight_pool.setMaxThreadCount(1)
+        # Number of the last requested preflight, results of earlier
+        # requests are outdated and not shown
+        self.storage_preflight_request = 0
+        # Converts recordings in worker processes, polled by a timer
+        self.batch_converter = BatchConverter()
+        self.conversion_timer = QTimer(self)
+        self.conversion_timer.setInterval(CONVERSION_POLL_INTERVAL)
+        self.conversion_results: list[ConversionResult] = []
+        self.number_of_files_to_convert = 0
+        # Preview windows that are open, kept to prevent garbage collection
+        self.recording_preview_views: list[RecordingPreviewView] = []
+        # Created on the first recording, see allocate_recording_path
+        self.filename_allocator: FilenameAllocator = None
+        # The outlet that publishes the samples runs in the acquisition
+        # engine; it is started when streaming is enabled and an engine runs
+        self.outlet_settings = OutletSettings()
+        self.is_stream_outlet_enabled = False
+        # Number of published chunks at the previous status update
+        self.outlet_chunks_shown = 0
+        self.outlet_status_timer = QTimer(self)
+        self.outlet_status_timer.setInterval(OUTLET_STATUS_INTERVAL)
+        # The saved recordings are added to the catalog with their
+        # duration and devices when the engine reports that they stopped
+        self.recording_engine: AcquisitionEngine = None
+        self.recording_subjects: dict[str, str] = {}
+        self.engine_event_timer = QTimer(self)
+        self.engine_event_timer.setInterval(ENGINE_EVENT_POLL_INTERVAL)
+        # Until the paired recorders are known, check the storage folder
+        # against the largest configuration that is supported
+        self.recording_configuration = RecordingConfiguration(
+            number_of_recorders=(MAX_BASE_STATIONS_SUPPORTED *
+                                 MAX_RECORDERS_PER_BASE_STATION))
 
         # Perform additional setup
         self.setup_local_ui_elements()
@@ -45,6 +183,8 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         self.connect_signals_to_actions()
         # Connect the deleting of the controller to the correct slot
         self.controller.destroyed.connect(self.on_controller_deleted)
+        # Start saving and streaming when the acquisition starts
+        add_engine_start_listener(self.engine_started)
 
     def load_page(self):
         """Performs the actions that are needed upon loading the page.
@@ -56,10 +196,20 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         other classes that no topbar is needed for this page view.
         Emits the sig_visible_frame_update_requested(True) to update other
         classes that the frame around the page needs to be shown.
+        Lists the paired recorders whose filters can be set.
+        Runs the storage preflight for the current folder, so the estimated
+        recording duration is up to date. The preflight touches the disk, so
+        it is deferred until the page was painted.
         """
         self.sig_full_screen_mode_changed.emit(False)
         self.sig_topbar_update_requested.emit(False, None, None)
         self.sig_visible_frame_update_requested.emit(True)
+        set_active_page(self.page_type)
+        leak_checkpoint(f"{self.page_type.name} load")
+        defer_until_first_paint("storage preflight",
+                                self.run_storage_preflight)
+        # Recorders may have been paired since the page was shown
+        self.update_filter_recorders()
 
     def on_controller_deleted(self):
         """ Define what the view should do if the controller is deleted while
@@ -71,14 +221,23 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         """
         Set up the file management page UI elements.
         """
+        self._setup_ui_elements_settings_profile()
         self._setup_ui_elements_folder_information()
         self._setup_ui_elements_file_information()
         self._setup_ui_elements_automatic_save()
+        self._setup_ui_elements_integrity_manifest()
+        self._setup_ui_elements_stream_outlet()
+        self._setup_ui_elements_recorder_filters()
+        self._setup_ui_elements_recording_catalog()
 
     def connect_widgets_to_actions(self):
         """
         Connect UI elements to their respective actions.
         """
+        # Switch to, or create, the selected settings profile
+        self.cb_settings_profile.activated.connect(
+            self.settings_profile_selected)
+
         # Connect the browse button to the select_and_display_folder method
         self.btn_browse_folder.clicked.connect(
             self.select_and_display_folder
@@ -102,11 +261,66 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         self.btn_manual_save.clicked.connect(
             partial(self.toggle_save_mode, is_automatic=False))
 
+        # Enable or disable the integrity manifest
+        self.btn_integrity_manifest.toggled.connect(
+            self.set_integrity_manifest_enabled)
+
+        # Configure the stream outlet
+        self.btn_stream_outlet.toggled.connect(
+            self.set_stream_outlet_enabled)
+        self.cb_outlet_transport.activated.connect(
+            self.outlet_settings_changed)
+        self.sb_outlet_chunk_size.editingFinished.connect(
+            self.outlet_settings_changed)
+        self.outlet_status_timer.timeout.connect(
+            self._update_outlet_status)
+
+        # Show and apply the filters of the selected recorder
+        self.cb_filter_recorder.activated.connect(self.show_recorder_filter)
+        self.btn_apply_filter.clicked.connect(self.apply_recorder_filter)
+
+        # Open a preview of a recording that is double clicked in the catalog
+        connect_traced(self.recording_catalog_view.sig_recording_selected,
+                       self.open_recording_preview)
+
+        # Convert the recordings selected in the catalog
+        self.btn_convert_recordings.clicked.connect(
+            self.convert_selected_recordings)
+        self.conversion_timer.timeout.connect(self._update_conversion_progress)
+        self.engine_event_timer.timeout.connect(self._poll_engine_events)
+
     def connect_signals_to_actions(self):
         """
         Connect signals received by this view to their corresponding actions.
         """
-        pass
+        # Connect the controller's signals to the view's slots
+        connect_traced(self.controller.sig_folder_changed,
+                       self.le_current_folder.setText)
+        # The result of the storage preflight arrives from its thread
+        connect_traced(self.sig_storage_preflight_finished,
+                       self._storage_preflight_finished)
+
+    def _setup_ui_elements_settings_profile(self):
+        """
+        Set up the combo box that selects the settings profile, e.g. of an
+        operator or a study. Typing a new name creates a profile.
+        """
+        widget_settings_profile = QWidget(self)
+        layout_settings_profile = QHBoxLayout(widget_settings_profile)
+        layout_settings_profile.setContentsMargins(0, 0, 0, 0)
+        lbl_settings_profile = QLabel(self.tr("Settings profile:"),
+                                      widget_settings_profile)
+        self.cb_settings_profile = QComboBox(widget_settings_profile)
+        self.cb_settings_profile.setEditable(True)
+        self.cb_settings_profile.setInsertPolicy(
+            QComboBox.InsertPolicy.InsertAlphabetically)
+        self.cb_settings_profile.addItems(
+            self.settings_store.get_profile_names())
+        self.cb_settings_profile.setCurrentText(
+            self.settings_store.active_profile)
+        layout_settings_profile.addWidget(lbl_settings_profile)
+        layout_settings_profile.addWidget(self.cb_settings_profile, 1)
+        self.layout().insertWidget(0, widget_settings_profile)
 
     def _setup_ui_elements_folder_information(self):
         """
@@ -123,6 +337,13 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         self.le_current_folder.setText(current_folder)
         self.btn_browse_folder.setText(self.tr("Browse"))
 
+        # Add a label below the folder that shows the result of the storage
+        # preflight
+        self.lbl_storage_preflight = QLabel(self)
+        self.lbl_storage_preflight.setWordWrap(True)
+        self.le_current_folder.parentWidget().layout().addWidget(
+            self.lbl_storage_preflight)
+
     def _setup_ui_elements_file_information(self):
         """
         Set up the UI elements for file information.
@@ -140,6 +361,19 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         self.le_filename.setText(filename)
         self.btn_filename_saved.setText(self.tr("Not Saved"))
 
+        # The subject fills the {subject} field of the filename template.
+        # It changes every session, so it is not saved in the profile.
+        widget_subject = QWidget(self)
+        layout_subject = QHBoxLayout(widget_subject)
+        layout_subject.setContentsMargins(0, 0, 0, 0)
+        self.lbl_subject = QLabel(self.tr("Subject:"), widget_subject)
+        self.le_subject = QLineEdit(widget_subject)
+        self.le_subject.setPlaceholderText(
+            self.tr("Fills {subject} in the file name"))
+        layout_subject.addWidget(self.lbl_subject)
+        layout_subject.addWidget(self.le_subject)
+        self.le_filename.parentWidget().layout().addWidget(widget_subject)
+
     def _setup_ui_elements_file_format(self):
         """
         Set up the UI elements for file format.
@@ -195,6 +429,222 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         )
         self.toggle_save_mode(is_automatic_save_enabled)
 
+    def _setup_ui_elements_integrity_manifest(self):
+        """
+        Set up the button that enables the integrity manifest. The manifest
+        holds hashes that are computed while the recording is written, so a
+        copy of the recording can be verified later on.
+        """
+        self.btn_integrity_manifest = QPushButton(
+            self.tr("Write integrity manifest"), self)
+        self.btn_integrity_manifest.setCheckable(True)
+        self.btn_automatic_save.parentWidget().layout().addWidget(
+            self.btn_integrity_manifest)
+        self.set_integrity_manifest_enabled(False)
+
+    def _setup_ui_elements_stream_outlet(self):
+        """
+        Set up the elements that configure the stream outlet, which
+        publishes the samples to analysis tools on this machine: the button
+        that enables it, the transport, the number of samples per chunk and
+        the measured latency.
+        """
+        widget_stream_outlet = QWidget(self)
+        layout_stream_outlet = QHBoxLayout(widget_stream_outlet)
+        layout_stream_outlet.setContentsMargins(0, 0, 0, 0)
+
+        self.btn_stream_outlet = QPushButton(
+            self.tr("Stream to local applications"), widget_stream_outlet)
+        self.btn_stream_outlet.setCheckable(True)
+
+        # Only the transports that can be used on this machine are offered
+        transport_names = {TRANSPORT_SHARED_MEMORY: self.tr("Shared memory"),
+                           TRANSPORT_LSL: self.tr(
+                               "Lab Streaming Layer (local network)")}
+        self.cb_outlet_transport = QComboBox(widget_stream_outlet)
+        for transport in get_available_transports():
+            self.cb_outlet_transport.addItem(transport_names[transport],
+                                             transport)
+
+        self.sb_outlet_chunk_size = QSpinBox(widget_stream_outlet)
+        self.sb_outlet_chunk_size.setRange(MIN_OUTLET_CHUNK_SIZE,
+                                           MAX_OUTLET_CHUNK_SIZE)
+        self.sb_outlet_chunk_size.setValue(self.outlet_settings.chunk_size)
+        self.sb_outlet_chunk_size.setSuffix(self.tr(" samples per chunk"))
+
+        self.lbl_outlet_status = QLabel(widget_stream_outlet)
+
+        layout_stream_outlet.addWidget(self.btn_stream_outlet)
+        layout_stream_outlet.addWidget(self.cb_outlet_transport)
+        layout_stream_outlet.addWidget(self.sb_outlet_chunk_size)
+        layout_stream_outlet.addWidget(self.lbl_outlet_status)
+        self.btn_automatic_save.parentWidget().layout().addWidget(
+            widget_stream_outlet)
+        self.set_stream_outlet_enabled(False)
+
+    def _setup_ui_elements_recorder_filters(self):
+        """
+        Set up the elements that set the filters of a recorder: the
+        recorder, the high-pass, low-pass and notch frequencies, the button
+        that applies them and a label that shows whether they are valid.
+        """
+        widget_recorder_filters = QWidget(self)
+        layout_recorder_filters = QHBoxLayout(widget_recorder_filters)
+        layout_recorder_filters.setContentsMargins(0, 0, 0, 0)
+
+        lbl_recorder_filters = QLabel(self.tr("Filters of"),
+                                      widget_recorder_filters)
+        self.cb_filter_recorder = QComboBox(widget_recorder_filters)
+
+        self.sb_highpass_frequency = self._create_filter_frequency_box(
+            self.tr("High-pass "), widget_recorder_filters)
+        self.sb_lowpass_frequency = self._create_filter_frequency_box(
+            self.tr("Low-pass "), widget_recorder_filters)
+        self.sb_notch_frequency = self._create_filter_frequency_box(
+            self.tr("Notch "), widget_recorder_filters)
+
+        self.btn_apply_filter = QPushButton(self.tr("Apply filters"),
+                                            widget_recorder_filters)
+        self.lbl_filter_status = QLabel(widget_recorder_filters)
+
+        layout_recorder_filters.addWidget(lbl_recorder_filters)
+        layout_recorder_filters.addWidget(self.cb_filter_recorder)
+        layout_recorder_filters.addWidget(self.sb_highpass_frequency)
+        layout_recorder_filters.addWidget(self.sb_lowpass_frequency)
+        layout_recorder_filters.addWidget(self.sb_notch_frequency)
+        layout_recorder_filters.addWidget(self.btn_apply_filter)
+        layout_recorder_filters.addWidget(self.lbl_filter_status, 1)
+        self.layout().addWidget(widget_recorder_filters)
+        self.update_filter_recorders()
+
+    def _create_filter_frequency_box(self, prefix: str,
+                                     parent: QWidget) -> QDoubleSpinBox:
+        """
+        :param prefix: Name of the filter, shown before the frequency
+        :type prefix: str
+        :param parent: Parent widget
+        :type parent: QWidget
+        :return: A spin box for the frequency of a filter, that shows "Off"
+                 for 0 Hz
+        :rtype: QDoubleSpinBox
+        """
+        spin_box = QDoubleSpinBox(parent)
+        spin_box.setRange(0.0, MAX_FILTER_FREQUENCY)
+        spin_box.setDecimals(1)
+        spin_box.setPrefix(prefix)
+        spin_box.setSuffix(" Hz")
+        spin_box.setSpecialValueText(prefix + self.tr("off"))
+        return spin_box
+
+    def update_filter_recorders(self):
+        """
+        List the paired recorders, and the recorders that have filters, in
+        the recorder filter combo box. The first item sets the filters of
+        all paired recorders.
+        """
+        selected_serial_number = self.cb_filter_recorder.currentData()
+        serial_numbers = acquisition_session.get_paired_serial_numbers()
+        serial_numbers += [serial_number for serial_number
+                           in acquisition_session.recorder_filters
+                           if serial_number not in serial_numbers]
+        self.cb_filter_recorder.clear()
+        self.cb_filter_recorder.addItem(self.tr("all paired recorders"),
+                                        None)
+        for serial_number in serial_numbers:
+            self.cb_filter_recorder.addItem(serial_number, serial_number)
+        index = self.cb_filter_recorder.findData(selected_serial_number)
+        self.cb_filter_recorder.setCurrentIndex(max(index, 0))
+        self.show_recorder_filter()
+
+    def _get_filter_serial_numbers(self) -> list[str]:
+        """
+        :return: Serial numbers of the recorders selected in the recorder
+                 filter combo box
+        :rtype: list[str]
+        """
+        serial_number = self.cb_filter_recorder.currentData()
+        if serial_number is None:
+            return acquisition_session.get_paired_serial_numbers()
+        return [serial_number]
+
+    def show_recorder_filter(self):
+        """
+        Show the filters of the selected recorder. If all paired recorders
+        are selected, their filters are shown if they are the same.
+        """
+        filters = [acquisition_session.recorder_filters.get(serial_number)
+                   for serial_number in self._get_filter_serial_numbers()]
+        keys = {None if filter_settings is None
+                else filter_settings.get_key()
+                for filter_settings in filters}
+        filter_settings = filters[0] if len(keys) == 1 else None
+        if filter_settings is None:
+            filter_settings = FilterSettings()
+        self.sb_highpass_frequency.setValue(
+            filter_settings.highpass_frequency or 0.0)
+        self.sb_lowpass_frequency.setValue(
+            filter_settings.lowpass_frequency or 0.0)
+        self.sb_notch_frequency.setValue(
+            filter_settings.notch_frequency or 0.0)
+        self.lbl_filter_status.setText(
+            "" if len(keys) <= 1 else self.tr("The recorders have different "
+                                              "filters"))
+
+    def apply_recorder_filter(self):
+        """
+        Apply the filter frequencies to the selected recorders, in the
+        running engine and in every engine that is started later, and
+        store them in the profile. The engine filters the samples before
+        they are saved, streamed and displayed.
+        """
+        serial_numbers = self._get_filter_serial_numbers()
+        if not serial_numbers:
+            self.lbl_filter_status.setText(self.tr("No recorder is paired"))
+            return
+        try:
+            for serial_number in serial_numbers:
+                acquisition_session.set_recorder_filter(
+                    serial_number, FilterSettings(
+                        highpass_frequency=(
+                            self.sb_highpass_frequency.value() or None),
+                        lowpass_frequency=(
+                            self.sb_lowpass_frequency.value() or None),
+                        notch_frequency=(
+                            self.sb_notch_frequency.value() or None)))
+        except ValueError as error:
+            self.lbl_filter_status.setText(
+                self.tr("Invalid filter: ") + str(error))
+            return
+        finally:
+            self.settings_store.set(
+                SETTING_RECORDER_FILTERS,
+                acquisition_session.get_recorder_filter_settings())
+        self.lbl_filter_status.setText(self.tr("Filters applied"))
+
+    def _setup_ui_elements_recording_catalog(self):
+        """
+        Set up the panel that lists the recordings in the storage folder.
+        """
+        # Recordings are recognised by the extensions of the supported file
+        # formats
+        recording_extensions = [
+            "." + file_format.value.lower().lstrip(".")
+            for file_format in self.controller.get_supported_file_formats()]
+        self.recording_catalog_view = RecordingCatalogView(
+            folder=self.controller.get_current_folder(),
+            recording_extensions=recording_extensions,
+            parent=self)
+        self.layout().addWidget(self.recording_catalog_view)
+
+        # Button and progress label to convert the selected recordings to the
+        # selected file format
+        self.btn_convert_recordings = QPushButton(
+            self.tr("Convert selected recordings"), self)
+        self.lbl_conversion_progress = QLabel(self)
+        self.lbl_conversion_progress.setWordWrap(True)
+        self.layout().addWidget(self.btn_convert_recordings)
+        self.layout().addWidget(self.lbl_conversion_progress)
+
     def select_and_display_folder(self):
         """
         Open a file dialog to select a folder and display the selected folder
@@ -212,11 +662,313 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         # Only proceed if a folder was actually selected (not cancelled)
         if folder_path:
             self.le_current_folder.setText(folder_path)
+            self.settings_store.set(SETTING_FOLDER, folder_path)
+            # Selecting the folder the controller uses already changes
+            # nothing
+            if folder_path == self.controller.get_current_folder():
+                return
             self.controller.set_current_folder(folder_path)
+            # Check whether the new folder can hold the recording
+            self.run_storage_preflight()
+            # Show the recordings in the new folder
+            self.recording_catalog_view.set_folder(folder_path)
         else:
             # If no folder was selected, just keep the previously selected one
             pass
 
+    def set_recording_configuration(
+            self, recording_configuration: RecordingConfiguration):
+        """
+        Set the recording configuration the storage folder is checked
+        against and rerun the storage preflight.
+
+        :param recording_configuration: The configuration of the recording
+        :type recording_configuration: RecordingConfiguration
+        """
+        self.recording_configuration = recording_configuration
+        self.run_storage_preflight()
+
+    def run_storage_preflight(self, force_benchmark: bool = False):
+        """
+        Check the selected storage folder against the recording
+        configuration and show the result once it is known.
+
+        The write benchmark takes up to a second, so the preflight runs in
+        the preflight thread and its result is shown by
+        _storage_preflight_finished.
+
+        :param force_benchmark: Rerun the write benchmark even if a result
+                                is cached for the volume
+        :type force_benchmark: bool
+        """
+        self.storage_preflight_request += 1
+        self.storage_preflight_pool.start(partial(
+            self._run_storage_preflight_in_thread,
+            self.storage_preflight_request,
+            self.controller.get_current_folder(),
+            self.recording_configuration, force_benchmark))
+
+    def _run_storage_preflight_in_thread(
+            self, request: int, folder: str,
+            configuration: RecordingConfiguration, force_benchmark: bool):
+        """
+        Run the storage preflight in the preflight thread and emit its
+        result.
+
+        :param request: Number of the request
+        :type request: int
+        :param folder: The storage folder
+        :type folder: str
+        :param configuration: The configuration of the recording
+        :type configuration: RecordingConfiguration
+        :param force_benchmark: Rerun the write benchmark even if cached
+        :type force_benchmark: bool
+        """
+        try:
+            result = self.disk_preflight.run(
+                folder=folder, configuration=configuration,
+                force_benchmark=force_benchmark)
+        except OSError as error:
+            # E.g. the folder was removed while it was checked
+            print(f"Warning: the storage folder {folder} could not be "
+                  f"checked: {error}")
+            return
+        self.sig_storage_preflight_finished.emit(request, result)
+
+    def _storage_preflight_finished(self, request: int,
+                                    result: DiskPreflightResult):
+        """
+        Show the result of a storage preflight, unless a newer preflight
+        was requested in the meantime.
+
+        :param request: Number of the request
+        :type request: int
+        :param result: The result of the preflight
+        :type result: DiskPreflightResult
+        """
+        if request == self.storage_preflight_request:
+            self._display_storage_preflight_result(result)
+
+    def check_storage_before_automatic_save(self) -> bool:
+        """
+        Check the storage folder right before automatic saving starts.
+
+        The benchmark is taken from the cache of the preflights that ran
+        when the page was loaded and the folder was selected, so only the
+        free space is checked again, as it might have changed since.
+
+        :return: True if automatic saving is disabled or the folder can
+                 sustain the recording, False otherwise
+        :rtype: bool
+        """
+        if not self.controller.get_automatic_save_enabled():
+            return True
+        # Results of preflights that are still running are outdated
+        self.storage_preflight_request += 1
+        try:
+            result = self.disk_preflight.run(
+                folder=self.controller.get_current_folder(),
+                configuration=self.recording_configuration)
+        except OSError as error:
+            print(f"Warning: the storage folder could not be checked: "
+                  f"{error}")
+            return False
+        self._display_storage_preflight_result(result)
+        return result.is_sufficient()
+
+    def engine_started(self, engine: AcquisitionEngine):
+        """
+        Start saving and streaming the samples of an engine that started,
+        as configured on this page.
+
+        :param engine: The engine that started
+        :type engine: AcquisitionEngine
+        """
+        self.start_automatic_save(engine)
+        if self.is_stream_outlet_enabled:
+            self._start_stream_outlet(engine)
+
+    def start_automatic_save(self, engine: AcquisitionEngine):
+        """
+        Save the samples of an engine that started to a new file in the
+        storage folder, if automatic saving is enabled and the folder can
+        sustain the recording. The subject field fills {subject} in the
+        filename template.
+
+        :param engine: The engine that started
+        :type engine: AcquisitionEngine
+        """
+        if not self.controller.get_automatic_save_enabled():
+            return
+        # An engine without recorders has no samples to save
+        if not engine.recorders:
+            return
+        # Check the folder against the recorders that are actually paired
+        self.recording_configuration = RecordingConfiguration(
+            number_of_recorders=len(engine.recorders),
+            channels_per_recorder=max(recorder.number_of_channels
+                                      for recorder in engine.recorders),
+            sample_rate=int(engine.sample_rate))
+        if not self.check_storage_before_automatic_save():
+            print("Warning: the storage folder can not sustain the "
+                  "recording, it is not saved.")
+            return
+        subject = self.le_subject.text().strip()
+        try:
+            recording_path = self.allocate_recording_path(subject)
+        except (OSError, FilenameTemplateError) as error:
+            print(f"Warning: no file could be created for the recording: "
+                  f"{error}")
+            return
+        engine.start_recording(
+            recording_path, engine.get_channel_names(),
+            write_integrity_manifest=self.is_integrity_manifest_enabled)
+        # Report the recordings of a previous engine before they are lost
+        if (self.recording_engine is not None and
+                self.recording_engine is not engine):
+            self._poll_engine_events()
+        self.recording_engine = engine
+        self.recording_subjects[recording_path] = subject
+        self.engine_event_timer.start()
+
+    def _poll_engine_events(self):
+        """
+        Handle the events of the engine that records, until it stopped.
+        """
+        engine = self.recording_engine
+        for event in engine.poll_events():
+            if event[0] == EVENT_RECORDING_STOPPED:
+                self._recording_saved(engine, *event[1:])
+            elif event[0] == EVENT_ERROR:
+                print(f"Warning: {event[1]}")
+            elif event[0] == EVENT_STOPPED:
+                self.engine_event_timer.stop()
+                self.recording_engine = None
+
+    def _recording_saved(self, engine: AcquisitionEngine,
+                         recording_path: str, number_of_samples: int):
+        """
+        Add a recording that was saved to the catalog, with its subject,
+        its duration and the recorders it contains.
+
+        :param engine: The engine that saved the recording
+        :type engine: AcquisitionEngine
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :param number_of_samples: Number of samples in the recording
+        :type number_of_samples: int
+        """
+        subject = self.recording_subjects.pop(recording_path, "")
+        self.recording_catalog_view.update_recording_metadata(
+            recording_path, subject=subject or None,
+            duration=number_of_samples / engine.sample_rate,
+            devices=[recorder.serial_number
+                     for recorder in engine.recorders])
+
+    def _display_storage_preflight_result(self, result: DiskPreflightResult):
+        """
+        Show the estimated recording duration and the warnings of the
+        preflight below the storage folder.
+
+        :param result: The result of the preflight
+        :type result: DiskPreflightResult
+        """
+        lines = [self.tr("Estimated maximum recording duration: ") +
+                 format_duration(result.max_recording_duration)]
+        for warning in result.warnings:
+            lines.append(self.tr("Warning: ") + self.tr(warning))
+        self.lbl_storage_preflight.setText("\n".join(lines))
+
+    def open_recording_preview(self, recording_path: str):
+        """
+        Open a window with the envelope preview of a recording.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        """
+        try:
+            preview_view = RecordingPreviewView(recording_path)
+        except (OSError, ValueError, KeyError):
+            print(f"Warning: No preview is available for {recording_path}.")
+            return
+        # Forget the preview once its window is closed
+        preview_view.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        preview_view.destroyed.connect(
+            partial(self._on_recording_preview_closed, preview_view))
+        self.recording_preview_views.append(preview_view)
+        preview_view.show()
+
+    def convert_selected_recordings(self):
+        """
+        Convert the recordings selected in the catalog to the selected file
+        format, in parallel worker processes.
+        """
+        source_paths = self.recording_catalog_view.get_selected_paths()
+        if not source_paths:
+            self.lbl_conversion_progress.setText(
+                self.tr("Select the recordings to convert in the list."))
+            return
+        target_format = self.controller.get_current_file_format()
+        target_extension = target_format.lower().lstrip(".")
+        if target_extension not in FILE_FORMAT_CODECS:
+            self.lbl_conversion_progress.setText(
+                self.tr("No converter is installed for the format ") +
+                target_format)
+            return
+        # Recordings that are in the format already would be overwritten
+        source_paths = [
+            path for path in source_paths
+            if os.path.splitext(path)[1].lower().lstrip(".") !=
+            target_extension]
+        if not source_paths:
+            self.lbl_conversion_progress.setText(
+                self.tr("The selected recordings are already in the format ")
+                + target_format)
+            return
+        self.batch_converter.submit(source_paths, target_format)
+        self.number_of_files_to_convert += len(source_paths)
+        self.btn_convert_recordings.setEnabled(False)
+        self._update_conversion_progress()
+        self.conversion_timer.start()
+
+    def _update_conversion_progress(self):
+        """
+        Show how many recordings are converted and the throughput of the
+        last one. Stops polling when all conversions are done.
+        """
+        self.conversion_results.extend(self.batch_converter.pop_completed())
+        lines = [self.tr("Converted ") +
+                 f"{len(self.conversion_results)}/"
+                 f"{self.number_of_files_to_convert}"]
+        if self.conversion_results:
+            last_result = self.conversion_results[-1]
+            if last_result.error is None:
+                lines.append(
+                    f"{os.path.basename(last_result.target_path)}: "
+                    f"{last_result.get_throughput() / (1024 * 1024):.1f} "
+                    f"MB/s")
+            else:
+                lines.append(self.tr("Failed: ") + last_result.error)
+        self.lbl_conversion_progress.setText("\n".join(lines))
+
+        if not self.batch_converter.is_running():
+            self.conversion_timer.stop()
+            self.batch_converter.shutdown()
+            self.conversion_results = []
+            self.number_of_files_to_convert = 0
+            self.btn_convert_recordings.setEnabled(True)
+
+    def _on_recording_preview_closed(self, preview_view: RecordingPreviewView
+                                     ):
+        """
+        Remove a closed preview from the list of open previews.
+
+        :param preview_view: The preview that was closed
+        :type preview_view: RecordingPreviewView
+        """
+        if preview_view in self.recording_preview_views:
+            self.recording_preview_views.remove(preview_view)
+
     def filename_editing_finished(self):
         """
         This function is called when the user finishes editing the filename.
@@ -233,8 +985,41 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
 
         # Get the filename from the line edit
         filename = self.le_filename.text()
-        # Update the controller with the new filename
+        # The filename can be a template such as {subject}_{date}_{seq:03d},
+        # do not store it if the template can not be used
+        try:
+            FilenameTemplate(filename)
+        except FilenameTemplateError as error:
+            self.btn_filename_saved.setText(self.tr("Not Saved"))
+            self.le_filename.setToolTip(self.tr(str(error)))
+            return
+        self.le_filename.setToolTip("")
+        # Update the controller with the new filename and store it
         self.controller.set_filename(filename)
+        self.settings_store.set(SETTING_FILENAME, filename)
+
+    def allocate_recording_path(self, subject: str = "") -> str:
+        """
+        Reserve a unique file in the storage folder for a new recording,
+        based on the filename template and the selected file format.
+
+        The sequence number is kept per folder, so no directory listing is
+        needed to find a free name.
+
+        :param subject: Subject of the recording
+        :type subject: str
+        :return: Path of the reserved file
+        :rtype: str
+        """
+        folder = self.controller.get_current_folder()
+        # Reuse the allocator, so its counters stay in memory
+        if (self.filename_allocator is None or
+                self.filename_allocator.folder != folder):
+            self.filename_allocator = FilenameAllocator(folder)
+        return self.filename_allocator.allocate(
+            template=FilenameTemplate(self.controller.get_filename()),
+            extension=self.controller.get_current_file_format().lower(),
+            subject=subject)
 
     def file_format_selected(self):
         """
@@ -253,8 +1038,9 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
 
         # Get the selected file format from the combo box
         file_format = self.cb_fileformat.currentText()
-        # Update the controller with the selected file format
+        # Update the controller with the selected file format and store it
         self.controller.set_current_file_format(file_format)
+        self.settings_store.set(SETTING_FILE_FORMAT, file_format)
 
     def toggle_save_mode(self, is_automatic):
         """
@@ -276,17 +1062,249 @@ class PageFileManagementView(BasePageView, Ui_file_management_page):
         self.btn_automatic_save.setStyleSheet(style_sheet)
         self.btn_manual_save.setStyleSheet(style_sheet)
 
-        # Update the controller with the new setting
+        # Update the controller with the new setting and store it
         self.controller.set_automatic_save_enabled(is_automatic)
+        self.settings_store.set(SETTING_AUTOMATIC_SAVE, is_automatic)
+
+    def settings_profile_selected(self):
+        """
+        Switch to the profile selected in the combo box, creating it from
+        the current settings if it is new, and show its settings.
+        """
+        try:
+            settings = self.settings_store.switch_profile(
+                self.cb_settings_profile.currentText())
+        except ValueError as error:
+            print(f"Warning: {error}")
+            self.cb_settings_profile.setCurrentText(
+                self.settings_store.active_profile)
+            return
+        self.apply_file_management_settings(settings)
+
+    def apply_file_management_settings(self, settings: dict):
+        """
+        Apply the settings of a profile to the controller and the fields of
+        the page in one batch. The storage preflight and the catalog are
+        only updated once, and only if the folder changed.
+
+        :param settings: The settings, keyed by the SETTING_ names
+        :type settings: dict
+        """
+        changed_settings = self._apply_settings_to_controller(settings)
+        register_file_formats(settings.get(SETTING_FILE_FORMAT_CODECS, {}))
+        acquisition_session.apply_settings(settings)
+        # The stored values are the ones the controller accepted
+        self.settings_store.update(self._get_controller_settings())
+
+        self.le_current_folder.setText(self.controller.get_current_folder())
+        self.le_filename.setText(self.controller.get_filename())
+        self.le_filename.setToolTip("")
+        index = self.cb_fileformat.findText(
+            self.controller.get_current_file_format())
+        if index != -1:
+            self.cb_fileformat.setCurrentIndex(index)
+        self.toggle_save_mode(self.controller.get_automatic_save_enabled())
+        self.update_filter_recorders()
+
+        if SETTING_FOLDER in changed_settings:
+            folder = self.controller.get_current_folder()
+            self.run_storage_preflight()
+            self.recording_catalog_view.set_folder(folder)
+
+    def _get_controller_settings(self) -> dict:
+        """
+        :return: The file management settings of the controller, keyed by
+                 the SETTING_ names
+        :rtype: dict
+        """
+        return {
+            SETTING_FOLDER: self.controller.get_current_folder(),
+            SETTING_FILENAME: self.controller.get_filename(),
+            SETTING_FILE_FORMAT: self.controller.get_current_file_format(),
+            SETTING_AUTOMATIC_SAVE:
+                self.controller.get_automatic_save_enabled()}
+
+    def _apply_settings_to_controller(self, settings: dict) -> list[str]:
+        """
+        Pass the settings that differ from the ones of the controller to the
+        controller. Settings that can not be used anymore, e.g. a folder
+        that was removed, are skipped.
+
+        :param settings: The settings, keyed by the SETTING_ names
+        :type settings: dict
+        :return: Names of the settings that were changed
+        :rtype: list[str]
+        """
+        current_settings = self._get_controller_settings()
+        supported_file_formats = [
+            file_format.value
+            for file_format in self.controller.get_supported_file_formats()]
+        setters = {
+            SETTING_FOLDER: self.controller.set_current_folder,
+            SETTING_FILENAME: self.controller.set_filename,
+            SETTING_FILE_FORMAT: self.controller.set_current_file_format,
+            SETTING_AUTOMATIC_SAVE:
+                self.controller.set_automatic_save_enabled}
+        changed_settings = []
+        for name, setter in setters.items():
+            value = settings.get(name)
+            if value is None or value == current_settings[name]:
+                continue
+            if name == SETTING_FOLDER and not os.path.isdir(value):
+                print(f"Warning: the saved storage folder {value} does not "
+                      f"exist anymore.")
+                continue
+            if (name == SETTING_FILE_FORMAT and
+                    value not in supported_file_formats):
+                print(f"Warning: the saved file format {value} is not "
+                      f"supported.")
+                continue
+            if name == SETTING_FILENAME:
+                try:
+                    FilenameTemplate(value)
+                except FilenameTemplateError:
+                    continue
+            setter(value)
+            changed_settings.append(name)
+        return changed_settings
+
+    def set_integrity_manifest_enabled(self, is_enabled: bool):
+        """
+        Enable or disable writing an integrity manifest with every
+        recording.
+
+        :param is_enabled: Whether the manifest should be written
+        :type is_enabled: bool
+        """
+        self.is_integrity_manifest_enabled = is_enabled
+        self.btn_integrity_manifest.setChecked(is_enabled)
+        self.style_class.add_property_to_widget(
+            self.btn_integrity_manifest, "state",
+            "active" if is_enabled else "none")
+
+    def set_stream_outlet_enabled(self, is_enabled: bool):
+        """
+        Enable or disable publishing the samples to other applications on
+        this machine. The outlet runs in the acquisition engine; if no
+        engine runs, it is started with the next engine.
+
+        :param is_enabled: Whether the samples should be published
+        :type is_enabled: bool
+        """
+        self.is_stream_outlet_enabled = is_enabled
+        self.btn_stream_outlet.setChecked(is_enabled)
+        self.style_class.add_property_to_widget(
+            self.btn_stream_outlet, "state",
+            "active" if is_enabled else "none")
+        engine = get_active_engine()
+        if is_enabled:
+            self.outlet_chunks_shown = 0
+            self.outlet_status_timer.start()
+            if engine is not None:
+                self._start_stream_outlet(engine)
+            self._update_outlet_status()
+        else:
+            self.outlet_status_timer.stop()
+            if engine is not None:
+                engine.set_stream_outlet(None)
+            self.lbl_outlet_status.setText(self.tr("Not streaming"))
+
+    def outlet_settings_changed(self):
+        """
+        Take the transport and chunk size from the UI, and restart the
+        outlet with them if it is running.
+        """
+        self.outlet_settings.transport = self.cb_outlet_transport.currentData()
+        self.outlet_settings.chunk_size = self.sb_outlet_chunk_size.value()
+        engine = get_active_engine()
+        if self.is_stream_outlet_enabled and engine is not None:
+            self._start_stream_outlet(engine)
+
+    def _start_stream_outlet(self, engine: AcquisitionEngine):
+        """
+        Start, or restart, the stream outlet of an engine with the current
+        settings.
+
+        :param engine: The running engine
+        :type engine: AcquisitionEngine
+        """
+        self.outlet_chunks_shown = 0
+        engine.set_stream_outlet(self.outlet_settings)
+
+    def _update_outlet_status(self):
+        """
+        Show the chunk rate and the time the samples wait to be published.
+        The end-to-end latency is measured by the clients, see StreamInlet.
+        """
+        engine = get_active_engine()
+        statistics = (None if engine is None
+                      else engine.get_stream_outlet_statistics())
+        if statistics is None:
+            self.lbl_outlet_status.setText(self.tr("No sample source"))
+            return
+        if statistics["state"] == OUTLET_STATE_FAILED:
+            self.lbl_outlet_status.setText(self.tr("Streaming failed"))
+            return
+        if statistics["state"] != OUTLET_STATE_STREAMING:
+            self.lbl_outlet_status.setText(self.tr("Starting the stream"))
+            return
+        latency = statistics["batching_latency"]
+        # The count starts again when the outlet is restarted
+        chunks = max(statistics["chunks"] - self.outlet_chunks_shown, 0)
+        self.outlet_chunks_shown = statistics["chunks"]
+        self.lbl_outlet_status.setText(
+            f"{chunks * 1000 / OUTLET_STATUS_INTERVAL:.0f} " +
+            self.tr("chunks/s, batching") +
+            f" {1000 * latency['mean']:.1f} ms " + self.tr("average") +
+            f", {1000 * latency['p95']:.1f} ms p95")
 
     def disconnect_signals_from_actions(self):
         """
         Disconnect all signals when the view is being closed.
         """
-        pass
+        disconnect_traced(self.controller.sig_folder_changed,
+                          self.le_current_folder.setText)
+        disconnect_traced(self.sig_storage_preflight_finished,
+                          self._storage_preflight_finished)
+        self.cb_settings_profile.activated.disconnect(
+            self.settings_profile_selected)
+        self.btn_integrity_manifest.toggled.disconnect(
+            self.set_integrity_manifest_enabled)
+        self.btn_stream_outlet.toggled.disconnect(
+            self.set_stream_outlet_enabled)
+        self.cb_outlet_transport.activated.disconnect(
+            self.outlet_settings_changed)
+        self.sb_outlet_chunk_size.editingFinished.disconnect(
+            self.outlet_settings_changed)
+        self.outlet_status_timer.timeout.disconnect(
+            self._update_outlet_status)
+        self.cb_filter_recorder.activated.disconnect(
+            self.show_recorder_filter)
+        self.btn_apply_filter.clicked.disconnect(self.apply_recorder_filter)
+        disconnect_traced(self.recording_catalog_view.sig_recording_selected,
+                          self.open_recording_preview)
+        self.btn_convert_recordings.clicked.disconnect(
+            self.convert_selected_recordings)
+        self.conversion_timer.timeout.disconnect(
+            self._update_conversion_progress)
+        self.engine_event_timer.timeout.disconnect(self._poll_engine_events)
 
     def close_widget(self):
         """
         Perform necessary actions to cleanly close the widget.
         """
         self.disconnect_signals_from_actions()
+        remove_engine_start_listener(self.engine_started)
+        # A running benchmark takes at most a second
+        self.storage_preflight_pool.clear()
+        self.storage_preflight_pool.waitForDone()
+        self.recording_catalog_view.close_widget()
+        self.conversion_timer.stop()
+        self.engine_event_timer.stop()
+        self.batch_converter.shutdown(cancel_pending=True)
+        if self.is_stream_outlet_enabled:
+            self.set_stream_outlet_enabled(False)
+        for preview_view in list(self.recording_preview_views):
+            preview_view.close_widget()
+        # Save the settings that are still waiting for the write delay
+        self.settings_store.close()
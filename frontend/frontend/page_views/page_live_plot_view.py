@@ -0,0 +1,453 @@
+from typing import List
+
+import numpy as np
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QPainter, QColor
+
+from application.Enums.workflow_enums import PageTypeEnum
+from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.diagnostics.event_loop_watchdog import (
+    set_active_page)
+from application.Views.classes.diagnostics.leak_detector import (
+    leak_checkpoint)
+from application.Views.classes.elements.signal_raster import (
+    create_image, rasterize_columns)
+from application.Views.classes.pipeline.acquisition_session import (
+    acquisition_session)
+from application.Views.classes.pipeline.filter_bank import FilterBank
+from application.Views.classes.pipeline.sample_ring_buffer import (
+    RingBufferReader, SampleRingBuffer)
+
+# Maximum number of times per second the plot is redrawn. New samples are
+# collected in between, so the drawing cost does not depend on the sample
+# rate.
+MAX_REDRAW_RATE: int = 30
+# Number of seconds shown over the full width of the plot
+DEFAULT_WINDOW_SECONDS: float = 10.0
+# Vertical space in pixels between the channel rows
+CHANNEL_ROW_MARGIN: int = 2
+# Colors used for the signals and the background
+SIGNAL_COLOR: QColor = QColor(0, 94, 184)
+BACKGROUND_COLOR: QColor = QColor(255, 255, 255)
+
+
+class LiveSignalPlot(QWidget):
+    """
+    Widget that draws the live signals of all channels, scrolling from right
+    to left.
+
+    The samples are decimated to one min/max pair per pixel column as they
+    arrive, so every sample is processed once. A redraw rasterizes the
+    min/max lines with NumPy, so its cost depends on the size of the widget
+    rather than on the number of samples or channels.
+
+    Attributes
+    ----------
+    sample_rate : int
+        Sample rate of the signals in Hz
+    window_seconds : float
+        Number of seconds shown over the full width
+    samples_per_column : int
+        Number of samples that are combined in one pixel column
+    columns : np.ndarray
+        Min/max per pixel column, shape (columns, channels, 2), used as a
+        circular buffer
+    last_values : np.ndarray
+        Last sample of every pixel column, shape (columns, channels), in
+        the same order as columns; it connects the line of a column to
+        the next one
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        """
+        Initialize an empty plot.
+
+        :param parent: Parent widget
+        :type parent: QWidget
+        """
+        super().__init__(parent)
+        self.sample_rate = 1
+        self.window_seconds = DEFAULT_WINDOW_SECONDS
+        self.number_of_channels = 0
+        self.samples_per_column = 1
+        self.columns = np.full((0, 0, 2), np.nan, dtype=np.float32)
+        self.last_values = np.full((0, 0), np.nan, dtype=np.float32)
+        self.number_of_columns_written = 0
+        # Min/max of the samples of the column that is not complete yet
+        self._partial_column: np.ndarray = None
+        self._partial_column_size = 0
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def reset(self, number_of_channels: int, sample_rate: int,
+              window_seconds: float) -> None:
+        """
+        Clear the plot and set up the columns for the current width.
+
+        :param number_of_channels: Number of channels to show
+        :type number_of_channels: int
+        :param sample_rate: Sample rate in Hz
+        :type sample_rate: int
+        :param window_seconds: Number of seconds shown over the full width
+        :type window_seconds: float
+        """
+        self.number_of_channels = number_of_channels
+        self.sample_rate = sample_rate
+        self.window_seconds = window_seconds
+        width = max(self.width(), 1)
+        self.samples_per_column = max(
+            int(window_seconds * sample_rate) // width, 1)
+        self.columns = np.full((width, number_of_channels, 2), np.nan,
+                               dtype=np.float32)
+        self.last_values = np.full((width, number_of_channels), np.nan,
+                                   dtype=np.float32)
+        self.number_of_columns_written = 0
+        self._partial_column = None
+        self._partial_column_size = 0
+
+    def get_window_samples(self) -> int:
+        """
+        :return: Number of samples shown over the full width
+        :rtype: int
+        """
+        return self.samples_per_column * self.columns.shape[0]
+
+    def add_samples(self, block: np.ndarray) -> None:
+        """
+        Decimate new samples into the pixel columns.
+
+        :param block: Samples of shape (samples, channels)
+        :type block: np.ndarray
+        """
+        if block.shape[0] == 0 or self.columns.shape[0] == 0:
+            return
+        # Complete the column that was started by the previous block
+        if self._partial_column_size:
+            needed = self.samples_per_column - self._partial_column_size
+            head = block[:needed]
+            self._partial_column[:, 0] = np.fmin(
+                self._partial_column[:, 0], head.min(axis=0))
+            self._partial_column[:, 1] = np.fmax(
+                self._partial_column[:, 1], head.max(axis=0))
+            self._partial_column_size += head.shape[0]
+            block = block[needed:]
+            if self._partial_column_size < self.samples_per_column:
+                return
+            self._append_columns(self._partial_column[np.newaxis],
+                                 head[-1][np.newaxis])
+            self._partial_column = None
+            self._partial_column_size = 0
+
+        # Reduce all complete columns in one vectorized operation
+        number_of_columns = block.shape[0] // self.samples_per_column
+        if number_of_columns:
+            complete = block[:number_of_columns * self.samples_per_column]
+            complete = complete.reshape(number_of_columns,
+                                        self.samples_per_column, -1)
+            self._append_columns(np.stack((complete.min(axis=1),
+                                           complete.max(axis=1)), axis=-1),
+                                 complete[:, -1])
+
+        # Keep the remaining samples for the next block
+        remainder = block[number_of_columns * self.samples_per_column:]
+        if remainder.shape[0]:
+            self._partial_column = np.stack(
+                (remainder.min(axis=0), remainder.max(axis=0)), axis=-1)
+            self._partial_column_size = remainder.shape[0]
+
+    def _append_columns(self, new_columns: np.ndarray,
+                        last_values: np.ndarray) -> None:
+        """
+        Write complete columns into the circular column buffer.
+
+        :param new_columns: Columns of shape (columns, channels, 2)
+        :type new_columns: np.ndarray
+        :param last_values: Last sample of every column, of shape (columns,
+                            channels)
+        :type last_values: np.ndarray
+        """
+        width = self.columns.shape[0]
+        new_columns = new_columns[-width:]
+        last_values = last_values[-width:]
+        positions = (self.number_of_columns_written +
+                     np.arange(new_columns.shape[0])) % width
+        self.columns[positions] = new_columns
+        self.last_values[positions] = last_values
+        self.number_of_columns_written += new_columns.shape[0]
+
+    def paintEvent(self, event) -> None:
+        """
+        Paint every channel in its own row, with the newest samples on the
+        right. Every pixel column of a channel is a vertical line from the
+        minimum to the maximum, extended to the last sample of the previous
+        column so a slow signal is drawn as a connected trace rather than
+        as dots; the lines are drawn as a single image.
+
+        :param event: The paint event
+        :type event: QPaintEvent
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        width = self.columns.shape[0]
+        if width == 0 or self.number_of_channels == 0:
+            painter.end()
+            return
+
+        # Put the circular buffer in chronological order
+        oldest = self.number_of_columns_written % width
+        columns = np.roll(self.columns, -oldest, axis=0)
+        valid = ~np.isnan(columns[..., 0])
+        # Connect every column to the last sample of the previous column.
+        # The oldest column has no previous column; NaN is ignored by
+        # fmin and fmax, so columns after a gap are not extended.
+        previous_values = np.roll(self.last_values, 1 - oldest, axis=0)
+        previous_values[0] = np.nan
+        columns = np.stack((np.fmin(columns[..., 0], previous_values),
+                            np.fmax(columns[..., 1], previous_values)),
+                           axis=-1)
+
+        # Scale every channel to its own row
+        row_height = self.height() / self.number_of_channels
+        minimum = np.nan_to_num(np.fmin.reduce(columns[..., 0], axis=0))
+        maximum = np.nan_to_num(np.fmax.reduce(columns[..., 1], axis=0))
+        value_range = np.where(maximum > minimum, maximum - minimum, 1.0)
+        usable_height = max(row_height - 2 * CHANNEL_ROW_MARGIN, 1)
+        row_bottom = (np.arange(1, self.number_of_channels + 1) *
+                      row_height - CHANNEL_ROW_MARGIN)
+        y_minimum = row_bottom - (columns[..., 0] - minimum) / \
+            value_range * usable_height
+        y_maximum = row_bottom - (columns[..., 1] - minimum) / \
+            value_range * usable_height
+
+        # Rasterize the vertical line of every column and channel at once
+        x = np.broadcast_to(np.arange(width)[:, np.newaxis],
+                            y_minimum.shape)[valid]
+        pixels = rasterize_columns(x, y_maximum[valid], y_minimum[valid],
+                                   width, self.height(), SIGNAL_COLOR,
+                                   BACKGROUND_COLOR)
+        # The pixel array is alive until the painting is done
+        painter.drawImage(0, 0, create_image(pixels))
+        painter.end()
+
+
+class PageLivePlotView(BasePageView):
+    """
+    Page of the acquisition that shows the live signals of all recorders.
+
+    The plot reads the samples from the shared ring buffer of the sample
+    pipeline with its own reader, so it never copies the samples of the
+    other readers (e.g. the file writer). Without an explicit sample source
+    it starts the acquisition of the paired recorders when the page is
+    loaded, and shows the ring buffer of its engine. The redraw rate is
+    capped at MAX_REDRAW_RATE; the samples that arrive in between are
+    decimated when the plot is updated.
+
+    Attributes
+    ----------
+    plot : LiveSignalPlot
+        The widget the signals are drawn on
+    ring_buffer_reader : RingBufferReader
+        Reads the samples from the shared ring buffer
+    redraw_timer : QTimer
+        Updates the plot at the capped redraw rate
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        """
+        Initialize the live plot page without a sample source.
+
+        :param parent: the parent of the view
+        :type parent: QWidget
+        """
+        super().__init__(page_type=PageTypeEnum.PageAcquisition,
+                         parent=parent)
+        # Define attributes
+        self.ring_buffer: SampleRingBuffer = None
+        self.ring_buffer_reader: RingBufferReader = None
+        # Filters only the displayed samples, not the saved samples
+        self.display_filter_bank: FilterBank = None
+        self.sample_rate = 1
+        self.window_seconds = DEFAULT_WINDOW_SECONDS
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setInterval(1000 // MAX_REDRAW_RATE)
+
+        # Perform the setup functions
+        self.setup_local_ui_elements()
+        self.connect_widgets_to_actions()
+        self.connect_signals_to_actions()
+
+    def setup_local_ui_elements(self) -> None:
+        """
+        Add the plot to the page.
+        """
+        self.plot = LiveSignalPlot(self)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.plot)
+
+    def connect_widgets_to_actions(self) -> None:
+        """
+        This page does not have any widgets that can perform an action.
+        """
+        pass
+
+    def connect_signals_to_actions(self) -> None:
+        """
+        Connect the redraw timer to the update of the plot.
+        """
+        self.redraw_timer.timeout.connect(self.update_plot)
+
+    def disconnect_signals_from_actions(self) -> None:
+        """
+        Disconnect the redraw timer from the update of the plot.
+        """
+        self.redraw_timer.timeout.disconnect(self.update_plot)
+
+    def set_sample_source(self, ring_buffer: SampleRingBuffer,
+                          sample_rate: int) -> None:
+        """
+        Show the samples of a ring buffer of the sample pipeline.
+
+        :param ring_buffer: The ring buffer to read the samples from, None
+                            to clear the plot
+        :type ring_buffer: SampleRingBuffer or None
+        :param sample_rate: Sample rate of the samples in Hz
+        :type sample_rate: int
+        """
+        self.ring_buffer = ring_buffer
+        self.sample_rate = sample_rate
+        self._restart_plot()
+
+    def set_display_filter_bank(self, filter_bank: FilterBank = None
+                                ) -> None:
+        """
+        Filter the displayed samples, e.g. with a notch filter for the mains
+        frequency. The saved samples are not affected.
+
+        :param filter_bank: The filters, or None to show the samples as they
+                            are in the ring buffer
+        :type filter_bank: FilterBank
+        """
+        self.display_filter_bank = filter_bank
+        self._restart_plot()
+
+    def set_window_seconds(self, window_seconds: float) -> None:
+        """
+        Set the number of seconds shown over the full width of the plot.
+
+        :param window_seconds: Number of seconds
+        :type window_seconds: float
+        """
+        self.window_seconds = window_seconds
+        self._restart_plot()
+
+    def update_plot(self) -> None:
+        """
+        Decimate the samples that arrived since the last update and redraw
+        the plot if there were any.
+        """
+        if self.ring_buffer_reader is None:
+            return
+        # The engine released the ring buffer when it stopped
+        if self.ring_buffer.buffer is None:
+            self.set_sample_source(None, self.sample_rate)
+            return
+        # Restart when the width changed, as the columns depend on it
+        if self.plot.width() != self.plot.columns.shape[0]:
+            self._restart_plot()
+            return
+        views: List[np.ndarray] = self.ring_buffer_reader.read()
+        for view in views:
+            self._add_samples(view)
+        if views:
+            self.plot.update()
+
+    def _restart_plot(self) -> None:
+        """
+        Clear the plot and fill it with the most recent samples in the ring
+        buffer.
+        """
+        if self.ring_buffer is None:
+            self.ring_buffer_reader = None
+            return
+        self.plot.reset(self.ring_buffer.number_of_channels,
+                        self.sample_rate, self.window_seconds)
+        self.ring_buffer_reader = self.ring_buffer.create_reader()
+        # The replayed samples do not continue the samples that were
+        # filtered last, so the filters start again from their first sample
+        if self.display_filter_bank is not None:
+            self.display_filter_bank.reset_state()
+        for view in self.ring_buffer_reader.read_latest(
+                self.plot.get_window_samples()):
+            self._add_samples(view)
+        self.plot.update()
+
+    def _add_samples(self, samples: np.ndarray) -> None:
+        """
+        Add samples of the ring buffer to the plot, filtered if a display
+        filter is set.
+
+        :param samples: Samples of shape (samples, channels)
+        :type samples: np.ndarray
+        """
+        if self.display_filter_bank is not None:
+            samples = self.display_filter_bank.process(samples)
+        self.plot.add_samples(samples)
+
+    def load_page(self) -> None:
+        """
+        Performs the actions that are needed upon loading the page.
+
+        Sends two signals: sends sig_full_screen_mode_changed(False) to update
+        other classes that this page does not need to be displayed in full
+        window mode but can be displayed in the normal way.
+        Emits the sig_topbar_update_requested(False, None, None) to update
+        other classes that no topbar is needed for this page view.
+        Emits the sig_visible_frame_update_requested(True) to update other
+        classes that the frame around the page needs to be shown.
+        Starts the acquisition if no sample source was set, and starts
+        updating the plot.
+        """
+        self.sig_full_screen_mode_changed.emit(False)
+        self.sig_topbar_update_requested.emit(False, None, None)
+        self.sig_visible_frame_update_requested.emit(True)
+        set_active_page(self.page_type)
+        leak_checkpoint(f"{self.page_type.name} load")
+        # Show the samples of the session, if no other source was set. The
+        # acquisition of the paired recorders starts with this page; the
+        # pages that save or stream the samples are informed by the engine
+        # start listeners.
+        if self.ring_buffer is None or self.ring_buffer.buffer is None:
+            engine = acquisition_session.start()
+        else:
+            engine = None
+        if engine is not None:
+            self.set_sample_source(engine.ring_buffer,
+                                   int(engine.sample_rate))
+        else:
+            self._restart_plot()
+        self.redraw_timer.start()
+
+    def leave_page(self) -> None:
+        """
+        Stop updating the plot while the page is not shown.
+        """
+        self.redraw_timer.stop()
+
+    def on_controller_deleted(self) -> None:
+        """
+        This view does not have its own controller, so the function can just
+        pass.
+        """
+        pass
+
+    def close_widget(self) -> None:
+        """
+        Stop updating the plot, stop the acquisition and disconnect all
+        signals.
+        """
+        self.leave_page()
+        self.disconnect_signals_from_actions()
+        acquisition_session.stop()
+        self.ring_buffer_reader = None
+        self.ring_buffer = None
@@ -0,0 +1,140 @@
+import importlib
+from enum import Enum
+from typing import Dict, List, Tuple
+
+from application.Enums.workflow_enums import PageTypeEnum
+from application.Enums.sub_page_enums import SubPageTypeEnum
+from application.Views.classes.diagnostics.repaint_monitor import (
+    watch_page_repaints)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_IMPORT, startup_profiler)
+
+# Package that contains the modules of the page views
+PAGE_VIEWS_PACKAGE: str = "application.Views.classes.page_views"
+
+# Maps every (sub) page type to the module and the name of the class of its
+# view. The modules are only imported when a page of that type is created,
+# so the pages that are never visited are never imported.
+PAGE_REGISTRY: Dict[Enum, Tuple[str, str]] = {
+    PageTypeEnum.PageSplash: (
+        f"{PAGE_VIEWS_PACKAGE}.page_splash_view", "PageSplashView"),
+    PageTypeEnum.PageConnection: (
+        f"{PAGE_VIEWS_PACKAGE}.page_connection_view", "PageConnectionView"),
+    PageTypeEnum.PageFileManagement: (
+        f"{PAGE_VIEWS_PACKAGE}.page_file_management_view",
+        "PageFileManagementView"),
+    PageTypeEnum.PageAcquisition: (
+        f"{PAGE_VIEWS_PACKAGE}.page_live_plot_view", "PageLivePlotView"),
+    SubPageTypeEnum.PageConnectionOverview: (
+        f"{PAGE_VIEWS_PACKAGE}.sub_page_connection_overview_view",
+        "SubPageConnectionOverviewView"),
+    SubPageTypeEnum.PageConnectionBaseStation: (
+        f"{PAGE_VIEWS_PACKAGE}.sub_page_connection_base_station_view",
+        "SubPageConnectionBaseStationView"),
+    SubPageTypeEnum.PageConnectionRecorders: (
+        f"{PAGE_VIEWS_PACKAGE}.sub_page_connection_recorder_view",
+        "SubPageConnectionRecorderView"),
+}
+
+# The impedance check is a sub page of the connection workflow once the sub
+# page enum defines it
+if hasattr(SubPageTypeEnum, "PageConnectionImpedance"):
+    PAGE_REGISTRY[SubPageTypeEnum.PageConnectionImpedance] = (
+        f"{PAGE_VIEWS_PACKAGE}.sub_page_connection_impedance_view",
+        "SubPageConnectionImpedanceView")
+
+# Cache of the page classes that were resolved
+_page_classes: Dict[Enum, type] = {}
+
+
+def register_page(page_type: Enum, module_path: str,
+                  class_name: str) -> None:
+    """
+    Register the view of a (sub) page type, or replace its registration.
+
+    :param page_type: The page type
+    :type page_type: PageTypeEnum or SubPageTypeEnum
+    :param module_path: Import path of the module of the view
+    :type module_path: str
+    :param class_name: Name of the class of the view in the module
+    :type class_name: str
+    """
+    PAGE_REGISTRY[page_type] = (module_path, class_name)
+    _page_classes.pop(page_type, None)
+
+
+def get_page_class(page_type: Enum) -> type:
+    """
+    Get the class of the view of a page type, importing its module on the
+    first request.
+
+    :param page_type: The page type
+    :type page_type: PageTypeEnum or SubPageTypeEnum
+    :raises KeyError: if no view is registered for the page type
+    :return: The class of the view
+    :rtype: type
+    """
+    page_class = _page_classes.get(page_type)
+    if page_class is None:
+        if page_type not in PAGE_REGISTRY:
+            raise KeyError(f"No view is registered for {page_type}")
+        module_path, class_name = PAGE_REGISTRY[page_type]
+        with startup_profiler.profile_phase(module_path, CATEGORY_IMPORT):
+            module = importlib.import_module(module_path)
+        page_class = getattr(module, class_name)
+        # Records the setupUi and load_page of the page in the startup
+        # timeline, if it is enabled
+        startup_profiler.instrument_page_class(page_class)
+        _page_classes[page_type] = page_class
+    return page_class
+
+
+def create_page(page_type: Enum, **kwargs):
+    """
+    Create the view of a page type.
+
+    :param page_type: The page type
+    :type page_type: PageTypeEnum or SubPageTypeEnum
+    :param kwargs: Arguments of the constructor of the view, e.g. parent
+    :raises KeyError: if no view is registered for the page type
+    :return: The view
+    :rtype: BasePageView
+    """
+    page_view = get_page_class(page_type)(**kwargs)
+    # Measures the repaints of the page, if it is enabled
+    watch_page_repaints(page_view)
+    return page_view
+
+
+def is_page_imported(page_type: Enum) -> bool:
+    """
+    :param page_type: The page type
+    :type page_type: PageTypeEnum or SubPageTypeEnum
+    :return: Whether the module of the view of the page type was imported
+    :rtype: bool
+    """
+    return page_type in _page_classes
+
+
+def get_page_module_paths() -> List[str]:
+    """
+    :return: Import paths of the modules of all registered views
+    :rtype: List[str]
+    """
+    return sorted({module_path for module_path, _ in PAGE_REGISTRY.values()})
+
+
+def get_class_module_path(class_name: str) -> str:
+    """
+    Get the module of a registered view by the name of its class.
+
+    :param class_name: Name of the class of the view
+    :type class_name: str
+    :raises AttributeError: if no view with that class name is registered
+    :return: Import path of the module of the view
+    :rtype: str
+    """
+    for module_path, registered_class_name in PAGE_REGISTRY.values():
+        if registered_class_name == class_name:
+            return module_path
+    raise AttributeError(class_name)
@@ -1,12 +1,13 @@
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import QTimer, QSize
 from PySide6.QtGui import QIcon
-# Import this QtSvg only for correct rendering of the svg images, no need to
-# use it.
-from PySide6 import QtSvg
 
 from application.Enums.workflow_enums import PageTypeEnum
 from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.diagnostics.event_loop_watchdog import (
+    set_active_page)
+from application.Views.classes.diagnostics.leak_detector import (
+    leak_checkpoint)
 from application.Views.designer._page_splashUI import Ui_splash_screen
 
 # height of the icon for the animation blocks
@@ -128,6 +129,8 @@ class PageSplashView(BasePageView, Ui_splash_screen):
     def load_page(self):
         """Start the interval of the loop_shown_icon function
         """
+        set_active_page(self.page_type)
+        leak_checkpoint(f"{self.page_type.name} load")
         self.timer.start(ANIMATION_TIME_INTERVAL)
 
     def leave_page(self):
@@ -174,6 +177,10 @@ class PageSplashView(BasePageView, Ui_splash_screen):
         :param icon_path: path of the icon to display
         :type icon_path: str
         """
+        # Import QtSvg only for correct rendering of the svg images, no need
+        # to use it. It is imported on first use instead of at startup, as
+        # it is one of the larger Qt modules.
+        from PySide6 import QtSvg  # noqa: F401
         icon = QIcon()
         icon.addFile(icon_path,
                      QSize(), QIcon.Mode.Normal, QIcon.State.Off)
@@ -2,13 +2,14 @@ from PySide6.QtWidgets import QWidget
 from typing import Dict, List
 
 from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.diagnostics.signal_tracer import (
+    connect_traced)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_CONTROLLER, startup_profiler)
 from application.Views.classes.connection_base_station_info_view import (
     ConnectionBaseStationInfoView)
 from application.Views.designer._sub_page_connection_base_stationUI import (
     Ui_sub_page_connection_base_station)
-from application.Controllers.page_controllers. \
-    sub_page_connection_base_station_controller import (
-        SubPageConnectionBaseStationController)
 
 from application.Enums.sub_page_enums import SubPageTypeEnum
 from application.Constants.device_constants import MAX_BASE_STATIONS_SUPPORTED
@@ -49,7 +50,14 @@ class SubPageConnectionBaseStationView(BasePageView,
         # Set up the UI from the Qt Designer file
         self.setupUi(self)
 
-        self.controller = SubPageConnectionBaseStationController()
+        # Import the controller on first use, so importing the page does not
+        # import the controllers of pages that are not shown yet
+        from application.Controllers.page_controllers. \
+            sub_page_connection_base_station_controller import (
+                SubPageConnectionBaseStationController)
+        with startup_profiler.profile_phase(
+                "SubPageConnectionBaseStationController", CATEGORY_CONTROLLER):
+            self.controller = SubPageConnectionBaseStationController()
 
         # Initialize the base_station_list_extended with info from the
         # controller
@@ -136,14 +144,14 @@ class SubPageConnectionBaseStationView(BasePageView,
         """ Connect the signals from the ConnectionBaseStationInfoView to their
         actions
         """
-        connection_bs_info_widget.sig_discover_started.connect(
-            self._on_sig_discover_started)
-        connection_bs_info_widget.sig_discover_finished.connect(
-            self._on_sig_discover_finished)
-        connection_bs_info_widget.sig_connection_finished.connect(
-            self._on_sig_connection_finished)
-        connection_bs_info_widget.sig_connection_started.connect(
-            self._on_sig_connection_started)
+        connect_traced(connection_bs_info_widget.sig_discover_started,
+                       self._on_sig_discover_started)
+        connect_traced(connection_bs_info_widget.sig_discover_finished,
+                       self._on_sig_discover_finished)
+        connect_traced(connection_bs_info_widget.sig_connection_finished,
+                       self._on_sig_connection_finished)
+        connect_traced(connection_bs_info_widget.sig_connection_started,
+                       self._on_sig_connection_started)
 
     def disconnect_signals_from_actions(self) -> None:
         """
@@ -0,0 +1,385 @@
+from typing import List
+
+import numpy as np
+from PySide6.QtWidgets import (
+    QHBoxLayout, QLabel, QPushButton, QSizePolicy, QVBoxLayout, QWidget)
+from PySide6.QtCore import QRect, Qt, QTimer
+from PySide6.QtGui import QColor, QPainter
+
+from application.Enums.sub_page_enums import SubPageTypeEnum
+from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.pipeline.acquisition_engine import (
+    RecorderConfiguration)
+from application.Views.classes.pipeline.acquisition_session import (
+    acquisition_session)
+from application.Views.classes.pipeline.impedance_engine import (
+    ImpedanceEngine, ImpedanceUpdate, LEVEL_UNKNOWN)
+
+# Maximum number of times per second the heatmap is updated. The
+# measurements that arrive in between are combined in one update.
+MAX_HEATMAP_UPDATE_RATE: int = 20
+# Number of channel cells per row of a recorder in the heatmap
+CHANNELS_PER_ROW: int = 16
+# Width in pixels of the serial numbers left of the cells
+RECORDER_LABEL_WIDTH: int = 90
+# Space in pixels between the cells and between the recorders
+CELL_SPACING: int = 2
+RECORDER_SPACING: int = 10
+# Number of changed cells above which the whole heatmap is redrawn at once
+MAX_PARTIAL_REDRAW_CELLS: int = 64
+# Colors of the impedance levels: not measured, good, moderate, bad and not
+# connected
+UNKNOWN_COLOR: QColor = QColor(200, 200, 200)
+LEVEL_COLORS: List[QColor] = [QColor(76, 175, 80), QColor(255, 193, 7),
+                              QColor(255, 120, 0), QColor(211, 47, 47)]
+BACKGROUND_COLOR: QColor = QColor(255, 255, 255)
+TEXT_COLOR: QColor = QColor(0, 0, 0)
+
+
+class ImpedanceHeatmap(QWidget):
+    """
+    Widget that shows the impedance of every channel of every recorder as a
+    colored cell, with the channels of a recorder in rows of
+    CHANNELS_PER_ROW cells.
+
+    Updates only invalidate the cells that changed, and a repaint only draws
+    the cells in the invalidated area, so the measurements that stream in
+    do not redraw the whole heatmap.
+
+    Attributes
+    ----------
+    serial_numbers : List[str]
+        Serial numbers of the recorders, one block of rows each
+    values : np.ndarray
+        Impedance in kOhm per recorder and channel, NaN if not measured
+    levels : np.ndarray
+        Impedance level per recorder and channel
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        """
+        Initialize an empty heatmap.
+
+        :param parent: Parent widget
+        :type parent: QWidget
+        """
+        super().__init__(parent)
+        self.serial_numbers: List[str] = []
+        self.channel_counts = np.zeros(0, dtype=int)
+        self.values = np.empty((0, 0))
+        self.levels = np.empty((0, 0), dtype=int)
+        # Top of the block of every recorder in cell rows
+        self._first_cell_rows = np.zeros(0, dtype=int)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding,
+                           QSizePolicy.Policy.Expanding)
+
+    def reset(self, serial_numbers: List[str],
+              channel_counts: List[int]) -> None:
+        """
+        Show the channels of the recorders as not measured.
+
+        :param serial_numbers: Serial numbers of the recorders
+        :type serial_numbers: List[str]
+        :param channel_counts: Number of channels of every recorder
+        :type channel_counts: List[int]
+        """
+        self.serial_numbers = list(serial_numbers)
+        self.channel_counts = np.asarray(channel_counts, dtype=int)
+        number_of_channels = int(self.channel_counts.max(initial=0))
+        shape = (len(self.serial_numbers), number_of_channels)
+        self.values = np.full(shape, np.nan)
+        self.levels = np.full(shape, LEVEL_UNKNOWN, dtype=int)
+        cell_rows = -(-self.channel_counts // CHANNELS_PER_ROW)
+        self._first_cell_rows = np.concatenate(([0], np.cumsum(cell_rows)))
+        self.update()
+
+    def apply_update(self, impedance_update: ImpedanceUpdate) -> None:
+        """
+        Show the channels that changed, and redraw only their cells.
+
+        :param impedance_update: The changed channels
+        :type impedance_update: ImpedanceUpdate
+        """
+        if not len(impedance_update):
+            return
+        rows = impedance_update.rows
+        channels = impedance_update.channels
+        self.values[rows, channels] = impedance_update.values
+        self.levels[rows, channels] = impedance_update.levels
+        if len(impedance_update) > MAX_PARTIAL_REDRAW_CELLS:
+            self.update()
+            return
+        x, y, width, height = self._get_cell_geometry(rows, channels)
+        for cell in range(len(rows)):
+            self.update(QRect(int(x[cell]), int(y[cell]), width, height))
+
+    def _get_cell_size(self):
+        """
+        :return: Width and height of a cell in pixels
+        :rtype: Tuple[int, int]
+        """
+        total_cell_rows = max(int(self._first_cell_rows[-1]), 1)
+        available_height = (self.height() - RECORDER_SPACING *
+                            max(len(self.serial_numbers) - 1, 0))
+        width = max((self.width() - RECORDER_LABEL_WIDTH) // CHANNELS_PER_ROW
+                    - CELL_SPACING, 1)
+        height = max(available_height // total_cell_rows - CELL_SPACING, 1)
+        return width, height
+
+    def _get_cell_geometry(self, rows: np.ndarray, channels: np.ndarray):
+        """
+        :param rows: Index of the recorder of every cell
+        :type rows: np.ndarray
+        :param channels: Index of the channel of every cell
+        :type channels: np.ndarray
+        :return: Left and top of every cell, and the width and height of the
+                 cells in pixels
+        :rtype: Tuple[np.ndarray, np.ndarray, int, int]
+        """
+        width, height = self._get_cell_size()
+        cell_rows = self._first_cell_rows[rows] + channels // CHANNELS_PER_ROW
+        x = (RECORDER_LABEL_WIDTH +
+             (channels % CHANNELS_PER_ROW) * (width + CELL_SPACING))
+        y = cell_rows * (height + CELL_SPACING) + rows * RECORDER_SPACING
+        return x, y, width, height
+
+    def paintEvent(self, event) -> None:
+        """
+        Paint the serial numbers and the cells in the invalidated area.
+
+        :param event: The paint event
+        :type event: QPaintEvent
+        """
+        painter = QPainter(self)
+        area = event.rect()
+        painter.fillRect(area, BACKGROUND_COLOR)
+        if self.values.size == 0:
+            painter.end()
+            return
+        painter.setPen(TEXT_COLOR)
+
+        # Select the cells that intersect the invalidated area at once
+        rows, channels = np.nonzero(np.arange(self.values.shape[1]) <
+                                    self.channel_counts[:, np.newaxis])
+        x, y, width, height = self._get_cell_geometry(rows, channels)
+        is_visible = ((x < area.right() + 1) & (x + width > area.left()) &
+                      (y < area.bottom() + 1) & (y + height > area.top()))
+        show_values = height >= painter.fontMetrics().height()
+        for cell in np.flatnonzero(is_visible):
+            row, channel = rows[cell], channels[cell]
+            level = self.levels[row, channel]
+            color = (UNKNOWN_COLOR if level == LEVEL_UNKNOWN
+                     else LEVEL_COLORS[min(level, len(LEVEL_COLORS) - 1)])
+            rect = QRect(int(x[cell]), int(y[cell]), width, height)
+            painter.fillRect(rect, color)
+            if show_values and level != LEVEL_UNKNOWN:
+                painter.drawText(rect, Qt.AlignCenter,
+                                 f"{self.values[row, channel]:.0f}")
+
+        # Serial number of every recorder left of its first row of cells
+        _, label_y, _, _ = self._get_cell_geometry(
+            np.arange(len(self.serial_numbers)),
+            np.zeros(len(self.serial_numbers), dtype=int))
+        for serial_number, top in zip(self.serial_numbers, label_y):
+            painter.drawText(QRect(0, int(top), RECORDER_LABEL_WIDTH - 4,
+                                   height),
+                             Qt.AlignRight | Qt.AlignVCenter, serial_number)
+        painter.end()
+
+
+class SubPageConnectionImpedanceView(BasePageView):
+    """
+    Sub page of the connection workflow that checks the electrode
+    impedances of all channels of the paired recorders before a recording.
+
+    All recorders are checked at the same time by the impedance engine. The
+    heatmap takes the changed channels from the engine at a capped rate and
+    only redraws their cells.
+
+    Attributes
+    ----------
+    engine : ImpedanceEngine
+        Measures the impedances of the recorders
+    recorders : List[RecorderConfiguration]
+        The recorders that are checked
+    heatmap : ImpedanceHeatmap
+        Shows the impedance of every channel
+    update_timer : QTimer
+        Updates the heatmap at the capped update rate
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        """
+        Initialize the impedance sub page without recorders.
+
+        :param parent: Parent widget
+        :type parent: QWidget
+        """
+        super().__init__(page_type=SubPageTypeEnum.PageConnectionImpedance,
+                         parent=parent)
+        # Define attributes
+        self.engine = ImpedanceEngine()
+        self.recorders: List[RecorderConfiguration] = []
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(1000 // MAX_HEATMAP_UPDATE_RATE)
+
+        # Perform the setup functions
+        self.setup_local_ui_elements()
+        self.connect_widgets_to_actions()
+        self.connect_signals_to_actions()
+
+    def setup_local_ui_elements(self) -> None:
+        """
+        Add the heatmap, the summary and the start/stop button.
+        """
+        layout = QVBoxLayout(self)
+        self.heatmap = ImpedanceHeatmap(self)
+        layout.addWidget(self.heatmap)
+
+        layout_controls = QHBoxLayout()
+        self.lbl_summary = QLabel(self)
+        self.btn_start_stop = QPushButton(self.tr("Start impedance check"),
+                                          self)
+        self.btn_start_stop.setSizePolicy(QSizePolicy(
+            QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Maximum))
+        layout_controls.addWidget(self.lbl_summary)
+        layout_controls.addWidget(self.btn_start_stop)
+        layout.addLayout(layout_controls)
+
+    def connect_widgets_to_actions(self) -> None:
+        """
+        Connect the start/stop button to the check.
+        """
+        self.btn_start_stop.clicked.connect(self.toggle_check)
+
+    def connect_signals_to_actions(self) -> None:
+        """
+        Connect the update timer to the update of the heatmap.
+        """
+        self.update_timer.timeout.connect(self.update_heatmap)
+
+    def disconnect_signals_from_actions(self) -> None:
+        """
+        Disconnect the update timer from the update of the heatmap.
+        """
+        self.update_timer.timeout.disconnect(self.update_heatmap)
+
+    def set_recorders(self, recorders: List[RecorderConfiguration]) -> None:
+        """
+        Set the recorders that are checked, e.g. the paired recorders.
+
+        :param recorders: The recorders
+        :type recorders: List[RecorderConfiguration]
+        """
+        self.stop_check()
+        self.recorders = list(recorders)
+        self.heatmap.reset(
+            [recorder.serial_number for recorder in self.recorders],
+            [recorder.number_of_channels for recorder in self.recorders])
+        self.update_summary()
+
+    def start_check(self) -> None:
+        """
+        Start checking the impedances of all recorders at the same time.
+        """
+        if not self.recorders:
+            return
+        self.stop_check()
+        if self.engine.is_running():
+            self.lbl_summary.setText(self.tr(
+                "The previous check is still stopping, try again later"))
+            return
+        self.heatmap.reset(
+            [recorder.serial_number for recorder in self.recorders],
+            [recorder.number_of_channels for recorder in self.recorders])
+        self.engine.start(self.recorders)
+        self.update_timer.start()
+        self.btn_start_stop.setText(self.tr("Stop impedance check"))
+
+    def stop_check(self) -> None:
+        """
+        Stop the check, and show the last measurements.
+        """
+        self.update_timer.stop()
+        if self.engine.is_running():
+            self.engine.stop()
+        self.update_heatmap()
+        self.btn_start_stop.setText(self.tr("Start impedance check"))
+
+    def toggle_check(self) -> None:
+        """
+        Start the check if it is not running, and stop it otherwise.
+        """
+        if self.update_timer.isActive():
+            self.stop_check()
+        else:
+            self.start_check()
+
+    def update_heatmap(self) -> None:
+        """
+        Show the channels that changed since the last update.
+        """
+        impedance_update = self.engine.take_changes()
+        if len(impedance_update):
+            self.heatmap.apply_update(impedance_update)
+            self.update_summary()
+        # Stop updating when all recorders finished their check
+        if self.update_timer.isActive() and not self.engine.is_running():
+            self.stop_check()
+
+    def update_summary(self) -> None:
+        """
+        Show the number of channels per impedance level, and the recorders
+        whose check failed.
+        """
+        summary = self.engine.get_summary()
+        measured = sum(count for level, count in summary.items()
+                       if level != LEVEL_UNKNOWN)
+        total = sum(summary.values())
+        good = summary.get(0, 0)
+        text = self.tr(f"{measured} of {total} channels measured, "
+                       f"{good} good")
+        if self.engine.errors:
+            text += self.tr(f", failed: {', '.join(self.engine.errors)}")
+        self.lbl_summary.setText(text)
+
+    def load_page(self) -> None:
+        """
+        Performs the actions that are needed upon loading the page.
+
+        Emits sig_full_screen_mode_changed(False),
+        sig_topbar_update_requested(False, None, None) and
+        sig_visible_frame_update_requested(True), like the other connection
+        sub pages. Shows the recorders that are paired now.
+        """
+        self.sig_full_screen_mode_changed.emit(False)
+        self.sig_topbar_update_requested.emit(False, None, None)
+        self.sig_visible_frame_update_requested.emit(True)
+        recorders = acquisition_session.get_recorders()
+        if ([(recorder.serial_number, recorder.number_of_channels)
+             for recorder in recorders] !=
+                [(recorder.serial_number, recorder.number_of_channels)
+                 for recorder in self.recorders]):
+            self.set_recorders(recorders)
+
+    def leave_page(self) -> None:
+        """
+        Stop the check while the page is not shown, so the recorders leave
+        the impedance mode.
+        """
+        self.stop_check()
+
+    def on_controller_deleted(self) -> None:
+        """
+        This view does not have its own controller, so the function can just
+        pass.
+        """
+        pass
+
+    def close_widget(self) -> None:
+        """
+        Stop the check and disconnect all signals.
+        """
+        self.leave_page()
+        self.disconnect_signals_from_actions()
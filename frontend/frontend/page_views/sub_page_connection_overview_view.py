@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (
     QLabel, QSizePolicy, QHBoxLayout, QVBoxLayout, QSpacerItem)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from typing import Dict, List
 
 from application.Views.classes.connection_recorder_info_view import \
@@ -8,8 +8,14 @@ from application.Views.classes.connection_recorder_info_view import \
 from application.Views.designer._sub_page_connection_overviewUI import (
     Ui_sub_page_connection_overview)
 from application.Views.classes.base_page_view import BasePageView
-from application.Controllers.page_controllers import (
-    SubPageConnectionOverviewController)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_CONTROLLER, startup_profiler)
+from application.Views.classes.elements.recorder_status_panel import (
+    RecorderStatusPanel)
+from application.Views.classes.pipeline.acquisition_session import (
+    acquisition_session)
+from application.Views.classes.pipeline.recorder_status_feed import (
+    RecorderStatusFeed, recorder_status_feed)
 
 from application.Enums.sub_page_enums import SubPageTypeEnum
 from application.Constants.device_constants import (
@@ -25,6 +31,10 @@ UI_ORDER_ONE_BASE_STATION = [1, 3, 2, 4]
 UI_ORDER_TWO_BASE_STATIONS = [1, 2, 3, 4,
                               1, 2, 3, 4]
 
+# Maximum number of times per second the status of the recorders is updated.
+# The reports of all recorders in between are coalesced into one update.
+MAX_STATUS_UPDATE_RATE: int = 30
+
 
 class SubPageConnectionOverviewView(BasePageView,
                                     Ui_sub_page_connection_overview):
@@ -42,6 +52,14 @@ class SubPageConnectionOverviewView(BasePageView,
         Number of connected base stations.
     recorder_info_ui_elements : Dict[str, ConnectionRecorderInfoView]
         Stores UI elements (i.e. recorder info widgets) for each recorder.
+    recorder_status_panels : Dict[str, RecorderStatusPanel]
+        Shows the battery, signal, packet loss and sync status of each
+        recorder, below its recorder info widget.
+    status_feed : RecorderStatusFeed
+        Collects the status reports of the recorders.
+    status_timer : QTimer
+        Takes the changed status of all recorders from the status feed at
+        the capped update rate.
     """
 
     def __init__(self, parent=None) -> None:
@@ -56,8 +74,14 @@ class SubPageConnectionOverviewView(BasePageView,
         # Set up the UI
         self.setupUi(self)
 
-        # Initialize the controller
-        self.controller = SubPageConnectionOverviewController(parent=self)
+        # Initialize the controller. It is imported on first use, so
+        # importing the page does not import the controllers of pages that
+        # are not shown yet
+        from application.Controllers.page_controllers import (
+            SubPageConnectionOverviewController)
+        with startup_profiler.profile_phase(
+                "SubPageConnectionOverviewController", CATEGORY_CONTROLLER):
+            self.controller = SubPageConnectionOverviewController(parent=self)
 
         # Retrieve the overview_devices_dict_extended from the controller.
         # This dictionary maps base station serial numbers to paired recorders.
@@ -65,6 +89,9 @@ class SubPageConnectionOverviewView(BasePageView,
             str, List[Dict[str, object]]] = (
             self.controller.get_overview_devices_dict_extended()
         )
+        # The acquisition and the impedance check use the paired recorders
+        acquisition_session.set_overview_devices_source(
+            self.controller.get_overview_devices_dict_extended)
 
         # Get the number of base stations that are connected
         self.num_base_stations: int = len(self.overview_devices_dict_extended)
@@ -79,7 +106,15 @@ class SubPageConnectionOverviewView(BasePageView,
         self.recorder_info_ui_elements: Dict[str,
                                              ConnectionRecorderInfoView] = {}
 
+        # The status of the recorders is shown at a capped rate, however
+        # often and from however many recorders it is reported
+        self.recorder_status_panels: Dict[str, RecorderStatusPanel] = {}
+        self.status_feed: RecorderStatusFeed = recorder_status_feed
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(1000 // MAX_STATUS_UPDATE_RATE)
+
         self.setup_local_ui_elements()
+        self.connect_signals_to_actions()
 
     def load_page(self):
         """Performs the actions that are needed upon loading the page.
@@ -96,6 +131,28 @@ class SubPageConnectionOverviewView(BasePageView,
         self.sig_topbar_update_requested.emit(False, None, None)
         self.sig_visible_frame_update_requested.emit(True)
 
+        # Show the complete status once, then only the changes
+        self.status_feed.mark_all_changed()
+        self.update_recorder_status()
+        self.status_timer.start()
+
+    def leave_page(self) -> None:
+        """
+        Stop updating the status of the recorders while the page is not
+        shown.
+        """
+        self.status_timer.stop()
+
+    def update_recorder_status(self) -> None:
+        """
+        Show the status fields that changed since the last update, for all
+        recorders at once.
+        """
+        for serial_number, fields in self.status_feed.take_changes().items():
+            status_panel = self.recorder_status_panels.get(serial_number)
+            if status_panel is not None:
+                status_panel.update_status(fields)
+
     def setup_local_ui_elements(self) -> None:
         """
         Set up the UI elements for the connection overview subpage.
@@ -185,7 +242,8 @@ class SubPageConnectionOverviewView(BasePageView,
                 # Add the recorder info widget to the appropriate column
                 self._add_recorder_widget_to_column(
                     idx_recorder, recorder_info_widget,
-                    total_number_of_recorders)
+                    total_number_of_recorders,
+                    self.recorder_status_panels[serial_number_recorder])
 
     def setup_ui_recorder_info(self, recorder_name: str, serial_number: str,
                                is_paired: bool) -> ConnectionRecorderInfoView:
@@ -215,6 +273,12 @@ class SubPageConnectionOverviewView(BasePageView,
         # Store the recorder info widget for later access
         self.recorder_info_ui_elements[serial_number] = recorder_info_widget
 
+        # Create the status panel of the recorder, and show the status that
+        # was already reported with the next update
+        self.recorder_status_panels[serial_number] = RecorderStatusPanel(
+            parent=self)
+        self.status_feed.mark_all_changed(serial_number)
+
         return recorder_info_widget
 
     def connect_signals_to_actions(self) -> None:
@@ -223,7 +287,7 @@ class SubPageConnectionOverviewView(BasePageView,
         """
         # TODO - self.controller.sig_overview_devices_dict_updated.connect(
         #       self.update_overview_devices_dict)
-        pass
+        self.status_timer.timeout.connect(self.update_recorder_status)
 
     def update_overview_devices_dict(self) -> None:
         """
@@ -368,6 +432,13 @@ class SubPageConnectionOverviewView(BasePageView,
             # Schedule the widget for deletion from the UI
             recorder_info_widget.deleteLater()
 
+            # Remove the status panel and the status of the recorder
+            status_panel = self.recorder_status_panels.pop(serial, None)
+            if status_panel is not None:
+                parent_layout.removeWidget(status_panel)
+                status_panel.deleteLater()
+            self.status_feed.remove_recorder(serial)
+
     def _collect_all_recorders(self) -> List[Dict[str, object]]:
         """
         Collect recorder info dictionaries for all base stations.
@@ -421,7 +492,8 @@ class SubPageConnectionOverviewView(BasePageView,
     def _add_recorder_widget_to_column(
         self, idx_recorder: int,
         recorder_info_widget: ConnectionRecorderInfoView,
-        total_number_of_recorders: int
+        total_number_of_recorders: int,
+        status_panel: RecorderStatusPanel = None
     ) -> None:
         """
         Add the recorder widget to the left or right column and add spacers
@@ -436,6 +508,9 @@ class SubPageConnectionOverviewView(BasePageView,
                                          or 8 if two base stations are
                                          connected.
         :type total_number_of_recorders: int
+        :param status_panel: Status panel of the recorder, added below the
+                             recorder info widget
+        :type status_panel: RecorderStatusPanel
         """
         # Calculate half of the total number of recorders
         half: int = total_number_of_recorders // 2
@@ -444,6 +519,8 @@ class SubPageConnectionOverviewView(BasePageView,
         if idx_recorder < half:
             self.layout_recorder_ui_dynamic_left.addWidget(
                 recorder_info_widget)
+            if status_panel is not None:
+                self.layout_recorder_ui_dynamic_left.addWidget(status_panel)
             # Add spacer below widget unless it's the last in the column
             if idx_recorder < half - 1:
                 spacer: QSpacerItem = QSpacerItem(
@@ -454,6 +531,8 @@ class SubPageConnectionOverviewView(BasePageView,
             # Place the second half of the recorder in the right column
             self.layout_recorder_ui_dynamic_right.addWidget(
                 recorder_info_widget)
+            if status_panel is not None:
+                self.layout_recorder_ui_dynamic_right.addWidget(status_panel)
             # Add spacer below widget unless it's the last in the column
             if idx_recorder < total_number_of_recorders - 1:
                 spacer: QSpacerItem = QSpacerItem(
@@ -476,10 +555,12 @@ class SubPageConnectionOverviewView(BasePageView,
         """
         # TODO - self.controller.sig_overview_devices_dict_updated.disconnect(
         #       self.update_overview_devices_dict)
-        pass
+        self.status_timer.timeout.disconnect(self.update_recorder_status)
 
     def close_widget(self) -> None:
         """
         Clean up resources when widget is closed.
         """
+        self.leave_page()
         self.disconnect_signals_from_actions()
+        acquisition_session.set_overview_devices_source(None)
@@ -1,18 +1,20 @@
 from PySide6.QtCore import QSize
 
-from application.Controllers.page_controllers. \
-    sub_page_connection_recorder_controller import (
-        SubPageConnectionRecorderController)
 from application.Views.classes.connection_recorders_pairing_status_view \
     import ConnectionRecordersPairingStatusView
 from application.Views.designer._sub_page_connection_recorderUI import (
     Ui_sub_page_connection_recorder
 )
-from application.Views.designer._discovered_recorderUI import (
-    Ui_discovered_recorder
-)
 
 from application.Views.classes.base_page_view import BasePageView
+from application.Views.classes.diagnostics.leak_detector import (
+    leak_checkpoint)
+from application.Views.classes.diagnostics.signal_tracer import (
+    connect_traced, disconnect_traced)
+from application.Views.classes.diagnostics.startup_profiler import (
+    CATEGORY_CONTROLLER, startup_profiler)
+from application.Views.classes.elements.cached_shadow import (
+    BUTTON_SHADOW, FRAME_SHADOW, add_cached_shadow, get_style_class_shadow)
 from application.Enums.sub_page_enums import SubPageTypeEnum
 
 # UI Constants
@@ -58,8 +60,15 @@ class SubPageConnectionRecorderView(BasePageView,
         # Set up the UI from the designer file
         self.setupUi(self)
 
-        # Instantiate the controller
-        self.controller = SubPageConnectionRecorderController()
+        # Instantiate the controller. It is imported on first use, so
+        # importing the page does not import the controllers of pages that
+        # are not shown yet
+        from application.Controllers.page_controllers. \
+            sub_page_connection_recorder_controller import (
+                SubPageConnectionRecorderController)
+        with startup_profiler.profile_phase(
+                "SubPageConnectionRecorderController", CATEGORY_CONTROLLER):
+            self.controller = SubPageConnectionRecorderController()
         # Store widgets for each base station
         self.recorder_pairing_status_widgets = {}
 
@@ -93,11 +102,15 @@ class SubPageConnectionRecorderView(BasePageView,
         """
         Apply styling to the frames in the UI.
         """
-        # Add shadow to the discovered recorder frame
+        # Add shadow to the discovered recorder frame. The cached shadow is
+        # painted beneath the frame instead of a graphics effect, which
+        # renders the frame offscreen and blurs it on every repaint.
         self.style_class.add_property_to_widget(
             self.frame_visible_discovered_recorders, "type", "visible-frame")
-        self.style_class.add_shadow_frame(
-            self, self.frame_visible_discovered_recorders)
+        add_cached_shadow(self.frame_visible_discovered_recorders,
+                          get_style_class_shadow(
+                              self.style_class.add_shadow_frame,
+                              FRAME_SHADOW))
 
     def _setup_button_styling(self) -> None:
         """
@@ -114,9 +127,11 @@ class SubPageConnectionRecorderView(BasePageView,
         self.btn_revert_changes.setIconSize(QSize(BUTTON_ICON_SIZE_REVERT,
                                                   BUTTON_ICON_SIZE_REVERT))
 
-        # Add shadows to action buttons
-        self.style_class.add_shadow_pushbutton(self, self.btn_save)
-        self.style_class.add_shadow_pushbutton(self, self.btn_revert_changes)
+        # Add cached shadows to action buttons
+        button_shadow = get_style_class_shadow(
+            self.style_class.add_shadow_pushbutton, BUTTON_SHADOW)
+        add_cached_shadow(self.btn_save, button_shadow)
+        add_cached_shadow(self.btn_revert_changes, button_shadow)
 
     def _setup_font_styling(self) -> None:
         """
@@ -176,16 +191,16 @@ class SubPageConnectionRecorderView(BasePageView,
         """
         # Connect the signals from the controller to the view when a BS is
         # connected or disconnected while the workflow is already selected
-        self.controller.sig_base_station_connected.connect(
-            self.on_base_station_connected)
-        self.controller.sig_base_station_disconnected.connect(
-            self.on_base_station_disconnected)
+        connect_traced(self.controller.sig_base_station_connected,
+                       self.on_base_station_connected)
+        connect_traced(self.controller.sig_base_station_disconnected,
+                       self.on_base_station_disconnected)
 
         # Connect the signals related to newly discovered recorder
-        self.controller.sig_new_recorders_discovered.connect(
-            self.on_new_recorder_discovered)
-        self.controller.sig_recorder_moved_to_base_station.connect(
-            self.add_selected_recorder_to_pairing_status_widget)
+        connect_traced(self.controller.sig_new_recorders_discovered,
+                       self.on_new_recorder_discovered)
+        connect_traced(self.controller.sig_recorder_moved_to_base_station,
+                       self.add_selected_recorder_to_pairing_status_widget)
 
     def connect_recorder_pairing_status_widget_signals(
         self,
@@ -235,6 +250,7 @@ class SubPageConnectionRecorderView(BasePageView,
             base_station_serial_number=base_station_serial_number,
             paired_recorders_list=paired_recorders_list
         )
+        leak_checkpoint("base station connected")
 
     def on_base_station_disconnected(self,
                                      base_station_serial_number: str) -> None:
@@ -245,23 +261,23 @@ class SubPageConnectionRecorderView(BasePageView,
                                            base station
         :type base_station_serial_number: str
         """
-        # TODO - Remove the UI element for the disconnected base station
-        # if base_station_serial_number in (
-        # self.recorder_pairing_status_widgets):
-        #     # Get the widget for this base station
-        #     recorder_pairing_status_widget = (
-        #       self.recorder_pairing_status_widgets[
-        #       base_station_serial_number])
-        #     # Disconnect signals for this widget
-        #     # self.disconnect_recorder_pairing_status_widget_signals(
-        #           recorder_pairing_status_widget)
-        #     # Remove from layout
-        #     # recorder_pairing_status_widget.setParent(None)
-        #     # Delete the widget
-        #     # recorder_pairing_status_widget.deleteLater()
-        #     # Remove from dictionary
-        #     # del self.recorder_pairing_status_widgets[
-        # base_station_serial_number]
+        if base_station_serial_number not in (
+                self.recorder_pairing_status_widgets):
+            return
+        # Get the widget for this base station, and remove it from the
+        # dictionary
+        recorder_pairing_status_widget = (
+            self.recorder_pairing_status_widgets.pop(
+                base_station_serial_number))
+        # Disconnect signals for this widget
+        self.disconnect_recorder_pairing_status_widget_signals(
+            recorder_pairing_status_widget)
+        # Remove from layout and delete the widget
+        self.layout_base_station_dynamic.removeWidget(
+            recorder_pairing_status_widget)
+        recorder_pairing_status_widget.setParent(None)
+        recorder_pairing_status_widget.deleteLater()
+        leak_checkpoint("base station disconnected")
 
     def notify_controller_to_reorder_selected_recorder(
             self, base_station_serial_number: str, recorder_serial_number: str,
@@ -350,16 +366,16 @@ class SubPageConnectionRecorderView(BasePageView,
         """
         # Disconnect the signals from the controller to the view when a BS is
         # connected or disconnected while the workflow is already selected
-        self.controller.sig_base_station_connected.disconnect(
-            self.on_base_station_connected)
-        self.controller.sig_base_station_disconnected.disconnect(
-            self.on_base_station_disconnected)
+        disconnect_traced(self.controller.sig_base_station_connected,
+                          self.on_base_station_connected)
+        disconnect_traced(self.controller.sig_base_station_disconnected,
+                          self.on_base_station_disconnected)
 
         # Disconnect the signals related to newly discovered recorder
-        self.controller.sig_new_recorders_discovered.disconnect(
-            self.on_new_recorder_discovered)
-        self.controller.sig_recorder_moved_to_base_station.disconnect(
-            self.add_selected_recorder_to_pairing_status_widget)
+        disconnect_traced(self.controller.sig_new_recorders_discovered,
+                          self.on_new_recorder_discovered)
+        disconnect_traced(self.controller.sig_recorder_moved_to_base_station,
+                          self.add_selected_recorder_to_pairing_status_widget)
 
     def disconnect_recorder_pairing_status_widget_signals(
         self,
@@ -484,7 +500,10 @@ class SubPageConnectionRecorderView(BasePageView,
         :param recorder_serial_number: Serial number of the discovered recorder
         :type recorder_serial_number: str
         """
-        # Instantiate the Ui_discovered_recorder from the designer file
+        # Instantiate the Ui_discovered_recorder from the designer file. The
+        # form is only imported once a recorder is discovered.
+        from application.Views.designer._discovered_recorderUI import (
+            Ui_discovered_recorder)
         discovered_recorder_widget = Ui_discovered_recorder()
         # Add the recorder serial number to the label
         (
@@ -509,7 +528,8 @@ class SubPageConnectionRecorderView(BasePageView,
         self._connect_discovered_recorder_buttons(discovered_recorder_widget)
 
     def _connect_discovered_recorder_buttons(
-            self, discovered_recorder_widget: Ui_discovered_recorder) -> None:
+            self, discovered_recorder_widget: "Ui_discovered_recorder"
+    ) -> None:
         """
         Connect the buttons of a discovered recorder widget to its actions.
 
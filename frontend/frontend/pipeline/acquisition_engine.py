@@ -0,0 +1,778 @@
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional
+
+from application.Views.classes.pipeline.filter_bank import (
+    FilterBank, FilterSettings)
+from application.Views.classes.pipeline.recorder_stream_merger import (
+    RecorderStreamMerger)
+from application.Views.classes.pipeline.sample_ring_buffer import (
+    RingBufferReader, SampleRingBuffer)
+from application.Views.classes.pipeline.stream_outlet import (
+    OUTLET_STATE_FAILED, OutletSettings, OutletStatistics, StreamOutlet)
+from application.Views.classes.storage.batch_converter import (
+    FILE_FORMAT_CODECS)
+from application.Views.classes.storage.envelope_pyramid import (
+    EnvelopePyramidWriter)
+from application.Views.classes.storage.event_index import (
+    EventIndexWriter, find_trigger_channels)
+from application.Views.classes.storage.integrity_manifest import (
+    IntegrityManifestWriter)
+
+# Number of seconds of samples the shared ring buffer to the GUI holds
+DEFAULT_BUFFER_SECONDS: float = 10.0
+# Time in seconds the worker sleeps when no device delivered samples
+WORKER_IDLE_SLEEP: float = 0.001
+# Time in seconds to wait for the worker to stop before it is terminated
+STOP_TIMEOUT: float = 5.0
+
+# Commands sent from the GUI to the worker over the control channel
+COMMAND_SET_FILTER: str = "set_filter"
+COMMAND_START_RECORDING: str = "start_recording"
+COMMAND_STOP_RECORDING: str = "stop_recording"
+COMMAND_ADD_EVENT: str = "add_event"
+COMMAND_SET_STREAM_OUTLET: str = "set_stream_outlet"
+COMMAND_STOP: str = "stop"
+# Events sent from the worker to the GUI over the control channel. A
+# stopped recording is reported with its path and its number of samples.
+EVENT_RECORDING_STARTED: str = "recording_started"
+EVENT_RECORDING_STOPPED: str = "recording_stopped"
+EVENT_ERROR: str = "error"
+EVENT_STOPPED: str = "stopped"
+
+# The engine of the running session, shared by the pages that show, save or
+# stream its samples
+_active_engine: Optional["AcquisitionEngine"] = None
+# Functions called with the engine when an engine starts
+_engine_start_listeners: List[Callable[["AcquisitionEngine"], None]] = []
+
+
+class RecorderConfiguration:
+    """
+    A recorder whose samples the acquisition engine acquires.
+
+    The device source is given as an import path, "module:ClassName", so the
+    worker process can create it after being spawned. It is constructed with
+    the serial number and provides
+      read() -> (samples, device_time) or None when no samples are ready,
+      close().
+
+    Attributes
+    ----------
+    serial_number : str
+        Serial number of the recorder
+    device_source : str
+        Import path of the class that reads the samples of the device
+    number_of_channels : int
+        Number of channels of the recorder
+    sample_rate : float
+        Nominal sample rate of the recorder in Hz
+    """
+
+    def __init__(self, serial_number: str, device_source: str,
+                 number_of_channels: int, sample_rate: float) -> None:
+        self.serial_number = serial_number
+        self.device_source = device_source
+        self.number_of_channels = number_of_channels
+        self.sample_rate = sample_rate
+
+
+class AcquisitionEngine:
+    """
+    Runs the device I/O, the merging of the recorder streams, the filters
+    and the file writer in a separate worker process, so the GUI can not
+    cause sample loss: a blocking dialog or a slow repaint only delays the
+    display.
+
+    The worker writes the merged samples into a ring buffer in shared
+    memory, which the GUI reads with readers from create_reader. Commands
+    and events are small messages over a pipe (the control channel). The
+    engine has no Qt dependency; the controllers act as proxies that
+    forward the user actions as commands and poll the events with a timer.
+
+    The worker only sends events when something happens. The progress, see
+    get_status, is read from the shared memory of the ring buffer, so the
+    worker never has to wait until the GUI reads the control channel.
+
+    Attributes
+    ----------
+    sample_rate : float
+        Sample rate of the merged samples in Hz
+    recorders : List[RecorderConfiguration]
+        The recorders of the running session
+    ring_buffer : SampleRingBuffer
+        Shared memory the worker writes the merged samples into
+    process : multiprocessing.Process
+        The worker process
+    recording_path : str
+        Path of the running recording as reported by the worker, None if
+        none is running
+    outlet_statistics : OutletStatistics
+        Shared memory the worker reports the statistics of the stream
+        outlet in
+    """
+
+    def __init__(self, sample_rate: float,
+                 buffer_seconds: float = DEFAULT_BUFFER_SECONDS) -> None:
+        """
+        Initialize an engine that is not running.
+
+        :param sample_rate: Sample rate of the merged samples in Hz
+        :type sample_rate: float
+        :param buffer_seconds: Seconds of samples in the shared ring buffer
+        :type buffer_seconds: float
+        """
+        self.sample_rate = sample_rate
+        self.buffer_seconds = buffer_seconds
+        self.recorders: List[RecorderConfiguration] = []
+        self.ring_buffer: SampleRingBuffer = None
+        self.process: multiprocessing.Process = None
+        self.connection: Connection = None
+        self.recording_path: Optional[str] = None
+        self.outlet_statistics: OutletStatistics = None
+        # Events that arrived while the engine was stopped, returned by the
+        # next poll_events
+        self._pending_events: List[tuple] = []
+        # Whether poll_events returned that the worker stopped, so it is
+        # returned once per run
+        self._is_stop_reported = False
+
+    def start(self, recorders: List[RecorderConfiguration]) -> None:
+        """
+        Start acquiring the samples of the recorders in a worker process.
+
+        :param recorders: The recorders of the session
+        :type recorders: List[RecorderConfiguration]
+        :raises RuntimeError: if the engine is already running
+        """
+        if self.is_running():
+            raise RuntimeError("The acquisition engine is already running")
+        self.recorders = list(recorders)
+        self.recording_path = None
+        self._is_stop_reported = False
+        number_of_channels = sum(recorder.number_of_channels
+                                 for recorder in self.recorders)
+        self.ring_buffer = SampleRingBuffer(
+            capacity=int(self.buffer_seconds * self.sample_rate),
+            number_of_channels=number_of_channels, shared=True)
+        self.outlet_statistics = OutletStatistics()
+
+        # Spawn rather than fork, so the worker does not inherit the state
+        # of the Qt application
+        context = multiprocessing.get_context("spawn")
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(
+            target=run_acquisition_worker,
+            args=(worker_connection, self.ring_buffer.get_name(),
+                  self.outlet_statistics.get_name(),
+                  self.sample_rate, self.recorders,
+                  dict(FILE_FORMAT_CODECS)),
+            name="acquisition-engine", daemon=True)
+        self.process.start()
+        worker_connection.close()
+        _set_active_engine(self)
+
+    def is_running(self) -> bool:
+        """
+        :return: Whether the worker process is running
+        :rtype: bool
+        """
+        return self.process is not None and self.process.is_alive()
+
+    def create_reader(self, on_overrun=None) -> Optional[RingBufferReader]:
+        """
+        Create a reader of the merged samples, e.g. for the live plot.
+
+        :param on_overrun: Called with the number of lost samples when the
+                           reader fell behind
+        :type on_overrun: Callable[[int], None], optional
+        :return: The reader, or None if the engine was not started
+        :rtype: RingBufferReader or None
+        """
+        if self.ring_buffer is None:
+            return None
+        return self.ring_buffer.create_reader(on_overrun=on_overrun)
+
+    def set_recorder_filter(self, serial_number: str,
+                            filter_settings: Optional[FilterSettings]
+                            ) -> None:
+        """
+        Set the filters applied to the samples of a recorder.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param filter_settings: The filters, or None to not filter
+        :type filter_settings: FilterSettings or None
+        """
+        self._send_command(COMMAND_SET_FILTER, serial_number,
+                           filter_settings)
+
+    def start_recording(self, recording_path: str,
+                        channel_names: List[str],
+                        write_integrity_manifest: bool = False) -> None:
+        """
+        Start writing the merged samples to a file. The writer is the
+        registered writer of the file format of the path.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :param channel_names: Names of all channels
+        :type channel_names: List[str]
+        :param write_integrity_manifest: Whether to write an integrity
+                                         manifest next to the recording.
+                                         Unless the writer reports its
+                                         bytes, the manifest is completed
+                                         shortly after the recording
+                                         stopped.
+        :type write_integrity_manifest: bool
+        """
+        self._send_command(COMMAND_START_RECORDING, recording_path,
+                           channel_names, write_integrity_manifest)
+
+    def stop_recording(self) -> None:
+        """
+        Stop writing the merged samples to the file.
+        """
+        self._send_command(COMMAND_STOP_RECORDING)
+
+    def add_event(self, code: int, duration: int = 0) -> None:
+        """
+        Add an annotation to the event index of the recording, at the
+        current end of the recording.
+
+        :param code: Code of the annotation
+        :type code: int
+        :param duration: Duration of the annotation in samples
+        :type duration: int
+        """
+        self._send_command(COMMAND_ADD_EVENT, code, duration)
+
+    def set_stream_outlet(self, settings: Optional[OutletSettings]) -> None:
+        """
+        Publish the filtered samples to other applications on this machine,
+        or stop publishing them. A running outlet is replaced.
+
+        :param settings: The configuration of the outlet, None to stop it
+        :type settings: OutletSettings or None
+        """
+        self._send_command(COMMAND_SET_STREAM_OUTLET, settings)
+
+    def get_stream_outlet_statistics(self) -> Optional[Dict[str, object]]:
+        """
+        Get the state and statistics of the stream outlet, read from the
+        shared memory.
+
+        :return: The statistics as returned by
+                 OutletStatistics.get_statistics, None if the engine was not
+                 started
+        :rtype: Dict[str, object] or None
+        """
+        if self.outlet_statistics is None:
+            return None
+        return self.outlet_statistics.get_statistics()
+
+    def get_status(self) -> Dict[str, object]:
+        """
+        Get the progress of the worker. The number of samples is read from
+        the shared memory, so it is up to date even if the events were not
+        polled for a while.
+
+        :return: The number of samples written, the path of the running
+                 recording and the process id of the worker, empty if the
+                 engine was not started
+        :rtype: Dict[str, object]
+        """
+        if self.ring_buffer is None:
+            return {}
+        return {"samples_written": self.ring_buffer.get_write_index(),
+                "recording_path": self.recording_path,
+                "process_id": (None if self.process is None
+                               else self.process.pid)}
+
+    def poll_events(self) -> List[tuple]:
+        """
+        Get the events the worker sent since the last call, without
+        blocking. The path of the running recording is kept in
+        recording_path.
+
+        :return: Events as (event, arguments...) tuples
+        :rtype: List[tuple]
+        """
+        events, self._pending_events = self._pending_events, []
+        if self.connection is None:
+            return events
+        try:
+            while self.connection.poll():
+                event = self.connection.recv()
+                if event[0] == EVENT_RECORDING_STARTED:
+                    self.recording_path = event[1]
+                elif event[0] == EVENT_RECORDING_STOPPED:
+                    self.recording_path = None
+                elif event[0] == EVENT_STOPPED:
+                    self._is_stop_reported = True
+                events.append(event)
+        except (EOFError, OSError):
+            # The worker ended without reporting it, e.g. after a crash
+            if not self._is_stop_reported:
+                self._is_stop_reported = True
+                events.append((EVENT_STOPPED,))
+        return events
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Stop the worker, which closes the devices and the recording, and
+        release the shared memory.
+
+        :param timeout: Seconds to wait before the worker is terminated
+        :type timeout: float
+        """
+        if self.process is not None:
+            self._send_command(COMMAND_STOP)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                print("Warning: the acquisition engine did not stop in "
+                      "time and is terminated")
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+            # Keep the last events, e.g. that the recording was saved
+            self._pending_events = self.poll_events()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self.ring_buffer is not None:
+            self.ring_buffer.close(unlink=True)
+            self.ring_buffer = None
+        if self.outlet_statistics is not None:
+            self.outlet_statistics.close(unlink=True)
+            self.outlet_statistics = None
+        global _active_engine
+        if _active_engine is self:
+            _active_engine = None
+
+    def get_channel_names(self) -> List[str]:
+        """
+        :return: Names of all merged channels, "SERIAL-CHANNEL" in the order
+                 of the recorders
+        :rtype: List[str]
+        """
+        return _get_channel_names(self.recorders)
+
+    def _send_command(self, command: str, *arguments) -> None:
+        """
+        Send a command to the worker over the control channel.
+
+        :param command: The command
+        :type command: str
+        """
+        if not self.is_running():
+            print(f"Warning: the acquisition engine is not running, "
+                  f"{command} is ignored")
+            return
+        self.connection.send((command,) + arguments)
+
+
+def get_active_engine() -> Optional[AcquisitionEngine]:
+    """
+    :return: The engine of the running session, None if no engine runs
+    :rtype: AcquisitionEngine or None
+    """
+    if _active_engine is not None and not _active_engine.is_running():
+        return None
+    return _active_engine
+
+
+def add_engine_start_listener(
+        listener: Callable[[AcquisitionEngine], None]) -> None:
+    """
+    Call a function with the engine every time an engine starts, e.g. to
+    start saving when the acquisition starts.
+
+    :param listener: The function to call
+    :type listener: Callable[[AcquisitionEngine], None]
+    """
+    if listener not in _engine_start_listeners:
+        _engine_start_listeners.append(listener)
+
+
+def remove_engine_start_listener(
+        listener: Callable[[AcquisitionEngine], None]) -> None:
+    """
+    Stop calling a function when an engine starts.
+
+    :param listener: The function added with add_engine_start_listener
+    :type listener: Callable[[AcquisitionEngine], None]
+    """
+    if listener in _engine_start_listeners:
+        _engine_start_listeners.remove(listener)
+
+
+def _set_active_engine(engine: AcquisitionEngine) -> None:
+    """
+    Make the engine that started the active engine, and inform the
+    listeners.
+
+    :param engine: The engine that started
+    :type engine: AcquisitionEngine
+    """
+    global _active_engine
+    _active_engine = engine
+    for listener in list(_engine_start_listeners):
+        listener(engine)
+
+
+def _get_channel_names(recorders: List[RecorderConfiguration]) -> List[str]:
+    """
+    :param recorders: The recorders of the session
+    :type recorders: List[RecorderConfiguration]
+    :return: Names of all merged channels, "SERIAL-CHANNEL" in the order of
+             the recorders
+    :rtype: List[str]
+    """
+    return [f"{recorder.serial_number}-{channel + 1}"
+            for recorder in recorders
+            for channel in range(recorder.number_of_channels)]
+
+
+def run_acquisition_worker(connection: Connection, ring_buffer_name: str,
+                           outlet_statistics_name: str, sample_rate: float,
+                           recorders: List[RecorderConfiguration],
+                           codecs: Dict[str, Dict[str, str]]) -> None:
+    """
+    Main loop of the worker process: read the devices, merge and filter
+    their samples, and pass them to the shared ring buffer and the writer.
+    Commands are handled between the reads, without blocking.
+
+    :param connection: The worker end of the control channel
+    :type connection: Connection
+    :param ring_buffer_name: Name of the shared memory of the ring buffer
+    :type ring_buffer_name: str
+    :param outlet_statistics_name: Name of the shared memory of the
+                                   statistics of the stream outlet
+    :type outlet_statistics_name: str
+    :param sample_rate: Sample rate of the merged samples in Hz
+    :type sample_rate: float
+    :param recorders: The recorders of the session
+    :type recorders: List[RecorderConfiguration]
+    :param codecs: The registered file format codecs
+    :type codecs: Dict[str, Dict[str, str]]
+    """
+    ring_buffer = SampleRingBuffer.attach(ring_buffer_name)
+    outlet_statistics = OutletStatistics(outlet_statistics_name)
+    merger = RecorderStreamMerger(sample_rate)
+    filter_bank = FilterBank(sample_rate)
+    merger.add_sink(filter_bank)
+    filter_bank.add_sink(ring_buffer)
+    devices = {}
+    recording: Optional[_RecordingSinks] = None
+    # Closed recordings whose integrity manifest is still being computed
+    finishing_recordings: List[_RecordingSinks] = []
+    stream_outlet: Optional[StreamOutlet] = None
+    try:
+        for recorder in recorders:
+            module_name, class_name = recorder.device_source.split(":")
+            device_class = getattr(importlib.import_module(module_name),
+                                   class_name)
+            devices[recorder.serial_number] = device_class(
+                recorder.serial_number)
+            merger.add_recorder(recorder.serial_number,
+                                recorder.number_of_channels,
+                                recorder.sample_rate)
+        filter_bank.set_channel_ranges(merger.get_channel_ranges())
+
+        is_running = True
+        while is_running:
+            # Handle the commands that arrived, without blocking
+            while connection.poll():
+                command, *arguments = connection.recv()
+                if command == COMMAND_STOP:
+                    is_running = False
+                elif command == COMMAND_SET_FILTER:
+                    try:
+                        filter_bank.set_recorder_filter(*arguments)
+                    except ValueError as error:
+                        connection.send((EVENT_ERROR, str(error)))
+                elif command == COMMAND_START_RECORDING:
+                    if recording is not None:
+                        _close_recording(recording, connection,
+                                         finishing_recordings)
+                        recording = None
+                    try:
+                        recording = _RecordingSinks(
+                            merger, filter_bank, codecs, sample_rate,
+                            *arguments)
+                    except (ValueError, OSError) as error:
+                        connection.send((EVENT_ERROR, str(error)))
+                        continue
+                    connection.send((EVENT_RECORDING_STARTED,
+                                     recording.recording_path))
+                elif (command == COMMAND_STOP_RECORDING and
+                      recording is not None):
+                    _close_recording(recording, connection,
+                                     finishing_recordings)
+                    recording = None
+                elif command == COMMAND_ADD_EVENT and recording is not None:
+                    code, duration = arguments
+                    recording.event_index_writer.add_event(
+                        code, duration=duration)
+                elif command == COMMAND_SET_STREAM_OUTLET:
+                    if stream_outlet is not None:
+                        filter_bank.remove_sink(stream_outlet)
+                        stream_outlet.close()
+                        stream_outlet = None
+                    outlet_statistics.publish(None)
+                    settings, = arguments
+                    if settings is None:
+                        continue
+                    try:
+                        # The outlet publishes the samples as they are saved
+                        stream_outlet = StreamOutlet(
+                            settings, _get_channel_names(recorders),
+                            sample_rate)
+                    except (ImportError, OSError, ValueError) as error:
+                        outlet_statistics.publish(None, OUTLET_STATE_FAILED)
+                        connection.send((EVENT_ERROR, f"The stream outlet "
+                                         f"could not be started: {error}"))
+                        continue
+                    filter_bank.add_sink(stream_outlet)
+
+            # Read all devices; the merger emits the blocks to the filters,
+            # the ring buffer and the writer
+            received_samples = False
+            for serial_number, device in devices.items():
+                result = device.read()
+                if result is not None:
+                    samples, device_time = result
+                    merger.push_samples(serial_number, samples, device_time)
+                    received_samples = True
+            if not received_samples:
+                merger.process()
+                time.sleep(WORKER_IDLE_SLEEP)
+            if stream_outlet is not None:
+                outlet_statistics.publish(stream_outlet)
+            if finishing_recordings:
+                _report_finished_recordings(finishing_recordings,
+                                            connection)
+    except Exception as error:
+        connection.send((EVENT_ERROR, f"{type(error).__name__}: {error}"))
+    finally:
+        if recording is not None:
+            _close_recording(recording, connection, finishing_recordings)
+        # The manifests are complete before the worker ends
+        _report_finished_recordings(finishing_recordings, connection,
+                                    wait=True)
+        if stream_outlet is not None:
+            stream_outlet.close()
+        outlet_statistics.publish(None)
+        outlet_statistics.close()
+        for device in devices.values():
+            device.close()
+        ring_buffer.close()
+        connection.send((EVENT_STOPPED,))
+        connection.close()
+
+
+def _close_recording(recording: "_RecordingSinks", connection: Connection,
+                     finishing_recordings: List["_RecordingSinks"]) -> None:
+    """
+    Close the writers of a recording and report that it stopped. A
+    recording whose integrity manifest is still being computed is added to
+    the finishing recordings.
+
+    :param recording: The recording to close
+    :type recording: _RecordingSinks
+    :param connection: The worker end of the control channel
+    :type connection: Connection
+    :param finishing_recordings: The recordings whose manifest is being
+                                 computed
+    :type finishing_recordings: List[_RecordingSinks]
+    """
+    try:
+        recording.close()
+    except OSError as error:
+        # The samples are saved, only a sidecar file is missing
+        connection.send((EVENT_ERROR, str(error)))
+    connection.send((EVENT_RECORDING_STOPPED, recording.recording_path,
+                     recording.event_index_writer.number_of_samples))
+    if recording.manifest_thread is not None:
+        finishing_recordings.append(recording)
+
+
+def _report_finished_recordings(finishing_recordings: List["_RecordingSinks"],
+                                connection: Connection,
+                                wait: bool = False) -> None:
+    """
+    Report the errors of the integrity manifests that were computed, and
+    forget their recordings.
+
+    :param finishing_recordings: The recordings whose manifest is being
+                                 computed
+    :type finishing_recordings: List[_RecordingSinks]
+    :param connection: The worker end of the control channel
+    :type connection: Connection
+    :param wait: Wait until all manifests are computed
+    :type wait: bool
+    """
+    for recording in list(finishing_recordings):
+        if wait:
+            recording.manifest_thread.join()
+        elif recording.manifest_thread.is_alive():
+            continue
+        finishing_recordings.remove(recording)
+        if recording.manifest_error is not None:
+            connection.send((EVENT_ERROR, str(recording.manifest_error)))
+
+
+class _RecordingSinks:
+    """
+    The sinks of the worker pipeline that save a recording: the file
+    writer and the envelope pyramid get the filtered samples, as they are
+    saved, and the event index gets the unfiltered samples, so the filters
+    do not change the trigger codes.
+
+    Writers that can report the bytes they write provide
+    set_integrity_manifest_writer(manifest_writer); they pass their bytes to
+    the integrity manifest while recording. For other writers the manifest
+    is computed from the file once it is closed, in a thread of its own, so
+    the devices are read meanwhile.
+
+    Attributes
+    ----------
+    recording_path : str
+        Path of the recording
+    writer : object
+        The registered writer of the file format of the recording
+    envelope_pyramid_writer : EnvelopePyramidWriter
+        Builds the preview sidecar of the recording
+    event_index_writer : EventIndexWriter
+        Builds the event index sidecar of the recording
+    integrity_manifest_writer : IntegrityManifestWriter
+        Builds the integrity manifest of the recording, None if no manifest
+        is written
+    manifest_thread : threading.Thread
+        Computes the manifest of a closed recording from its file, None if
+        the manifest is complete
+    manifest_error : OSError
+        Error of the manifest thread, None if the manifest was written
+    """
+
+    def __init__(self, merger: RecorderStreamMerger,
+                 filter_bank: FilterBank,
+                 codecs: Dict[str, Dict[str, str]], sample_rate: float,
+                 recording_path: str, channel_names: List[str],
+                 write_integrity_manifest: bool = False) -> None:
+        """
+        Create the writers and add them to the pipeline.
+
+        :param merger: The merger of the recorder streams
+        :type merger: RecorderStreamMerger
+        :param filter_bank: The filters after the merger
+        :type filter_bank: FilterBank
+        :param codecs: The registered file format codecs
+        :type codecs: Dict[str, Dict[str, str]]
+        :param sample_rate: Sample rate in Hz
+        :type sample_rate: float
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :param channel_names: Names of all channels
+        :type channel_names: List[str]
+        :param write_integrity_manifest: Whether to write an integrity
+                                         manifest next to the recording
+        :type write_integrity_manifest: bool
+        :raises ValueError: if no writer is registered for the format
+        :raises OSError: if the recording can not be created
+        """
+        self.merger = merger
+        self.filter_bank = filter_bank
+        self.recording_path = recording_path
+        self.writer = _create_writer(codecs, recording_path, channel_names,
+                                     sample_rate)
+        try:
+            self.envelope_pyramid_writer = EnvelopePyramidWriter(
+                recording_path, len(channel_names), sample_rate)
+            self.event_index_writer = EventIndexWriter(
+                recording_path, sample_rate,
+                find_trigger_channels(channel_names))
+        except OSError:
+            self.writer.close()
+            raise
+        self.integrity_manifest_writer: Optional[IntegrityManifestWriter] = \
+            None
+        self._is_manifest_fed_by_writer = False
+        self.manifest_thread: Optional[threading.Thread] = None
+        self.manifest_error: Optional[OSError] = None
+        if write_integrity_manifest:
+            self.integrity_manifest_writer = IntegrityManifestWriter(
+                recording_path)
+            if hasattr(self.writer, "set_integrity_manifest_writer"):
+                self.writer.set_integrity_manifest_writer(
+                    self.integrity_manifest_writer)
+                self._is_manifest_fed_by_writer = True
+        filter_bank.add_sink(self.writer)
+        filter_bank.add_sink(self.envelope_pyramid_writer)
+        merger.add_sink(self.event_index_writer)
+
+    def close(self) -> None:
+        """
+        Remove the writers from the pipeline and close them. The integrity
+        manifest is written last, once the recording is complete; if the
+        writer did not report its bytes, manifest_thread computes it from
+        the file.
+
+        :raises OSError: if the integrity manifest can not be written
+        """
+        self.filter_bank.remove_sink(self.writer)
+        self.filter_bank.remove_sink(self.envelope_pyramid_writer)
+        self.merger.remove_sink(self.event_index_writer)
+        self.writer.close()
+        self.envelope_pyramid_writer.close()
+        self.event_index_writer.close()
+        if self.integrity_manifest_writer is None:
+            return
+        if self._is_manifest_fed_by_writer:
+            self.integrity_manifest_writer.close()
+        else:
+            self.manifest_thread = threading.Thread(
+                target=self._hash_recording, name="integrity-manifest")
+            self.manifest_thread.start()
+
+    def _hash_recording(self) -> None:
+        """
+        Compute the integrity manifest from the closed recording. Runs in
+        manifest_thread; hashing and reading release the GIL, so the
+        acquisition loop keeps running.
+        """
+        try:
+            self.integrity_manifest_writer.hash_recording()
+            self.integrity_manifest_writer.close()
+        except OSError as error:
+            self.manifest_error = error
+
+
+def _create_writer(codecs: Dict[str, Dict[str, str]], recording_path: str,
+                   channel_names: List[str], sample_rate: float):
+    """
+    Create the registered writer of the file format of a recording.
+
+    :param codecs: The registered file format codecs
+    :type codecs: Dict[str, Dict[str, str]]
+    :param recording_path: Path of the recording
+    :type recording_path: str
+    :param channel_names: Names of all channels
+    :type channel_names: List[str]
+    :param sample_rate: Sample rate in Hz
+    :type sample_rate: float
+    :raises ValueError: if no writer is registered for the format
+    :return: The writer
+    """
+    file_format = os.path.splitext(recording_path)[1].lower().lstrip(".")
+    if file_format not in codecs:
+        raise ValueError(f"No writer is registered for the "
+                         f".{file_format} format")
+    module_name, class_name = codecs[file_format]["writer"].split(":")
+    writer_class = getattr(importlib.import_module(module_name), class_name)
+    return writer_class(recording_path, channel_names, sample_rate)
@@ -0,0 +1,209 @@
+from typing import Callable, Dict, List, Optional
+
+from application.Views.classes.pipeline.acquisition_engine import (
+    AcquisitionEngine, RecorderConfiguration, get_active_engine)
+from application.Views.classes.pipeline.filter_bank import FilterSettings
+from application.Views.classes.storage.disk_preflight import (
+    DEFAULT_CHANNELS_PER_RECORDER, DEFAULT_SAMPLE_RATE)
+
+# Names of the acquisition settings in the settings store. The device
+# source is the import path, "module:ClassName", of the class that reads
+# the samples of a recorder, see RecorderConfiguration.
+SETTING_DEVICE_SOURCE: str = "device_source"
+SETTING_CHANNELS_PER_RECORDER: str = "channels_per_recorder"
+SETTING_SAMPLE_RATE: str = "sample_rate"
+# Maps the serial number of every filtered recorder to its filter settings,
+# see FilterSettings.to_dict
+SETTING_RECORDER_FILTERS: str = "recorder_filters"
+
+
+class AcquisitionSession:
+    """
+    The recorders the acquisition engine of the application is started
+    with.
+
+    The connection overview provides which recorders are paired, the file
+    management page applies the acquisition settings of the active profile,
+    and the acquisition page starts the engine with the paired recorders.
+    The impedance check measures the same recorders. The filters of the
+    recorders are sent to the running engine and to every engine that is
+    started.
+
+    Attributes
+    ----------
+    overview_devices_source : Callable[[], Dict[str, List[Dict[str, object]]]]
+        Returns the recorders of every base station and whether they are
+        paired, None if the connections are not known
+    device_source : str
+        Import path of the class that reads the samples of a recorder, None
+        if none is configured
+    channels_per_recorder : int
+        Number of channels of every recorder
+    sample_rate : float
+        Sample rate of the recorders in Hz
+    recorder_filters : Dict[str, FilterSettings]
+        Filters of the recorders that are filtered, by serial number
+    """
+
+    def __init__(self) -> None:
+        self.overview_devices_source: Optional[
+            Callable[[], Dict[str, List[Dict[str, object]]]]] = None
+        self.device_source: Optional[str] = None
+        self.channels_per_recorder = DEFAULT_CHANNELS_PER_RECORDER
+        self.sample_rate = float(DEFAULT_SAMPLE_RATE)
+        self.recorder_filters: Dict[str, FilterSettings] = {}
+
+    def set_overview_devices_source(
+            self,
+            overview_devices_source: Optional[
+                Callable[[], Dict[str, List[Dict[str, object]]]]]
+    ) -> None:
+        """
+        Set the function that returns the connected recorders, e.g.
+        get_overview_devices_dict_extended of the connection overview
+        controller. It is called every time the recorders are needed, so
+        recorders that are paired later are included.
+
+        :param overview_devices_source: Returns a dictionary that maps the
+                                        serial numbers of the base stations
+                                        to the information of their
+                                        recorders, None to remove it
+        :type overview_devices_source: Callable[[], Dict[str, List[Dict[str,
+                                       object]]]]
+        """
+        self.overview_devices_source = overview_devices_source
+
+    def get_paired_serial_numbers(self) -> List[str]:
+        """
+        :return: Serial numbers of the recorders that are paired to a base
+                 station, in the order of the devices
+        :rtype: List[str]
+        """
+        if self.overview_devices_source is None:
+            return []
+        return [recorder_info['serial_number_recorder']
+                for recorders_info in self.overview_devices_source().values()
+                for recorder_info in recorders_info
+                if recorder_info.get('is_paired')]
+
+    def apply_settings(self, settings: Dict[str, object]) -> None:
+        """
+        Apply the acquisition settings of a profile. Settings that are not
+        set keep their default.
+
+        :param settings: The settings, keyed by the SETTING_ names
+        :type settings: Dict[str, object]
+        """
+        self.device_source = settings.get(SETTING_DEVICE_SOURCE) or None
+        self.channels_per_recorder = int(settings.get(
+            SETTING_CHANNELS_PER_RECORDER, DEFAULT_CHANNELS_PER_RECORDER))
+        self.sample_rate = float(settings.get(SETTING_SAMPLE_RATE,
+                                              DEFAULT_SAMPLE_RATE))
+        # The filters of the previous profile are removed from the running
+        # engine, the filters of this profile are set
+        previous_serial_numbers = set(self.recorder_filters)
+        self.recorder_filters = {}
+        for serial_number, filter_settings in settings.get(
+                SETTING_RECORDER_FILTERS, {}).items():
+            try:
+                self.set_recorder_filter(
+                    serial_number, FilterSettings.from_dict(filter_settings))
+            except (AttributeError, TypeError, ValueError) as error:
+                print(f"Warning: the saved filters of recorder "
+                      f"{serial_number} are skipped: {error}")
+        engine = get_active_engine()
+        if engine is not None:
+            for serial_number in (previous_serial_numbers -
+                                  set(self.recorder_filters)):
+                engine.set_recorder_filter(serial_number, None)
+
+    def set_recorder_filter(self, serial_number: str,
+                            filter_settings: Optional[FilterSettings]
+                            ) -> None:
+        """
+        Set the filters of a recorder, in the running engine and in every
+        engine that is started later.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param filter_settings: The filters, or None to not filter
+        :type filter_settings: FilterSettings or None
+        :raises ValueError: if a frequency is not below the Nyquist
+                            frequency of the sample rate
+        """
+        if filter_settings is not None and not filter_settings.is_enabled():
+            filter_settings = None
+        if filter_settings is None:
+            self.recorder_filters.pop(serial_number, None)
+        else:
+            # Design the filter here, so invalid settings are reported to
+            # the caller instead of by the engine process
+            filter_settings.design(self.sample_rate)
+            self.recorder_filters[serial_number] = filter_settings
+        engine = get_active_engine()
+        if engine is not None:
+            engine.set_recorder_filter(serial_number, filter_settings)
+
+    def get_recorder_filter_settings(self) -> Dict[str, Dict[str, object]]:
+        """
+        :return: The filters of the recorders, as they are saved in the
+                 SETTING_RECORDER_FILTERS setting
+        :rtype: Dict[str, Dict[str, object]]
+        """
+        return {serial_number: filter_settings.to_dict()
+                for serial_number, filter_settings
+                in self.recorder_filters.items()}
+
+    def get_recorders(self) -> List[RecorderConfiguration]:
+        """
+        :return: The paired recorders, or an empty list if no device source
+                 is configured
+        :rtype: List[RecorderConfiguration]
+        """
+        if self.device_source is None:
+            return []
+        return [RecorderConfiguration(serial_number, self.device_source,
+                                      self.channels_per_recorder,
+                                      self.sample_rate)
+                for serial_number in self.get_paired_serial_numbers()]
+
+    def start(self) -> Optional[AcquisitionEngine]:
+        """
+        Start acquiring the samples of the paired recorders, unless an
+        engine is already running. The listeners added with
+        add_engine_start_listener are called with the new engine.
+
+        :return: The running engine, None if no recorder can be acquired
+        :rtype: AcquisitionEngine or None
+        """
+        engine = get_active_engine()
+        if engine is not None:
+            return engine
+        recorders = self.get_recorders()
+        if not recorders:
+            if self.device_source is None:
+                print("Warning: no device source is configured, the "
+                      "acquisition is not started")
+            else:
+                print("Warning: no recorder is paired, the acquisition is "
+                      "not started")
+            return None
+        engine = AcquisitionEngine(self.sample_rate)
+        engine.start(recorders)
+        for serial_number, filter_settings in self.recorder_filters.items():
+            engine.set_recorder_filter(serial_number, filter_settings)
+        return engine
+
+    def stop(self) -> None:
+        """
+        Stop the running engine, which closes the recorders and the
+        recording.
+        """
+        engine = get_active_engine()
+        if engine is not None:
+            engine.stop()
+
+
+# The session of the application, shared by the connection, file management
+# and acquisition pages
+acquisition_session = AcquisitionSession()
@@ -0,0 +1,58 @@
+from typing import List
+
+import numpy as np
+
+
+class BlockSource:
+    """
+    Base class for the stages of the sample pipeline that produce blocks of
+    samples.
+
+    Every block is a NumPy array of shape (samples, channels) and is passed
+    to all connected sinks in the order they were added. A sink is any
+    object with a write_block(block) method, such as the file writer, the
+    sidecar writers of the storage folder or another pipeline stage. Sinks
+    must not keep a reference to the block after write_block returns, as
+    sources may reuse its memory for the next block.
+
+    Attributes
+    ----------
+    sinks : list
+        The sinks the blocks are passed to
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the source without sinks.
+        """
+        self.sinks: List[object] = []
+
+    def add_sink(self, sink) -> None:
+        """
+        Pass the blocks of this source to a sink as well.
+
+        :param sink: Object with a write_block(block) method
+        :type sink: object
+        """
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def remove_sink(self, sink) -> None:
+        """
+        Stop passing the blocks of this source to a sink.
+
+        :param sink: A sink that was added before
+        :type sink: object
+        """
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def emit_block(self, block: np.ndarray) -> None:
+        """
+        Pass a block to all sinks.
+
+        :param block: Block of shape (samples, channels)
+        :type block: np.ndarray
+        """
+        for sink in self.sinks:
+            sink.write_block(block)
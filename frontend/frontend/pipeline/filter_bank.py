@@ -0,0 +1,338 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.Views.classes.pipeline.block_pipeline import BlockSource
+
+# Order of the Butterworth high-pass and low-pass filters
+DEFAULT_FILTER_ORDER: int = 4
+# Quality factor of the notch filter; higher is narrower
+DEFAULT_NOTCH_QUALITY: float = 30.0
+
+
+class FilterSettings:
+    """
+    The filters that are applied to the channels of one recorder.
+
+    Attributes
+    ----------
+    highpass_frequency : float or None
+        Cut-off frequency of the high-pass filter in Hz
+    lowpass_frequency : float or None
+        Cut-off frequency of the low-pass filter in Hz
+    notch_frequency : float or None
+        Frequency removed by the notch filter in Hz, e.g. the mains
+        frequency
+    notch_quality : float
+        Quality factor of the notch filter
+    order : int
+        Order of the high-pass and low-pass filters
+    """
+
+    def __init__(self, highpass_frequency: Optional[float] = None,
+                 lowpass_frequency: Optional[float] = None,
+                 notch_frequency: Optional[float] = None,
+                 notch_quality: float = DEFAULT_NOTCH_QUALITY,
+                 order: int = DEFAULT_FILTER_ORDER) -> None:
+        self.highpass_frequency = highpass_frequency
+        self.lowpass_frequency = lowpass_frequency
+        self.notch_frequency = notch_frequency
+        self.notch_quality = notch_quality
+        self.order = order
+
+    def get_key(self) -> tuple:
+        """
+        :return: Key that is equal for settings that give the same filter
+        :rtype: tuple
+        """
+        return (self.highpass_frequency, self.lowpass_frequency,
+                self.notch_frequency, self.notch_quality, self.order)
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        :return: The settings, as they are saved in a settings profile
+        :rtype: Dict[str, object]
+        """
+        return {"highpass_frequency": self.highpass_frequency,
+                "lowpass_frequency": self.lowpass_frequency,
+                "notch_frequency": self.notch_frequency,
+                "notch_quality": self.notch_quality,
+                "order": self.order}
+
+    @classmethod
+    def from_dict(cls, settings: Dict[str, object]) -> "FilterSettings":
+        """
+        :param settings: The settings as returned by to_dict; settings that
+                         are missing keep their default
+        :type settings: Dict[str, object]
+        :return: The filter settings
+        :rtype: FilterSettings
+        """
+        return cls(highpass_frequency=settings.get("highpass_frequency"),
+                   lowpass_frequency=settings.get("lowpass_frequency"),
+                   notch_frequency=settings.get("notch_frequency"),
+                   notch_quality=settings.get("notch_quality",
+                                              DEFAULT_NOTCH_QUALITY),
+                   order=settings.get("order", DEFAULT_FILTER_ORDER))
+
+    def is_enabled(self) -> bool:
+        """
+        :return: Whether any filter is enabled
+        :rtype: bool
+        """
+        return bool(self.highpass_frequency or self.lowpass_frequency or
+                    self.notch_frequency)
+
+    def design(self, sample_rate: float) -> Optional[np.ndarray]:
+        """
+        Design the filter as second-order sections.
+
+        :param sample_rate: Sample rate in Hz
+        :type sample_rate: float
+        :return: Second-order sections of shape (sections, 6), or None if
+                 no filter is enabled
+        :rtype: np.ndarray or None
+        :raises ValueError: if a frequency is not below the Nyquist
+                            frequency
+        """
+        # SciPy takes most of the import time of the sample pipeline, so it
+        # is imported once filters are actually used
+        from scipy import signal
+        sections: List[np.ndarray] = []
+        if self.highpass_frequency and self.lowpass_frequency:
+            sections.append(signal.butter(
+                self.order, [self.highpass_frequency, self.lowpass_frequency],
+                btype="bandpass", fs=sample_rate, output="sos"))
+        elif self.highpass_frequency:
+            sections.append(signal.butter(
+                self.order, self.highpass_frequency, btype="highpass",
+                fs=sample_rate, output="sos"))
+        elif self.lowpass_frequency:
+            sections.append(signal.butter(
+                self.order, self.lowpass_frequency, btype="lowpass",
+                fs=sample_rate, output="sos"))
+        if self.notch_frequency:
+            numerator, denominator = signal.iirnotch(
+                self.notch_frequency, self.notch_quality, fs=sample_rate)
+            sections.append(signal.tf2sos(numerator, denominator))
+        if not sections:
+            return None
+        return np.concatenate(sections)
+
+
+class _FilterGroup:
+    """
+    The channels of all recorders that use the same filter, filtered
+    together in one call.
+
+    Attributes
+    ----------
+    sos : np.ndarray
+        Second-order sections of the filter
+    channel_list : tuple
+        The channels of the group
+    channels : slice or np.ndarray
+        The channels of the group; a slice if they are contiguous
+    state : np.ndarray
+        Filter state of shape (sections, 2, channels)
+    needs_initialization : np.ndarray
+        Channels whose state has to be initialized with the next sample
+    sosfilt : Callable
+        scipy.signal.sosfilt, kept so SciPy is only imported when a filter
+        is used
+    """
+
+    def __init__(self, sos: np.ndarray, channels: List[int]) -> None:
+        from scipy import signal
+        self.sos = sos
+        self.channel_list = tuple(channels)
+        if channels == list(range(channels[0], channels[-1] + 1)):
+            self.channels = slice(channels[0], channels[-1] + 1)
+        else:
+            self.channels = np.array(channels)
+        self.state = np.zeros((sos.shape[0], 2, len(channels)))
+        self.needs_initialization = np.ones(len(channels), dtype=bool)
+        # Steady-state response of the filter to a step of 1
+        self._step_state = signal.sosfilt_zi(sos)[:, :, np.newaxis]
+        self.sosfilt = signal.sosfilt
+
+
+class FilterBank(BlockSource):
+    """
+    Stage of the sample pipeline that filters all channels of every block
+    with the filter configured for their recorder.
+
+    The channels of all recorders with the same filter are filtered with a
+    single vectorized call that keeps the filter state between blocks, so
+    there is no Python loop over channels or samples. The output block is
+    reused for every block of the same shape. The state of a channel starts
+    at the steady state of its first sample, so the DC offset of the
+    electrodes does not give a start-up transient, and is restarted after
+    a dropout (NaN samples).
+
+    The filter bank can be a sink of the merger (filtering the samples
+    before they are saved and displayed) or be used with process by a
+    single reader, such as the live plot.
+
+    Attributes
+    ----------
+    sample_rate : float
+        Sample rate of the blocks in Hz
+    channel_ranges : Dict[str, Tuple[int, int]]
+        Maps the serial number of every recorder to the first and the last
+        (exclusive) channel of its samples
+    filter_settings : Dict[str, FilterSettings]
+        Maps the serial number of a recorder to its filters
+    """
+
+    def __init__(self, sample_rate: float) -> None:
+        """
+        Initialize a filter bank that does not filter any channel yet.
+
+        :param sample_rate: Sample rate of the blocks in Hz
+        :type sample_rate: float
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.channel_ranges: Dict[str, Tuple[int, int]] = {}
+        self.filter_settings: Dict[str, FilterSettings] = {}
+        self._groups: List[_FilterGroup] = []
+        self._output_block: Optional[np.ndarray] = None
+
+    def set_channel_ranges(self, channel_ranges: Dict[str, Tuple[int, int]]
+                           ) -> None:
+        """
+        Set the channels of every recorder in the blocks, e.g. from
+        RecorderStreamMerger.get_channel_ranges.
+
+        :param channel_ranges: Maps the serial number of every recorder to
+                               its first and last (exclusive) channel
+        :type channel_ranges: Dict[str, Tuple[int, int]]
+        """
+        self.channel_ranges = dict(channel_ranges)
+        self._build_groups()
+
+    def set_recorder_filter(self, serial_number: str,
+                            filter_settings: Optional[FilterSettings]
+                            ) -> None:
+        """
+        Set the filters of the channels of a recorder. The filter state of
+        the groups of channels that did not change is kept.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param filter_settings: The filters, or None to not filter
+        :type filter_settings: FilterSettings or None
+        :raises ValueError: if a frequency is not below the Nyquist
+                            frequency
+        """
+        if filter_settings is None:
+            self.filter_settings.pop(serial_number, None)
+        else:
+            # Design the filter first, so invalid settings are not stored
+            filter_settings.design(self.sample_rate)
+            self.filter_settings[serial_number] = filter_settings
+        self._build_groups()
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Filter a block. The returned block is reused for the next block, so
+        it has to be consumed before process is called again.
+
+        :param block: Block of shape (samples, channels)
+        :type block: np.ndarray
+        :return: The filtered block
+        :rtype: np.ndarray
+        """
+        if (self._output_block is None or
+                self._output_block.shape != block.shape):
+            self._output_block = np.empty(block.shape, dtype=np.float32)
+        output_block = self._output_block
+        # Channels without a filter are passed on unchanged
+        np.copyto(output_block, block)
+        if block.shape[0] == 0:
+            return output_block
+
+        for group in self._groups:
+            samples = block[:, group.channels]
+            self._initialize_state(group, samples[0])
+            filtered, group.state = group.sosfilt(
+                group.sos, samples, axis=0, zi=group.state)
+            output_block[:, group.channels] = filtered
+            # Restart the filter of channels that dropped out, as the NaN
+            # samples spread through their state
+            group.needs_initialization |= ~np.isfinite(
+                group.state).all(axis=(0, 1))
+        return output_block
+
+    def reset_state(self) -> None:
+        """
+        Restart the filters of all channels, e.g. before samples that do
+        not continue the previous block are processed. The state starts
+        again at the steady state of the next sample.
+        """
+        for group in self._groups:
+            group.needs_initialization[:] = True
+
+    def write_block(self, block: np.ndarray) -> None:
+        """
+        Filter a block and pass it on to the sinks.
+
+        :param block: Block of shape (samples, channels)
+        :type block: np.ndarray
+        """
+        self.emit_block(self.process(block))
+
+    def close(self) -> None:
+        """
+        Close the sinks of the filter bank.
+        """
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+    def _initialize_state(self, group: _FilterGroup,
+                          first_sample: np.ndarray) -> None:
+        """
+        Set the state of the channels that start (again) to the steady
+        state of their first sample.
+
+        :param group: The filter group
+        :type group: _FilterGroup
+        :param first_sample: First sample of the block for the channels of
+                             the group
+        :type first_sample: np.ndarray
+        """
+        if not group.needs_initialization.any():
+            return
+        channels = group.needs_initialization & np.isfinite(first_sample)
+        group.state[:, :, channels] = (group._step_state *
+                                       first_sample[channels])
+        group.needs_initialization &= ~channels
+
+    def _build_groups(self) -> None:
+        """
+        Group the channels of all recorders by their filter. The state of
+        a group whose filter and channels did not change is kept.
+        """
+        channels_per_filter: Dict[tuple, List[int]] = {}
+        settings_per_filter: Dict[tuple, FilterSettings] = {}
+        for serial_number, filter_settings in self.filter_settings.items():
+            if serial_number not in self.channel_ranges:
+                continue
+            key = filter_settings.get_key()
+            first_channel, last_channel = self.channel_ranges[serial_number]
+            channels_per_filter.setdefault(key, []).extend(
+                range(first_channel, last_channel))
+            settings_per_filter[key] = filter_settings
+
+        previous_groups = {(group.sos.tobytes(), group.channel_list): group
+                           for group in self._groups}
+        self._groups = []
+        for key, channels in channels_per_filter.items():
+            sos = settings_per_filter[key].design(self.sample_rate)
+            if sos is None or not channels:
+                continue
+            group = _FilterGroup(sos, sorted(channels))
+            self._groups.append(previous_groups.get(
+                (sos.tobytes(), group.channel_list), group))
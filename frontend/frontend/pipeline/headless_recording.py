@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import signal
+import sys
+import time
+from typing import List, Optional
+
+from application.Views.classes.pipeline.acquisition_engine import (
+    AcquisitionEngine, RecorderConfiguration, EVENT_ERROR,
+    EVENT_RECORDING_STARTED, EVENT_RECORDING_STOPPED, EVENT_STOPPED)
+from application.Views.classes.storage.batch_converter import (
+    register_file_format)
+from application.Views.classes.storage.disk_preflight import (
+    DiskPreflight, RecordingConfiguration, format_duration)
+from application.Views.classes.storage.filename_template import (
+    FilenameAllocator, FilenameTemplate, FilenameTemplateError)
+
+# Filename template used when none is given
+DEFAULT_FILENAME_TEMPLATE: str = "{subject}_{date}_{time}_{seq:03d}"
+# Interval in seconds at which the progress is printed
+PROGRESS_INTERVAL: float = 5.0
+# Interval in seconds at which the events of the engine are polled
+EVENT_POLL_INTERVAL: float = 0.1
+
+
+def parse_recorder(argument: str) -> tuple:
+    """
+    Parse a recorder of the pairing plan, "SERIAL:CHANNELS".
+
+    :param argument: The command line argument
+    :type argument: str
+    :raises argparse.ArgumentTypeError: if the argument is invalid
+    :return: The serial number and the number of channels
+    :rtype: tuple
+    """
+    try:
+        serial_number, number_of_channels = argument.rsplit(":", 1)
+        return serial_number, int(number_of_channels)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid recorder {argument}, expected SERIAL:CHANNELS")
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    :return: Parser of the command line arguments of the headless recorder
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        description="Record from the paired recorders without the "
+                    "graphical user interface.")
+    parser.add_argument("--recorder", action="append", required=True,
+                        type=parse_recorder, metavar="SERIAL:CHANNELS",
+                        help="A recorder of the pairing plan; repeat for "
+                             "every recorder")
+    parser.add_argument("--device-source", required=True,
+                        metavar="MODULE:CLASS",
+                        help="Import path of the class that reads the "
+                             "samples of a recorder")
+    parser.add_argument("--sample-rate", type=float, required=True,
+                        help="Sample rate in Hz")
+    parser.add_argument("--folder", required=True,
+                        help="Folder the recording is saved in")
+    parser.add_argument("--filename", default=DEFAULT_FILENAME_TEMPLATE,
+                        help="Filename template with the fields {subject}, "
+                             "{date}, {time} and {seq}")
+    parser.add_argument("--format", required=True, dest="file_format",
+                        help="Extension of the file format, e.g. poly5")
+    parser.add_argument("--subject", default="",
+                        help="Subject of the recording")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Seconds to record; records until interrupted "
+                             "if not given")
+    parser.add_argument("--codec", action="append", default=[],
+                        metavar="EXTENSION=READER,WRITER",
+                        help="Register a file format, e.g. "
+                             "poly5=module:Reader,module:Writer")
+    parser.add_argument("--integrity-manifest", action="store_true",
+                        help="Write an integrity manifest next to the "
+                             "recording")
+    parser.add_argument("--skip-preflight", action="store_true",
+                        help="Record even if the storage is insufficient")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point of the headless recorder. It uses the same
+    filename templates, storage preflight and acquisition engine as the
+    file management page, but never imports Qt.
+
+    :param argv: Command line arguments, defaults to sys.argv
+    :type argv: List[str], optional
+    :return: Exit code, 1 if the recording failed
+    :rtype: int
+    """
+    parser = create_argument_parser()
+    arguments = parser.parse_args(argv)
+    for codec in arguments.codec:
+        try:
+            extension, classes = codec.split("=")
+            reader, writer = classes.split(",")
+        except ValueError:
+            parser.error(f"Invalid codec {codec}")
+        register_file_format(extension, reader, writer)
+    try:
+        template = FilenameTemplate(arguments.filename)
+    except FilenameTemplateError as error:
+        parser.error(str(error))
+
+    # Check the storage folder against the paired recorders
+    channels_per_recorder = max(number_of_channels for _, number_of_channels
+                                in arguments.recorder)
+    preflight = DiskPreflight().run(arguments.folder, RecordingConfiguration(
+        number_of_recorders=len(arguments.recorder),
+        channels_per_recorder=channels_per_recorder,
+        sample_rate=int(arguments.sample_rate)))
+    for warning in preflight.warnings:
+        print(f"Warning: {warning}")
+    if preflight.max_recording_duration != float("inf"):
+        print("Storage is sufficient for "
+              f"{format_duration(preflight.max_recording_duration)}")
+    if not preflight.is_sufficient() and not arguments.skip_preflight:
+        print("The storage is not sufficient, use --skip-preflight to "
+              "record anyway")
+        return 1
+
+    recording_path = FilenameAllocator(arguments.folder).allocate(
+        template=template, extension=arguments.file_format.lower(),
+        subject=arguments.subject)
+    recorders = [RecorderConfiguration(serial_number, arguments.device_source,
+                                       number_of_channels,
+                                       arguments.sample_rate)
+                 for serial_number, number_of_channels in arguments.recorder]
+    return asyncio.run(record(recorders, arguments.sample_rate,
+                              recording_path, arguments.duration,
+                              arguments.integrity_manifest))
+
+
+async def record(recorders: List[RecorderConfiguration],
+                 sample_rate: float, recording_path: str,
+                 duration: Optional[float] = None,
+                 write_integrity_manifest: bool = False) -> int:
+    """
+    Record until the duration passed or the process is interrupted.
+
+    :param recorders: The recorders of the pairing plan
+    :type recorders: List[RecorderConfiguration]
+    :param sample_rate: Sample rate in Hz
+    :type sample_rate: float
+    :param recording_path: Path of the recording
+    :type recording_path: str
+    :param duration: Seconds to record, None to record until interrupted
+    :type duration: float, optional
+    :param write_integrity_manifest: Whether to write an integrity manifest
+                                     next to the recording
+    :type write_integrity_manifest: bool
+    :return: Exit code, 1 if the recording failed
+    :rtype: int
+    """
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop_requested.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows has no signal handlers in the event loop, there
+            # Ctrl+C raises KeyboardInterrupt
+            pass
+
+    engine = AcquisitionEngine(sample_rate)
+    engine.start(recorders)
+    engine.start_recording(recording_path, engine.get_channel_names(),
+                           write_integrity_manifest)
+    exit_code = 0
+    start_time = time.monotonic()
+    next_progress_time = start_time + PROGRESS_INTERVAL
+    try:
+        while not stop_requested.is_set():
+            now = time.monotonic()
+            if duration is not None and now - start_time >= duration:
+                break
+            for event in engine.poll_events():
+                if event[0] == EVENT_RECORDING_STARTED:
+                    print(f"Recording to {event[1]}")
+                elif event[0] == EVENT_ERROR:
+                    print(f"Error: {event[1]}")
+                    exit_code = 1
+                    stop_requested.set()
+                elif event[0] == EVENT_STOPPED:
+                    stop_requested.set()
+            if now >= next_progress_time:
+                next_progress_time += PROGRESS_INTERVAL
+                samples_written = engine.get_status().get(
+                    "samples_written", 0)
+                print(f"{now - start_time:.0f} s recorded, "
+                      f"{samples_written} samples")
+            try:
+                await asyncio.wait_for(stop_requested.wait(),
+                                       EVENT_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if engine.is_running():
+            engine.stop_recording()
+        engine.stop()
+        for event in engine.poll_events():
+            if event[0] == EVENT_RECORDING_STOPPED:
+                print(f"Saved {event[1]}")
+            elif event[0] == EVENT_ERROR:
+                print(f"Error: {event[1]}")
+                exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
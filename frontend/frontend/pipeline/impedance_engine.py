@@ -0,0 +1,305 @@
+import importlib
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from application.Views.classes.pipeline.acquisition_engine import (
+    RecorderConfiguration)
+
+# Upper limits in kOhm of the impedance levels. An impedance below the first
+# limit is good, above the last limit the electrode is not connected.
+DEFAULT_LEVEL_LIMITS: List[float] = [10.0, 50.0, 200.0]
+# Level of a channel that was not measured yet
+LEVEL_UNKNOWN: int = -1
+# Weight of a new measurement of a channel in its shown impedance; lower
+# values average out more noise, 1 shows every measurement as it is
+DEFAULT_SMOOTHING: float = 0.5
+# A measured impedance that differs less than this fraction from the shown
+# impedance does not change the heatmap
+CHANGE_TOLERANCE: float = 0.02
+# Time in seconds a worker sleeps when its recorder had no measurement ready
+POLL_INTERVAL: float = 0.01
+# Time in seconds after which the check of a recorder that did not measure
+# all its channels is given up
+DEFAULT_MEASUREMENT_TIMEOUT: float = 30.0
+# Time in seconds to wait for the recorders to leave the impedance mode
+# when the check is stopped
+STOP_TIMEOUT: float = 5.0
+
+
+class ImpedanceUpdate:
+    """
+    The channels whose impedance changed since the previous update.
+
+    Attributes
+    ----------
+    rows : np.ndarray
+        Index of the recorder of every changed channel
+    channels : np.ndarray
+        Index of every changed channel within its recorder
+    values : np.ndarray
+        Impedance in kOhm of every changed channel
+    levels : np.ndarray
+        Impedance level of every changed channel, LEVEL_UNKNOWN if it was
+        not measured
+    """
+
+    def __init__(self, rows: np.ndarray, channels: np.ndarray,
+                 values: np.ndarray, levels: np.ndarray) -> None:
+        self.rows = rows
+        self.channels = channels
+        self.values = values
+        self.levels = levels
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class ImpedanceEngine:
+    """
+    Checks the electrode impedances of all channels of several recorders at
+    the same time.
+
+    Every recorder is measured by its own worker thread, so checking many
+    recorders takes as long as checking the slowest one. The workers write
+    the measurements into one (recorders, channels) matrix, in which the
+    smoothing and the classification into levels are done with NumPy for
+    all channels at once. The view takes the changed channels with
+    take_changes at its own frame rate, so it only redraws what changed.
+
+    The device source of a recorder (see RecorderConfiguration) provides
+      start_impedance(), stop_impedance(),
+      read_impedance() -> impedance in kOhm per channel, NaN for the
+      channels without new measurement, or None when no measurement is
+      ready,
+      close().
+
+    Attributes
+    ----------
+    level_limits : np.ndarray
+        Upper limits in kOhm of the impedance levels
+    smoothing : float
+        Weight of a new measurement in the shown impedance
+    timeout : float
+        Time in seconds after which the check of a recorder is given up
+    continuous : bool
+        Whether the recorders are measured until stop, instead of until all
+        their channels were measured once
+    recorders : List[RecorderConfiguration]
+        The recorders that are checked
+    values : np.ndarray
+        Impedance in kOhm per recorder and channel, NaN if not measured
+    completion_times : Dict[str, float]
+        Time in seconds it took to measure all channels of each recorder
+    errors : Dict[str, str]
+        The error of each recorder whose check failed
+    """
+
+    def __init__(self, level_limits: List[float] = DEFAULT_LEVEL_LIMITS,
+                 smoothing: float = DEFAULT_SMOOTHING,
+                 timeout: float = DEFAULT_MEASUREMENT_TIMEOUT,
+                 continuous: bool = True) -> None:
+        self.level_limits = np.asarray(level_limits, dtype=float)
+        self.smoothing = smoothing
+        self.timeout = timeout
+        self.continuous = continuous
+        self.recorders: List[RecorderConfiguration] = []
+        self.values = np.empty((0, 0))
+        self.completion_times: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        # Channels that do not exist, because their recorder has fewer
+        # channels than the largest recorder
+        self._padding = np.empty((0, 0), dtype=bool)
+        # Channels that changed since the last take_changes
+        self._changed = np.empty((0, 0), dtype=bool)
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._start_time = 0.0
+
+    def start(self, recorders: List[RecorderConfiguration]) -> None:
+        """
+        Start checking the impedances of the recorders, one worker thread
+        per recorder.
+
+        :param recorders: The recorders to check
+        :type recorders: List[RecorderConfiguration]
+        :raises RuntimeError: if a check is already running
+        """
+        if self.is_running():
+            raise RuntimeError("An impedance check is already running")
+        self.recorders = list(recorders)
+        number_of_channels = max((recorder.number_of_channels
+                                  for recorder in self.recorders), default=0)
+        shape = (len(self.recorders), number_of_channels)
+        self.values = np.full(shape, np.nan)
+        recorder_channels = np.array([recorder.number_of_channels
+                                      for recorder in self.recorders],
+                                     dtype=int)
+        self._padding = (np.arange(number_of_channels) >=
+                         recorder_channels[:, np.newaxis])
+        # The first update shows all channels as not measured
+        self._changed = ~self._padding
+        self.completion_times = {}
+        self.errors = {}
+        self._stop_event.clear()
+        self._start_time = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._measure_recorder, args=(row,),
+                             name=f"impedance-{recorder.serial_number}",
+                             daemon=True)
+            for row, recorder in enumerate(self.recorders)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Stop the check and wait until the recorders left the impedance mode.
+        A recorder that is blocked in its device keeps its worker thread, so
+        the engine is still running until that thread finished.
+
+        :param timeout: Seconds to wait for all recorders together
+        :type timeout: float
+        """
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0.0))
+        self._threads = [thread for thread in self._threads
+                         if thread.is_alive()]
+        for thread in self._threads:
+            print(f"Warning: {thread.name} did not stop within "
+                  f"{timeout:g} s")
+
+    def is_running(self) -> bool:
+        """
+        :return: Whether any recorder is still being checked
+        :rtype: bool
+        """
+        return any(thread.is_alive() for thread in self._threads)
+
+    def is_complete(self) -> bool:
+        """
+        :return: Whether all channels of all recorders were measured
+        :rtype: bool
+        """
+        with self._lock:
+            return bool(np.all(~np.isnan(self.values) | self._padding))
+
+    def get_levels(self, values: np.ndarray) -> np.ndarray:
+        """
+        Classify impedances into levels: 0 is good, len(level_limits) means
+        the electrode is not connected.
+
+        :param values: Impedances in kOhm, NaN if not measured
+        :type values: np.ndarray
+        :return: The level of every impedance, LEVEL_UNKNOWN if not measured
+        :rtype: np.ndarray
+        """
+        levels = np.searchsorted(self.level_limits, values, side="right")
+        return np.where(np.isnan(values), LEVEL_UNKNOWN, levels)
+
+    def take_changes(self) -> ImpedanceUpdate:
+        """
+        Take the channels whose impedance changed since the last call.
+
+        :return: The changed channels, empty if nothing changed
+        :rtype: ImpedanceUpdate
+        """
+        with self._lock:
+            rows, channels = np.nonzero(self._changed)
+            values = self.values[rows, channels]
+            self._changed[rows, channels] = False
+        return ImpedanceUpdate(rows, channels, values,
+                               self.get_levels(values))
+
+    def get_summary(self) -> Dict[int, int]:
+        """
+        :return: Number of channels per impedance level, including
+                 LEVEL_UNKNOWN
+        :rtype: Dict[int, int]
+        """
+        with self._lock:
+            levels = self.get_levels(self.values[~self._padding])
+        return {int(level): int(count) for level, count
+                in zip(*np.unique(levels, return_counts=True))}
+
+    def add_measurement(self, row: int, measurement: np.ndarray) -> None:
+        """
+        Add a measurement of a recorder to the impedances.
+
+        :param row: Index of the recorder
+        :type row: int
+        :param measurement: Impedance in kOhm per channel of the recorder,
+                            NaN for the channels that were not measured
+        :type measurement: np.ndarray
+        """
+        measurement = np.asarray(measurement, dtype=float)
+        number_of_channels = min(len(measurement), self.values.shape[1])
+        measurement = measurement[:number_of_channels]
+        with self._lock:
+            shown = self.values[row, :number_of_channels]
+            is_measured = ~np.isnan(measurement)
+            # A channel that was not measured before shows its first
+            # measurement, the others average their measurements
+            smoothed = np.where(np.isnan(shown), measurement,
+                                shown + self.smoothing * (measurement - shown))
+            has_changed = is_measured & (
+                np.isnan(shown) |
+                (np.abs(smoothed - shown) > CHANGE_TOLERANCE * shown))
+            shown[is_measured] = smoothed[is_measured]
+            self._changed[row, :number_of_channels] |= has_changed
+
+    def _measure_recorder(self, row: int) -> None:
+        """
+        Body of the worker thread of a recorder.
+
+        :param row: Index of the recorder
+        :type row: int
+        """
+        recorder = self.recorders[row]
+        device = None
+        try:
+            module_name, class_name = recorder.device_source.split(":")
+            device_class = getattr(importlib.import_module(module_name),
+                                   class_name)
+            device = device_class(recorder.serial_number)
+            device.start_impedance()
+            while not self._stop_event.is_set():
+                if (time.monotonic() - self._start_time > self.timeout and
+                        recorder.serial_number not in self.completion_times):
+                    raise TimeoutError(
+                        f"Not all channels were measured within "
+                        f"{self.timeout:.0f} s")
+                measurement = device.read_impedance()
+                if measurement is None:
+                    self._stop_event.wait(POLL_INTERVAL)
+                    continue
+                self.add_measurement(row, measurement)
+                if (recorder.serial_number not in self.completion_times and
+                        self._is_recorder_complete(row)):
+                    self.completion_times[recorder.serial_number] = (
+                        time.monotonic() - self._start_time)
+                    if not self.continuous:
+                        break
+        except Exception as error:
+            self.errors[recorder.serial_number] = str(error)
+            print(f"Warning: impedance check of {recorder.serial_number} "
+                  f"failed: {error}")
+        finally:
+            if device is not None:
+                try:
+                    device.stop_impedance()
+                finally:
+                    device.close()
+
+    def _is_recorder_complete(self, row: int) -> bool:
+        """
+        :return: Whether all channels of a recorder were measured
+        :rtype: bool
+        """
+        with self._lock:
+            return bool(np.all(~np.isnan(self.values[row]) |
+                               self._padding[row]))
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Names of the status fields of a recorder
+FIELD_BATTERY: str = "battery"
+FIELD_RSSI: str = "rssi"
+FIELD_PACKET_LOSS: str = "packet_loss"
+FIELD_SYNC: str = "sync"
+STATUS_FIELDS: List[str] = [FIELD_BATTERY, FIELD_RSSI, FIELD_PACKET_LOSS,
+                            FIELD_SYNC]
+# A recorder that did not report its status for this many seconds is shown
+# as stale
+DEFAULT_STALE_TIMEOUT: float = 3.0
+
+
+class RecorderStatusFeed:
+    """
+    Collects the telemetry of all recorders (battery level, signal strength,
+    packet loss and synchronization) and hands it to the user interface in
+    coalesced snapshots.
+
+    The devices report their status at their own rate and from any thread
+    with update_status, which only stores the latest values. The user
+    interface takes the changes once per frame with take_changes, so many
+    recorders that report often cost one delivery per frame, and fields
+    that did not change are not delivered at all.
+
+    Attributes
+    ----------
+    stale_timeout : float
+        Time in seconds without report after which a recorder is stale
+    number_of_updates : int
+        Number of status reports received
+    number_of_deliveries : int
+        Number of snapshots with changes that were taken
+    """
+
+    def __init__(self, stale_timeout: float = DEFAULT_STALE_TIMEOUT) -> None:
+        self.stale_timeout = stale_timeout
+        self.number_of_updates = 0
+        self.number_of_deliveries = 0
+        # Latest values per recorder serial number
+        self._status: Dict[str, Dict[str, object]] = {}
+        # Fields per recorder that changed since the last snapshot
+        self._changed: Dict[str, set] = {}
+        # Time of the last report per recorder
+        self._last_report: Dict[str, float] = {}
+        # Recorders that were stale in the last snapshot
+        self._stale: set = set()
+        self._lock = threading.Lock()
+
+    def update_status(self, serial_number: str, **fields) -> None:
+        """
+        Store the status of a recorder. Can be called from any thread.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param fields: The reported fields, e.g. battery=80, rssi=-60,
+                       packet_loss=0.01, sync=True
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.number_of_updates += 1
+            self._last_report[serial_number] = now
+            status = self._status.setdefault(serial_number, {})
+            changed = None
+            for name, value in fields.items():
+                # Reports that repeat the shown value are not delivered
+                if name in status and status[name] == value:
+                    continue
+                status[name] = value
+                if changed is None:
+                    changed = self._changed.setdefault(serial_number, set())
+                changed.add(name)
+
+    def remove_recorder(self, serial_number: str) -> None:
+        """
+        Forget the status of a recorder that is no longer connected.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        """
+        with self._lock:
+            self._status.pop(serial_number, None)
+            self._changed.pop(serial_number, None)
+            self._last_report.pop(serial_number, None)
+            self._stale.discard(serial_number)
+
+    def get_status(self, serial_number: str) -> Dict[str, object]:
+        """
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :return: All latest fields of the recorder
+        :rtype: Dict[str, object]
+        """
+        with self._lock:
+            return dict(self._status.get(serial_number, {}))
+
+    def mark_all_changed(self, serial_number: Optional[str] = None) -> None:
+        """
+        Deliver all fields with the next snapshot, e.g. after a new widget
+        was created for a recorder.
+
+        :param serial_number: The recorder, defaults to all recorders
+        :type serial_number: str, optional
+        """
+        with self._lock:
+            serial_numbers = (list(self._status) if serial_number is None
+                              else [serial_number])
+            for serial in serial_numbers:
+                if serial in self._status:
+                    self._changed.setdefault(serial, set()).update(
+                        self._status[serial])
+                    self._stale.discard(serial)
+
+    def take_changes(self) -> Dict[str, Dict[str, object]]:
+        """
+        Take the fields that changed since the last snapshot. A recorder that
+        became stale is delivered with the field "stale" set to True, and
+        with False when it reports again.
+
+        :return: The changed fields per recorder serial number, empty if
+                 nothing changed
+        :rtype: Dict[str, Dict[str, object]]
+        """
+        now = time.monotonic()
+        with self._lock:
+            changes: Dict[str, Dict[str, object]] = {}
+            for serial, names in self._changed.items():
+                status = self._status[serial]
+                changes[serial] = {name: status[name] for name in names}
+            self._changed = {}
+            for serial, last_report in self._last_report.items():
+                is_stale = now - last_report > self.stale_timeout
+                if is_stale != (serial in self._stale):
+                    changes.setdefault(serial, {})["stale"] = is_stale
+                    if is_stale:
+                        self._stale.add(serial)
+                    else:
+                        self._stale.discard(serial)
+            if changes:
+                self.number_of_deliveries += 1
+            return changes
+
+
+# The status feed of the application. The device layer reports the status of
+# the recorders to it, the connection overview shows it.
+recorder_status_feed = RecorderStatusFeed()
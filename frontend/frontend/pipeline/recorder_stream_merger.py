@@ -0,0 +1,461 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.Views.classes.pipeline.block_pipeline import BlockSource
+
+# Number of seconds of samples that is buffered per recorder
+DEFAULT_BUFFER_SECONDS: float = 10.0
+# Number of output samples per emitted block
+DEFAULT_OUTPUT_BLOCK_SIZE: int = 256
+# A recorder that did not deliver samples for this many seconds, while the
+# other recorders did, is considered dropped out. Its channels are filled
+# with NaN until it delivers samples again.
+DEFAULT_DROPOUT_TIMEOUT: float = 1.0
+# Forgetting factor of the clock drift estimation per received block. Values
+# closer to 1 average over more blocks.
+DRIFT_FORGETTING_FACTOR: float = 0.995
+# A jump in the device timestamps of more than this many sample periods is
+# treated as lost samples, which are filled with NaN
+MAX_TIMESTAMP_JITTER_SAMPLES: float = 1.5
+
+
+class RecorderClock:
+    """
+    Maps the clock of a recorder onto the common (host) clock.
+
+    The mapping host_time = offset + rate * device_time is fitted with
+    exponentially weighted least squares on the pairs of device timestamps
+    and host receive times. The weighting follows slow drift while averaging
+    out the jitter of the receive times.
+
+    Attributes
+    ----------
+    offset : float
+        Host time at device time zero (relative to the reference times)
+    rate : float
+        Host seconds per device second
+    """
+
+    def __init__(self, device_reference: float, host_reference: float
+                 ) -> None:
+        """
+        Initialize the clock, starting without drift.
+
+        :param device_reference: First device timestamp, subtracted from all
+                                 device times for numerical precision
+        :type device_reference: float
+        :param host_reference: First host time, subtracted from all host
+                               times for numerical precision
+        :type host_reference: float
+        """
+        self.device_reference = device_reference
+        self.host_reference = host_reference
+        self.offset = 0.0
+        self.rate = 1.0
+        # Exponentially weighted sums of the least squares fit
+        self._sums = np.zeros(5)
+
+    def update(self, device_time: float, host_time: float) -> None:
+        """
+        Add a pair of a device timestamp and the host time it was received.
+
+        :param device_time: Timestamp of the device
+        :type device_time: float
+        :param host_time: Host time at which the timestamp was received
+        :type host_time: float
+        """
+        x = device_time - self.device_reference
+        y = host_time - self.host_reference
+        self._sums *= DRIFT_FORGETTING_FACTOR
+        self._sums += (1.0, x, y, x * x, x * y)
+        weight, sum_x, sum_y, sum_xx, sum_xy = self._sums
+        denominator = weight * sum_xx - sum_x * sum_x
+        # Two distinct points are needed to estimate the drift
+        if denominator > 1e-12:
+            self.rate = (weight * sum_xy - sum_x * sum_y) / denominator
+        self.offset = (sum_y - self.rate * sum_x) / weight
+
+    def to_host(self, device_time):
+        """
+        Convert device times to host times (relative to the reference).
+
+        :param device_time: Device time(s)
+        :type device_time: float or np.ndarray
+        :return: Host time(s)
+        :rtype: float or np.ndarray
+        """
+        return self.offset + self.rate * (device_time -
+                                          self.device_reference)
+
+    def to_device(self, host_time):
+        """
+        Convert host times (relative to the reference) to device times.
+
+        :param host_time: Host time(s)
+        :type host_time: float or np.ndarray
+        :return: Device time(s)
+        :rtype: float or np.ndarray
+        """
+        return ((host_time - self.offset) / self.rate +
+                self.device_reference)
+
+
+class RecorderStream:
+    """
+    The buffered samples and the clock of a single recorder.
+
+    Samples are stored in a preallocated ring buffer, addressed by their
+    absolute sample index since the start of the stream. Sample index i was
+    taken at device time first_device_time + i / sample_rate.
+
+    Attributes
+    ----------
+    serial_number : str
+        Serial number of the recorder
+    number_of_channels : int
+        Number of channels of the recorder
+    sample_rate : float
+        Nominal sample rate of the recorder in Hz
+    buffer : np.ndarray
+        Ring buffer of shape (capacity, channels)
+    samples_received : int
+        Absolute index of the next sample to be received
+    last_receive_time : float
+        Host time at which the last block was received
+    """
+
+    def __init__(self, serial_number: str, number_of_channels: int,
+                 sample_rate: float, capacity: int) -> None:
+        self.serial_number = serial_number
+        self.number_of_channels = number_of_channels
+        self.sample_rate = sample_rate
+        self.buffer = np.full((capacity, number_of_channels), np.nan,
+                              dtype=np.float32)
+        self.samples_received = 0
+        self.first_device_time: Optional[float] = None
+        self.clock: Optional[RecorderClock] = None
+        self.last_receive_time: Optional[float] = None
+        self.is_active = True
+
+    def push(self, samples: np.ndarray, device_time: float,
+             host_time: float) -> None:
+        """
+        Add a block of samples to the ring buffer.
+
+        :param samples: Block of shape (samples, channels)
+        :type samples: np.ndarray
+        :param device_time: Device timestamp of the first sample
+        :type device_time: float
+        :param host_time: Host time at which the block was received,
+                          relative to the host reference of the merger
+        :type host_time: float
+        """
+        if self.first_device_time is None:
+            self.first_device_time = device_time
+            self.clock = RecorderClock(device_time, 0.0)
+        else:
+            # Fill samples that were lost on the way with NaN, so the sample
+            # index keeps matching the device time
+            expected_index = (device_time - self.first_device_time) * \
+                self.sample_rate
+            missing = int(round(expected_index - self.samples_received))
+            if missing > MAX_TIMESTAMP_JITTER_SAMPLES:
+                self._write(np.full(
+                    (min(missing, self.buffer.shape[0]),
+                     self.number_of_channels), np.nan, dtype=np.float32))
+                self.samples_received += missing - min(
+                    missing, self.buffer.shape[0])
+
+        # The host time belongs to the last sample of the block
+        last_device_time = device_time + (samples.shape[0] - 1) / \
+            self.sample_rate
+        self.clock.update(last_device_time, host_time)
+        self._write(samples)
+        self.last_receive_time = host_time
+        self.is_active = True
+
+    def get_host_time_range(self) -> tuple:
+        """
+        Get the host times of the oldest and newest sample in the buffer.
+
+        :return: Host time of the oldest and the newest buffered sample
+        :rtype: tuple(float, float)
+        """
+        oldest_index = max(self.samples_received - self.buffer.shape[0], 0)
+        newest_index = self.samples_received - 1
+        return (self.clock.to_host(self._index_to_device_time(oldest_index)),
+                self.clock.to_host(self._index_to_device_time(newest_index)))
+
+    def resample(self, host_times: np.ndarray, out: np.ndarray) -> None:
+        """
+        Linearly interpolate the buffered samples at the given host times.
+        Times that are not in the buffer give NaN.
+
+        :param host_times: Host times (relative to the clock reference)
+        :type host_times: np.ndarray
+        :param out: Output array of shape (len(host_times), channels)
+        :type out: np.ndarray
+        """
+        positions = (self.clock.to_device(host_times) -
+                     self.first_device_time) * self.sample_rate
+        oldest_index = max(self.samples_received - self.buffer.shape[0], 0)
+        valid = ((positions >= oldest_index) &
+                 (positions <= self.samples_received - 1))
+        positions = np.clip(positions, oldest_index,
+                            max(self.samples_received - 1, 0))
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, max(self.samples_received - 1, 0))
+        fraction = (positions - lower)[:, np.newaxis].astype(np.float32)
+
+        capacity = self.buffer.shape[0]
+        lower_samples = self.buffer[lower % capacity]
+        upper_samples = self.buffer[upper % capacity]
+        np.multiply(lower_samples, 1.0 - fraction, out=out)
+        out += upper_samples * fraction
+        out[~valid] = np.nan
+
+    def _index_to_device_time(self, index: int) -> float:
+        """
+        :return: The device time of an absolute sample index
+        :rtype: float
+        """
+        return self.first_device_time + index / self.sample_rate
+
+    def _write(self, samples: np.ndarray) -> None:
+        """
+        Copy samples into the ring buffer, wrapping around at the end.
+
+        :param samples: Block of shape (samples, channels)
+        :type samples: np.ndarray
+        """
+        capacity = self.buffer.shape[0]
+        # Only the newest samples fit if the block exceeds the capacity
+        if samples.shape[0] > capacity:
+            self.samples_received += samples.shape[0] - capacity
+            samples = samples[-capacity:]
+        start = self.samples_received % capacity
+        first_part = min(samples.shape[0], capacity - start)
+        self.buffer[start:start + first_part] = samples[:first_part]
+        self.buffer[:samples.shape[0] - first_part] = samples[first_part:]
+        self.samples_received += samples.shape[0]
+
+
+class RecorderStreamMerger(BlockSource):
+    """
+    Aligns the sample streams of all paired recorders onto a common timeline
+    and emits synchronized, contiguous blocks to its sinks (the writer, the
+    live display, ...).
+
+    Each recorder has its own clock. The clock of every recorder is mapped
+    onto the host clock with a drift estimate, and the samples are
+    resampled with vectorized linear interpolation at the common output
+    rate. The channels of all recorders are concatenated in the order the
+    recorders were added. The memory use is bounded by the ring buffer per
+    recorder. A recorder that drops out mid-session gives NaN samples until
+    it delivers samples again, without holding back the others.
+
+    Attributes
+    ----------
+    sample_rate : float
+        Output sample rate in Hz
+    output_block_size : int
+        Number of samples per emitted block
+    streams : Dict[str, RecorderStream]
+        Maps the serial number of a recorder to its stream
+    """
+
+    def __init__(self, sample_rate: float,
+                 output_block_size: int = DEFAULT_OUTPUT_BLOCK_SIZE,
+                 buffer_seconds: float = DEFAULT_BUFFER_SECONDS,
+                 dropout_timeout: float = DEFAULT_DROPOUT_TIMEOUT) -> None:
+        """
+        Initialize the merger without recorders.
+
+        :param sample_rate: Output sample rate in Hz
+        :type sample_rate: float
+        :param output_block_size: Number of samples per emitted block
+        :type output_block_size: int
+        :param buffer_seconds: Seconds of samples buffered per recorder
+        :type buffer_seconds: float
+        :param dropout_timeout: Seconds without samples after which a
+                                recorder is considered dropped out
+        :type dropout_timeout: float
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.output_block_size = output_block_size
+        self.buffer_seconds = buffer_seconds
+        self.dropout_timeout = dropout_timeout
+        self.streams: Dict[str, RecorderStream] = {}
+        self.host_reference: Optional[float] = None
+        # Host time (relative to host_reference) of the next output sample
+        self.next_output_time: Optional[float] = None
+        self._output_block: Optional[np.ndarray] = None
+        self._sample_offsets = (np.arange(output_block_size) /
+                                sample_rate)
+
+    def add_recorder(self, serial_number: str, number_of_channels: int,
+                     sample_rate: float) -> None:
+        """
+        Add a recorder whose stream should be merged.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param number_of_channels: Number of channels of the recorder
+        :type number_of_channels: int
+        :param sample_rate: Nominal sample rate of the recorder in Hz
+        :type sample_rate: float
+        """
+        capacity = int(self.buffer_seconds * sample_rate)
+        self.streams[serial_number] = RecorderStream(
+            serial_number, number_of_channels, sample_rate, capacity)
+        self._output_block = None
+
+    def remove_recorder(self, serial_number: str) -> None:
+        """
+        Stop merging the stream of a recorder.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        """
+        self.streams.pop(serial_number, None)
+        self._output_block = None
+
+    def get_number_of_channels(self) -> int:
+        """
+        :return: Number of channels of the merged blocks
+        :rtype: int
+        """
+        return sum(stream.number_of_channels
+                   for stream in self.streams.values())
+
+    def get_channel_ranges(self) -> Dict[str, Tuple[int, int]]:
+        """
+        :return: Maps the serial number of every recorder to the first and
+                 the last (exclusive) channel of its samples in the merged
+                 blocks
+        :rtype: Dict[str, Tuple[int, int]]
+        """
+        channel_ranges = {}
+        first_channel = 0
+        for serial_number, stream in self.streams.items():
+            last_channel = first_channel + stream.number_of_channels
+            channel_ranges[serial_number] = (first_channel, last_channel)
+            first_channel = last_channel
+        return channel_ranges
+
+    def push_samples(self, serial_number: str, samples: np.ndarray,
+                     device_time: float,
+                     host_time: Optional[float] = None) -> None:
+        """
+        Add a block of samples of a recorder and emit all merged blocks that
+        are complete.
+
+        :param serial_number: Serial number of the recorder
+        :type serial_number: str
+        :param samples: Block of shape (samples, channels)
+        :type samples: np.ndarray
+        :param device_time: Device timestamp of the first sample
+        :type device_time: float
+        :param host_time: Host time at which the block was received,
+                          defaults to now
+        :type host_time: float, optional
+        """
+        if host_time is None:
+            host_time = time.monotonic()
+        if self.host_reference is None:
+            self.host_reference = host_time
+        # All recorders share the same host reference
+        self.streams[serial_number].push(samples, device_time,
+                                         host_time - self.host_reference)
+        self.process(host_time)
+
+    def process(self, host_time: Optional[float] = None) -> None:
+        """
+        Emit all merged blocks for which every active recorder has
+        delivered its samples.
+
+        :param host_time: The current host time, defaults to now
+        :type host_time: float, optional
+        """
+        if host_time is None:
+            host_time = time.monotonic()
+        if self.host_reference is None:
+            return
+        now = host_time - self.host_reference
+
+        # Wait until every recorder delivered its first samples. Recorders
+        # that are added later do not hold back the others, and a recorder
+        # that does not start within the dropout timeout is treated as
+        # dropped out.
+        streams = list(self.streams.values())
+        started_streams = [stream for stream in streams
+                           if stream.clock is not None]
+        if not started_streams or (
+                self.next_output_time is None and
+                len(started_streams) < len(streams) and
+                now <= self.dropout_timeout):
+            return
+        self._update_dropouts(now)
+        active_streams = [stream for stream in started_streams
+                          if stream.is_active]
+        if not active_streams:
+            return
+
+        if self.next_output_time is None:
+            # Start where all started recorders have samples
+            self.next_output_time = max(
+                stream.get_host_time_range()[0]
+                for stream in started_streams)
+        # Blocks can be emitted up to the newest sample all active
+        # recorders have delivered
+        available_until = min(stream.get_host_time_range()[1]
+                              for stream in active_streams)
+        block_duration = self.output_block_size / self.sample_rate
+        while self.next_output_time + block_duration <= available_until:
+            self.emit_block(self._merge_block(streams))
+            self.next_output_time += block_duration
+
+    def _merge_block(self, streams: List[RecorderStream]) -> np.ndarray:
+        """
+        Resample all recorders at the times of the next output block.
+
+        :param streams: The streams of all recorders, in channel order
+        :type streams: List[RecorderStream]
+        :return: Block of shape (samples, channels)
+        :rtype: np.ndarray
+        """
+        number_of_channels = self.get_number_of_channels()
+        if (self._output_block is None or
+                self._output_block.shape[1] != number_of_channels):
+            self._output_block = np.empty(
+                (self.output_block_size, number_of_channels),
+                dtype=np.float32)
+        host_times = self.next_output_time + self._sample_offsets
+
+        first_channel = 0
+        for stream in streams:
+            last_channel = first_channel + stream.number_of_channels
+            columns = self._output_block[:, first_channel:last_channel]
+            if stream.is_active and stream.clock is not None:
+                resampled = np.empty_like(columns)
+                stream.resample(host_times, resampled)
+                columns[:] = resampled
+            else:
+                columns[:] = np.nan
+            first_channel = last_channel
+        return self._output_block
+
+    def _update_dropouts(self, now: float) -> None:
+        """
+        Mark recorders that stopped delivering samples as dropped out.
+
+        :param now: Current host time (relative to the host reference)
+        :type now: float
+        """
+        for stream in self.streams.values():
+            if (stream.last_receive_time is not None and
+                    now - stream.last_receive_time > self.dropout_timeout):
+                stream.is_active = False
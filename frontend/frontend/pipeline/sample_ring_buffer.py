@@ -0,0 +1,319 @@
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Size in bytes of the header in front of the samples in shared memory. It
+# holds the write index, the capacity, the number of channels and the
+# pending write end as int64.
+SHARED_HEADER_SIZE: int = 64
+# Positions of the fields in the header
+HEADER_WRITE_INDEX: int = 0
+HEADER_CAPACITY: int = 1
+HEADER_NUMBER_OF_CHANNELS: int = 2
+HEADER_PENDING_WRITE_END: int = 3
+HEADER_LENGTH: int = 4
+# Data type of the samples in the ring buffer
+SAMPLE_DTYPE = np.float32
+
+
+class SampleRingBuffer:
+    """
+    Preallocated multi-channel ring buffer that is shared between the
+    acquisition, the live display and the file writer.
+
+    The buffer is a sink of the sample pipeline: every block passed to
+    write_block is copied once into the preallocated array. Readers (see
+    create_reader) each keep their own cursor and get views on the buffer
+    instead of copies. A reader that falls more than the capacity behind
+    loses samples; this overrun is detected and reported per reader.
+
+    With shared=True the buffer lives in shared memory, so a reader in
+    another process can attach to it by name with attach.
+
+    Writes work like a seqlock: the end of the write is published as the
+    pending write end before the samples are copied, and the write index
+    only after. A reader compares its samples against the pending write
+    end, so samples that are being overwritten are never taken as valid.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of samples (per channel) the buffer holds
+    number_of_channels : int
+        Number of channels per sample
+    buffer : np.ndarray
+        The samples, shape (capacity, channels)
+    """
+
+    def __init__(self, capacity: int, number_of_channels: int,
+                 shared: bool = False, name: Optional[str] = None,
+                 _shared_memory: shared_memory.SharedMemory = None) -> None:
+        """
+        Allocate the ring buffer.
+
+        :param capacity: Number of samples the buffer holds
+        :type capacity: int
+        :param number_of_channels: Number of channels per sample
+        :type number_of_channels: int
+        :param shared: Allocate the buffer in shared memory
+        :type shared: bool
+        :param name: Name of the shared memory block, generated if None
+        :type name: str, optional
+        """
+        self.capacity = capacity
+        self.number_of_channels = number_of_channels
+        self.shared_memory = _shared_memory
+        data_size = (capacity * number_of_channels *
+                     np.dtype(SAMPLE_DTYPE).itemsize)
+
+        if shared and self.shared_memory is None:
+            self.shared_memory = shared_memory.SharedMemory(
+                name=name, create=True, size=SHARED_HEADER_SIZE + data_size)
+        if self.shared_memory is not None:
+            self._header = np.ndarray((HEADER_LENGTH,), dtype=np.int64,
+                                      buffer=self.shared_memory.buf)
+            self.buffer = np.ndarray((capacity, number_of_channels),
+                                     dtype=SAMPLE_DTYPE,
+                                     buffer=self.shared_memory.buf,
+                                     offset=SHARED_HEADER_SIZE)
+            if _shared_memory is None:
+                self._header[:] = (0, capacity, number_of_channels, 0)
+        else:
+            self._header = np.zeros(HEADER_LENGTH, dtype=np.int64)
+            self._header[HEADER_CAPACITY] = capacity
+            self._header[HEADER_NUMBER_OF_CHANNELS] = number_of_channels
+            self.buffer = np.zeros((capacity, number_of_channels),
+                                   dtype=SAMPLE_DTYPE)
+
+    @classmethod
+    def attach(cls, name: str) -> "SampleRingBuffer":
+        """
+        Attach to a ring buffer in shared memory created by another process.
+
+        :param name: Name of the shared memory block
+        :type name: str
+        :return: The ring buffer
+        :rtype: SampleRingBuffer
+        """
+        existing = shared_memory.SharedMemory(name=name)
+        header = np.ndarray((HEADER_LENGTH,), dtype=np.int64,
+                            buffer=existing.buf)
+        capacity = header[HEADER_CAPACITY]
+        number_of_channels = header[HEADER_NUMBER_OF_CHANNELS]
+        return cls(int(capacity), int(number_of_channels),
+                   _shared_memory=existing)
+
+    def get_name(self) -> Optional[str]:
+        """
+        :return: Name of the shared memory block, None if not shared
+        :rtype: str or None
+        """
+        return None if self.shared_memory is None else self.shared_memory.name
+
+    def get_write_index(self) -> int:
+        """
+        :return: Absolute index of the next sample to be written
+        :rtype: int
+        """
+        return int(self._header[HEADER_WRITE_INDEX])
+
+    def get_pending_write_end(self) -> int:
+        """
+        :return: Absolute index after the last sample of the write that is
+                 in progress, equal to the write index between writes
+        :rtype: int
+        """
+        return int(self._header[HEADER_PENDING_WRITE_END])
+
+    def write_block(self, block: np.ndarray) -> None:
+        """
+        Copy a block of samples into the ring buffer. The pending write end
+        is advanced before the copy, so readers know which samples are
+        being overwritten. The write index is only advanced after the
+        samples are in place, so readers never see samples that are not
+        yet written.
+
+        :param block: Block of shape (samples, channels)
+        :type block: np.ndarray
+        """
+        write_index = self.get_write_index()
+        number_of_samples = block.shape[0]
+        # Only the newest samples fit if the block exceeds the capacity
+        if number_of_samples > self.capacity:
+            block = block[-self.capacity:]
+            write_index += number_of_samples - self.capacity
+            number_of_samples = self.capacity
+
+        write_end = write_index + number_of_samples
+        self._header[HEADER_PENDING_WRITE_END] = write_end
+        start = write_index % self.capacity
+        first_part = min(number_of_samples, self.capacity - start)
+        self.buffer[start:start + first_part] = block[:first_part]
+        self.buffer[:number_of_samples - first_part] = block[first_part:]
+        self._header[HEADER_WRITE_INDEX] = write_end
+
+    def create_reader(self, on_overrun: Callable[[int], None] = None,
+                      from_start: bool = False) -> "RingBufferReader":
+        """
+        Create an independent reader of the buffer.
+
+        :param on_overrun: Called with the number of lost samples when the
+                           reader fell behind more than the capacity
+        :type on_overrun: Callable[[int], None], optional
+        :param from_start: Start at the oldest sample in the buffer instead
+                           of at the next sample to be written
+        :type from_start: bool
+        :return: The reader
+        :rtype: RingBufferReader
+        """
+        write_index = self.get_write_index()
+        cursor = (max(write_index - self.capacity, 0) if from_start
+                  else write_index)
+        return RingBufferReader(self, cursor, on_overrun)
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the shared memory of the buffer.
+
+        :param unlink: Also destroy the shared memory block. Only the process
+                       that created the buffer should do this.
+        :type unlink: bool
+        """
+        if self.shared_memory is None:
+            return
+        # Drop the views before closing the memory they point to
+        self.buffer = None
+        self._header = None
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
+        self.shared_memory = None
+
+
+class RingBufferReader:
+    """
+    A reader of a SampleRingBuffer with its own cursor.
+
+    read returns views on the ring buffer; they are only valid until the
+    writer wraps around to them again. A reader that processes the views
+    slowly can check with is_last_read_valid whether they were overwritten
+    in the meantime.
+
+    Attributes
+    ----------
+    cursor : int
+        Absolute index of the next sample this reader reads
+    overrun_count : int
+        Number of times this reader fell behind more than the capacity
+    lost_samples : int
+        Total number of samples this reader lost through overruns
+    """
+
+    def __init__(self, ring_buffer: SampleRingBuffer, cursor: int,
+                 on_overrun: Callable[[int], None] = None) -> None:
+        self.ring_buffer = ring_buffer
+        self.cursor = cursor
+        self.on_overrun = on_overrun
+        self.overrun_count = 0
+        self.lost_samples = 0
+        self._last_read_start = cursor
+
+    def get_available(self) -> int:
+        """
+        :return: Number of samples that can be read
+        :rtype: int
+        """
+        return min(self.ring_buffer.get_write_index() - self.cursor,
+                   self.ring_buffer.capacity)
+
+    def read(self, max_samples: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Read the samples that were written since the last read, as views
+        on the ring buffer. Two views are returned when the samples wrap
+        around the end of the buffer.
+
+        :param max_samples: Maximum number of samples to read
+        :type max_samples: int, optional
+        :return: Views of shape (samples, channels), oldest first
+        :rtype: List[np.ndarray]
+        """
+        write_index = self.ring_buffer.get_write_index()
+        self._check_overrun(self.ring_buffer.get_pending_write_end())
+        stop = write_index
+        if max_samples is not None:
+            stop = min(stop, self.cursor + max_samples)
+        views = self._get_views(self.cursor, stop)
+        self._last_read_start = self.cursor
+        self.cursor = stop
+        return views
+
+    def read_latest(self, number_of_samples: int) -> List[np.ndarray]:
+        """
+        Read the newest samples, skipping everything older without counting
+        it as an overrun. Used by displays that only show the most recent
+        data.
+
+        :param number_of_samples: Number of samples to read
+        :type number_of_samples: int
+        :return: Views of shape (samples, channels), oldest first
+        :rtype: List[np.ndarray]
+        """
+        write_index = self.ring_buffer.get_write_index()
+        # Samples that the write in progress overwrites are skipped
+        oldest = (self.ring_buffer.get_pending_write_end() -
+                  self.ring_buffer.capacity)
+        start = max(write_index - number_of_samples, oldest, 0)
+        views = self._get_views(start, write_index)
+        self._last_read_start = start
+        self.cursor = write_index
+        return views
+
+    def is_last_read_valid(self) -> bool:
+        """
+        Check that the views of the last read were not overwritten by the
+        writer while they were being used. A write that is still copying
+        counts as overwriting.
+
+        :return: True if the views still hold the samples that were read
+        :rtype: bool
+        """
+        return (self.ring_buffer.get_pending_write_end() -
+                self._last_read_start <= self.ring_buffer.capacity)
+
+    def _check_overrun(self, write_end: int) -> None:
+        """
+        Detect whether the writer overtook this reader, and if so move the
+        cursor to the oldest sample that is not being overwritten.
+
+        :param write_end: The current pending write end
+        :type write_end: int
+        """
+        lost = write_end - self.cursor - self.ring_buffer.capacity
+        if lost > 0:
+            self.overrun_count += 1
+            self.lost_samples += lost
+            self.cursor += lost
+            if self.on_overrun is not None:
+                self.on_overrun(lost)
+
+    def _get_views(self, start: int, stop: int) -> List[np.ndarray]:
+        """
+        Get views on the samples between two absolute indices.
+
+        :param start: Absolute index of the first sample
+        :type start: int
+        :param stop: Absolute index after the last sample
+        :type stop: int
+        :return: One or two views, oldest first
+        :rtype: List[np.ndarray]
+        """
+        if stop <= start:
+            return []
+        capacity = self.ring_buffer.capacity
+        buffer = self.ring_buffer.buffer
+        first = start % capacity
+        last = first + (stop - start)
+        if last <= capacity:
+            return [buffer[first:last]]
+        return [buffer[first:], buffer[:last - capacity]]
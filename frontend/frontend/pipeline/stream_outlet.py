@@ -0,0 +1,594 @@
+import glob
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from application.Views.classes.diagnostics.signal_tracer import (
+    HISTOGRAM_BUCKETS, LatencyHistogram)
+from application.Views.classes.pipeline.sample_ring_buffer import (
+    RingBufferReader, SampleRingBuffer, SAMPLE_DTYPE)
+
+# Transports the outlet can publish the samples over: a ring buffer in shared
+# memory read with StreamInlet, or Lab Streaming Layer (needs pylsl)
+TRANSPORT_SHARED_MEMORY: str = "shared_memory"
+TRANSPORT_LSL: str = "lsl"
+# Number of samples that are published together
+DEFAULT_CHUNK_SIZE: int = 32
+# Time in seconds after which the samples collected for a chunk are
+# published, even if the chunk is not full, so a low sample rate does not
+# add latency
+DEFAULT_MAX_CHUNK_DELAY: float = 0.02
+# Number of seconds of samples the shared memory stream holds. Inlets that
+# fall further behind lose samples.
+DEFAULT_STREAM_BUFFER_SECONDS: float = 10.0
+# Number of chunks whose timing is kept in shared memory for the latency
+# measurement of the inlets
+CHUNK_LOG_CAPACITY: int = 4096
+# Directory with one description file per shared memory stream, used by the
+# inlets to find the streams by name
+STREAM_DIRECTORY: str = os.path.join(tempfile.gettempdir(),
+                                     "tmsi_sample_streams")
+# Content type of the published streams
+STREAM_TYPE: str = "EEG"
+# States of the outlet reported by OutletStatistics
+OUTLET_STATE_STOPPED: str = "stopped"
+OUTLET_STATE_STREAMING: str = "streaming"
+OUTLET_STATE_FAILED: str = "failed"
+
+
+def get_available_transports() -> List[str]:
+    """
+    :return: The transports that can be used on this machine
+    :rtype: List[str]
+    """
+    transports = [TRANSPORT_SHARED_MEMORY]
+    if importlib.util.find_spec("pylsl") is not None:
+        transports.append(TRANSPORT_LSL)
+    return transports
+
+
+class OutletSettings:
+    """
+    The configuration of the stream outlet.
+
+    Attributes
+    ----------
+    transport : str
+        TRANSPORT_SHARED_MEMORY or TRANSPORT_LSL
+    stream_name : str
+        Name the clients find the stream by
+    chunk_size : int
+        Number of samples that are published together
+    max_chunk_delay : float
+        Time in seconds after which an incomplete chunk is published
+    """
+
+    def __init__(self, transport: str = TRANSPORT_SHARED_MEMORY,
+                 stream_name: str = "TMSi",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_chunk_delay: float = DEFAULT_MAX_CHUNK_DELAY) -> None:
+        self.transport = transport
+        self.stream_name = stream_name
+        self.chunk_size = chunk_size
+        self.max_chunk_delay = max_chunk_delay
+
+
+class _ChunkLog:
+    """
+    Ring of (end index, arrival time, publish time) records of the published
+    chunks in shared memory. The times are time.monotonic() of the outlet
+    process, which is the same clock in all processes on the machine.
+    """
+
+    # The header holds the number of records written and the capacity
+    HEADER_SIZE = 16
+
+    def __init__(self, capacity: int = CHUNK_LOG_CAPACITY,
+                 name: Optional[str] = None) -> None:
+        if name is None:
+            self.shared_memory = shared_memory.SharedMemory(
+                create=True, size=self.HEADER_SIZE + capacity * 3 * 8)
+        else:
+            self.shared_memory = shared_memory.SharedMemory(name=name)
+        self._header = np.ndarray((2,), dtype=np.int64,
+                                  buffer=self.shared_memory.buf)
+        if name is None:
+            self._header[:] = (0, capacity)
+        self.capacity = int(self._header[1])
+        self.records = np.ndarray((self.capacity, 3), dtype=np.float64,
+                                  buffer=self.shared_memory.buf,
+                                  offset=self.HEADER_SIZE)
+
+    def get_count(self) -> int:
+        """
+        :return: Number of records written
+        :rtype: int
+        """
+        return int(self._header[0])
+
+    def add(self, end_index: int, arrival_time: float,
+            publish_time: float) -> None:
+        """
+        Add a record. The count is only advanced after the record is in
+        place, so readers never see a record that is not written yet.
+        """
+        count = self.get_count()
+        self.records[count % self.capacity] = (end_index, arrival_time,
+                                               publish_time)
+        self._header[0] = count + 1
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the shared memory of the log.
+        """
+        self.records = None
+        self._header = None
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
+
+
+class SharedMemoryTransport:
+    """
+    Publishes the chunks into a ring buffer in shared memory, and announces
+    the stream with a description file in STREAM_DIRECTORY.
+    """
+
+    def __init__(self, settings: OutletSettings, channel_names: List[str],
+                 sample_rate: float) -> None:
+        self.ring_buffer = SampleRingBuffer(
+            capacity=int(DEFAULT_STREAM_BUFFER_SECONDS * sample_rate),
+            number_of_channels=len(channel_names), shared=True)
+        self.chunk_log = _ChunkLog()
+        os.makedirs(STREAM_DIRECTORY, exist_ok=True)
+        self.description_path = os.path.join(
+            STREAM_DIRECTORY, f"{settings.stream_name}.json")
+        description = {"name": settings.stream_name, "type": STREAM_TYPE,
+                       "sample_rate": sample_rate,
+                       "channel_names": list(channel_names),
+                       "chunk_size": settings.chunk_size,
+                       "samples": self.ring_buffer.get_name(),
+                       "chunks": self.chunk_log.shared_memory.name,
+                       "process_id": os.getpid()}
+        with open(self.description_path + ".tmp", "w") as description_file:
+            json.dump(description, description_file)
+        os.replace(self.description_path + ".tmp", self.description_path)
+
+    def publish(self, chunk: np.ndarray, arrival_time: float) -> None:
+        """
+        :param chunk: Samples of shape (samples, channels)
+        :type chunk: np.ndarray
+        :param arrival_time: time.monotonic() at which the first sample of
+                             the chunk arrived at the outlet
+        :type arrival_time: float
+        """
+        self.ring_buffer.write_block(chunk)
+        self.chunk_log.add(self.ring_buffer.get_write_index(), arrival_time,
+                           time.monotonic())
+
+    def close(self) -> None:
+        """
+        Remove the description and release the shared memory.
+        """
+        try:
+            os.remove(self.description_path)
+        except OSError:
+            pass
+        self.ring_buffer.close(unlink=True)
+        self.chunk_log.close(unlink=True)
+
+
+class LslTransport:
+    """
+    Publishes the chunks as a Lab Streaming Layer outlet.
+
+    Unlike the shared memory transport, the outlet is not restricted to
+    this machine: LSL announces it to every client on the local network.
+    To keep it on this machine, set ResolveScope = machine in the
+    [multicast] section of the lsl_api.cfg of the application.
+    """
+
+    def __init__(self, settings: OutletSettings, channel_names: List[str],
+                 sample_rate: float) -> None:
+        import pylsl
+        self.pylsl = pylsl
+        info = pylsl.StreamInfo(settings.stream_name, STREAM_TYPE,
+                                len(channel_names), sample_rate,
+                                "float32",
+                                f"{settings.stream_name}-{os.getpid()}")
+        channels = info.desc().append_child("channels")
+        for channel_name in channel_names:
+            channels.append_child("channel").append_child_value(
+                "label", channel_name)
+        self.outlet = pylsl.StreamOutlet(info, settings.chunk_size)
+
+    def publish(self, chunk: np.ndarray, arrival_time: float) -> None:
+        """
+        :param chunk: Samples of shape (samples, channels)
+        :type chunk: np.ndarray
+        :param arrival_time: time.monotonic() at which the first sample of
+                             the chunk arrived at the outlet
+        :type arrival_time: float
+        """
+        # Time stamp the chunk in the LSL clock with the time it arrived,
+        # so the clients see the batching delay as latency
+        timestamp = (self.pylsl.local_clock() -
+                     (time.monotonic() - arrival_time))
+        self.outlet.push_chunk(
+            np.ascontiguousarray(chunk, dtype=np.float32), timestamp)
+
+    def close(self) -> None:
+        """
+        Close the outlet.
+        """
+        self.outlet = None
+
+
+# The transports per name
+TRANSPORTS: Dict[str, type] = {TRANSPORT_SHARED_MEMORY: SharedMemoryTransport,
+                               TRANSPORT_LSL: LslTransport}
+
+
+class StreamOutlet:
+    """
+    Stage of the sample pipeline that publishes the merged samples of all
+    recorders to other applications on the same machine, or on the local
+    network with the LSL transport.
+
+    The outlet is a sink: it collects the blocks into chunks of chunk_size
+    samples and publishes every chunk at once, which keeps the number of
+    transfers independent of the block size of the pipeline. A chunk that
+    is not full is published after max_chunk_delay. The time every chunk
+    waited for its samples is measured, the inlets measure the end-to-end
+    latency from the arrival of a chunk at the outlet to its reception.
+
+    Attributes
+    ----------
+    settings : OutletSettings
+        The configuration of the outlet
+    number_of_channels : int
+        Number of channels per sample
+    number_of_samples : int
+        Number of samples published
+    number_of_chunks : int
+        Number of chunks published
+    batching_latency : LatencyHistogram
+        Time the first sample of every chunk waited until it was published
+    """
+
+    def __init__(self, settings: OutletSettings, channel_names: List[str],
+                 sample_rate: float) -> None:
+        """
+        Create the outlet and announce the stream.
+
+        :param settings: The configuration of the outlet
+        :type settings: OutletSettings
+        :param channel_names: Names of the channels
+        :type channel_names: List[str]
+        :param sample_rate: Sample rate of the samples in Hz
+        :type sample_rate: float
+        :raises ValueError: if the transport is unknown or not available
+        """
+        if settings.transport not in get_available_transports():
+            raise ValueError(f"The {settings.transport} transport is not "
+                             f"available")
+        self.settings = settings
+        self.number_of_channels = len(channel_names)
+        self.number_of_samples = 0
+        self.number_of_chunks = 0
+        self.batching_latency = LatencyHistogram()
+        self.transport = TRANSPORTS[settings.transport](
+            settings, channel_names, sample_rate)
+        # The chunk that is being collected
+        self._pending = np.empty((settings.chunk_size,
+                                  self.number_of_channels),
+                                 dtype=SAMPLE_DTYPE)
+        self._pending_size = 0
+        self._pending_arrival_time = 0.0
+
+    def write_block(self, block: np.ndarray) -> None:
+        """
+        Add a block of samples, and publish the chunks that are complete.
+
+        :param block: Block of shape (samples, channels)
+        :type block: np.ndarray
+        """
+        now = time.monotonic()
+        chunk_size = self.settings.chunk_size
+        position = 0
+        number_of_samples = block.shape[0]
+        while position < number_of_samples:
+            if self._pending_size == 0:
+                self._pending_arrival_time = now
+                # Complete chunks in the block are published without
+                # copying them into the pending chunk first
+                if number_of_samples - position >= chunk_size:
+                    self._publish(block[position:position + chunk_size],
+                                  now)
+                    position += chunk_size
+                    continue
+            length = min(chunk_size - self._pending_size,
+                         number_of_samples - position)
+            self._pending[self._pending_size:self._pending_size + length] = (
+                block[position:position + length])
+            self._pending_size += length
+            position += length
+            if self._pending_size == chunk_size:
+                self.flush()
+        # Do not hold back the samples of a slow stream
+        if (self._pending_size and now - self._pending_arrival_time >=
+                self.settings.max_chunk_delay):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Publish the samples that are collected, even if the chunk is not
+        full.
+        """
+        if self._pending_size:
+            self._publish(self._pending[:self._pending_size],
+                          self._pending_arrival_time)
+            self._pending_size = 0
+
+    def get_statistics(self) -> Dict[str, object]:
+        """
+        :return: The number of published samples and chunks, and the
+                 batching latency
+        :rtype: Dict[str, object]
+        """
+        return {"samples": self.number_of_samples,
+                "chunks": self.number_of_chunks,
+                "batching_latency": self.batching_latency.to_dict()}
+
+    def close(self) -> None:
+        """
+        Publish the remaining samples and close the transport.
+        """
+        self.flush()
+        self.transport.close()
+
+    def _publish(self, chunk: np.ndarray, arrival_time: float) -> None:
+        """
+        Publish a chunk over the transport.
+        """
+        self.transport.publish(chunk, arrival_time)
+        self.batching_latency.add(time.monotonic() - arrival_time)
+        self.number_of_samples += chunk.shape[0]
+        self.number_of_chunks += 1
+
+
+class OutletStatistics:
+    """
+    The statistics of a stream outlet in shared memory, so the GUI can show
+    them while the outlet runs in the acquisition worker, without messages
+    over the control channel.
+
+    The worker copies the counters of the outlet with publish; the GUI
+    reads them with get_statistics. The values are only used for display,
+    so a read during a copy at most mixes two consecutive updates.
+    """
+
+    # Slots of the shared values, followed by the bucket counts of the
+    # batching latency
+    SLOT_STATE = 0
+    SLOT_SAMPLES = 1
+    SLOT_CHUNKS = 2
+    SLOT_LATENCY_COUNT = 3
+    SLOT_LATENCY_TOTAL = 4
+    SLOT_LATENCY_MAXIMUM = 5
+    SLOT_LATENCY_BUCKETS = 6
+    # Codes of the outlet states in SLOT_STATE
+    STATES = (OUTLET_STATE_STOPPED, OUTLET_STATE_STREAMING,
+              OUTLET_STATE_FAILED)
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        """
+        Create the shared statistics, or attach to existing ones.
+
+        :param name: Name of the shared memory to attach to, None to create
+                     it
+        :type name: str, optional
+        """
+        size = self.SLOT_LATENCY_BUCKETS + len(HISTOGRAM_BUCKETS) + 1
+        if name is None:
+            self.shared_memory = shared_memory.SharedMemory(create=True,
+                                                            size=size * 8)
+        else:
+            self.shared_memory = shared_memory.SharedMemory(name=name)
+        self.values = np.ndarray((size,), dtype=np.float64,
+                                 buffer=self.shared_memory.buf)
+        if name is None:
+            self.values[:] = 0
+
+    def get_name(self) -> str:
+        """
+        :return: Name of the shared memory, to attach from another process
+        :rtype: str
+        """
+        return self.shared_memory.name
+
+    def publish(self, stream_outlet: Optional["StreamOutlet"],
+                state: Optional[str] = None) -> None:
+        """
+        Copy the statistics of the outlet into the shared memory.
+
+        :param stream_outlet: The running outlet, None if none runs
+        :type stream_outlet: StreamOutlet or None
+        :param state: The state of the outlet, defaults to streaming if an
+                      outlet is given and stopped otherwise
+        :type state: str, optional
+        """
+        if state is None:
+            state = (OUTLET_STATE_STOPPED if stream_outlet is None
+                     else OUTLET_STATE_STREAMING)
+        if stream_outlet is None:
+            self.values[self.SLOT_SAMPLES:] = 0
+        else:
+            latency = stream_outlet.batching_latency
+            self.values[self.SLOT_SAMPLES:self.SLOT_LATENCY_BUCKETS] = (
+                stream_outlet.number_of_samples,
+                stream_outlet.number_of_chunks, latency.count,
+                latency.total, latency.maximum)
+            self.values[self.SLOT_LATENCY_BUCKETS:] = latency.counts
+        self.values[self.SLOT_STATE] = self.STATES.index(state)
+
+    def get_statistics(self) -> Dict[str, object]:
+        """
+        :return: The state of the outlet, the number of published samples
+                 and chunks, and the batching latency, as returned by
+                 StreamOutlet.get_statistics
+        :rtype: Dict[str, object]
+        """
+        values = self.values.copy()
+        latency = LatencyHistogram()
+        latency.counts = [int(count) for count in
+                          values[self.SLOT_LATENCY_BUCKETS:]]
+        latency.count = int(values[self.SLOT_LATENCY_COUNT])
+        latency.total = float(values[self.SLOT_LATENCY_TOTAL])
+        latency.maximum = float(values[self.SLOT_LATENCY_MAXIMUM])
+        return {"state": self.STATES[int(values[self.SLOT_STATE])],
+                "samples": int(values[self.SLOT_SAMPLES]),
+                "chunks": int(values[self.SLOT_CHUNKS]),
+                "batching_latency": latency.to_dict()}
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the shared memory.
+
+        :param unlink: Also remove the shared memory, by its creator
+        :type unlink: bool
+        """
+        self.values = None
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
+
+
+def find_streams() -> List[Dict[str, object]]:
+    """
+    :return: The descriptions of the shared memory streams on this machine
+    :rtype: List[Dict[str, object]]
+    """
+    descriptions = []
+    for path in sorted(glob.glob(os.path.join(STREAM_DIRECTORY, "*.json"))):
+        try:
+            with open(path) as description_file:
+                descriptions.append(json.load(description_file))
+        except (OSError, ValueError):
+            continue
+    return descriptions
+
+
+class StreamInlet:
+    """
+    Client of a shared memory stream of a StreamOutlet, for analysis tools
+    on the same machine.
+
+    Example:
+        inlet = StreamInlet("TMSi")
+        while True:
+            samples = inlet.pull_chunk()
+
+    Attributes
+    ----------
+    name : str
+        Name of the stream
+    sample_rate : float
+        Sample rate of the stream in Hz
+    channel_names : List[str]
+        Names of the channels
+    latency : LatencyHistogram
+        Time from the arrival of every chunk at the outlet until it was
+        pulled by this inlet
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Connect to a stream, starting at its newest sample.
+
+        :param name: Name of the stream
+        :type name: str
+        :raises LookupError: if no stream with this name is published
+        """
+        description = next((description for description in find_streams()
+                            if description["name"] == name), None)
+        if description is None:
+            raise LookupError(f"No stream with the name {name} is "
+                              f"published")
+        self.name = name
+        self.sample_rate: float = description["sample_rate"]
+        self.channel_names: List[str] = description["channel_names"]
+        self.latency = LatencyHistogram()
+        self.ring_buffer = SampleRingBuffer.attach(description["samples"])
+        self.chunk_log = _ChunkLog(name=description["chunks"])
+        self.reader: RingBufferReader = self.ring_buffer.create_reader()
+        self._chunk_cursor = self.chunk_log.get_count()
+
+    def pull_chunk(self, max_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Get the samples that were published since the last pull. Samples
+        that the outlet overwrote while they were copied are dropped and
+        counted as lost by the reader.
+
+        :param max_samples: Maximum number of samples to get
+        :type max_samples: int, optional
+        :return: Copy of the samples, shape (samples, channels)
+        :rtype: np.ndarray
+        """
+        views = self.reader.read(max_samples)
+        samples = (np.concatenate(views) if views else
+                   np.empty((0, len(self.channel_names)),
+                            dtype=SAMPLE_DTYPE))
+        if not self.reader.is_last_read_valid():
+            # Only the oldest samples of the copy can have been overwritten:
+            # those further back than the capacity from the newest write
+            first_index = self.reader.cursor - len(samples)
+            overwritten = min(self.ring_buffer.get_pending_write_end() -
+                              self.ring_buffer.capacity - first_index,
+                              len(samples))
+            self.reader.overrun_count += 1
+            self.reader.lost_samples += overwritten
+            samples = samples[overwritten:]
+        self._measure_latency(time.monotonic())
+        return samples
+
+    def get_latency(self) -> Tuple[float, float]:
+        """
+        :return: Mean and 95th percentile of the latency in seconds
+        :rtype: Tuple[float, float]
+        """
+        return self.latency.get_mean(), self.latency.get_percentile(95)
+
+    def close(self) -> None:
+        """
+        Disconnect from the stream.
+        """
+        self.reader = None
+        self.ring_buffer.close()
+        self.chunk_log.close()
+
+    def _measure_latency(self, now: float) -> None:
+        """
+        Add the latency of the chunks that were completely pulled.
+
+        :param now: time.monotonic() at which the chunks were pulled
+        :type now: float
+        """
+        count = self.chunk_log.get_count()
+        # Records that were overwritten before this inlet saw them are
+        # skipped
+        first = max(self._chunk_cursor, count - self.chunk_log.capacity)
+        for index in range(first, count):
+            end_index, arrival_time, _ = self.chunk_log.records[
+                index % self.chunk_log.capacity]
+            if end_index > self.reader.cursor:
+                count = index
+                break
+            self.latency.add(now - arrival_time)
+        self._chunk_cursor = count
@@ -0,0 +1,486 @@
+import datetime
+import os
+import sqlite3
+from functools import partial
+from typing import Dict, List
+
+from PySide6.QtWidgets import (QWidget, QLineEdit, QTableView, QVBoxLayout,
+                               QHeaderView, QAbstractItemView)
+from PySide6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QTimer,
+                            QFileSystemWatcher, QThreadPool, Signal)
+
+from application.Styling.general_style_elements import GeneralStyleElements
+from application.Views.classes.storage.disk_preflight import format_duration
+from application.Views.classes.storage.recording_catalog import (
+    RecordingCatalog, SORTABLE_COLUMNS)
+
+# Time in milliseconds to wait after the last file system change before the
+# catalog is refreshed. Recordings that are being written trigger many
+# change notifications.
+REFRESH_DEBOUNCE_INTERVAL: int = 1000
+# Time in milliseconds to wait after the last keystroke before searching
+SEARCH_DEBOUNCE_INTERVAL: int = 200
+
+
+class RecordingCatalogTableModel(QAbstractTableModel):
+    """
+    Table model that shows the result of a catalog search. Sorting is done
+    by the catalog database, not by Qt.
+
+    Attributes
+    ----------
+    catalog : RecordingCatalog
+        The catalog to search in
+    rows : List[Dict[str, object]]
+        The recordings currently shown
+    search_text : str
+        The text the recordings are filtered on
+    sort_column : str
+        The catalog column the recordings are sorted on
+    descending : bool
+        Whether the recordings are sorted in descending order
+    """
+
+    def __init__(self, parent=None) -> None:
+        """
+        Initialize an empty table model.
+
+        :param parent: Parent object
+        :type parent: QObject
+        """
+        super().__init__(parent)
+        self.catalog: RecordingCatalog = None
+        self.rows: List[Dict[str, object]] = []
+        self.search_text = ""
+        self.sort_column = "recorded_at"
+        self.descending = True
+        self.headers = [self.tr("Name"), self.tr("Subject"), self.tr("Date"),
+                        self.tr("Duration"), self.tr("Devices"),
+                        self.tr("Format"), self.tr("Size")]
+
+    def set_catalog(self, catalog: RecordingCatalog) -> None:
+        """
+        Set the catalog to show and load its recordings.
+
+        :param catalog: The catalog to show
+        :type catalog: RecordingCatalog
+        """
+        self.catalog = catalog
+        self.reload()
+
+    def set_search_text(self, search_text: str) -> None:
+        """
+        Filter the recordings on the search text.
+
+        :param search_text: Text to search for
+        :type search_text: str
+        """
+        self.search_text = search_text
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Query the catalog again with the current search and sort settings.
+        """
+        self.beginResetModel()
+        if self.catalog is None:
+            self.rows = []
+        else:
+            self.rows = self.catalog.search(
+                text=self.search_text, sort_column=self.sort_column,
+                descending=self.descending)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """
+        :return: Number of recordings shown
+        :rtype: int
+        """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """
+        :return: Number of columns shown
+        :rtype: int
+        """
+        return 0 if parent.isValid() else len(SORTABLE_COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        :return: The header text of a column
+        :rtype: str
+        """
+        if (orientation == Qt.Orientation.Horizontal and
+                role == Qt.ItemDataRole.DisplayRole):
+            return self.headers[section]
+        return None
+
+    def data(self, index: QModelIndex,
+             role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        :return: The formatted value of a cell
+        :rtype: str
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        column = SORTABLE_COLUMNS[index.column()]
+        value = row[column]
+        if value is None:
+            return ""
+        if column == "recorded_at":
+            return datetime.datetime.fromtimestamp(value).strftime(
+                "%Y-%m-%d %H:%M")
+        if column == "duration":
+            return format_duration(value)
+        if column == "size":
+            return f"{value / (1024 * 1024):.1f} MB"
+        return str(value)
+
+    def sort(self, column: int,
+             order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Sort the recordings on a column by querying the catalog again.
+
+        :param column: Index of the column to sort on
+        :type column: int
+        :param order: The sort order
+        :type order: Qt.SortOrder
+        """
+        self.sort_column = SORTABLE_COLUMNS[column]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    def get_path(self, row: int) -> str:
+        """
+        :return: The path of the recording in a row
+        :rtype: str
+        """
+        return self.rows[row]["path"]
+
+
+class RecordingCatalogView(QWidget):
+    """
+    Panel that lists the recordings in the storage folder, with search and
+    sort.
+
+    The catalog is kept up to date by watching the folder and all its
+    subdirectories: a change notification (debounced) triggers an
+    incremental refresh of the catalog. The refresh lists directories and
+    writes the database, so it runs in the refresh thread, with its own
+    connection to the database; the view only searches the catalog.
+
+    A catalog that can not be opened, e.g. because it is locked by another
+    instance of the application, is turned off with a warning.
+
+    Signals
+    ---------------
+    sig_recording_selected : Signal(str)
+        Emits the path of the recording the user double clicked.
+    sig_refresh_finished : Signal(int, int, object)
+        Emitted from the refresh thread with the number of the folder, the
+        number of changes and the indexed directories, or None if the
+        catalog could not be refreshed.
+    """
+    sig_recording_selected = Signal(str)
+    sig_refresh_finished = Signal(int, int, object)
+
+    def __init__(self, folder: str, recording_extensions: List[str],
+                 parent: QWidget = None) -> None:
+        """
+        Initialize the catalog panel for the storage folder.
+
+        :param folder: The storage folder
+        :type folder: str
+        :param recording_extensions: File extensions of recordings
+        :type recording_extensions: List[str]
+        :param parent: Parent widget
+        :type parent: QWidget
+        """
+        super().__init__(parent)
+        self.style_class = GeneralStyleElements()
+        self.recording_extensions = recording_extensions
+        self.folder: str = None
+        self.catalog: RecordingCatalog = None
+        # Refreshes the catalog outside the GUI thread, one refresh at a time
+        self.refresh_pool = QThreadPool(self)
+        self.refresh_pool.setMaxThreadCount(1)
+        # Number of the folder that is shown, refreshes of a previous folder
+        # are ignored
+        self.folder_number = 0
+
+        # Watch the storage folder and refresh shortly after it changed
+        self.file_system_watcher = QFileSystemWatcher(self)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_DEBOUNCE_INTERVAL)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_INTERVAL)
+
+        self.setup_local_ui_elements()
+        self.connect_widgets_to_actions()
+        self.connect_signals_to_actions()
+        self.set_folder(folder)
+
+    def setup_local_ui_elements(self) -> None:
+        """
+        Create the search field and the table with the recordings.
+        """
+        self.le_search = QLineEdit(self)
+        self.le_search.setPlaceholderText(
+            self.tr("Search by name, subject, device or format"))
+
+        self.table_model = RecordingCatalogTableModel(self)
+        self.table_recordings = QTableView(self)
+        self.table_recordings.setModel(self.table_model)
+        self.table_recordings.setSortingEnabled(True)
+        self.table_recordings.sortByColumn(
+            SORTABLE_COLUMNS.index("recorded_at"),
+            Qt.SortOrder.DescendingOrder)
+        self.table_recordings.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_recordings.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table_recordings.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_recordings.verticalHeader().setVisible(False)
+        self.table_recordings.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.ResizeToContents)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.le_search)
+        layout.addWidget(self.table_recordings)
+
+    def connect_widgets_to_actions(self) -> None:
+        """
+        Connect the search field and the table to their actions.
+        """
+        self.le_search.textChanged.connect(self.search_timer.start)
+        self.table_recordings.doubleClicked.connect(
+            self._on_recording_double_clicked)
+
+    def connect_signals_to_actions(self) -> None:
+        """
+        Connect the file system watcher and timers to their actions.
+        """
+        self.file_system_watcher.directoryChanged.connect(
+            self.refresh_timer.start)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.search_timer.timeout.connect(self._on_search_text_changed)
+        self.sig_refresh_finished.connect(self._on_refresh_finished)
+
+    def disconnect_signals_from_actions(self) -> None:
+        """
+        Disconnect the file system watcher and timers from their actions.
+        """
+        self.file_system_watcher.directoryChanged.disconnect(
+            self.refresh_timer.start)
+        self.refresh_timer.timeout.disconnect(self.refresh)
+        self.search_timer.timeout.disconnect(self._on_search_text_changed)
+        self.sig_refresh_finished.disconnect(self._on_refresh_finished)
+
+    def set_folder(self, folder: str) -> None:
+        """
+        Show the catalog of another storage folder. The recordings are shown
+        once the first refresh of the folder finished.
+
+        :param folder: The storage folder
+        :type folder: str
+        """
+        self.folder_number += 1
+        self.refresh_timer.stop()
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
+        self.table_model.set_catalog(None)
+        self._watch_directories([])
+
+        self.folder = folder if folder and os.path.isdir(folder) else None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Update the catalog with the changes in the storage folder in the
+        refresh thread; the result is shown by _on_refresh_finished.
+        """
+        if self.folder is None:
+            return
+        self.refresh_pool.start(partial(
+            self._refresh_in_thread, self.folder_number, self.folder))
+
+    def _refresh_in_thread(self, folder_number: int, folder: str) -> None:
+        """
+        Refresh the catalog of a folder in the refresh thread and emit the
+        result.
+
+        :param folder_number: Number of the folder when it was selected
+        :type folder_number: int
+        :param folder: The storage folder
+        :type folder: str
+        """
+        if folder_number != self.folder_number:
+            return
+        try:
+            catalog = RecordingCatalog(folder, self.recording_extensions)
+            try:
+                number_of_changes = catalog.refresh()
+                directories = catalog.get_directories()
+            finally:
+                catalog.close()
+        except (sqlite3.Error, OSError) as error:
+            print(f"Warning: the recording catalog of {folder} can not be "
+                  f"used: {error}")
+            self.sig_refresh_finished.emit(folder_number, 0, None)
+            return
+        self.sig_refresh_finished.emit(folder_number, number_of_changes,
+                                       directories)
+
+    def update_recording_metadata(self, path: str,
+                                  **metadata: object) -> None:
+        """
+        Store the metadata of a recording in the storage folder, e.g. after
+        the writer closed it. The catalog is written in the refresh thread;
+        the table shows the metadata once it is stored.
+
+        :param path: Path of the recording
+        :type path: str
+        :param metadata: The subject, duration and devices, see
+                         RecordingCatalog.update_recording_metadata
+        :type metadata: object
+        """
+        if self.folder is None:
+            return
+        # Recordings outside the storage folder are not in its catalog
+        path = os.path.abspath(path)
+        if not path.startswith(os.path.join(os.path.abspath(self.folder),
+                                            "")):
+            return
+        self.refresh_pool.start(partial(
+            self._update_metadata_in_thread, self.folder_number, self.folder,
+            path, metadata))
+
+    def _update_metadata_in_thread(self, folder_number: int, folder: str,
+                                   path: str,
+                                   metadata: Dict[str, object]) -> None:
+        """
+        Store the metadata of a recording in the refresh thread and emit
+        the result like a refresh.
+
+        :param folder_number: Number of the folder when it was selected
+        :type folder_number: int
+        :param folder: The storage folder
+        :type folder: str
+        :param path: Path of the recording
+        :type path: str
+        :param metadata: The metadata, keyed by the arguments of
+                         RecordingCatalog.update_recording_metadata
+        :type metadata: Dict[str, object]
+        """
+        if folder_number != self.folder_number:
+            return
+        try:
+            catalog = RecordingCatalog(folder, self.recording_extensions)
+            try:
+                catalog.update_recording_metadata(path, **metadata)
+                directories = catalog.get_directories()
+            finally:
+                catalog.close()
+        except (sqlite3.Error, OSError) as error:
+            print(f"Warning: the metadata of {path} can not be stored in "
+                  f"the recording catalog: {error}")
+            return
+        self.sig_refresh_finished.emit(folder_number, 1, directories)
+
+    def _on_refresh_finished(self, folder_number: int,
+                             number_of_changes: int, directories) -> None:
+        """
+        Show the refreshed catalog and watch the directories that were
+        found.
+
+        :param folder_number: Number of the folder that was refreshed
+        :type folder_number: int
+        :param number_of_changes: Number of recordings that changed
+        :type number_of_changes: int
+        :param directories: The indexed directories, None if the refresh
+                            failed
+        :type directories: List[str] or None
+        """
+        if folder_number != self.folder_number:
+            return
+        if directories is None:
+            # Turn the catalog off, it is refreshed again when the folder
+            # is selected again
+            self.set_folder(None)
+            return
+        self._watch_directories(directories)
+        if self.catalog is None:
+            try:
+                self.catalog = RecordingCatalog(self.folder,
+                                                self.recording_extensions)
+            except (sqlite3.Error, OSError) as error:
+                print(f"Warning: the recording catalog of {self.folder} "
+                      f"can not be used: {error}")
+                self.set_folder(None)
+                return
+            self.table_model.set_catalog(self.catalog)
+        elif number_of_changes > 0:
+            self.table_model.reload()
+
+    def _watch_directories(self, directories: List[str]) -> None:
+        """
+        Watch exactly the given directories for changes.
+
+        :param directories: The directories to watch
+        :type directories: List[str]
+        """
+        watched_directories = set(self.file_system_watcher.directories())
+        removed_directories = watched_directories - set(directories)
+        added_directories = set(directories) - watched_directories
+        if removed_directories:
+            self.file_system_watcher.removePaths(list(removed_directories))
+        if added_directories:
+            self.file_system_watcher.addPaths(sorted(added_directories))
+
+    def get_selected_paths(self) -> List[str]:
+        """
+        Get the paths of the recordings selected in the table.
+
+        :return: Paths of the selected recordings
+        :rtype: List[str]
+        """
+        return [self.table_model.get_path(index.row()) for index in
+                self.table_recordings.selectionModel().selectedRows()]
+
+    def _on_search_text_changed(self) -> None:
+        """
+        Filter the recordings on the text in the search field.
+        """
+        self.table_model.set_search_text(self.le_search.text())
+
+    def _on_recording_double_clicked(self, index: QModelIndex) -> None:
+        """
+        Emit the path of the recording that was double clicked.
+
+        :param index: Index of the cell that was double clicked
+        :type index: QModelIndex
+        """
+        self.sig_recording_selected.emit(
+            self.table_model.get_path(index.row()))
+
+    def close_widget(self) -> None:
+        """
+        Disconnect all signals and close the catalog.
+        """
+        self.disconnect_signals_from_actions()
+        self.refresh_timer.stop()
+        self.search_timer.stop()
+        # Ignore the refresh that might still run
+        self.folder_number += 1
+        self.refresh_pool.clear()
+        self.refresh_pool.waitForDone()
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
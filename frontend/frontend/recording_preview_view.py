@@ -0,0 +1,201 @@
+import os
+
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPainter, QColor
+
+from application.Styling.general_style_elements import GeneralStyleElements
+from application.Views.classes.elements.signal_raster import (
+    create_image, rasterize_columns)
+from application.Views.classes.storage.envelope_pyramid import (
+    EnvelopePyramidReader)
+
+# Minimum number of samples that is shown over the full width of the widget
+MIN_VISIBLE_SAMPLES: int = 64
+# Factor by which one step of the mouse wheel zooms in or out
+ZOOM_STEP_FACTOR: float = 1.25
+# Vertical space in pixels between the channel rows
+CHANNEL_ROW_MARGIN: int = 2
+# Colors used for the envelope and the background
+ENVELOPE_COLOR: QColor = QColor(0, 94, 184)
+BACKGROUND_COLOR: QColor = QColor(255, 255, 255)
+
+
+class RecordingPreviewView(QWidget):
+    """
+    Widget that shows the min/max envelope of all channels of a finished (or
+    running) recording.
+
+    Only the pyramid level that matches the current zoom is read, through
+    memory-mapped I/O, so any zoom level of a multi-hour recording renders
+    without loading the recording itself. Zoom with the mouse wheel, pan by
+    dragging.
+
+    Attributes
+    ----------
+    reader : EnvelopePyramidReader
+        Reads the envelope pyramid of the recording
+    visible_start : int
+        First sample shown
+    visible_stop : int
+        Sample after the last sample shown
+    """
+
+    def __init__(self, recording_path: str, parent: QWidget = None) -> None:
+        """
+        Initialize the preview of a recording.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :param parent: Parent widget
+        :type parent: QWidget
+        :raises FileNotFoundError: if the recording has no envelope pyramid
+        """
+        super().__init__(parent)
+        self.style_class = GeneralStyleElements()
+        self.reader = EnvelopePyramidReader(recording_path)
+        self.visible_start = 0
+        self.visible_stop = max(self.reader.get_number_of_samples(),
+                                MIN_VISIBLE_SAMPLES)
+        self._drag_start_x: float = None
+        self.setup_local_ui_elements(recording_path)
+
+    def setup_local_ui_elements(self, recording_path: str) -> None:
+        """
+        Set the window title and the default size of the preview.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        """
+        self.setWindowTitle(self.tr("Preview: ") +
+                            os.path.basename(recording_path))
+        self.setMinimumSize(400, 200)
+        self.resize(1000, 600)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def paintEvent(self, event) -> None:
+        """
+        Paint the envelope of every channel in its own row. Every pixel
+        column is a vertical line from the minimum to the maximum; the
+        lines of all columns and channels are rasterized with NumPy and
+        drawn as a single image.
+
+        :param event: The paint event
+        :type event: QPaintEvent
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+
+        width = self.width()
+        envelope = self.reader.get_envelope(
+            self.visible_start, self.visible_stop, width)
+        number_of_channels = self.reader.number_of_channels
+        if envelope.shape[0] == 0 or number_of_channels == 0:
+            painter.end()
+            return
+
+        # Scale every channel to its own row. Gaps in the recording are NaN
+        # and are neither scaled nor drawn.
+        row_height = self.height() / number_of_channels
+        minimum = np.nan_to_num(np.fmin.reduce(envelope[..., 0], axis=0))
+        maximum = np.nan_to_num(np.fmax.reduce(envelope[..., 1], axis=0))
+        value_range = np.where(maximum > minimum, maximum - minimum, 1.0)
+        usable_height = max(row_height - 2 * CHANNEL_ROW_MARGIN, 1)
+        row_bottom = (np.arange(1, number_of_channels + 1) * row_height -
+                      CHANNEL_ROW_MARGIN)
+        y_minimum = row_bottom - (envelope[..., 0] - minimum) / \
+            value_range * usable_height
+        y_maximum = row_bottom - (envelope[..., 1] - minimum) / \
+            value_range * usable_height
+
+        # Spread the columns over the width of the widget
+        x = np.rint(np.linspace(0, width - 1, envelope.shape[0]))
+        x = np.broadcast_to(x[:, np.newaxis], y_minimum.shape)
+        valid = ~np.isnan(envelope[..., 0])
+        pixels = rasterize_columns(x[valid], y_maximum[valid],
+                                   y_minimum[valid], width, self.height(),
+                                   ENVELOPE_COLOR, BACKGROUND_COLOR)
+        # The pixel array is alive until the painting is done
+        painter.drawImage(0, 0, create_image(pixels))
+        painter.end()
+
+    def wheelEvent(self, event) -> None:
+        """
+        Zoom in or out around the position of the mouse.
+
+        :param event: The wheel event
+        :type event: QWheelEvent
+        """
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        visible_samples = self.visible_stop - self.visible_start
+        anchor = self.visible_start + visible_samples * (
+            event.position().x() / max(self.width(), 1))
+        new_visible_samples = visible_samples / ZOOM_STEP_FACTOR ** steps
+        new_visible_samples = min(
+            max(new_visible_samples, MIN_VISIBLE_SAMPLES),
+            max(self.reader.get_number_of_samples(), MIN_VISIBLE_SAMPLES))
+        scale = new_visible_samples / visible_samples
+        self._set_visible_range(
+            anchor - (anchor - self.visible_start) * scale,
+            new_visible_samples)
+
+    def mousePressEvent(self, event) -> None:
+        """
+        Start dragging the visible range.
+
+        :param event: The mouse event
+        :type event: QMouseEvent
+        """
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_start_x = event.position().x()
+
+    def mouseMoveEvent(self, event) -> None:
+        """
+        Move the visible range along with the mouse.
+
+        :param event: The mouse event
+        :type event: QMouseEvent
+        """
+        if self._drag_start_x is None:
+            return
+        visible_samples = self.visible_stop - self.visible_start
+        moved_samples = ((self._drag_start_x - event.position().x()) *
+                         visible_samples / max(self.width(), 1))
+        self._drag_start_x = event.position().x()
+        self._set_visible_range(self.visible_start + moved_samples,
+                                visible_samples)
+
+    def mouseReleaseEvent(self, event) -> None:
+        """
+        Stop dragging the visible range.
+
+        :param event: The mouse event
+        :type event: QMouseEvent
+        """
+        self._drag_start_x = None
+
+    def _set_visible_range(self, start: float, visible_samples: float
+                           ) -> None:
+        """
+        Show a range of samples, kept within the recording, and repaint.
+
+        :param start: First sample to show
+        :type start: float
+        :param visible_samples: Number of samples to show
+        :type visible_samples: float
+        """
+        number_of_samples = max(self.reader.get_number_of_samples(),
+                                MIN_VISIBLE_SAMPLES)
+        start = min(max(start, 0), number_of_samples - visible_samples)
+        self.visible_start = int(start)
+        self.visible_stop = int(start + visible_samples)
+        self.update()
+
+    def close_widget(self) -> None:
+        """
+        Close the preview.
+        """
+        self.close()
@@ -0,0 +1,390 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+# Number of samples that is read and written per chunk. Together with the
+# number of channels this bounds the memory used per conversion.
+DEFAULT_CHUNK_SIZE: int = 65536
+# Start method of the worker processes. Spawn rather than fork, so the
+# workers do not inherit the state of the Qt application.
+WORKER_START_METHOD: str = "spawn"
+
+# Maps a lower case file extension (without dot) to the import paths of the
+# classes that read and write that format, as "module:ClassName". Import paths
+# are used instead of classes so the worker processes can resolve them after
+# being spawned.
+#
+# A reader is constructed with the path of the file and provides
+#   get_sample_rate() -> float, get_channel_names() -> List[str],
+#   iter_chunks(chunk_size) yielding arrays of shape (samples, channels) and
+#   close().
+# A writer is constructed with the path, the channel names and the sample
+# rate, and provides write_block(samples) and close(), like the other block
+# sinks of the save pipeline.
+FILE_FORMAT_CODECS: Dict[str, Dict[str, str]] = {}
+
+
+class ConversionResult:
+    """
+    Outcome of the conversion of a single file.
+
+    Attributes
+    ----------
+    source_path : str
+        The file that was converted
+    target_path : str
+        The file that was written
+    bytes_read : int
+        Size of the source file in bytes
+    duration : float
+        Time the conversion took in seconds
+    error : str or None
+        Description of the error, None if the conversion succeeded
+    """
+
+    def __init__(self, source_path: str, target_path: str, bytes_read: int,
+                 duration: float, error: Optional[str] = None) -> None:
+        self.source_path = source_path
+        self.target_path = target_path
+        self.bytes_read = bytes_read
+        self.duration = duration
+        self.error = error
+
+    def get_throughput(self) -> float:
+        """
+        :return: Conversion throughput in bytes of source file per second
+        :rtype: float
+        """
+        return self.bytes_read / max(self.duration, 1e-6)
+
+
+def register_file_format(extension: str, reader: str, writer: str) -> None:
+    """
+    Register the reader and writer of a file format for conversion.
+
+    :param extension: File extension of the format, e.g. "poly5"
+    :type extension: str
+    :param reader: Import path of the reader class, "module:ClassName"
+    :type reader: str
+    :param writer: Import path of the writer class, "module:ClassName"
+    :type writer: str
+    """
+    FILE_FORMAT_CODECS[extension.lower().lstrip(".")] = {
+        "reader": reader, "writer": writer}
+
+
+def register_file_formats(codecs: Dict[str, Dict[str, str]]) -> None:
+    """
+    Register the readers and writers of several file formats, e.g. the
+    codecs saved in the settings.
+
+    :param codecs: Maps the extension of every format to the import paths
+                   of its "reader" and "writer"
+    :type codecs: Dict[str, Dict[str, str]]
+    """
+    for extension, codec in codecs.items():
+        try:
+            register_file_format(extension, codec["reader"], codec["writer"])
+        except (KeyError, TypeError, AttributeError):
+            print(f"Warning: the codec of the .{extension} format is "
+                  f"invalid and is ignored")
+
+
+def get_target_path(source_path: str, target_format: str,
+                    target_folder: Optional[str] = None) -> str:
+    """
+    Get the path of the converted file: same name, new extension.
+
+    :param source_path: Path of the file to convert
+    :type source_path: str
+    :param target_format: Extension of the format to convert to
+    :type target_format: str
+    :param target_folder: Folder for the converted file, defaults to the
+                          folder of the source file
+    :type target_folder: str, optional
+    :return: Path of the converted file
+    :rtype: str
+    """
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    folder = target_folder or os.path.dirname(source_path)
+    return os.path.join(folder,
+                        f"{stem}.{target_format.lower().lstrip('.')}")
+
+
+def convert_file(source_path: str, target_path: str,
+                 codecs: Dict[str, Dict[str, str]],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> ConversionResult:
+    """
+    Convert a single file by streaming it chunk by chunk from the reader of
+    its format to the writer of the target format. Runs in a worker process.
+
+    :param source_path: Path of the file to convert
+    :type source_path: str
+    :param target_path: Path of the file to write
+    :type target_path: str
+    :param codecs: The registered file format codecs
+    :type codecs: Dict[str, Dict[str, str]]
+    :param chunk_size: Number of samples per chunk
+    :type chunk_size: int
+    :return: The outcome of the conversion
+    :rtype: ConversionResult
+    """
+    start_time = time.perf_counter()
+    try:
+        bytes_read = os.path.getsize(source_path)
+        # The writer would truncate the file that is being read
+        if (os.path.exists(target_path) and
+                os.path.samefile(source_path, target_path)):
+            raise ValueError("The recording is already in this format")
+        source_format = os.path.splitext(source_path)[1].lower().lstrip(".")
+        target_format = os.path.splitext(target_path)[1].lower().lstrip(".")
+        reader_class = _resolve_codec(codecs, source_format, "reader")
+        writer_class = _resolve_codec(codecs, target_format, "writer")
+
+        reader = reader_class(source_path)
+        try:
+            writer = writer_class(target_path, reader.get_channel_names(),
+                                  reader.get_sample_rate())
+            try:
+                for chunk in reader.iter_chunks(chunk_size):
+                    writer.write_block(chunk)
+            finally:
+                writer.close()
+        finally:
+            reader.close()
+    except Exception as error:
+        return ConversionResult(source_path, target_path, 0,
+                                time.perf_counter() - start_time,
+                                f"{type(error).__name__}: {error}")
+    return ConversionResult(source_path, target_path, bytes_read,
+                            time.perf_counter() - start_time)
+
+
+class BatchConverter:
+    """
+    Converts many files in parallel in a pool of worker processes.
+
+    Each file is converted by one worker, so converting a day of sessions
+    scales with the number of cores, while the memory per worker stays
+    bounded by the chunk size.
+
+    Attributes
+    ----------
+    max_workers : int
+        Number of worker processes
+    chunk_size : int
+        Number of samples per chunk
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Initialize the batch converter.
+
+        :param max_workers: Number of worker processes, defaults to the
+                            number of cores
+        :type max_workers: int, optional
+        :param chunk_size: Number of samples per chunk
+        :type chunk_size: int
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor: ProcessPoolExecutor = None
+        self.futures: list = []
+
+    def submit(self, source_paths: List[str], target_format: str,
+               target_folder: Optional[str] = None) -> None:
+        """
+        Start converting the files in the background. Use
+        iter_completed to collect the results.
+
+        :param source_paths: Paths of the files to convert
+        :type source_paths: List[str]
+        :param target_format: Extension of the format to convert to
+        :type target_format: str
+        :param target_folder: Folder for the converted files, defaults to the
+                              folder of each source file
+        :type target_folder: str, optional
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, max(len(source_paths), 1)),
+                mp_context=multiprocessing.get_context(WORKER_START_METHOD))
+        for source_path in source_paths:
+            self.futures.append(self.executor.submit(
+                convert_file, source_path,
+                get_target_path(source_path, target_format, target_folder),
+                dict(FILE_FORMAT_CODECS), self.chunk_size))
+
+    def iter_completed(self):
+        """
+        Yield the results in the order the conversions finish.
+
+        :return: Generator of the conversion results
+        :rtype: Generator[ConversionResult]
+        """
+        for future in as_completed(self.futures):
+            yield future.result()
+        self.futures = []
+
+    def pop_completed(self) -> List[ConversionResult]:
+        """
+        Get the results of the conversions that finished so far, without
+        waiting. Used by the GUI to poll for progress.
+
+        :return: The results that finished since the last call
+        :rtype: List[ConversionResult]
+        """
+        finished = []
+        running = []
+        # Check every future once, a future that finishes in between
+        # would otherwise be in neither list
+        for future in self.futures:
+            (finished if future.done() else running).append(future)
+        self.futures = running
+        return [future.result() for future in finished]
+
+    def is_running(self) -> bool:
+        """
+        :return: Whether conversions are still running
+        :rtype: bool
+        """
+        return bool(self.futures)
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        """
+        Stop the worker processes.
+
+        :param cancel_pending: Cancel the conversions that did not start yet
+        :type cancel_pending: bool
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=not cancel_pending,
+                                   cancel_futures=cancel_pending)
+            self.executor = None
+        self.futures = []
+
+    def convert(self, source_paths: List[str], target_format: str,
+                target_folder: Optional[str] = None,
+                progress_callback: Callable[[int, int, ConversionResult],
+                                            None] = None
+                ) -> List[ConversionResult]:
+        """
+        Convert the files and wait until all are done.
+
+        :param source_paths: Paths of the files to convert
+        :type source_paths: List[str]
+        :param target_format: Extension of the format to convert to
+        :type target_format: str
+        :param target_folder: Folder for the converted files
+        :type target_folder: str, optional
+        :param progress_callback: Called with the number of finished files,
+                                  the total number of files and the result
+                                  of the file that finished
+        :type progress_callback: Callable, optional
+        :return: The results of all conversions
+        :rtype: List[ConversionResult]
+        """
+        results: List[ConversionResult] = []
+        self.submit(source_paths, target_format, target_folder)
+        try:
+            for result in self.iter_completed():
+                results.append(result)
+                if progress_callback is not None:
+                    progress_callback(len(results), len(source_paths),
+                                      result)
+        finally:
+            self.shutdown()
+        return results
+
+
+def _resolve_codec(codecs: Dict[str, Dict[str, str]], file_format: str,
+                   role: str) -> type:
+    """
+    Import the reader or writer class of a file format.
+
+    :param codecs: The registered file format codecs
+    :type codecs: Dict[str, Dict[str, str]]
+    :param file_format: Extension of the format
+    :type file_format: str
+    :param role: "reader" or "writer"
+    :type role: str
+    :raises ValueError: if the format has no registered codec
+    :return: The reader or writer class
+    :rtype: type
+    """
+    if file_format not in codecs:
+        raise ValueError(f"No {role} is registered for the "
+                         f".{file_format} format")
+    module_name, class_name = codecs[file_format][role].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _print_progress(number_finished: int, number_of_files: int,
+                    result: ConversionResult) -> None:
+    """
+    Print the progress of the conversion to the terminal.
+    """
+    if result.error is None:
+        status = f"{result.get_throughput() / (1024 * 1024):.1f} MB/s"
+    else:
+        status = f"failed: {result.error}"
+    print(f"[{number_finished}/{number_of_files}] "
+          f"{os.path.basename(result.source_path)} -> "
+          f"{os.path.basename(result.target_path)} ({status})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point of the batch converter.
+
+    :param argv: Command line arguments, defaults to sys.argv
+    :type argv: List[str], optional
+    :return: Exit code, 1 if any conversion failed
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert recordings to another file format in "
+                    "parallel.")
+    parser.add_argument("files", nargs="+", help="Recordings to convert")
+    parser.add_argument("--to", required=True, dest="target_format",
+                        help="Extension of the format to convert to")
+    parser.add_argument("--output-folder", default=None,
+                        help="Folder for the converted files")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Number of samples per chunk")
+    parser.add_argument("--codec", action="append", default=[],
+                        metavar="EXTENSION=READER,WRITER",
+                        help="Register a file format, e.g. "
+                             "poly5=module:Reader,module:Writer")
+    arguments = parser.parse_args(argv)
+
+    for codec in arguments.codec:
+        try:
+            extension, classes = codec.split("=")
+            reader, writer = classes.split(",")
+        except ValueError:
+            parser.error(f"Invalid codec {codec}")
+        register_file_format(extension, reader, writer)
+
+    start_time = time.perf_counter()
+    converter = BatchConverter(max_workers=arguments.workers,
+                               chunk_size=arguments.chunk_size)
+    results = converter.convert(arguments.files, arguments.target_format,
+                                arguments.output_folder, _print_progress)
+    total_bytes = sum(result.bytes_read for result in results)
+    duration = time.perf_counter() - start_time
+    print(f"Converted {len(results)} files in {duration:.1f} s "
+          f"({total_bytes / max(duration, 1e-6) / (1024 * 1024):.1f} MB/s)")
+    return int(any(result.error is not None for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Size of a single block written during the write benchmark (1 MiB)
+BENCHMARK_BLOCK_SIZE_BYTES: int = 1024 * 1024
+# Maximum amount of data written during the write benchmark (16 MiB)
+BENCHMARK_MAX_SIZE_BYTES: int = 16 * BENCHMARK_BLOCK_SIZE_BYTES
+# Maximum time in seconds the write benchmark is allowed to take
+BENCHMARK_MAX_DURATION_SECONDS: float = 1.0
+# The measured write throughput must be this many times higher than the
+# required data rate of the recording
+REQUIRED_THROUGHPUT_SAFETY_FACTOR: float = 4.0
+# Storage below this throughput (in bytes per second) is reported as slow
+SLOW_STORAGE_THROUGHPUT_BYTES_PER_SECOND: float = 20 * 1024 * 1024
+# Free space that is kept available for the operating system and sidecars
+RESERVED_FREE_SPACE_BYTES: int = 512 * 1024 * 1024
+
+# Default recording configuration used when nothing else is known yet. These
+# values describe the most demanding configuration the application supports.
+DEFAULT_CHANNELS_PER_RECORDER: int = 64
+DEFAULT_SAMPLE_RATE: int = 4000
+DEFAULT_BYTES_PER_SAMPLE: int = 4
+
+# File system types that are reported as network storage on POSIX systems
+NETWORK_FILE_SYSTEM_TYPES: set = {"nfs", "nfs4", "cifs", "smbfs", "smb3",
+                                  "sshfs", "fuse.sshfs", "afpfs", "webdav",
+                                  "davfs", "9p"}
+# Directory in which Linux lists the block devices and their partitions
+SYS_CLASS_BLOCK_PATH: str = "/sys/class/block"
+# Drive types returned by GetDriveTypeW on Windows
+WINDOWS_DRIVE_REMOVABLE: int = 2
+WINDOWS_DRIVE_REMOTE: int = 4
+
+
+class RecordingConfiguration:
+    """
+    Describes the amount of data a recording produces per second.
+
+    Attributes
+    ----------
+    number_of_recorders : int
+        Number of recorders that write to the same file
+    channels_per_recorder : int
+        Number of channels that are stored per recorder
+    sample_rate : int
+        Sample rate of every channel in Hz
+    bytes_per_sample : int
+        Number of bytes a single sample takes on disk
+    """
+
+    def __init__(self, number_of_recorders: int,
+                 channels_per_recorder: int = DEFAULT_CHANNELS_PER_RECORDER,
+                 sample_rate: int = DEFAULT_SAMPLE_RATE,
+                 bytes_per_sample: int = DEFAULT_BYTES_PER_SAMPLE) -> None:
+        """
+        Initialize the recording configuration.
+
+        :param number_of_recorders: Number of recorders in the recording
+        :type number_of_recorders: int
+        :param channels_per_recorder: Number of channels per recorder
+        :type channels_per_recorder: int
+        :param sample_rate: Sample rate in Hz
+        :type sample_rate: int
+        :param bytes_per_sample: Number of bytes per stored sample
+        :type bytes_per_sample: int
+        """
+        self.number_of_recorders = number_of_recorders
+        self.channels_per_recorder = channels_per_recorder
+        self.sample_rate = sample_rate
+        self.bytes_per_sample = bytes_per_sample
+
+    def get_data_rate(self) -> float:
+        """
+        Get the number of bytes the recording writes per second.
+
+        :return: Data rate in bytes per second
+        :rtype: float
+        """
+        return float(self.number_of_recorders * self.channels_per_recorder *
+                     self.sample_rate * self.bytes_per_sample)
+
+
+class DiskPreflightResult:
+    """
+    Outcome of a storage preflight for a single folder.
+
+    Attributes
+    ----------
+    folder : str
+        The folder that was checked
+    write_throughput : float
+        Measured sequential write throughput in bytes per second, 0.0 if the
+        folder could not be written to
+    free_space : int
+        Free space on the volume in bytes
+    required_data_rate : float
+        Data rate of the planned recording in bytes per second
+    max_recording_duration : float
+        Estimated maximum recording duration in seconds
+    is_network_drive : bool
+        Whether the folder lives on a network drive
+    is_removable_drive : bool
+        Whether the folder lives on a removable (e.g. USB) drive
+    warnings : List[str]
+        Human readable warnings found by the preflight
+    """
+
+    def __init__(self, folder: str, write_throughput: float, free_space: int,
+                 required_data_rate: float, is_network_drive: bool,
+                 is_removable_drive: bool, warnings: List[str]) -> None:
+        self.folder = folder
+        self.write_throughput = write_throughput
+        self.free_space = free_space
+        self.required_data_rate = required_data_rate
+        self.is_network_drive = is_network_drive
+        self.is_removable_drive = is_removable_drive
+        self.warnings = warnings
+
+        # Estimate how long the recording can last with the free space left
+        usable_space = max(free_space - RESERVED_FREE_SPACE_BYTES, 0)
+        if required_data_rate > 0:
+            self.max_recording_duration = usable_space / required_data_rate
+        else:
+            self.max_recording_duration = float("inf")
+
+    def is_sufficient(self) -> bool:
+        """
+        Whether the folder can sustain the recording.
+
+        :return: True if the folder is fast enough and has space left
+        :rtype: bool
+        """
+        return (self.write_throughput >= self.required_data_rate *
+                REQUIRED_THROUGHPUT_SAFETY_FACTOR and
+                self.max_recording_duration > 0)
+
+
+class DiskPreflight:
+    """
+    Checks whether a storage folder can sustain and hold a recording.
+
+    The sequential write benchmark is the expensive part of the preflight,
+    therefore its result is cached per volume. The free space is cheap to
+    query and is checked again on every run.
+
+    Attributes
+    ----------
+    volume_cache : Dict[int, Dict[str, object]]
+        Maps a volume (device id) to the cached benchmark results of it
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the disk preflight with an empty cache.
+        """
+        self.volume_cache: Dict[int, Dict[str, object]] = {}
+
+    def run(self, folder: str, configuration: RecordingConfiguration,
+            force_benchmark: bool = False) -> DiskPreflightResult:
+        """
+        Run the preflight for the folder and the recording configuration.
+
+        :param folder: Path of the storage folder
+        :type folder: str
+        :param configuration: Configuration of the planned recording
+        :type configuration: RecordingConfiguration
+        :param force_benchmark: Rerun the benchmark even if it is cached
+        :type force_benchmark: bool
+        :return: The result of the preflight
+        :rtype: DiskPreflightResult
+        """
+        warnings: List[str] = []
+        required_data_rate = configuration.get_data_rate()
+
+        # A folder that does not exist can not be checked at all
+        if not os.path.isdir(folder):
+            warnings.append(f"The folder {folder} does not exist.")
+            return DiskPreflightResult(folder, 0.0, 0, required_data_rate,
+                                       False, False, warnings)
+
+        volume_id = os.stat(folder).st_dev
+        volume_info = self.volume_cache.get(volume_id)
+        if volume_info is None or force_benchmark:
+            volume_info = {
+                "write_throughput": self._benchmark_write_throughput(folder),
+                "is_network_drive": _is_network_drive(folder),
+                "is_removable_drive": _is_removable_drive(folder)
+            }
+            # Do not cache a failed benchmark, the folder might become
+            # writable later on
+            if volume_info["write_throughput"] > 0:
+                self.volume_cache[volume_id] = volume_info
+
+        free_space = shutil.disk_usage(folder).free
+        write_throughput = volume_info["write_throughput"]
+
+        # Collect the warnings for the user
+        if write_throughput <= 0:
+            warnings.append(f"The folder {folder} is not writable.")
+        elif write_throughput < (required_data_rate *
+                                 REQUIRED_THROUGHPUT_SAFETY_FACTOR):
+            warnings.append(
+                f"The drive writes {_format_rate(write_throughput)}, which "
+                f"is too slow for {_format_rate(required_data_rate)}.")
+        elif write_throughput < SLOW_STORAGE_THROUGHPUT_BYTES_PER_SECOND:
+            warnings.append(
+                f"The drive is slow ({_format_rate(write_throughput)}).")
+        if volume_info["is_network_drive"]:
+            warnings.append("The folder is on a network drive, the "
+                            "connection may drop during the recording.")
+        if volume_info["is_removable_drive"]:
+            warnings.append("The folder is on a removable drive, which may "
+                            "be slow or disconnected during the recording.")
+
+        result = DiskPreflightResult(
+            folder, write_throughput, free_space, required_data_rate,
+            volume_info["is_network_drive"],
+            volume_info["is_removable_drive"], warnings)
+        if result.max_recording_duration <= 0:
+            warnings.append("There is not enough free space left on the "
+                            "drive.")
+        return result
+
+    def clear_cache(self) -> None:
+        """
+        Forget all cached benchmark results.
+        """
+        self.volume_cache.clear()
+
+    def _benchmark_write_throughput(self, folder: str) -> float:
+        """
+        Measure the sequential write throughput of the folder.
+
+        A temporary file is written in blocks until either
+        BENCHMARK_MAX_SIZE_BYTES is written or BENCHMARK_MAX_DURATION_SECONDS
+        has passed. The data is flushed to the disk before the time is taken,
+        so the operating system cache does not hide a slow drive.
+
+        :param folder: Path of the folder to benchmark
+        :type folder: str
+        :return: Throughput in bytes per second, 0.0 if writing failed
+        :rtype: float
+        """
+        block = os.urandom(BENCHMARK_BLOCK_SIZE_BYTES)
+        try:
+            file_descriptor, file_path = tempfile.mkstemp(
+                prefix=".preflight_", dir=folder)
+        except OSError:
+            return 0.0
+
+        bytes_written = 0
+        try:
+            start_time = time.perf_counter()
+            while bytes_written < BENCHMARK_MAX_SIZE_BYTES:
+                bytes_written += os.write(file_descriptor, block)
+                if (time.perf_counter() - start_time >
+                        BENCHMARK_MAX_DURATION_SECONDS):
+                    break
+            os.fsync(file_descriptor)
+            elapsed_time = time.perf_counter() - start_time
+        except OSError:
+            return 0.0
+        finally:
+            os.close(file_descriptor)
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+        return bytes_written / max(elapsed_time, 1e-6)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration in seconds as hours and minutes.
+
+    :param seconds: Duration in seconds
+    :type seconds: float
+    :return: The formatted duration, e.g. "12 h 05 min"
+    :rtype: str
+    """
+    if seconds == float("inf"):
+        return "unlimited"
+    total_minutes = int(max(seconds, 0) // 60)
+    return f"{total_minutes // 60} h {total_minutes % 60:02d} min"
+
+
+def _format_rate(bytes_per_second: float) -> str:
+    """
+    Format a data rate in MB/s.
+
+    :param bytes_per_second: Data rate in bytes per second
+    :type bytes_per_second: float
+    :return: The formatted data rate
+    :rtype: str
+    """
+    return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+
+
+def _is_network_drive(folder: str) -> bool:
+    """
+    Check whether the folder lives on a network drive.
+
+    :param folder: Path of the folder
+    :type folder: str
+    :return: True if the folder is on a network drive
+    :rtype: bool
+    """
+    folder = os.path.abspath(folder)
+    if sys.platform == "win32":
+        # UNC paths are always network paths
+        if folder.startswith("\\\\"):
+            return True
+        return _get_windows_drive_type(folder) == WINDOWS_DRIVE_REMOTE
+    file_system_type = _get_posix_mount(folder)[1]
+    return file_system_type in NETWORK_FILE_SYSTEM_TYPES
+
+
+def _is_removable_drive(folder: str) -> bool:
+    """
+    Check whether the folder lives on a removable drive, such as a USB stick.
+
+    :param folder: Path of the folder
+    :type folder: str
+    :return: True if the folder is on a removable drive
+    :rtype: bool
+    """
+    folder = os.path.abspath(folder)
+    if sys.platform == "win32":
+        return _get_windows_drive_type(folder) == WINDOWS_DRIVE_REMOVABLE
+    device = _get_posix_mount(folder)[0]
+    if not device.startswith("/dev/"):
+        return False
+    # Resolve links such as /dev/disk/by-uuid/... to the device itself
+    block_path = os.path.realpath(os.path.join(
+        SYS_CLASS_BLOCK_PATH, os.path.basename(os.path.realpath(device))))
+    # A partition is a subdirectory of its disk in sysfs, e.g. sdb1 of sdb,
+    # nvme0n1p1 of nvme0n1 and mmcblk0p1 of mmcblk0; only the disk tells
+    # whether it is removable
+    if os.path.exists(os.path.join(block_path, "partition")):
+        block_path = os.path.dirname(block_path)
+    removable_path = os.path.join(block_path, "removable")
+    try:
+        with open(removable_path) as removable_file:
+            return removable_file.read().strip() == "1"
+    except OSError:
+        return False
+
+
+def _get_windows_drive_type(folder: str) -> Optional[int]:
+    """
+    Get the drive type of the drive the folder lives on (Windows only).
+
+    :param folder: Absolute path of the folder
+    :type folder: str
+    :return: The drive type as returned by GetDriveTypeW
+    :rtype: int or None
+    """
+    import ctypes
+    drive = os.path.splitdrive(folder)[0]
+    if not drive:
+        return None
+    return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\")
+
+
+def _get_posix_mount(folder: str) -> tuple:
+    """
+    Find the mount that holds the folder (POSIX only).
+
+    :param folder: Absolute path of the folder
+    :type folder: str
+    :return: Tuple of the mounted device and the file system type
+    :rtype: tuple(str, str)
+    """
+    best_mount_point = ""
+    best_mount = ("", "")
+    try:
+        with open("/proc/mounts") as mounts_file:
+            for line in mounts_file:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                device, mount_point, file_system_type = fields[:3]
+                # The longest mount point that contains the folder wins
+                if ((folder == mount_point or
+                     folder.startswith(mount_point.rstrip("/") + "/")) and
+                        len(mount_point) > len(best_mount_point)):
+                    best_mount_point = mount_point
+                    best_mount = (device, file_system_type)
+    except OSError:
+        pass
+    return best_mount
@@ -0,0 +1,355 @@
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+# Suffix of the sidecar directory that holds the pyramid of a recording,
+# e.g. recording.poly5 -> recording.poly5.envelope
+ENVELOPE_SIDECAR_SUFFIX: str = ".envelope"
+# Name of the header file inside the sidecar directory
+ENVELOPE_HEADER_FILENAME: str = "header.json"
+# Name of the data file of a level inside the sidecar directory
+ENVELOPE_LEVEL_FILENAME: str = "level_{level}.f32"
+# Version of the sidecar layout
+ENVELOPE_FORMAT_VERSION: int = 1
+# Number of samples that are combined in one bin of the finest level
+DEFAULT_BASE_BIN_SIZE: int = 16
+# Every level combines this many bins of the level below
+DEFAULT_DECIMATION_FACTOR: int = 4
+# Number of levels in the pyramid
+DEFAULT_NUMBER_OF_LEVELS: int = 8
+# Data type of the envelope values on disk
+ENVELOPE_DTYPE = np.float32
+
+
+def get_envelope_sidecar_path(recording_path: str) -> str:
+    """
+    Get the path of the envelope sidecar directory of a recording.
+
+    :param recording_path: Path of the recording
+    :type recording_path: str
+    :return: Path of the sidecar directory
+    :rtype: str
+    """
+    return recording_path + ENVELOPE_SIDECAR_SUFFIX
+
+
+class EnvelopePyramidWriter:
+    """
+    Builds the min/max envelope pyramid of a recording while it is written.
+
+    The writer passes every block of samples to write_block. Level 0 stores
+    the minimum and maximum of every base_bin_size samples per channel, every
+    next level combines decimation_factor bins of the level below. Each level
+    is appended to its own file as an array of shape (bins, channels, 2), so
+    a reader can memory-map any level while the recording is still running.
+
+    Blocks have the shape (samples, channels). NaN samples, e.g. the gaps
+    the merger fills when a recorder drops out, are left out of the minimum
+    and maximum; a bin with only NaN samples is NaN.
+
+    Attributes
+    ----------
+    sidecar_path : str
+        Path of the sidecar directory
+    number_of_channels : int
+        Number of channels in the recording
+    bin_sizes : List[int]
+        Number of samples per bin for every level
+    """
+
+    def __init__(self, recording_path: str, number_of_channels: int,
+                 sample_rate: float,
+                 base_bin_size: int = DEFAULT_BASE_BIN_SIZE,
+                 decimation_factor: int = DEFAULT_DECIMATION_FACTOR,
+                 number_of_levels: int = DEFAULT_NUMBER_OF_LEVELS) -> None:
+        """
+        Create the sidecar directory and its header.
+
+        :param recording_path: Path of the recording the pyramid belongs to
+        :type recording_path: str
+        :param number_of_channels: Number of channels in the recording
+        :type number_of_channels: int
+        :param sample_rate: Sample rate of the recording in Hz
+        :type sample_rate: float
+        :param base_bin_size: Number of samples per bin of level 0
+        :type base_bin_size: int
+        :param decimation_factor: Number of bins combined per level
+        :type decimation_factor: int
+        :param number_of_levels: Number of levels in the pyramid
+        :type number_of_levels: int
+        """
+        self.sidecar_path = get_envelope_sidecar_path(recording_path)
+        self.number_of_channels = number_of_channels
+        self.sample_rate = sample_rate
+        self.decimation_factor = decimation_factor
+        self.bin_sizes: List[int] = [
+            base_bin_size * decimation_factor ** level
+            for level in range(number_of_levels)]
+
+        os.makedirs(self.sidecar_path, exist_ok=True)
+        self.level_files = [
+            open(os.path.join(self.sidecar_path,
+                              ENVELOPE_LEVEL_FILENAME.format(level=level)),
+                 "wb")
+            for level in range(number_of_levels)]
+
+        # Samples (level 0) and bins (higher levels) that do not yet fill a
+        # complete bin are carried over to the next block
+        self.sample_carry = np.empty((0, number_of_channels),
+                                     dtype=ENVELOPE_DTYPE)
+        self.level_carries: List[np.ndarray] = [
+            np.empty((0, number_of_channels, 2), dtype=ENVELOPE_DTYPE)
+            for _ in range(number_of_levels)]
+        self._write_header(complete=False)
+
+    def write_block(self, samples: np.ndarray) -> None:
+        """
+        Add a block of samples to the pyramid.
+
+        :param samples: Block of shape (samples, channels)
+        :type samples: np.ndarray
+        """
+        samples = np.asarray(samples, dtype=ENVELOPE_DTYPE)
+        if self.sample_carry.shape[0]:
+            samples = np.concatenate((self.sample_carry, samples))
+
+        # Reduce all complete base bins of the block at once
+        base_bin_size = self.bin_sizes[0]
+        number_of_bins = samples.shape[0] // base_bin_size
+        complete = samples[:number_of_bins * base_bin_size].reshape(
+            number_of_bins, base_bin_size, self.number_of_channels)
+        self.sample_carry = samples[number_of_bins * base_bin_size:].copy()
+        if not number_of_bins:
+            return
+
+        envelope = np.stack((np.fmin.reduce(complete, axis=1),
+                             np.fmax.reduce(complete, axis=1)), axis=-1)
+        self._append_to_level(0, envelope)
+
+    def close(self) -> None:
+        """
+        Write the incomplete last bin of every level and close the level
+        files, so the end of the recording is visible in the preview.
+        """
+        partial_bin = None
+        if self.sample_carry.shape[0]:
+            partial_bin = np.stack(
+                (np.fmin.reduce(self.sample_carry, axis=0),
+                 np.fmax.reduce(self.sample_carry, axis=0)),
+                axis=-1)[np.newaxis]
+        for level, level_file in enumerate(self.level_files):
+            if level > 0:
+                # Combine the bins that did not fill a group yet with the
+                # partial bin of the level below
+                carry = self.level_carries[level]
+                if partial_bin is not None:
+                    carry = np.concatenate((carry, partial_bin))
+                partial_bin = (_reduce_bins(carry)[np.newaxis]
+                               if carry.shape[0] else None)
+            if partial_bin is not None:
+                partial_bin.tofile(level_file)
+            level_file.close()
+        self._write_header(complete=True)
+
+    def _append_to_level(self, level: int, envelope: np.ndarray) -> None:
+        """
+        Write envelope bins to a level and reduce all complete groups of
+        bins into the next level.
+
+        :param level: The level the bins belong to
+        :type level: int
+        :param envelope: Bins of shape (bins, channels, 2)
+        :type envelope: np.ndarray
+        """
+        envelope.tofile(self.level_files[level])
+        self.level_files[level].flush()
+        next_level = level + 1
+        if next_level >= len(self.bin_sizes):
+            return
+
+        carry = self.level_carries[next_level]
+        if carry.shape[0]:
+            envelope = np.concatenate((carry, envelope))
+        number_of_groups = envelope.shape[0] // self.decimation_factor
+        usable = number_of_groups * self.decimation_factor
+        self.level_carries[next_level] = envelope[usable:].copy()
+        if not number_of_groups:
+            return
+
+        groups = envelope[:usable].reshape(
+            number_of_groups, self.decimation_factor,
+            self.number_of_channels, 2)
+        reduced = np.stack((np.fmin.reduce(groups[..., 0], axis=1),
+                            np.fmax.reduce(groups[..., 1], axis=1)), axis=-1)
+        self._append_to_level(next_level, reduced)
+
+    def _write_header(self, complete: bool) -> None:
+        """
+        Write the header that describes the layout of the pyramid.
+
+        :param complete: Whether the recording is finished
+        :type complete: bool
+        """
+        header = {"version": ENVELOPE_FORMAT_VERSION,
+                  "number_of_channels": self.number_of_channels,
+                  "sample_rate": self.sample_rate,
+                  "bin_sizes": self.bin_sizes,
+                  "dtype": np.dtype(ENVELOPE_DTYPE).str,
+                  "complete": complete}
+        header_path = os.path.join(self.sidecar_path,
+                                   ENVELOPE_HEADER_FILENAME)
+        with open(header_path + ".tmp", "w") as header_file:
+            json.dump(header, header_file)
+        os.replace(header_path + ".tmp", header_path)
+
+
+def _reduce_bins(bins: np.ndarray) -> np.ndarray:
+    """
+    Combine envelope bins into a single bin, ignoring NaN bins.
+
+    :param bins: Bins of shape (bins, channels, 2)
+    :type bins: np.ndarray
+    :return: The combined bin of shape (channels, 2)
+    :rtype: np.ndarray
+    """
+    return np.stack((np.fmin.reduce(bins[..., 0], axis=0),
+                     np.fmax.reduce(bins[..., 1], axis=0)), axis=-1)
+
+
+class EnvelopePyramidReader:
+    """
+    Reads the envelope pyramid of a recording through memory-mapped I/O.
+
+    Only the level that matches the requested resolution is touched, so
+    rendering any zoom level of a multi-hour recording reads at most a few
+    bins per pixel.
+
+    Attributes
+    ----------
+    number_of_channels : int
+        Number of channels in the recording
+    sample_rate : float
+        Sample rate of the recording in Hz
+    bin_sizes : List[int]
+        Number of samples per bin for every level
+    """
+
+    def __init__(self, recording_path: str) -> None:
+        """
+        Read the header of the pyramid of the recording.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :raises FileNotFoundError: if the recording has no pyramid
+        """
+        self.sidecar_path = get_envelope_sidecar_path(recording_path)
+        with open(os.path.join(self.sidecar_path,
+                               ENVELOPE_HEADER_FILENAME)) as header_file:
+            header = json.load(header_file)
+        self.number_of_channels: int = header["number_of_channels"]
+        self.sample_rate: float = header["sample_rate"]
+        self.bin_sizes: List[int] = header["bin_sizes"]
+        self.dtype = np.dtype(header["dtype"])
+
+    def get_number_of_samples(self) -> int:
+        """
+        Get the (approximate) number of samples in the recording, based on
+        the number of bins in level 0.
+
+        :return: Number of samples
+        :rtype: int
+        """
+        return self._get_number_of_bins(0) * self.bin_sizes[0]
+
+    def get_level(self, level: int) -> Optional[np.ndarray]:
+        """
+        Memory-map a level of the pyramid.
+
+        :param level: The level to map
+        :type level: int
+        :return: Array of shape (bins, channels, 2), or None if the level is
+                 still empty
+        :rtype: np.ndarray or None
+        """
+        number_of_bins = self._get_number_of_bins(level)
+        if not number_of_bins:
+            return None
+        return np.memmap(self._get_level_path(level), dtype=self.dtype,
+                         mode="r",
+                         shape=(number_of_bins, self.number_of_channels, 2))
+
+    def get_envelope(self, start_sample: int, stop_sample: int,
+                     number_of_pixels: int) -> np.ndarray:
+        """
+        Get the min/max envelope of a range of samples, reduced to at most
+        number_of_pixels columns.
+
+        The coarsest level that still has at least one bin per pixel is
+        used, and its bins are reduced to pixels with a vectorized min/max.
+
+        :param start_sample: First sample of the range
+        :type start_sample: int
+        :param stop_sample: Sample after the last sample of the range
+        :type stop_sample: int
+        :param number_of_pixels: Number of pixel columns to render
+        :type number_of_pixels: int
+        :return: Array of shape (columns, channels, 2)
+        :rtype: np.ndarray
+        """
+        samples_per_pixel = max((stop_sample - start_sample) /
+                                max(number_of_pixels, 1), 1)
+        # Pick the coarsest level whose bins are not larger than a pixel
+        level = 0
+        for candidate, bin_size in enumerate(self.bin_sizes):
+            if bin_size <= samples_per_pixel:
+                level = candidate
+        data = self.get_level(level)
+        if data is None:
+            return np.empty((0, self.number_of_channels, 2),
+                            dtype=self.dtype)
+
+        bin_size = self.bin_sizes[level]
+        first_bin = max(start_sample // bin_size, 0)
+        last_bin = min(-(-stop_sample // bin_size), data.shape[0])
+        bins = np.asarray(data[first_bin:last_bin])
+        if bins.shape[0] <= number_of_pixels:
+            return bins
+
+        # Map every bin to a pixel column and reduce per column
+        columns = (np.arange(bins.shape[0]) * number_of_pixels //
+                   bins.shape[0])
+        boundaries = np.flatnonzero(np.diff(columns)) + 1
+        starts = np.concatenate(([0], boundaries))
+        return np.stack((np.fmin.reduceat(bins[..., 0], starts, axis=0),
+                         np.fmax.reduceat(bins[..., 1], starts, axis=0)),
+                        axis=-1)
+
+    def _get_level_path(self, level: int) -> str:
+        """
+        :return: Path of the data file of a level
+        :rtype: str
+        """
+        return os.path.join(self.sidecar_path,
+                            ENVELOPE_LEVEL_FILENAME.format(level=level))
+
+    def _get_number_of_bins(self, level: int) -> int:
+        """
+        Get the number of complete bins in a level. The size of the file is
+        used rather than the header, so a pyramid that is still being
+        written can be read.
+
+        :param level: The level
+        :type level: int
+        :return: Number of bins
+        :rtype: int
+        """
+        if level >= len(self.bin_sizes):
+            return 0
+        try:
+            file_size = os.path.getsize(self._get_level_path(level))
+        except OSError:
+            return 0
+        return file_size // (self.number_of_channels * 2 *
+                             self.dtype.itemsize)
@@ -0,0 +1,500 @@
+import csv
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Suffix of the sidecar directory that holds the event index of a
+# recording, e.g. recording.poly5 -> recording.poly5.events
+EVENT_INDEX_SIDECAR_SUFFIX: str = ".events"
+# Name of the header file inside the sidecar directory
+EVENT_INDEX_HEADER_FILENAME: str = "header.json"
+# Names of the data files inside the sidecar directory: the events sorted by
+# sample, the events sorted by code and sample, and the sparse time index
+EVENTS_FILENAME: str = "events.bin"
+EVENTS_BY_CODE_FILENAME: str = "events_by_code.bin"
+TIME_INDEX_FILENAME: str = "time_index.i8"
+# Version of the sidecar layout
+EVENT_INDEX_FORMAT_VERSION: int = 1
+# Layout of an event on disk: the sample of the onset, the code and the
+# duration in samples
+EVENT_DTYPE = np.dtype([("sample", "<i8"), ("code", "<i4"),
+                        ("duration", "<i4")])
+# Number of seconds covered by one entry of the sparse time index
+DEFAULT_TIME_INDEX_INTERVAL: float = 10.0
+# Channels whose name starts with this prefix hold the trigger codes
+TRIGGER_CHANNEL_PREFIX: str = "TRIG"
+# Number of events that are exported per chunk
+EXPORT_CHUNK_SIZE: int = 65536
+
+
+def get_event_index_sidecar_path(recording_path: str) -> str:
+    """
+    Get the path of the event index sidecar directory of a recording.
+
+    :param recording_path: Path of the recording
+    :type recording_path: str
+    :return: Path of the sidecar directory
+    :rtype: str
+    """
+    return recording_path + EVENT_INDEX_SIDECAR_SUFFIX
+
+
+def find_trigger_channels(channel_names: List[str]) -> List[int]:
+    """
+    :param channel_names: Names of all channels of the recording
+    :type channel_names: List[str]
+    :return: Indices of the channels that hold trigger codes
+    :rtype: List[int]
+    """
+    return [index for index, name in enumerate(channel_names)
+            if name.upper().startswith(TRIGGER_CHANNEL_PREFIX)]
+
+
+class EventIndexWriter:
+    """
+    Builds the event index of a recording while it is written.
+
+    The writer is a sink of the sample pipeline. In every block it detects
+    the changes of the trigger channels with NumPy: every run of a nonzero
+    code is an event with its onset and duration. Annotations are added
+    with add_event. The events are appended to the sidecar as they are
+    found, so they survive a crash, and are sorted and indexed when the
+    recording is closed.
+
+    Blocks have the shape (samples, channels).
+
+    Attributes
+    ----------
+    sidecar_path : str
+        Path of the sidecar directory
+    sample_rate : float
+        Sample rate of the recording in Hz
+    trigger_channels : List[int]
+        Indices of the channels that hold trigger codes
+    number_of_samples : int
+        Number of samples written so far
+    number_of_events : int
+        Number of events written so far
+    """
+
+    def __init__(self, recording_path: str, sample_rate: float,
+                 trigger_channels: List[int],
+                 time_index_interval: float = DEFAULT_TIME_INDEX_INTERVAL
+                 ) -> None:
+        """
+        Create the sidecar directory and its header.
+
+        :param recording_path: Path of the recording the index belongs to
+        :type recording_path: str
+        :param sample_rate: Sample rate of the recording in Hz
+        :type sample_rate: float
+        :param trigger_channels: Indices of the channels that hold trigger
+                                 codes, see find_trigger_channels
+        :type trigger_channels: List[int]
+        :param time_index_interval: Seconds per entry of the time index
+        :type time_index_interval: float
+        """
+        self.sidecar_path = get_event_index_sidecar_path(recording_path)
+        self.sample_rate = sample_rate
+        self.trigger_channels = list(trigger_channels)
+        self.time_index_interval = max(
+            int(round(time_index_interval * sample_rate)), 1)
+        self.number_of_samples = 0
+        self.number_of_events = 0
+        # Code and onset of the event that is still running on every trigger
+        # channel
+        self._running_codes = np.zeros(len(self.trigger_channels),
+                                       dtype=np.int64)
+        self._running_onsets = np.zeros(len(self.trigger_channels),
+                                        dtype=np.int64)
+
+        os.makedirs(self.sidecar_path, exist_ok=True)
+        self.events_file = open(os.path.join(self.sidecar_path,
+                                             EVENTS_FILENAME), "wb")
+        self._write_header(complete=False)
+
+    def write_block(self, samples: np.ndarray) -> None:
+        """
+        Find the events in a block of samples.
+
+        :param samples: Block of shape (samples, channels)
+        :type samples: np.ndarray
+        """
+        number_of_samples = samples.shape[0]
+        if not number_of_samples:
+            return
+        if self.trigger_channels:
+            # Samples of a recorder that dropped out are NaN, they have no
+            # trigger code
+            codes = np.nan_to_num(samples[:, self.trigger_channels]
+                                  ).astype(np.int64)
+            # Prepend the running code, so a change at the first sample of
+            # the block is found as well
+            codes = np.concatenate((self._running_codes[np.newaxis], codes))
+            positions, channels = np.nonzero(codes[1:] != codes[:-1])
+            self._add_code_changes(positions, channels, codes)
+        self.number_of_samples += number_of_samples
+
+    def add_event(self, code: int, sample: Optional[int] = None,
+                  duration: int = 0) -> None:
+        """
+        Add an annotation or an event that is not in a trigger channel.
+
+        :param code: Code of the event
+        :type code: int
+        :param sample: Onset of the event, defaults to the current end of
+                       the recording
+        :type sample: int, optional
+        :param duration: Duration of the event in samples
+        :type duration: int
+        """
+        if sample is None:
+            sample = self.number_of_samples
+        event = np.array([(sample, code, duration)], dtype=EVENT_DTYPE)
+        self._append_events(event)
+
+    def close(self) -> Dict[str, object]:
+        """
+        End the running events, and write the sorted events, the events
+        sorted by code and the time index.
+
+        :return: The header of the index
+        :rtype: Dict[str, object]
+        """
+        is_running = self._running_codes != 0
+        if np.any(is_running):
+            onsets = self._running_onsets[is_running]
+            self._append_events(self._create_events(
+                onsets, self._running_codes[is_running],
+                self.number_of_samples - onsets))
+            self._running_codes[:] = 0
+        self.events_file.close()
+
+        events_path = os.path.join(self.sidecar_path, EVENTS_FILENAME)
+        events = np.fromfile(events_path, dtype=EVENT_DTYPE)
+        # The trigger events are found in order, the annotations may not be
+        events = events[np.argsort(events["sample"], kind="stable")]
+        events_by_code = events[np.lexsort((events["sample"],
+                                            events["code"]))]
+        time_index = np.searchsorted(
+            events["sample"],
+            np.arange(0, self.number_of_samples + self.time_index_interval,
+                      self.time_index_interval), side="left")
+        _write_atomically(events_path, events)
+        _write_atomically(os.path.join(self.sidecar_path,
+                                       EVENTS_BY_CODE_FILENAME),
+                          events_by_code)
+        _write_atomically(os.path.join(self.sidecar_path,
+                                       TIME_INDEX_FILENAME),
+                          time_index.astype("<i8"))
+
+        # Range of every code in the events sorted by code
+        codes, starts, counts = np.unique(events_by_code["code"],
+                                          return_index=True,
+                                          return_counts=True)
+        code_ranges = {str(code): [int(start), int(start + count)]
+                       for code, start, count in zip(codes, starts, counts)}
+        return self._write_header(complete=True, code_ranges=code_ranges)
+
+    def _add_code_changes(self, positions: np.ndarray, channels: np.ndarray,
+                          codes: np.ndarray) -> None:
+        """
+        End the events whose code changed and start the events of the new
+        codes.
+
+        :param positions: Position in the block of every code change
+        :type positions: np.ndarray
+        :param channels: Trigger channel of every code change
+        :type channels: np.ndarray
+        :param codes: Codes of the block, preceded by the running codes
+        :type codes: np.ndarray
+        """
+        if not len(positions):
+            return
+        # Handle the changes per channel in order of time
+        order = np.lexsort((positions, channels))
+        positions, channels = positions[order], channels[order]
+        samples = self.number_of_samples + positions
+        old_codes = codes[positions, channels]
+        new_codes = codes[positions + 1, channels]
+        # The onset of every change is the previous change on the same
+        # channel, or the onset of the running event for the first change
+        onsets = np.empty_like(samples)
+        onsets[1:] = samples[:-1]
+        is_first = np.ones(len(channels), dtype=bool)
+        is_first[1:] = channels[1:] != channels[:-1]
+        onsets[is_first] = self._running_onsets[channels[is_first]]
+        ends_event = old_codes != 0
+        self._append_events(self._create_events(
+            onsets[ends_event], old_codes[ends_event],
+            samples[ends_event] - onsets[ends_event]))
+        # Keep the last code of every channel running into the next block
+        is_last = np.ones(len(channels), dtype=bool)
+        is_last[:-1] = channels[:-1] != channels[1:]
+        self._running_codes[channels[is_last]] = new_codes[is_last]
+        self._running_onsets[channels[is_last]] = samples[is_last]
+
+    @staticmethod
+    def _create_events(samples: np.ndarray, codes: np.ndarray,
+                       durations: np.ndarray) -> np.ndarray:
+        """
+        :return: Events of EVENT_DTYPE
+        :rtype: np.ndarray
+        """
+        events = np.empty(len(samples), dtype=EVENT_DTYPE)
+        events["sample"] = samples
+        events["code"] = codes
+        events["duration"] = durations
+        return events
+
+    def _append_events(self, events: np.ndarray) -> None:
+        """
+        Append events to the events file.
+
+        :param events: Events of EVENT_DTYPE
+        :type events: np.ndarray
+        """
+        if not len(events):
+            return
+        events.tofile(self.events_file)
+        self.events_file.flush()
+        self.number_of_events += len(events)
+
+    def _write_header(self, complete: bool,
+                      code_ranges: Optional[Dict[str, List[int]]] = None
+                      ) -> Dict[str, object]:
+        """
+        Write the header that describes the layout of the index.
+
+        :param complete: Whether the recording is finished and the events
+                         are sorted
+        :type complete: bool
+        :param code_ranges: Range of every code in the events sorted by code
+        :type code_ranges: Dict[str, List[int]]
+        :return: The header
+        :rtype: Dict[str, object]
+        """
+        header = {"version": EVENT_INDEX_FORMAT_VERSION,
+                  "sample_rate": self.sample_rate,
+                  "number_of_samples": self.number_of_samples,
+                  "number_of_events": self.number_of_events,
+                  "time_index_interval": self.time_index_interval,
+                  "dtype": EVENT_DTYPE.descr,
+                  "code_ranges": code_ranges or {},
+                  "complete": complete}
+        header_path = os.path.join(self.sidecar_path,
+                                   EVENT_INDEX_HEADER_FILENAME)
+        with open(header_path + ".tmp", "w") as header_file:
+            json.dump(header, header_file)
+        os.replace(header_path + ".tmp", header_path)
+        return header
+
+
+def _write_atomically(path: str, data: np.ndarray) -> None:
+    """
+    Write an array to a file, replacing the file only when it is complete.
+
+    :param path: Path of the file
+    :type path: str
+    :param data: The array
+    :type data: np.ndarray
+    """
+    data.tofile(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+class EventIndexReader:
+    """
+    Queries the event index of a recording through memory-mapped I/O.
+
+    A time range is found with the sparse time index, which narrows the
+    search to the events of a few index intervals, and a binary search in
+    those events. A code is found by its range in the events sorted by
+    code. Both take O(log n) and touch only the events they return, so the
+    events of a multi-hour recording are found without reading the samples
+    or all events.
+
+    The index of a recording that is still being written (or that was not
+    closed) is not sorted yet; it is read and sorted in memory instead.
+
+    Attributes
+    ----------
+    sample_rate : float
+        Sample rate of the recording in Hz
+    number_of_events : int
+        Number of events in the recording
+    is_complete : bool
+        Whether the index was closed and sorted
+    """
+
+    def __init__(self, recording_path: str) -> None:
+        """
+        Read the header of the index and map the events.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :raises FileNotFoundError: if the recording has no event index
+        """
+        self.sidecar_path = get_event_index_sidecar_path(recording_path)
+        with open(os.path.join(self.sidecar_path,
+                               EVENT_INDEX_HEADER_FILENAME)) as header_file:
+            header = json.load(header_file)
+        self.sample_rate: float = header["sample_rate"]
+        self.is_complete: bool = header["complete"]
+        self.time_index_interval: int = header["time_index_interval"]
+        self.code_ranges: Dict[int, List[int]] = {
+            int(code): code_range
+            for code, code_range in header["code_ranges"].items()}
+
+        if self.is_complete:
+            self.events = self._map(EVENTS_FILENAME, EVENT_DTYPE)
+            self.events_by_code = self._map(EVENTS_BY_CODE_FILENAME,
+                                            EVENT_DTYPE)
+            self.time_index = self._map(TIME_INDEX_FILENAME,
+                                        np.dtype("<i8"))
+        else:
+            events = np.fromfile(os.path.join(self.sidecar_path,
+                                              EVENTS_FILENAME),
+                                 dtype=EVENT_DTYPE)
+            self.events = events[np.argsort(events["sample"],
+                                            kind="stable")]
+            self.events_by_code = self.events[np.lexsort(
+                (self.events["sample"], self.events["code"]))]
+            self.time_index = np.empty(0, dtype="<i8")
+            codes, starts, counts = np.unique(self.events_by_code["code"],
+                                              return_index=True,
+                                              return_counts=True)
+            self.code_ranges = {int(code): [int(start), int(start + count)]
+                                for code, start, count
+                                in zip(codes, starts, counts)}
+        self.number_of_events = len(self.events)
+
+    def _map(self, filename: str, dtype: np.dtype) -> np.ndarray:
+        """
+        Memory-map a data file of the index.
+
+        :return: The array, empty if the file is empty
+        :rtype: np.ndarray
+        """
+        path = os.path.join(self.sidecar_path, filename)
+        if not os.path.getsize(path):
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def get_codes(self) -> Dict[int, int]:
+        """
+        :return: Number of events per code
+        :rtype: Dict[int, int]
+        """
+        return {code: stop - start
+                for code, (start, stop) in self.code_ranges.items()}
+
+    def get_events(self, start_sample: int = 0,
+                   stop_sample: Optional[int] = None,
+                   code: Optional[int] = None) -> np.ndarray:
+        """
+        Get the events with their onset in a range of samples.
+
+        :param start_sample: First sample of the range
+        :type start_sample: int
+        :param stop_sample: Sample after the last sample of the range,
+                            defaults to the end of the recording
+        :type stop_sample: int, optional
+        :param code: Only return the events with this code
+        :type code: int, optional
+        :return: Events of EVENT_DTYPE, sorted by sample
+        :rtype: np.ndarray
+        """
+        if code is not None:
+            start, stop = self.code_ranges.get(code, (0, 0))
+            events = self.events_by_code[start:stop]
+        else:
+            events = self.events
+            start, stop = self._get_time_index_bounds(start_sample,
+                                                      stop_sample)
+            events = events[start:stop]
+        samples = events["sample"]
+        first = np.searchsorted(samples, start_sample, side="left")
+        last = (len(samples) if stop_sample is None else
+                np.searchsorted(samples, stop_sample, side="left"))
+        return np.asarray(events[first:last])
+
+    def get_events_between(self, start_time: float,
+                           stop_time: Optional[float] = None,
+                           code: Optional[int] = None) -> np.ndarray:
+        """
+        Get the events with their onset in a range of time.
+
+        :param start_time: Start of the range in seconds
+        :type start_time: float
+        :param stop_time: End of the range in seconds, defaults to the end
+                          of the recording
+        :type stop_time: float, optional
+        :param code: Only return the events with this code
+        :type code: int, optional
+        :return: Events of EVENT_DTYPE, sorted by sample
+        :rtype: np.ndarray
+        """
+        stop_sample = (None if stop_time is None else
+                       int(np.ceil(stop_time * self.sample_rate)))
+        return self.get_events(int(np.ceil(start_time * self.sample_rate)),
+                               stop_sample, code)
+
+    def export_csv(self, export_path: str,
+                   code: Optional[int] = None) -> int:
+        """
+        Write the events to a CSV file with the onset and duration in
+        seconds, the samples and the code of every event.
+
+        :param export_path: Path of the CSV file
+        :type export_path: str
+        :param code: Only export the events with this code
+        :type code: int, optional
+        :return: Number of exported events
+        :rtype: int
+        """
+        if code is not None:
+            start, stop = self.code_ranges.get(code, (0, 0))
+            events = self.events_by_code[start:stop]
+        else:
+            events = self.events
+        with open(export_path, "w", newline="") as export_file:
+            writer = csv.writer(export_file)
+            writer.writerow(["onset", "duration", "sample",
+                             "duration_samples", "code"])
+            # Convert the events per chunk, so the export of a long
+            # recording does not load all events at once
+            for first in range(0, len(events), EXPORT_CHUNK_SIZE):
+                chunk = np.asarray(events[first:first + EXPORT_CHUNK_SIZE])
+                onsets = chunk["sample"] / self.sample_rate
+                durations = chunk["duration"] / self.sample_rate
+                writer.writerows(zip(onsets.round(6).tolist(),
+                                     durations.round(6).tolist(),
+                                     chunk["sample"].tolist(),
+                                     chunk["duration"].tolist(),
+                                     chunk["code"].tolist()))
+        return len(events)
+
+    def _get_time_index_bounds(self, start_sample: int,
+                               stop_sample: Optional[int]):
+        """
+        Narrow a range of samples down to a range of events with the sparse
+        time index.
+
+        :return: First and stop position in the events sorted by sample
+        :rtype: Tuple[int, int]
+        """
+        if not len(self.time_index):
+            return 0, len(self.events)
+        last_entry = len(self.time_index) - 1
+        start_entry = min(max(start_sample, 0) // self.time_index_interval,
+                          last_entry)
+        start = int(self.time_index[start_entry])
+        if stop_sample is None:
+            return start, len(self.events)
+        stop_entry = -(-stop_sample // self.time_index_interval)
+        stop = (int(self.time_index[stop_entry]) if stop_entry <= last_entry
+                else len(self.events))
+        return start, max(stop, start)
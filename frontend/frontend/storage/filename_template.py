@@ -0,0 +1,298 @@
+import datetime
+import json
+import os
+import string
+from typing import Dict
+
+# Name of the file in the storage folder that stores the sequence counters
+SEQUENCE_COUNTER_FILENAME: str = ".filename_sequence.json"
+# Fields that can be used in a filename template
+TEMPLATE_FIELDS: set = {"subject", "date", "time", "seq"}
+# Format of the date and time fields
+DATE_FORMAT: str = "%Y%m%d"
+TIME_FORMAT: str = "%H%M%S"
+# Number of times a name is tried before giving up. Collisions only happen
+# if files were created by another application, so this is rarely reached.
+MAX_ALLOCATION_ATTEMPTS: int = 1000
+# Characters that are not allowed in filenames on any supported platform
+INVALID_FILENAME_CHARACTERS: str = '<>:"/\\|?*'
+
+
+class FilenameTemplateError(ValueError):
+    """
+    Raised when a filename template can not be used.
+    """
+
+
+class FilenameTemplate:
+    """
+    A filename with fields that are filled in when a recording starts, e.g.
+    "{subject}_{date}_{seq:03d}".
+
+    Available fields are {subject}, {date}, {time} and {seq}. A filename
+    without any field is a valid template as well; a sequence number is then
+    appended when the name is already taken.
+
+    Attributes
+    ----------
+    template : str
+        The template text
+    has_sequence : bool
+        Whether the template contains the {seq} field
+    has_date : bool
+        Whether the template contains the {date} field
+    """
+
+    def __init__(self, template: str) -> None:
+        """
+        Parse and validate the template.
+
+        :param template: The template text
+        :type template: str
+        :raises FilenameTemplateError: if the template is not valid
+        """
+        self.template = template
+        used_fields = self._validate(template)
+        self.has_sequence = "seq" in used_fields
+        self.has_date = "date" in used_fields
+
+    def render(self, subject: str = "", sequence_number: int = 1,
+               timestamp: datetime.datetime = None) -> str:
+        """
+        Fill in the fields of the template.
+
+        :param subject: Subject of the recording
+        :type subject: str
+        :param sequence_number: Sequence number of the recording
+        :type sequence_number: int
+        :param timestamp: Start time of the recording, defaults to now
+        :type timestamp: datetime.datetime, optional
+        :return: The filename without extension
+        :rtype: str
+        """
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        name = self.template.format(
+            subject=_sanitize(subject),
+            date=timestamp.strftime(DATE_FORMAT),
+            time=timestamp.strftime(TIME_FORMAT),
+            seq=sequence_number)
+        # Templates without {seq} get the number appended on collision only
+        if not self.has_sequence and sequence_number > 1:
+            name = f"{name}_{sequence_number:03d}"
+        return name
+
+    def get_counter_key(self, subject: str = "",
+                        timestamp: datetime.datetime = None) -> str:
+        """
+        Get the key of the sequence counter for the template. All fields but
+        {seq} are filled in, so each subject/date combination has its own
+        sequence.
+
+        :param subject: Subject of the recording
+        :type subject: str
+        :param timestamp: Start time of the recording, defaults to now
+        :type timestamp: datetime.datetime, optional
+        :return: The counter key
+        :rtype: str
+        """
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        values = {"subject": _sanitize(subject),
+                  "date": timestamp.strftime(DATE_FORMAT),
+                  # The time never repeats, so it is left out of the key
+                  "time": "",
+                  "seq": "#"}
+        return "".join(
+            literal_text + (values[field_name] if field_name else "")
+            for literal_text, field_name, _, _ in
+            string.Formatter().parse(self.template))
+
+    @staticmethod
+    def _validate(template: str) -> set:
+        """
+        Check that the template only uses known fields and results in a
+        valid filename.
+
+        :param template: The template text
+        :type template: str
+        :raises FilenameTemplateError: if the template is not valid
+        :return: The fields used in the template
+        :rtype: set
+        """
+        if not template.strip():
+            raise FilenameTemplateError("The filename is empty.")
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError as error:
+            raise FilenameTemplateError(str(error))
+
+        used_fields: set = set()
+        for literal_text, field_name, format_spec, _ in parsed:
+            if any(character in literal_text for character in
+                   INVALID_FILENAME_CHARACTERS):
+                raise FilenameTemplateError(
+                    f"The filename can not contain any of "
+                    f"{INVALID_FILENAME_CHARACTERS}")
+            if field_name is None:
+                continue
+            if field_name not in TEMPLATE_FIELDS:
+                raise FilenameTemplateError(
+                    f"Unknown field {{{field_name}}} in the filename.")
+            if format_spec and field_name != "seq":
+                raise FilenameTemplateError(
+                    f"The field {{{field_name}}} can not be formatted.")
+            used_fields.add(field_name)
+
+        # Check the format specification of {seq}, e.g. {seq:03d}
+        try:
+            template.format(subject="", date="", time="", seq=1)
+        except (ValueError, IndexError) as error:
+            raise FilenameTemplateError(str(error))
+        return used_fields
+
+
+class FilenameAllocator:
+    """
+    Allocates unique recording filenames in a storage folder.
+
+    The next sequence number per counter key is kept in memory and persisted
+    in SEQUENCE_COUNTER_FILENAME, so allocating a name does not depend on the
+    number of files in the folder. Keys that contain a date are dropped once
+    a name for a later date is allocated, so the counter file does not grow
+    with every recording day. The name is reserved by creating the file
+    exclusively. If that fails because the file already exists (e.g. it was
+    copied into the folder), the next sequence number is tried.
+
+    Attributes
+    ----------
+    folder : str
+        The storage folder
+    counters : Dict[str, int]
+        Maps a counter key to the next sequence number to try
+    counter_dates : Dict[str, str]
+        Maps the counter keys that contain a date to that date
+    """
+
+    def __init__(self, folder: str) -> None:
+        """
+        Initialize the allocator and load the persisted counters.
+
+        :param folder: The storage folder
+        :type folder: str
+        """
+        self.folder = folder
+        self.counter_file_path = os.path.join(folder,
+                                              SEQUENCE_COUNTER_FILENAME)
+        self.counters: Dict[str, int] = {}
+        self.counter_dates: Dict[str, str] = {}
+        self._load_counters()
+
+    def allocate(self, template: FilenameTemplate, extension: str,
+                 subject: str = "",
+                 timestamp: datetime.datetime = None) -> str:
+        """
+        Reserve a unique file for a new recording.
+
+        :param template: The filename template
+        :type template: FilenameTemplate
+        :param extension: The file extension, e.g. ".poly5"
+        :type extension: str
+        :param subject: Subject of the recording
+        :type subject: str
+        :param timestamp: Start time of the recording, defaults to now
+        :type timestamp: datetime.datetime, optional
+        :raises FileExistsError: if no free name was found
+        :return: Path of the reserved (empty) file
+        :rtype: str
+        """
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        extension = "." + extension.lstrip(".")
+        date = timestamp.strftime(DATE_FORMAT)
+        counter_key = template.get_counter_key(subject, timestamp) + extension
+        sequence_number = self.counters.get(counter_key, 1)
+
+        for _ in range(MAX_ALLOCATION_ATTEMPTS):
+            path = os.path.join(self.folder, template.render(
+                subject, sequence_number, timestamp) + extension)
+            try:
+                # Create the file exclusively, this fails if it exists
+                file_descriptor = os.open(
+                    path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                sequence_number += 1
+                continue
+            os.close(file_descriptor)
+            self.counters[counter_key] = sequence_number + 1
+            if template.has_date:
+                self.counter_dates[counter_key] = date
+            self._save_counters(date)
+            return path
+
+        raise FileExistsError(
+            f"No free filename found for {template.template} in "
+            f"{self.folder}")
+
+    def _load_counters(self) -> None:
+        """
+        Load the persisted counters of the folder. A missing or damaged
+        counter file leaves the counters empty.
+        """
+        try:
+            with open(self.counter_file_path) as counter_file:
+                data = json.load(counter_file)
+            for key, value in data.items():
+                # Counter files of older versions only store the number
+                if isinstance(value, dict):
+                    self.counters[key] = int(value["next"])
+                    if value.get("date"):
+                        self.counter_dates[key] = str(value["date"])
+                else:
+                    self.counters[key] = int(value)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A missing or damaged counter file only costs extra exclusive
+            # create attempts
+            self.counters = {}
+            self.counter_dates = {}
+
+    def _save_counters(self, current_date: str) -> None:
+        """
+        Persist the counters atomically by replacing the counter file.
+        Counters of dates before the current date are dropped first, as
+        their keys are never allocated again.
+
+        :param current_date: Date of the allocated name, in DATE_FORMAT
+        :type current_date: str
+        """
+        for key, date in list(self.counter_dates.items()):
+            # Dates in DATE_FORMAT sort as text
+            if date < current_date:
+                del self.counter_dates[key]
+                self.counters.pop(key, None)
+        data = {key: {"next": sequence_number,
+                      "date": self.counter_dates.get(key)}
+                for key, sequence_number in self.counters.items()}
+        temporary_path = self.counter_file_path + ".tmp"
+        try:
+            with open(temporary_path, "w") as counter_file:
+                json.dump(data, counter_file)
+            os.replace(temporary_path, self.counter_file_path)
+        except OSError:
+            # The name is already reserved, a stale counter file only costs
+            # extra attempts next time
+            pass
+
+
+def _sanitize(text: str) -> str:
+    """
+    Replace characters that are not allowed in filenames.
+
+    :param text: The text to sanitize
+    :type text: str
+    :return: The sanitized text
+    :rtype: str
+    """
+    for character in INVALID_FILENAME_CHARACTERS:
+        text = text.replace(character, "-")
+    return text.strip()
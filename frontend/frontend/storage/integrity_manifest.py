@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Suffix of the manifest file of a recording,
+# e.g. recording.poly5 -> recording.poly5.manifest.json
+MANIFEST_SUFFIX: str = ".manifest.json"
+# Version of the manifest layout
+MANIFEST_FORMAT_VERSION: int = 1
+# Hash algorithm used for the chunks and the root hash
+HASH_ALGORITHM: str = "sha256"
+# Number of bytes covered by one chunk hash (4 MiB)
+DEFAULT_CHUNK_SIZE_BYTES: int = 4 * 1024 * 1024
+
+
+def get_manifest_path(recording_path: str) -> str:
+    """
+    Get the path of the integrity manifest of a recording.
+
+    :param recording_path: Path of the recording
+    :type recording_path: str
+    :return: Path of the manifest
+    :rtype: str
+    """
+    return recording_path + MANIFEST_SUFFIX
+
+
+def compute_root_hash(chunk_hashes: List[str]) -> str:
+    """
+    Compute the hash of the whole file from the hashes of its chunks.
+
+    Hashing the chunk hashes, rather than the file itself, allows the whole
+    file to be verified in parallel and allows a chunk that is rewritten in
+    place (e.g. a header that is updated at the end of the recording) to be
+    rehashed without hashing the rest of the file again.
+
+    :param chunk_hashes: Hexadecimal hashes of the chunks, in file order
+    :type chunk_hashes: List[str]
+    :return: Hexadecimal root hash
+    :rtype: str
+    """
+    root = hashlib.new(HASH_ALGORITHM)
+    for chunk_hash in chunk_hashes:
+        root.update(bytes.fromhex(chunk_hash))
+    return root.hexdigest()
+
+
+class IntegrityManifestWriter:
+    """
+    Computes chunk hashes of a recording from the bytes the writer writes,
+    so no data has to be read back from the disk.
+
+    The writer passes every block of bytes it appends to the recording to
+    write_block. If the writer updates bytes in place (e.g. the header with
+    the final number of samples), it reports that with rewrite; only the
+    chunks it touches are read back and hashed again on close.
+
+    Attributes
+    ----------
+    recording_path : str
+        Path of the recording
+    chunk_size : int
+        Number of bytes per chunk hash
+    chunk_hashes : List[str]
+        Hashes of the completed chunks
+    file_size : int
+        Number of bytes written so far
+    """
+
+    def __init__(self, recording_path: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE_BYTES) -> None:
+        """
+        Initialize the manifest writer of a recording.
+
+        :param recording_path: Path of the recording
+        :type recording_path: str
+        :param chunk_size: Number of bytes per chunk hash
+        :type chunk_size: int
+        """
+        self.recording_path = recording_path
+        self.chunk_size = chunk_size
+        self.chunk_hashes: List[str] = []
+        self.file_size = 0
+        self._current_chunk = hashlib.new(HASH_ALGORITHM)
+        self._current_chunk_size = 0
+        self._rewritten_chunks: set = set()
+
+    def write_block(self, data) -> None:
+        """
+        Hash a block of bytes that was appended to the recording.
+
+        :param data: The bytes that were written
+        :type data: bytes-like object, e.g. bytes or a contiguous np.ndarray
+        """
+        view = memoryview(data).cast("B")
+        position = 0
+        while position < len(view):
+            # Fill up the current chunk, and start a new one when it is full
+            length = min(self.chunk_size - self._current_chunk_size,
+                         len(view) - position)
+            self._current_chunk.update(view[position:position + length])
+            self._current_chunk_size += length
+            position += length
+            if self._current_chunk_size == self.chunk_size:
+                self.chunk_hashes.append(self._current_chunk.hexdigest())
+                self._current_chunk = hashlib.new(HASH_ALGORITHM)
+                self._current_chunk_size = 0
+        self.file_size += len(view)
+
+    def rewrite(self, offset: int, length: int) -> None:
+        """
+        Report that bytes that were already written were changed in place.
+
+        :param offset: Offset of the first changed byte
+        :type offset: int
+        :param length: Number of changed bytes
+        :type length: int
+        """
+        first_chunk = offset // self.chunk_size
+        last_chunk = (offset + max(length, 1) - 1) // self.chunk_size
+        self._rewritten_chunks.update(range(first_chunk, last_chunk + 1))
+
+    def hash_recording(self) -> None:
+        """
+        Hash the recording as it is on disk, replacing what was hashed so
+        far. Used for writers that do not report the bytes they write; call
+        it once the recording is closed.
+        """
+        self.chunk_hashes = []
+        self.file_size = 0
+        self._current_chunk = hashlib.new(HASH_ALGORITHM)
+        self._current_chunk_size = 0
+        self._rewritten_chunks.clear()
+        with open(self.recording_path, "rb") as recording_file:
+            while True:
+                data = recording_file.read(self.chunk_size)
+                if not data:
+                    break
+                self.write_block(data)
+
+    def close(self) -> Dict[str, object]:
+        """
+        Finish the last chunk, rehash rewritten chunks and write the
+        manifest next to the recording.
+
+        :return: The manifest
+        :rtype: Dict[str, object]
+        """
+        if self._current_chunk_size:
+            self.chunk_hashes.append(self._current_chunk.hexdigest())
+            self._current_chunk = hashlib.new(HASH_ALGORITHM)
+            self._current_chunk_size = 0
+
+        # Only the chunks that were changed in place are read back
+        if self._rewritten_chunks:
+            with open(self.recording_path, "rb") as recording_file:
+                for chunk_index in sorted(self._rewritten_chunks):
+                    if chunk_index < len(self.chunk_hashes):
+                        self.chunk_hashes[chunk_index] = _hash_chunk(
+                            recording_file, chunk_index, self.chunk_size)
+            self._rewritten_chunks.clear()
+
+        manifest = {"version": MANIFEST_FORMAT_VERSION,
+                    "algorithm": HASH_ALGORITHM,
+                    "chunk_size": self.chunk_size,
+                    "file_size": self.file_size,
+                    "root_hash": compute_root_hash(self.chunk_hashes),
+                    "chunk_hashes": self.chunk_hashes}
+        manifest_path = get_manifest_path(self.recording_path)
+        with open(manifest_path + ".tmp", "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        return manifest
+
+
+class VerificationReport:
+    """
+    Result of the verification of a recording against its manifest.
+
+    Attributes
+    ----------
+    verified_chunks : List[int]
+        Chunks whose hash matches the manifest
+    corrupt_chunks : List[int]
+        Chunks whose hash does not match the manifest
+    missing_chunks : List[int]
+        Chunks that are not (completely) present, e.g. because the file is
+        still being copied
+    root_hash_matches : bool
+        Whether the file is complete and the root hash matches
+    """
+
+    def __init__(self, verified_chunks: List[int], corrupt_chunks: List[int],
+                 missing_chunks: List[int], root_hash_matches: bool) -> None:
+        self.verified_chunks = verified_chunks
+        self.corrupt_chunks = corrupt_chunks
+        self.missing_chunks = missing_chunks
+        self.root_hash_matches = root_hash_matches
+
+    def is_valid(self) -> bool:
+        """
+        :return: Whether the complete file matches the manifest
+        :rtype: bool
+        """
+        return (self.root_hash_matches and not self.corrupt_chunks and
+                not self.missing_chunks)
+
+
+def verify_recording(recording_path: str,
+                     manifest_path: Optional[str] = None,
+                     max_workers: Optional[int] = None
+                     ) -> VerificationReport:
+    """
+    Verify a (possibly partially copied) recording against its manifest.
+
+    The chunks are hashed in parallel threads; the hash functions release
+    the GIL on large buffers. Chunks that are not completely present yet
+    are reported as missing rather than corrupt, so a copy in progress can
+    be checked chunk by chunk.
+
+    :param recording_path: Path of the recording (or its copy)
+    :type recording_path: str
+    :param manifest_path: Path of the manifest, defaults to the manifest
+                          next to the recording
+    :type manifest_path: str, optional
+    :param max_workers: Number of threads, defaults to the number of cores
+    :type max_workers: int, optional
+    :return: The verification report
+    :rtype: VerificationReport
+    """
+    if manifest_path is None:
+        manifest_path = get_manifest_path(recording_path)
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    chunk_size: int = manifest["chunk_size"]
+    expected_hashes: List[str] = manifest["chunk_hashes"]
+    expected_size: int = manifest["file_size"]
+    current_size = os.path.getsize(recording_path)
+
+    def _is_present(chunk_index: int) -> bool:
+        chunk_end = min((chunk_index + 1) * chunk_size, expected_size)
+        return current_size >= chunk_end
+
+    present_chunks = [chunk_index for chunk_index in
+                      range(len(expected_hashes)) if _is_present(chunk_index)]
+    missing_chunks = [chunk_index for chunk_index in
+                      range(len(expected_hashes))
+                      if not _is_present(chunk_index)]
+
+    def _verify_chunk(chunk_index: int) -> bool:
+        # Every thread uses its own file handle
+        with open(recording_path, "rb") as recording_file:
+            return _hash_chunk(recording_file, chunk_index, chunk_size) == \
+                expected_hashes[chunk_index]
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as \
+            executor:
+        matches = list(executor.map(_verify_chunk, present_chunks))
+
+    verified_chunks = [chunk_index for chunk_index, match in
+                       zip(present_chunks, matches) if match]
+    corrupt_chunks = [chunk_index for chunk_index, match in
+                      zip(present_chunks, matches) if not match]
+    root_hash_matches = (not missing_chunks and not corrupt_chunks and
+                         current_size == expected_size and
+                         compute_root_hash(expected_hashes) ==
+                         manifest["root_hash"])
+    return VerificationReport(verified_chunks, corrupt_chunks,
+                              missing_chunks, root_hash_matches)
+
+
+def _hash_chunk(recording_file, chunk_index: int, chunk_size: int) -> str:
+    """
+    Hash a single chunk of an open recording.
+
+    :param recording_file: The recording, opened in binary mode
+    :type recording_file: BinaryIO
+    :param chunk_index: Index of the chunk
+    :type chunk_index: int
+    :param chunk_size: Number of bytes per chunk
+    :type chunk_size: int
+    :return: Hexadecimal hash of the chunk
+    :rtype: str
+    """
+    recording_file.seek(chunk_index * chunk_size)
+    return hashlib.new(HASH_ALGORITHM,
+                       recording_file.read(chunk_size)).hexdigest()
@@ -0,0 +1,418 @@
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+# Name of the index file that is stored in the root of the storage folder
+CATALOG_DATABASE_FILENAME: str = ".recording_catalog.sqlite"
+# Version of the database layout, a catalog with another version is rebuilt
+CATALOG_SCHEMA_VERSION: int = 1
+# Columns the catalog can be sorted on
+SORTABLE_COLUMNS: List[str] = ["name", "subject", "recorded_at", "duration",
+                               "devices", "format", "size"]
+# Maximum number of rows returned by a single search
+DEFAULT_SEARCH_LIMIT: int = 1000
+# Time in seconds to wait for a database that is locked by another instance
+DATABASE_BUSY_TIMEOUT: float = 5.0
+# SQLite result codes of a damaged database: SQLITE_CORRUPT and SQLITE_NOTADB
+CORRUPT_DATABASE_ERROR_CODES: set = {11, 26}
+# Messages of those result codes, for Python versions that do not report
+# the code
+CORRUPT_DATABASE_MESSAGES: tuple = ("file is not a database",
+                                    "database disk image is malformed")
+
+_CREATE_TABLES_SQL: str = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS recordings (
+    path TEXT PRIMARY KEY,
+    directory TEXT,
+    name TEXT,
+    subject TEXT,
+    recorded_at REAL,
+    duration REAL,
+    devices TEXT,
+    format TEXT,
+    size INTEGER,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_directory ON recordings(directory);
+CREATE INDEX IF NOT EXISTS idx_recordings_name ON recordings(name);
+CREATE INDEX IF NOT EXISTS idx_recordings_subject ON recordings(subject);
+CREATE INDEX IF NOT EXISTS idx_recordings_recorded_at
+    ON recordings(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_recordings_duration ON recordings(duration);
+CREATE INDEX IF NOT EXISTS idx_recordings_devices ON recordings(devices);
+CREATE INDEX IF NOT EXISTS idx_recordings_format ON recordings(format);
+CREATE INDEX IF NOT EXISTS idx_recordings_size ON recordings(size);
+"""
+
+
+class RecordingCatalog:
+    """
+    A small SQLite index of the recordings in a storage folder.
+
+    The catalog is updated incrementally: the modification time of every
+    directory is stored, and only directories that changed since the last
+    refresh are listed again. Within those directories only files with a
+    changed modification time or size are updated. Metadata that can not be
+    derived from the file system (duration, devices) is added by the writer
+    through update_recording_metadata.
+
+    Attributes
+    ----------
+    folder : str
+        The storage folder that is indexed
+    recording_extensions : set
+        Lower case file extensions (including the dot) of recordings
+    connection : sqlite3.Connection
+        Connection to the index database
+    """
+
+    def __init__(self, folder: str, recording_extensions: Iterable[str],
+                 database_path: Optional[str] = None) -> None:
+        """
+        Open (or create) the catalog of the storage folder.
+
+        :param folder: The storage folder to index
+        :type folder: str
+        :param recording_extensions: File extensions of recordings, e.g.
+                                     [".poly5", ".edf"]
+        :type recording_extensions: Iterable[str]
+        :param database_path: Path of the index database, defaults to
+                              CATALOG_DATABASE_FILENAME inside the folder
+        :type database_path: str, optional
+        :raises sqlite3.Error: if the database can not be used, e.g. because
+                               it is locked by another instance
+        :raises OSError: if a damaged database can not be removed
+        """
+        self.folder = os.path.abspath(folder)
+        self.recording_extensions = {extension.lower() for extension in
+                                     recording_extensions}
+        if database_path is None:
+            database_path = os.path.join(self.folder,
+                                         CATALOG_DATABASE_FILENAME)
+        try:
+            self._open_database(database_path)
+        except sqlite3.DatabaseError as error:
+            # The catalog is only an index, rebuild it if it is damaged.
+            # Other errors, e.g. a database that is locked, are raised, as
+            # the database is fine.
+            if not is_corrupt_database_error(error):
+                raise
+            os.remove(database_path)
+            self._open_database(database_path)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Bring the catalog up to date with the storage folder.
+
+        :param full: Check every directory, even if its modification time did
+                     not change. Needed only if files were modified in place
+                     by another application.
+        :type full: bool
+        :return: Number of recordings that were added, updated or removed
+        :rtype: int
+        """
+        known_directories: Dict[str, float] = dict(self.connection.execute(
+            "SELECT path, mtime FROM directories"))
+        known_subdirectories: Dict[str, List[str]] = {}
+        for path in known_directories:
+            if path != self.folder:
+                known_subdirectories.setdefault(
+                    os.path.dirname(path), []).append(path)
+        seen_directories: set = set()
+        number_of_changes = 0
+
+        # Walk the folder tree, but only list directories that changed
+        directories_to_visit = [self.folder]
+        while directories_to_visit:
+            directory = directories_to_visit.pop()
+            seen_directories.add(directory)
+            try:
+                directory_mtime = os.stat(directory).st_mtime
+            except OSError:
+                continue
+            if not full and known_directories.get(directory) == \
+                    directory_mtime:
+                # Nothing was added or removed here, but subdirectories can
+                # still have changed
+                directories_to_visit.extend(
+                    known_subdirectories.get(directory, []))
+                continue
+            subdirectories, changes = self._refresh_directory(directory)
+            directories_to_visit.extend(subdirectories)
+            number_of_changes += changes
+            self.connection.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime) "
+                "VALUES (?, ?)", (directory, directory_mtime))
+
+        # Forget about directories that no longer exist
+        for directory in set(known_directories) - seen_directories:
+            number_of_changes += self.connection.execute(
+                "DELETE FROM recordings WHERE directory = ?",
+                (directory,)).rowcount
+            self.connection.execute("DELETE FROM directories WHERE path = ?",
+                                    (directory,))
+        self.connection.commit()
+        return number_of_changes
+
+    def add_or_update_recording(self, path: str) -> None:
+        """
+        Add a single recording to the catalog, e.g. after the writer closed
+        it. This avoids a refresh of the whole directory.
+
+        :param path: Path of the recording
+        :type path: str
+        """
+        path = os.path.abspath(path)
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            self.remove_recording(path)
+            return
+        self._upsert_recording(path, stat_result.st_size,
+                               stat_result.st_mtime)
+        self.connection.commit()
+
+    def update_recording_metadata(self, path: str, subject: str = None,
+                                  duration: float = None,
+                                  devices: List[str] = None) -> None:
+        """
+        Store metadata of a recording that can not be derived from the file
+        system. Only the fields that are given are updated.
+
+        :param path: Path of the recording
+        :type path: str
+        :param subject: Subject of the recording
+        :type subject: str, optional
+        :param duration: Duration of the recording in seconds
+        :type duration: float, optional
+        :param devices: Serial numbers of the recorders in the recording
+        :type devices: List[str], optional
+        """
+        path = os.path.abspath(path)
+        self.add_or_update_recording(path)
+        if subject is not None:
+            self.connection.execute(
+                "UPDATE recordings SET subject = ? WHERE path = ?",
+                (subject, path))
+        if duration is not None:
+            self.connection.execute(
+                "UPDATE recordings SET duration = ? WHERE path = ?",
+                (duration, path))
+        if devices is not None:
+            self.connection.execute(
+                "UPDATE recordings SET devices = ? WHERE path = ?",
+                (", ".join(devices), path))
+        self.connection.commit()
+
+    def remove_recording(self, path: str) -> None:
+        """
+        Remove a recording from the catalog.
+
+        :param path: Path of the recording
+        :type path: str
+        """
+        self.connection.execute("DELETE FROM recordings WHERE path = ?",
+                                (os.path.abspath(path),))
+        self.connection.commit()
+
+    def search(self, text: str = "", sort_column: str = "recorded_at",
+               descending: bool = True, limit: int = DEFAULT_SEARCH_LIMIT
+               ) -> List[Dict[str, object]]:
+        """
+        Search the catalog on name, subject, devices and format.
+
+        :param text: Text to search for, an empty text matches everything
+        :type text: str
+        :param sort_column: Column to sort on, one of SORTABLE_COLUMNS
+        :type sort_column: str
+        :param descending: Sort in descending order
+        :type descending: bool
+        :param limit: Maximum number of recordings to return
+        :type limit: int
+        :return: The matching recordings
+        :rtype: List[Dict[str, object]]
+        """
+        if sort_column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Can not sort the catalog on {sort_column}")
+        order = "DESC" if descending else "ASC"
+        query = ("SELECT path, name, subject, recorded_at, duration, "
+                 "devices, format, size FROM recordings")
+        parameters: list = []
+        if text:
+            # Escape the LIKE wildcards, recording names often contain "_"
+            escaped_text = (text.replace("\\", "\\\\")
+                            .replace("%", "\\%").replace("_", "\\_"))
+            pattern = f"%{escaped_text}%"
+            query += (" WHERE name LIKE ?1 ESCAPE '\\' OR subject LIKE ?1 "
+                      "ESCAPE '\\' OR devices LIKE ?1 ESCAPE '\\' OR "
+                      "format LIKE ?1 ESCAPE '\\'")
+            parameters = [pattern]
+        query += (f" ORDER BY {sort_column} {order} "
+                  f"LIMIT ?{len(parameters) + 1}")
+        parameters.append(limit)
+
+        cursor = self.connection.execute(query, parameters)
+        column_names = [description[0] for description in cursor.description]
+        return [dict(zip(column_names, row)) for row in cursor]
+
+    def get_directories(self) -> List[str]:
+        """
+        Get the directories of the storage folder that are indexed.
+
+        :return: Paths of the folder and its subdirectories
+        :rtype: List[str]
+        """
+        return [path for path, in self.connection.execute(
+            "SELECT path FROM directories")]
+
+    def count(self) -> int:
+        """
+        Get the number of recordings in the catalog.
+
+        :return: Number of recordings
+        :rtype: int
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM recordings").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the connection to the index database.
+        """
+        self.connection.close()
+
+    def _open_database(self, database_path: str) -> None:
+        """
+        Connect to the index database and create its tables.
+
+        The rollback journal is kept in memory. A journal file would be
+        created and removed next to the database on every write, which
+        changes the modification time of the storage folder and defeats the
+        incremental refresh.
+
+        :param database_path: Path of the index database
+        :type database_path: str
+        """
+        self.connection = sqlite3.connect(database_path,
+                                          timeout=DATABASE_BUSY_TIMEOUT)
+        try:
+            self.connection.execute("PRAGMA journal_mode = MEMORY")
+            self._create_schema()
+        except sqlite3.Error:
+            # Release the file, so a damaged database can be removed
+            self.connection.close()
+            raise
+
+    def _create_schema(self) -> None:
+        """
+        Create the tables of the catalog, or rebuild them if the catalog was
+        written with another schema version.
+        """
+        self.connection.executescript(_CREATE_TABLES_SQL)
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is not None and int(row[0]) != CATALOG_SCHEMA_VERSION:
+            self.connection.executescript(
+                "DROP TABLE recordings; DROP TABLE directories;")
+            self.connection.executescript(_CREATE_TABLES_SQL)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES "
+            "('schema_version', ?)", (str(CATALOG_SCHEMA_VERSION),))
+        self.connection.commit()
+
+    def _refresh_directory(self, directory: str) -> tuple:
+        """
+        Update the recordings of a single directory.
+
+        :param directory: The directory to update
+        :type directory: str
+        :return: The subdirectories found and the number of changes
+        :rtype: tuple(List[str], int)
+        """
+        indexed: Dict[str, tuple] = {
+            path: (size, mtime) for path, size, mtime in
+            self.connection.execute(
+                "SELECT path, size, mtime FROM recordings WHERE "
+                "directory = ?", (directory,))}
+        subdirectories: List[str] = []
+        number_of_changes = 0
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                    continue
+                if (os.path.splitext(entry.name)[1].lower() not in
+                        self.recording_extensions):
+                    continue
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            # Only touch the database if the file changed
+            known = indexed.pop(entry.path, None)
+            if known != (stat_result.st_size, stat_result.st_mtime):
+                self._upsert_recording(entry.path, stat_result.st_size,
+                                       stat_result.st_mtime)
+                number_of_changes += 1
+
+        # Whatever is left in the index was removed from the directory
+        for path in indexed:
+            self.connection.execute("DELETE FROM recordings WHERE path = ?",
+                                    (path,))
+            number_of_changes += 1
+        return subdirectories, number_of_changes
+
+    def _upsert_recording(self, path: str, size: int, mtime: float) -> None:
+        """
+        Insert a recording or update its file system information, keeping
+        the metadata that was stored by the writer.
+
+        :param path: Absolute path of the recording
+        :type path: str
+        :param size: Size of the recording in bytes
+        :type size: int
+        :param mtime: Modification time of the recording
+        :type mtime: float
+        """
+        name = os.path.basename(path)
+        stem, extension = os.path.splitext(name)
+        # Recordings are named <subject>_<...>, use the first part as the
+        # subject until the writer provides the real one
+        subject = stem.split("_")[0]
+        self.connection.execute(
+            "INSERT INTO recordings (path, directory, name, subject, "
+            "recorded_at, format, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+            "mtime = excluded.mtime",
+            (path, os.path.dirname(path), name, subject, mtime,
+             extension.lstrip(".").lower(), size, mtime))
+
+
+def is_corrupt_database_error(error: sqlite3.DatabaseError) -> bool:
+    """
+    Check whether an error means that the database file is damaged, rather
+    than e.g. locked or on a drive that is not writable.
+
+    :param error: The error raised by sqlite3
+    :type error: sqlite3.DatabaseError
+    :return: True if the database is damaged
+    :rtype: bool
+    """
+    error_code = getattr(error, "sqlite_errorcode", None)
+    if error_code is not None:
+        # Extended result codes keep the primary code in the lowest byte
+        return error_code & 0xFF in CORRUPT_DATABASE_ERROR_CODES
+    return any(message in str(error) for message in
+               CORRUPT_DATABASE_MESSAGES)
@@ -0,0 +1,315 @@
+import copy
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Version of the layout of the settings file. Files of an older version are
+# converted with SETTINGS_MIGRATIONS when they are loaded.
+SETTINGS_SCHEMA_VERSION: int = 1
+# Location of the settings file of the user
+DEFAULT_SETTINGS_PATH: str = os.path.join(
+    os.path.expanduser("~"), ".tmsi", "file_management_settings.json")
+# Profile that is used when no other profile was selected
+DEFAULT_PROFILE_NAME: str = "Default"
+# Time in seconds without changes after which the settings are written
+DEFAULT_WRITE_DELAY: float = 0.5
+# Time in seconds after which changed settings are written, even when they
+# keep changing
+MAX_WRITE_DELAY: float = 5.0
+# Functions that convert the settings file of a version into the next
+# version, keyed by the version they convert from
+SETTINGS_MIGRATIONS: Dict[int, Callable[[dict], dict]] = {}
+
+
+class SettingsStore:
+    """
+    Persistent settings, grouped in profiles, e.g. per operator or per
+    study.
+
+    All reads and writes go to an in-memory copy of the settings. Changes
+    are written to disk by a background thread once no change was made for
+    write_delay seconds, so typing or toggling does not touch the disk on
+    every edit. The file is replaced atomically, so it is never left half
+    written.
+
+    Attributes
+    ----------
+    path : str
+        Path of the settings file
+    defaults : Dict[str, object]
+        Value of every setting that was not set in a profile
+    write_delay : float
+        Time in seconds without changes after which the settings are written
+    active_profile : str
+        Name of the profile that is read and changed
+    is_read_only : bool
+        Whether the settings file was written by a newer version, in which
+        case it is not overwritten
+    number_of_changes : int
+        Number of set or update calls that changed a setting
+    number_of_writes : int
+        Number of times the settings file was written
+    """
+
+    def __init__(self, path: str = DEFAULT_SETTINGS_PATH,
+                 defaults: Optional[Dict[str, object]] = None,
+                 write_delay: float = DEFAULT_WRITE_DELAY) -> None:
+        """
+        Load the settings file and start the writer thread.
+
+        :param path: Path of the settings file
+        :type path: str
+        :param defaults: Value of every setting that was not set
+        :type defaults: Dict[str, object], optional
+        :param write_delay: Time in seconds without changes after which the
+                            settings are written
+        :type write_delay: float
+        """
+        self.path = path
+        self.defaults: Dict[str, object] = dict(defaults or {})
+        self.write_delay = write_delay
+        self.is_read_only = False
+        self.number_of_changes = 0
+        self.number_of_writes = 0
+        self._profiles: Dict[str, Dict[str, object]] = {}
+        self.active_profile = DEFAULT_PROFILE_NAME
+        self._load()
+        self._profiles.setdefault(self.active_profile, {})
+        # Times of the first and the last change that was not written yet
+        self._first_change_time: Optional[float] = None
+        self._last_change_time = 0.0
+        self._is_closed = False
+        self._condition = threading.Condition()
+        self._writer_thread = threading.Thread(
+            target=self._write_when_idle, name="settings-writer",
+            daemon=True)
+        self._writer_thread.start()
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        :param key: Name of the setting
+        :type key: str
+        :param default: Value if the setting is not set and has no default
+        :type default: object
+        :return: Value of the setting in the active profile
+        :rtype: object
+        """
+        with self._condition:
+            profile = self._profiles[self.active_profile]
+            if key in profile:
+                return profile[key]
+            return self.defaults.get(key, default)
+
+    def get_all(self) -> Dict[str, object]:
+        """
+        :return: All settings of the active profile, including the defaults
+        :rtype: Dict[str, object]
+        """
+        with self._condition:
+            settings = dict(self.defaults)
+            settings.update(self._profiles[self.active_profile])
+            return copy.deepcopy(settings)
+
+    def set(self, key: str, value: object) -> bool:
+        """
+        Change a setting of the active profile.
+
+        :param key: Name of the setting
+        :type key: str
+        :param value: New value, must be JSON serializable
+        :type value: object
+        :return: Whether the value changed
+        :rtype: bool
+        """
+        return key in self.update({key: value})
+
+    def update(self, values: Dict[str, object]) -> List[str]:
+        """
+        Change several settings of the active profile at once.
+
+        :param values: New value of every setting to change
+        :type values: Dict[str, object]
+        :return: Names of the settings whose value changed
+        :rtype: List[str]
+        """
+        with self._condition:
+            profile = self._profiles[self.active_profile]
+            # Setting a value that is already shown, e.g. when editing
+            # finishes without an edit, does not cause a write
+            changed_keys = [key for key, value in values.items()
+                            if profile.get(key, self.defaults.get(key))
+                            != value]
+            if not changed_keys:
+                return []
+            for key in changed_keys:
+                profile[key] = copy.deepcopy(values[key])
+            self._mark_changed()
+            return changed_keys
+
+    def get_profile_names(self) -> List[str]:
+        """
+        :return: Names of all profiles, sorted
+        :rtype: List[str]
+        """
+        with self._condition:
+            return sorted(self._profiles)
+
+    def switch_profile(self, name: str) -> Dict[str, object]:
+        """
+        Make a profile the active one. A profile that does not exist yet is
+        created as a copy of the active profile.
+
+        :param name: Name of the profile
+        :type name: str
+        :raises ValueError: if the name is empty
+        :return: All settings of the profile, including the defaults
+        :rtype: Dict[str, object]
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("The name of a profile can not be empty")
+        with self._condition:
+            if name not in self._profiles:
+                self._profiles[name] = copy.deepcopy(
+                    self._profiles[self.active_profile])
+            if name != self.active_profile:
+                self.active_profile = name
+                self._mark_changed()
+        return self.get_all()
+
+    def delete_profile(self, name: str) -> None:
+        """
+        Delete a profile that is not active.
+
+        :param name: Name of the profile
+        :type name: str
+        :raises ValueError: if the profile is the active profile
+        """
+        with self._condition:
+            if name == self.active_profile:
+                raise ValueError("The active profile can not be deleted")
+            if self._profiles.pop(name, None) is not None:
+                self._mark_changed()
+
+    def flush(self) -> None:
+        """
+        Write the changed settings now, instead of after the write delay.
+        """
+        with self._condition:
+            if self._first_change_time is None:
+                return
+            content = self._serialize()
+        self._write(content)
+
+    def close(self) -> None:
+        """
+        Write the changed settings and stop the writer thread.
+        """
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify()
+        self._writer_thread.join()
+        self.flush()
+
+    def _mark_changed(self) -> None:
+        """
+        Note a change and wake the writer thread. The caller holds the
+        condition.
+        """
+        now = time.monotonic()
+        if self._first_change_time is None:
+            self._first_change_time = now
+        self._last_change_time = now
+        self.number_of_changes += 1
+        self._condition.notify()
+
+    def _serialize(self) -> str:
+        """
+        Convert the settings to the content of the settings file, and mark
+        them as written. The caller holds the condition.
+
+        :return: The content of the settings file
+        :rtype: str
+        """
+        self._first_change_time = None
+        return json.dumps({"version": SETTINGS_SCHEMA_VERSION,
+                           "active_profile": self.active_profile,
+                           "profiles": self._profiles}, indent=2)
+
+    def _write_when_idle(self) -> None:
+        """
+        Body of the writer thread: write the settings once no change was
+        made for write_delay seconds, or once they were changed for
+        MAX_WRITE_DELAY seconds.
+        """
+        while True:
+            with self._condition:
+                while not self._is_closed:
+                    if self._first_change_time is None:
+                        self._condition.wait()
+                        continue
+                    due_time = min(
+                        self._last_change_time + self.write_delay,
+                        self._first_change_time + MAX_WRITE_DELAY)
+                    remaining = due_time - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._is_closed:
+                    # close writes the remaining changes itself
+                    return
+                content = self._serialize()
+            # The file is written outside the lock, so the settings can be
+            # read and changed in the meantime
+            self._write(content)
+
+    def _write(self, content: str) -> None:
+        """
+        Replace the settings file atomically.
+
+        :param content: The content of the settings file
+        :type content: str
+        """
+        if self.is_read_only:
+            return
+        temporary_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(temporary_path, "w") as settings_file:
+                settings_file.write(content)
+            os.replace(temporary_path, self.path)
+            self.number_of_writes += 1
+        except OSError as error:
+            print(f"Warning: the settings could not be saved to "
+                  f"{self.path}: {error}")
+
+    def _load(self) -> None:
+        """
+        Load the settings file, converting it to the current schema version.
+        A missing or damaged file leaves the defaults in place.
+        """
+        try:
+            with open(self.path) as settings_file:
+                data = json.load(settings_file)
+            version = int(data["version"])
+            while version < SETTINGS_SCHEMA_VERSION:
+                data = SETTINGS_MIGRATIONS[version](data)
+                version += 1
+            if version > SETTINGS_SCHEMA_VERSION:
+                print(f"Warning: the settings in {self.path} were saved by "
+                      f"a newer version and are not changed.")
+                self.is_read_only = True
+            self._profiles = {str(name): dict(profile) for name, profile
+                              in data["profiles"].items()}
+            self.active_profile = str(data.get("active_profile",
+                                               DEFAULT_PROFILE_NAME))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError,
+                AttributeError) as error:
+            print(f"Warning: the settings in {self.path} could not be "
+                  f"read: {error}")
+            self._profiles = {}
+            self.active_profile = DEFAULT_PROFILE_NAME
@@ -0,0 +1,41 @@
+"""
+Make the modules of frontend/frontend importable under their package name,
+application.Views.classes, when the tests run from this repository without
+the rest of the application.
+"""
+import importlib.util
+import os
+import sys
+import types
+
+# Directory that is the application.Views.classes package
+PACKAGE_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "frontend", "frontend")
+
+
+def _add_namespace_package(name: str, path: list) -> None:
+    """
+    Register an empty package, unless the application provides it.
+
+    :param name: Name of the package
+    :type name: str
+    :param path: Directories the modules of the package are found in
+    :type path: list
+    """
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = path
+        sys.modules[name] = package
+
+
+if importlib.util.find_spec("application") is None:
+    _add_namespace_package("application", [])
+    _add_namespace_package("application.Views", [])
+    spec = importlib.util.spec_from_file_location(
+        "application.Views.classes",
+        os.path.join(PACKAGE_DIRECTORY, "__init__.py"),
+        submodule_search_locations=[PACKAGE_DIRECTORY])
+    classes = importlib.util.module_from_spec(spec)
+    sys.modules["application.Views.classes"] = classes
+    spec.loader.exec_module(classes)
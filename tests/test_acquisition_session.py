@@ -0,0 +1,66 @@
+import pytest
+
+from application.Views.classes.pipeline.acquisition_session import (
+    SETTING_CHANNELS_PER_RECORDER, SETTING_DEVICE_SOURCE,
+    SETTING_RECORDER_FILTERS, SETTING_SAMPLE_RATE, AcquisitionSession)
+from application.Views.classes.pipeline.filter_bank import FilterSettings
+
+# Connected recorders as returned by the connection overview controller
+OVERVIEW_DEVICES = {
+    "BS1": [{"serial_number_recorder": "R1", "is_paired": True},
+            {"serial_number_recorder": "R2", "is_paired": False}],
+    "BS2": [{"serial_number_recorder": "R3", "is_paired": True}],
+}
+
+
+def test_paired_recorders_are_acquired():
+    session = AcquisitionSession()
+    session.set_overview_devices_source(lambda: OVERVIEW_DEVICES)
+    assert session.get_paired_serial_numbers() == ["R1", "R3"]
+    # Without a device source no recorder can be read
+    assert session.get_recorders() == []
+    session.apply_settings({SETTING_DEVICE_SOURCE: "devices:Source",
+                            SETTING_CHANNELS_PER_RECORDER: 32,
+                            SETTING_SAMPLE_RATE: 2000})
+    recorders = session.get_recorders()
+    assert [recorder.serial_number for recorder in recorders] == ["R1",
+                                                                  "R3"]
+    assert all(recorder.device_source == "devices:Source" and
+               recorder.number_of_channels == 32 and
+               recorder.sample_rate == 2000.0 for recorder in recorders)
+
+
+def test_start_without_recorders_returns_none():
+    session = AcquisitionSession()
+    session.apply_settings({SETTING_DEVICE_SOURCE: "devices:Source"})
+    assert session.start() is None
+    session.set_overview_devices_source(lambda: OVERVIEW_DEVICES)
+    session.set_overview_devices_source(None)
+    assert session.get_paired_serial_numbers() == []
+
+
+def test_recorder_filters_are_validated_and_saved():
+    session = AcquisitionSession()
+    session.apply_settings({SETTING_SAMPLE_RATE: 500})
+    session.set_recorder_filter("R1", FilterSettings(highpass_frequency=1.0,
+                                                     notch_frequency=50.0))
+    # The Nyquist frequency is 250 Hz, the invalid filter is not stored
+    with pytest.raises(ValueError):
+        session.set_recorder_filter("R3", FilterSettings(
+            lowpass_frequency=300.0))
+    # Settings without any filter remove the filters of the recorder
+    session.set_recorder_filter("R1", FilterSettings())
+    assert session.recorder_filters == {}
+    session.set_recorder_filter("R3", FilterSettings(lowpass_frequency=100.0))
+    saved_filters = session.get_recorder_filter_settings()
+
+    restored = AcquisitionSession()
+    restored.apply_settings({SETTING_SAMPLE_RATE: 500,
+                             SETTING_RECORDER_FILTERS: saved_filters})
+    assert list(restored.recorder_filters) == ["R3"]
+    assert (restored.recorder_filters["R3"].get_key() ==
+            session.recorder_filters["R3"].get_key())
+    # Filters that are invalid at the sample rate of a profile are skipped
+    restored.apply_settings({SETTING_SAMPLE_RATE: 100,
+                             SETTING_RECORDER_FILTERS: saved_filters})
+    assert restored.recorder_filters == {}
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from application.Views.classes.storage import batch_converter
+from application.Views.classes.storage.batch_converter import (
+    BatchConverter, convert_file, get_target_path, main,
+    register_file_formats)
+
+# Sample rate of the recordings in the tests, in Hz
+SAMPLE_RATE = 500.0
+# Number of channels of the recordings in the tests
+NUMBER_OF_CHANNELS = 3
+
+
+class NpyReader:
+    """
+    Reads recordings that are NumPy files of shape (samples, channels).
+    """
+
+    def __init__(self, path):
+        self.samples = np.load(path, mmap_mode="r")
+
+    def get_sample_rate(self):
+        return SAMPLE_RATE
+
+    def get_channel_names(self):
+        return [f"CH{index}" for index in range(self.samples.shape[1])]
+
+    def iter_chunks(self, chunk_size):
+        for first in range(0, self.samples.shape[0], chunk_size):
+            yield np.asarray(self.samples[first:first + chunk_size])
+
+    def close(self):
+        self.samples = None
+
+
+class RawWriter:
+    """
+    Writes the samples as raw float32 values.
+    """
+    # Number of samples of every written block, of the conversions in
+    # this process
+    block_sizes = []
+
+    def __init__(self, path, channel_names, sample_rate):
+        self.raw_file = open(path, "wb")
+
+    def write_block(self, samples):
+        samples.astype(np.float32).tofile(self.raw_file)
+        self.block_sizes.append(samples.shape[0])
+
+    def close(self):
+        self.raw_file.close()
+
+
+# The workers of the pool tests import the codecs of this module, which
+# only forked workers can
+requires_fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="the workers import the codecs of this module")
+
+
+@pytest.fixture
+def codecs(monkeypatch):
+    """
+    Register the codecs of this module for the .npy and .raw formats.
+    """
+    monkeypatch.setattr(batch_converter, "FILE_FORMAT_CODECS", {})
+    monkeypatch.setattr(batch_converter, "WORKER_START_METHOD", "fork")
+    monkeypatch.setattr(RawWriter, "block_sizes", [])
+    batch_converter.register_file_format(
+        ".NPY", f"{__name__}:NpyReader", f"{__name__}:RawWriter")
+    batch_converter.register_file_format(
+        "raw", f"{__name__}:NpyReader", f"{__name__}:RawWriter")
+    return batch_converter.FILE_FORMAT_CODECS
+
+
+def _save_recording(path, number_of_samples=1000, seed=0):
+    samples = np.random.default_rng(seed).normal(
+        size=(number_of_samples, NUMBER_OF_CHANNELS)).astype(np.float32)
+    np.save(path, samples)
+    return samples
+
+
+def test_get_target_path():
+    assert get_target_path(os.path.join("data", "S01.poly5"), ".EDF") == \
+        os.path.join("data", "S01.edf")
+    assert get_target_path(os.path.join("data", "S01.poly5"), "edf",
+                           "out") == os.path.join("out", "S01.edf")
+
+
+def test_file_is_converted_in_chunks(codecs, tmp_path):
+    source_path = str(tmp_path / "S01.npy")
+    samples = _save_recording(source_path)
+    target_path = str(tmp_path / "S01.raw")
+    result = convert_file(source_path, target_path, codecs, chunk_size=300)
+    assert result.error is None
+    assert result.bytes_read == os.path.getsize(source_path)
+    assert result.get_throughput() > 0
+    assert np.array_equal(np.fromfile(target_path, dtype=np.float32),
+                          samples.ravel())
+    assert RawWriter.block_sizes == [300, 300, 300, 100]
+
+
+def test_unknown_format_is_reported(codecs, tmp_path):
+    source_path = str(tmp_path / "S01.npy")
+    _save_recording(source_path)
+    result = convert_file(source_path, str(tmp_path / "S01.edf"), codecs)
+    assert result.error == ("ValueError: No writer is registered for the "
+                            ".edf format")
+    assert result.bytes_read == 0
+
+
+def test_recording_is_not_converted_onto_itself(codecs, tmp_path):
+    source_path = str(tmp_path / "S01.npy")
+    _save_recording(source_path)
+    size = os.path.getsize(source_path)
+    result = convert_file(source_path, source_path, codecs)
+    assert result.error == ("ValueError: The recording is already in this "
+                            "format")
+    assert os.path.getsize(source_path) == size
+    assert RawWriter.block_sizes == []
+
+
+def test_register_file_formats(codecs):
+    register_file_formats({"EDF": {"reader": "a:R", "writer": "a:W"},
+                           "bdf": "invalid"})
+    assert codecs["edf"] == {"reader": "a:R", "writer": "a:W"}
+    assert "bdf" not in codecs
+
+
+@requires_fork
+def test_batch_conversion(codecs, tmp_path):
+    source_paths = [str(tmp_path / f"S{index:02}.npy") for index in range(4)]
+    for index, source_path in enumerate(source_paths):
+        _save_recording(source_path, seed=index)
+    source_paths.append(str(tmp_path / "missing.npy"))
+    output_folder = tmp_path / "converted"
+    output_folder.mkdir()
+    progress = []
+    results = BatchConverter(max_workers=2).convert(
+        source_paths, "raw", str(output_folder),
+        lambda finished, total, result: progress.append((finished, total)))
+    assert progress == [(number, 5) for number in range(1, 6)]
+    failed = [result.source_path for result in results if result.error]
+    assert failed == [source_paths[-1]]
+    assert sorted(name for name in os.listdir(output_folder)
+                  if name.endswith(".raw")) == [f"S{index:02}.raw"
+                                                for index in range(4)]
+
+
+@requires_fork
+def test_pop_completed_reports_every_result(codecs, tmp_path):
+    source_paths = [str(tmp_path / f"S{index:02}.npy") for index in range(6)]
+    for index, source_path in enumerate(source_paths):
+        _save_recording(source_path, seed=index)
+    converter = BatchConverter(max_workers=3)
+    converter.submit(source_paths, "raw")
+    results = []
+    try:
+        while converter.is_running():
+            results.extend(converter.pop_completed())
+    finally:
+        converter.shutdown()
+    assert sorted(result.source_path for result in results) == source_paths
+
+
+@requires_fork
+def test_main_returns_error_if_a_conversion_failed(codecs, tmp_path,
+                                                   capsys):
+    source_path = str(tmp_path / "S01.npy")
+    _save_recording(source_path)
+    assert main([source_path, "--to", "raw", "--workers", "1"]) == 0
+    assert main([str(tmp_path / "missing.npy"), "--to", "raw"]) == 1
+    assert "Converted 1 files" in capsys.readouterr().out
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from application.Views.classes.storage import disk_preflight
+from application.Views.classes.storage.disk_preflight import (
+    RESERVED_FREE_SPACE_BYTES, DiskPreflight, DiskPreflightResult,
+    RecordingConfiguration, format_duration)
+
+# Throughput reported by the stubbed benchmark, in bytes per second
+BENCHMARK_THROUGHPUT = 500 * 1024 * 1024
+
+
+@pytest.fixture
+def preflight(monkeypatch):
+    """
+    A preflight whose benchmark does not write to the disk.
+    """
+    calls = []
+
+    def benchmark(self, folder):
+        calls.append(folder)
+        return BENCHMARK_THROUGHPUT
+
+    monkeypatch.setattr(DiskPreflight, "_benchmark_write_throughput",
+                        benchmark)
+    monkeypatch.setattr(disk_preflight, "_is_network_drive",
+                        lambda folder: False)
+    monkeypatch.setattr(disk_preflight, "_is_removable_drive",
+                        lambda folder: False)
+    preflight = DiskPreflight()
+    preflight.benchmark_calls = calls
+    return preflight
+
+
+def test_data_rate():
+    configuration = RecordingConfiguration(2, channels_per_recorder=32,
+                                           sample_rate=1000,
+                                           bytes_per_sample=4)
+    assert configuration.get_data_rate() == 2 * 32 * 1000 * 4
+
+
+def test_max_recording_duration():
+    result = DiskPreflightResult("folder", 1e9,
+                                 RESERVED_FREE_SPACE_BYTES + 3600 * 1000,
+                                 1000.0, False, False, [])
+    assert result.max_recording_duration == pytest.approx(3600)
+    assert result.is_sufficient()
+
+
+def test_missing_folder_is_reported(tmp_path):
+    result = DiskPreflight().run(str(tmp_path / "missing"),
+                                 RecordingConfiguration(1))
+    assert not result.is_sufficient()
+    assert "does not exist" in result.warnings[0]
+
+
+def test_benchmark_is_cached_per_volume(preflight, tmp_path):
+    configuration = RecordingConfiguration(1, channels_per_recorder=1,
+                                           sample_rate=1)
+    preflight.run(str(tmp_path), configuration)
+    preflight.run(str(tmp_path), configuration)
+    assert len(preflight.benchmark_calls) == 1
+    result = preflight.run(str(tmp_path), configuration,
+                           force_benchmark=True)
+    assert len(preflight.benchmark_calls) == 2
+    assert result.write_throughput == BENCHMARK_THROUGHPUT
+
+
+def test_too_slow_drive_is_reported(preflight, tmp_path):
+    configuration = RecordingConfiguration(
+        1, channels_per_recorder=1, sample_rate=1,
+        bytes_per_sample=BENCHMARK_THROUGHPUT)
+    result = preflight.run(str(tmp_path), configuration)
+    assert not result.is_sufficient()
+    assert any("too slow" in warning for warning in result.warnings)
+
+
+def test_benchmark_measures_the_folder(tmp_path):
+    throughput = DiskPreflight()._benchmark_write_throughput(str(tmp_path))
+    assert throughput > 0
+    # The benchmark file is removed again
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("seconds, text", [(0, "0 h 00 min"),
+                                           (3 * 3600 + 5 * 60, "3 h 05 min"),
+                                           (float("inf"), "unlimited")])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
+
+
+def _add_block_device(sys_path, disk, partition, removable):
+    """
+    Create the sysfs entries of a disk and its partition, as Linux lists
+    them: the partition is a subdirectory of the disk, and both are linked
+    from the class directory.
+    """
+    class_path = sys_path / "class" / "block"
+    disk_path = sys_path / "devices" / disk
+    partition_path = disk_path / partition
+    partition_path.mkdir(parents=True)
+    class_path.mkdir(parents=True, exist_ok=True)
+    (disk_path / "removable").write_text(f"{int(removable)}\n")
+    (partition_path / "partition").write_text("1\n")
+    os.symlink(disk_path, class_path / disk)
+    os.symlink(partition_path, class_path / partition)
+    return str(class_path)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt",
+                    reason="sysfs is only used on Linux")
+@pytest.mark.parametrize("disk, partition, removable", [
+    ("sdb", "sdb1", False),
+    ("nvme0n1", "nvme0n1p1", True),
+    ("mmcblk0", "mmcblk0p1", True)])
+def test_removable_drive_of_partition(monkeypatch, tmp_path, disk,
+                                      partition, removable):
+    class_path = _add_block_device(tmp_path, disk, partition, removable)
+    monkeypatch.setattr(disk_preflight, "SYS_CLASS_BLOCK_PATH", class_path)
+    monkeypatch.setattr(disk_preflight.sys, "platform", "linux")
+    for device in (partition, disk):
+        monkeypatch.setattr(disk_preflight, "_get_posix_mount",
+                            lambda folder: (f"/dev/{device}", "ext4"))
+        assert disk_preflight._is_removable_drive(str(tmp_path)) is \
+            removable
@@ -0,0 +1,71 @@
+import numpy as np
+
+from application.Views.classes.storage.envelope_pyramid import (
+    EnvelopePyramidReader, EnvelopePyramidWriter)
+
+
+def write_pyramid(recording_path, samples, block_size=1000, **kwargs):
+    writer = EnvelopePyramidWriter(str(recording_path), samples.shape[1],
+                                   1000.0, **kwargs)
+    for start in range(0, samples.shape[0], block_size):
+        writer.write_block(samples[start:start + block_size])
+    writer.close()
+    return EnvelopePyramidReader(str(recording_path))
+
+
+def test_levels_hold_min_and_max_of_their_bins(tmp_path):
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal((4096, 3)).astype(np.float32)
+    reader = write_pyramid(tmp_path / "recording.poly5", samples,
+                           block_size=333, base_bin_size=16,
+                           decimation_factor=4, number_of_levels=3)
+    for level, bin_size in enumerate(reader.bin_sizes):
+        data = np.asarray(reader.get_level(level))
+        bins = samples.reshape(-1, bin_size, 3)
+        assert np.array_equal(data[..., 0], bins.min(axis=1))
+        assert np.array_equal(data[..., 1], bins.max(axis=1))
+
+
+def test_partial_last_bin_is_written_on_close(tmp_path):
+    samples = np.arange(40, dtype=np.float32).reshape(20, 2)
+    reader = write_pyramid(tmp_path / "recording.poly5", samples,
+                           base_bin_size=8, decimation_factor=2,
+                           number_of_levels=2)
+    level_0 = np.asarray(reader.get_level(0))
+    assert level_0.shape[0] == 3
+    assert np.array_equal(level_0[-1, :, 0], samples[16])
+    assert np.array_equal(level_0[-1, :, 1], samples[19])
+    level_1 = np.asarray(reader.get_level(1))
+    assert np.array_equal(level_1[-1, :, 1], samples[19])
+
+
+def test_nan_gaps_do_not_spread_into_other_bins(tmp_path):
+    samples = np.ones((1024, 2), dtype=np.float32)
+    # A gap the merger filled with NaN, inside the first bin and covering
+    # the complete second bin of level 0
+    samples[4:32, 0] = np.nan
+    reader = write_pyramid(tmp_path / "recording.poly5", samples,
+                           base_bin_size=16, decimation_factor=4,
+                           number_of_levels=3)
+    level_0 = np.asarray(reader.get_level(0))
+    assert np.array_equal(level_0[0, 0], [1.0, 1.0])
+    assert np.isnan(level_0[1, 0]).all()
+    assert not np.isnan(level_0[2:]).any()
+    assert not np.isnan(level_0[:, 1]).any()
+    for level in (1, 2):
+        assert not np.isnan(np.asarray(reader.get_level(level))).any()
+    envelope = reader.get_envelope(0, 1024, 7)
+    assert not np.isnan(envelope).any()
+
+
+def test_envelope_uses_a_level_matching_the_pixels(tmp_path):
+    rng = np.random.default_rng(1)
+    samples = rng.standard_normal((16384, 1)).astype(np.float32)
+    reader = write_pyramid(tmp_path / "recording.poly5", samples,
+                           base_bin_size=16, decimation_factor=4,
+                           number_of_levels=4)
+    envelope = reader.get_envelope(0, 16384, 100)
+    assert envelope.shape == (100, 1, 2)
+    assert envelope[..., 0].min() == samples.min()
+    assert envelope[..., 1].max() == samples.max()
+    assert reader.get_number_of_samples() == 16384
@@ -0,0 +1,111 @@
+import csv
+
+import numpy as np
+import pytest
+
+from application.Views.classes.storage.event_index import (
+    EventIndexReader, EventIndexWriter, find_trigger_channels)
+
+# Sample rate of the recordings in the tests, in Hz
+SAMPLE_RATE = 100.0
+# Channels of the recordings in the tests
+CHANNEL_NAMES = ["EEG-1", "TRIGGERS", "EEG-2"]
+
+
+@pytest.fixture
+def recording_path(tmp_path):
+    return str(tmp_path / "recording.poly5")
+
+
+def _trigger_samples(codes):
+    """
+    Samples of the channels of CHANNEL_NAMES with the trigger codes.
+    """
+    samples = np.random.default_rng(0).normal(
+        size=(len(codes), len(CHANNEL_NAMES))).astype(np.float32)
+    samples[:, 1] = codes
+    return samples
+
+
+def _write_index(recording_path, codes, block_size=50,
+                 time_index_interval=0.5):
+    writer = EventIndexWriter(recording_path, SAMPLE_RATE,
+                              find_trigger_channels(CHANNEL_NAMES),
+                              time_index_interval)
+    samples = _trigger_samples(codes)
+    for first in range(0, len(samples), block_size):
+        writer.write_block(samples[first:first + block_size])
+    return writer
+
+
+def test_find_trigger_channels():
+    assert find_trigger_channels(CHANNEL_NAMES) == [1]
+    assert find_trigger_channels(["trig", "EEG"]) == [0]
+
+
+def test_trigger_events_over_block_boundaries(recording_path):
+    codes = np.zeros(150)
+    codes[10:20] = 5
+    codes[45:55] = 7
+    codes[55:60] = 5
+    codes[140:] = 3
+    # Samples of a recorder that dropped out have no code
+    codes[100:105] = np.nan
+    writer = _write_index(recording_path, codes)
+    writer.add_event(9, sample=30, duration=2)
+    header = writer.close()
+    assert header["complete"]
+    assert header["number_of_events"] == 5
+
+    reader = EventIndexReader(recording_path)
+    assert reader.is_complete
+    events = reader.get_events()
+    assert events.tolist() == [(10, 5, 10), (30, 9, 2), (45, 7, 10),
+                               (55, 5, 5), (140, 3, 10)]
+    assert reader.get_codes() == {3: 1, 5: 2, 7: 1, 9: 1}
+    assert reader.get_events(code=5)["sample"].tolist() == [10, 55]
+    assert reader.get_events(20, 56)["sample"].tolist() == [30, 45, 55]
+    assert reader.get_events_between(0.3, 0.5)["code"].tolist() == [9, 7]
+
+
+def test_time_index_matches_a_full_search(recording_path):
+    rng = np.random.default_rng(1)
+    codes = np.repeat(rng.integers(0, 4, size=400), 5).astype(np.float64)
+    _write_index(recording_path, codes, block_size=64).close()
+    reader = EventIndexReader(recording_path)
+    events = np.asarray(reader.events)
+    for _ in range(50):
+        start, stop = sorted(rng.integers(-10, len(codes) + 10, size=2))
+        expected = events[(events["sample"] >= start) &
+                          (events["sample"] < stop)]
+        assert np.array_equal(reader.get_events(start, stop), expected)
+
+
+def test_unclosed_index_is_read(recording_path):
+    codes = np.zeros(100)
+    codes[60:70] = 2
+    codes[20:30] = 1
+    writer = _write_index(recording_path, codes)
+    writer.add_event(4, sample=5)
+    reader = EventIndexReader(recording_path)
+    assert not reader.is_complete
+    assert reader.get_events()["code"].tolist() == [4, 1, 2]
+    assert reader.get_events(code=2)["duration"].tolist() == [10]
+    writer.close()
+
+
+def test_export_csv(recording_path, tmp_path):
+    codes = np.zeros(100)
+    codes[50:75] = 8
+    _write_index(recording_path, codes).close()
+    export_path = str(tmp_path / "events.csv")
+    assert EventIndexReader(recording_path).export_csv(export_path) == 1
+    with open(export_path, newline="") as export_file:
+        rows = list(csv.reader(export_file))
+    assert rows == [["onset", "duration", "sample", "duration_samples",
+                     "code"], ["0.5", "0.25", "50", "25", "8"]]
+
+
+def test_missing_index_is_reported(recording_path):
+    with pytest.raises(FileNotFoundError):
+        EventIndexReader(recording_path)
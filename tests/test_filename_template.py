@@ -0,0 +1,91 @@
+import datetime
+import json
+import os
+
+import pytest
+
+from application.Views.classes.storage.filename_template import (
+    SEQUENCE_COUNTER_FILENAME, FilenameAllocator, FilenameTemplate,
+    FilenameTemplateError)
+
+# Start time of the recordings in the tests
+TIMESTAMP = datetime.datetime(2024, 3, 1, 9, 30, 15)
+
+
+def test_render_fills_in_all_fields():
+    template = FilenameTemplate("{subject}_{date}_{time}_{seq:03d}")
+    assert template.render("S01", 7, TIMESTAMP) == "S01_20240301_093015_007"
+
+
+def test_render_appends_sequence_without_seq_field():
+    template = FilenameTemplate("recording")
+    assert template.render(sequence_number=1) == "recording"
+    assert template.render(sequence_number=2) == "recording_002"
+
+
+def test_subject_is_sanitized():
+    template = FilenameTemplate("{subject}")
+    assert template.render("a/b:c", 1, TIMESTAMP) == "a-b-c"
+
+
+@pytest.mark.parametrize("text", ["", "  ", "{unknown}", "a/b", "{date:x}",
+                                  "{seq:q}", "{seq"])
+def test_invalid_templates_are_rejected(text):
+    with pytest.raises(FilenameTemplateError):
+        FilenameTemplate(text)
+
+
+def test_allocate_reserves_consecutive_names(tmp_path):
+    allocator = FilenameAllocator(str(tmp_path))
+    template = FilenameTemplate("{subject}_{seq:03d}")
+    first = allocator.allocate(template, "poly5", "S01", TIMESTAMP)
+    second = allocator.allocate(template, ".poly5", "S01", TIMESTAMP)
+    assert os.path.basename(first) == "S01_001.poly5"
+    assert os.path.basename(second) == "S01_002.poly5"
+    assert os.path.exists(first) and os.path.exists(second)
+
+
+def test_allocate_skips_existing_files(tmp_path):
+    (tmp_path / "S01_001.poly5").touch()
+    allocator = FilenameAllocator(str(tmp_path))
+    path = allocator.allocate(FilenameTemplate("{subject}_{seq:03d}"),
+                              "poly5", "S01", TIMESTAMP)
+    assert os.path.basename(path) == "S01_002.poly5"
+
+
+def test_counters_are_persisted(tmp_path):
+    template = FilenameTemplate("{subject}_{seq:03d}")
+    FilenameAllocator(str(tmp_path)).allocate(template, "poly5", "S01",
+                                              TIMESTAMP)
+    path = FilenameAllocator(str(tmp_path)).allocate(template, "poly5",
+                                                     "S01", TIMESTAMP)
+    assert os.path.basename(path) == "S01_002.poly5"
+
+
+def test_counters_of_past_dates_are_dropped(tmp_path):
+    allocator = FilenameAllocator(str(tmp_path))
+    dated = FilenameTemplate("{date}_{seq:03d}")
+    undated = FilenameTemplate("{subject}_{seq:03d}")
+    allocator.allocate(dated, "poly5", timestamp=TIMESTAMP)
+    allocator.allocate(undated, "poly5", "S01", TIMESTAMP)
+    next_day = TIMESTAMP + datetime.timedelta(days=1)
+    allocator.allocate(dated, "poly5", timestamp=next_day)
+
+    with open(tmp_path / SEQUENCE_COUNTER_FILENAME) as counter_file:
+        keys = set(json.load(counter_file))
+    assert keys == {"20240302_#.poly5", "S01_#.poly5"}
+
+
+def test_counter_file_of_older_version_is_read(tmp_path):
+    with open(tmp_path / SEQUENCE_COUNTER_FILENAME, "w") as counter_file:
+        json.dump({"S01_#.poly5": 5}, counter_file)
+    path = FilenameAllocator(str(tmp_path)).allocate(
+        FilenameTemplate("{subject}_{seq:03d}"), "poly5", "S01", TIMESTAMP)
+    assert os.path.basename(path) == "S01_005.poly5"
+
+
+def test_damaged_counter_file_is_ignored(tmp_path):
+    (tmp_path / SEQUENCE_COUNTER_FILENAME).write_text("{not json")
+    path = FilenameAllocator(str(tmp_path)).allocate(
+        FilenameTemplate("{subject}_{seq:03d}"), "poly5", "S01", TIMESTAMP)
+    assert os.path.basename(path) == "S01_001.poly5"
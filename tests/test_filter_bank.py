@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from application.Views.classes.pipeline.filter_bank import (
+    FilterBank, FilterSettings)
+
+# Sample rate of the blocks in the tests, in Hz
+SAMPLE_RATE = 1000.0
+
+
+class _Sink:
+    def __init__(self):
+        self.blocks = []
+        self.is_closed = False
+
+    def write_block(self, block):
+        self.blocks.append(block.copy())
+
+    def close(self):
+        self.is_closed = True
+
+
+@pytest.fixture
+def filter_bank():
+    """
+    A filter bank of two recorders with two channels each, of which only
+    the first is filtered.
+    """
+    filter_bank = FilterBank(SAMPLE_RATE)
+    filter_bank.set_channel_ranges({"A": (0, 2), "B": (2, 4)})
+    filter_bank.set_recorder_filter("A", FilterSettings(
+        highpass_frequency=1.0, notch_frequency=50.0))
+    return filter_bank
+
+
+def _new_filter_bank(filter_bank):
+    """
+    A filter bank with the filters of another one, but a new state.
+    """
+    new_filter_bank = FilterBank(SAMPLE_RATE)
+    new_filter_bank.set_channel_ranges(filter_bank.channel_ranges)
+    new_filter_bank.set_recorder_filter("A",
+                                        filter_bank.filter_settings["A"])
+    return new_filter_bank
+
+
+def _signal(number_of_samples, offset=100.0):
+    time = np.arange(number_of_samples) / SAMPLE_RATE
+    mains = np.sin(2 * np.pi * 50.0 * time)
+    return (offset + mains[:, None] * np.ones(4)).astype(np.float32)
+
+
+def test_unfiltered_channels_are_unchanged(filter_bank):
+    block = _signal(500)
+    filtered = filter_bank.process(block)
+    assert np.array_equal(filtered[:, 2:], block[:, 2:])
+    assert not np.allclose(filtered[:, :2], block[:, :2])
+
+
+def test_state_is_kept_between_blocks(filter_bank):
+    block = _signal(1000)
+    expected = filter_bank.process(block).copy()
+    filter_bank.reset_state()
+    parts = [filter_bank.process(part).copy()
+             for part in np.array_split(block, 7)]
+    assert np.allclose(np.concatenate(parts), expected, atol=1e-4)
+
+
+def test_offset_gives_no_transient(filter_bank):
+    filtered = filter_bank.process(_signal(2000))
+    # The notch removes the mains and the high-pass the offset, without
+    # the step response of the offset at the start
+    assert np.abs(filtered[:, :2]).max() < 2.0
+    assert np.abs(filtered[-500:, :2]).max() < 0.1
+
+
+def test_dropout_restarts_the_filter(filter_bank):
+    block = _signal(1000)
+    block[400:450, 0] = np.nan
+    first = filter_bank.process(block[:500]).copy()
+    second = filter_bank.process(block[500:]).copy()
+    assert np.isnan(first[400:450, 0]).all()
+    assert np.isfinite(second).all()
+    # After the dropout the channel is filtered as if the filter started
+    # at the next block
+    expected = _new_filter_bank(filter_bank).process(block[500:])
+    assert np.allclose(second[:, 0], expected[:, 0], atol=1e-4)
+
+
+def test_reset_state_restarts_from_the_next_sample(filter_bank):
+    expected = filter_bank.process(_signal(200)).copy()
+    filter_bank.process(_signal(200, offset=-500.0))
+    filter_bank.reset_state()
+    assert np.allclose(filter_bank.process(_signal(200)), expected)
+
+
+def test_invalid_filter_is_not_stored(filter_bank):
+    with pytest.raises(ValueError):
+        filter_bank.set_recorder_filter("B", FilterSettings(
+            lowpass_frequency=SAMPLE_RATE))
+    assert "B" not in filter_bank.filter_settings
+    filter_bank.set_recorder_filter("A", None)
+    block = _signal(100)
+    assert np.array_equal(filter_bank.process(block), block)
+
+
+def test_write_block_passes_filtered_block_to_sinks(filter_bank):
+    sink = _Sink()
+    filter_bank.add_sink(sink)
+    block = _signal(100)
+    expected = _new_filter_bank(filter_bank).process(block)
+    filter_bank.write_block(block)
+    assert np.array_equal(sink.blocks[0], expected)
+    filter_bank.close()
+    assert sink.is_closed
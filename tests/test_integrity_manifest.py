@@ -0,0 +1,84 @@
+import json
+import os
+
+from application.Views.classes.storage.integrity_manifest import (
+    IntegrityManifestWriter, get_manifest_path, verify_recording)
+
+# Small chunks, so a few hundred bytes cover several chunks
+CHUNK_SIZE = 64
+
+
+def _write_recording(path, blocks, chunk_size=CHUNK_SIZE):
+    """
+    Write blocks to a recording while hashing them, as a writer does.
+    """
+    manifest_writer = IntegrityManifestWriter(str(path), chunk_size)
+    with open(path, "wb") as recording_file:
+        for block in blocks:
+            recording_file.write(block)
+            manifest_writer.write_block(block)
+    return manifest_writer.close()
+
+
+def test_manifest_of_written_blocks_verifies(tmp_path):
+    path = tmp_path / "recording.raw"
+    manifest = _write_recording(path, [os.urandom(50), os.urandom(100),
+                                       os.urandom(7)])
+    assert manifest["file_size"] == 157
+    assert len(manifest["chunk_hashes"]) == 3
+    assert os.path.exists(get_manifest_path(str(path)))
+    assert verify_recording(str(path)).is_valid()
+
+
+def test_corrupt_chunk_is_reported(tmp_path):
+    path = tmp_path / "recording.raw"
+    _write_recording(path, [bytes(200)])
+    with open(path, "r+b") as recording_file:
+        recording_file.seek(70)
+        recording_file.write(b"x")
+    report = verify_recording(str(path))
+    assert not report.is_valid()
+    assert report.corrupt_chunks == [1]
+    assert report.verified_chunks == [0, 2, 3]
+
+
+def test_partial_copy_reports_missing_chunks(tmp_path):
+    path = tmp_path / "recording.raw"
+    _write_recording(path, [os.urandom(200)])
+    copy_path = tmp_path / "copy.raw"
+    copy_path.write_bytes(path.read_bytes()[:100])
+    report = verify_recording(str(copy_path),
+                              get_manifest_path(str(path)))
+    assert report.verified_chunks == [0]
+    assert report.missing_chunks == [1, 2, 3]
+    assert not report.corrupt_chunks
+    assert not report.is_valid()
+
+
+def test_rewritten_chunk_is_hashed_again(tmp_path):
+    path = tmp_path / "recording.raw"
+    manifest_writer = IntegrityManifestWriter(str(path), CHUNK_SIZE)
+    with open(path, "wb") as recording_file:
+        block = bytes(200)
+        recording_file.write(block)
+        manifest_writer.write_block(block)
+        # Update the header in place, as writers do on close
+        recording_file.seek(0)
+        recording_file.write(b"header")
+    manifest_writer.rewrite(0, 6)
+    manifest_writer.close()
+    assert verify_recording(str(path)).is_valid()
+
+
+def test_hash_recording_matches_reported_bytes(tmp_path):
+    blocks = [os.urandom(90), os.urandom(90)]
+    reported = _write_recording(tmp_path / "reported.raw", blocks)
+    path = tmp_path / "hashed.raw"
+    path.write_bytes(b"".join(blocks))
+    manifest_writer = IntegrityManifestWriter(str(path), CHUNK_SIZE)
+    manifest_writer.hash_recording()
+    hashed = manifest_writer.close()
+    assert hashed["chunk_hashes"] == reported["chunk_hashes"]
+    assert hashed["root_hash"] == reported["root_hash"]
+    with open(get_manifest_path(str(path))) as manifest_file:
+        assert json.load(manifest_file)["file_size"] == 180
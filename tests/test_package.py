@@ -0,0 +1,21 @@
+import importlib
+
+import pytest
+
+
+def test_subpackage_is_resolved_without_recursion():
+    from application.Views.classes import storage
+    assert storage.__name__ == "application.Views.classes.storage"
+
+
+def test_subpackage_is_resolved_by_attribute():
+    classes = importlib.import_module("application.Views.classes")
+    assert classes.pipeline.__name__ == "application.Views.classes.pipeline"
+    assert classes.diagnostics.__name__ == (
+        "application.Views.classes.diagnostics")
+
+
+def test_private_name_raises_attribute_error():
+    classes = importlib.import_module("application.Views.classes")
+    with pytest.raises(AttributeError):
+        classes.__all__
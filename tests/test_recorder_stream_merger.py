@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from application.Views.classes.pipeline.recorder_stream_merger import (
+    RecorderClock, RecorderStreamMerger)
+
+# Sample rate of the recorders and of the merged blocks, in Hz
+SAMPLE_RATE = 100.0
+# Number of samples per block of the recorders and of the merger
+BLOCK_SIZE = 10
+# Host time at which the recorders start, in seconds
+START_TIME = 1000.0
+
+
+class _Sink:
+    def __init__(self):
+        self.blocks = []
+
+    def write_block(self, block):
+        self.blocks.append(block.copy())
+
+
+@pytest.fixture
+def merger():
+    """
+    A merger of two recorders with four and two channels.
+    """
+    merger = RecorderStreamMerger(SAMPLE_RATE, output_block_size=BLOCK_SIZE,
+                                  dropout_timeout=0.5)
+    merger.add_recorder("A", 4, SAMPLE_RATE)
+    merger.add_recorder("B", 2, SAMPLE_RATE)
+    merger.sink = _Sink()
+    merger.add_sink(merger.sink)
+    return merger
+
+
+def _push(merger, serial_number, first_index,
+          number_of_samples=BLOCK_SIZE):
+    """
+    Push a block of a recorder whose samples are their sample index, as it
+    is received when its last sample was taken.
+    """
+    number_of_channels = merger.streams[serial_number].number_of_channels
+    indices = np.arange(first_index, first_index + number_of_samples)
+    samples = (indices[:, None] * np.ones(number_of_channels)).astype(
+        np.float32)
+    host_time = START_TIME + indices[-1] / SAMPLE_RATE
+    merger.push_samples(serial_number, samples, first_index / SAMPLE_RATE,
+                        host_time)
+
+
+def test_clock_estimates_drift():
+    clock = RecorderClock(0.0, 0.0)
+    for device_time in np.arange(0.0, 10.0, 0.1):
+        clock.update(device_time, 1.001 * device_time)
+    assert clock.rate == pytest.approx(1.001)
+    assert clock.to_device(clock.to_host(5.0)) == pytest.approx(5.0)
+
+
+def test_channel_ranges(merger):
+    assert merger.get_number_of_channels() == 6
+    assert merger.get_channel_ranges() == {"A": (0, 4), "B": (4, 6)}
+
+
+def test_streams_are_aligned(merger):
+    for first_index in range(0, 100, BLOCK_SIZE):
+        _push(merger, "A", first_index)
+        # Nothing is emitted before every recorder delivered samples
+        if first_index == 0:
+            assert merger.sink.blocks == []
+        _push(merger, "B", first_index)
+    merged = np.concatenate(merger.sink.blocks)
+    assert merged.shape[1] == 6
+    assert len(merged) >= 80
+    # Every channel has the same sample at the same time, and the samples
+    # are contiguous over the blocks
+    assert np.allclose(merged, merged[:, :1], atol=1e-3)
+    assert np.allclose(np.diff(merged[:, 0]), 1.0, atol=1e-3)
+
+
+def test_lost_samples_are_filled_with_nan(merger):
+    for first_index in range(0, 100, BLOCK_SIZE):
+        _push(merger, "B", first_index)
+        if first_index != 50:
+            _push(merger, "A", first_index)
+    merged = np.concatenate(merger.sink.blocks)
+    lost = np.isnan(merged[:, 0])
+    assert np.isfinite(merged[:, 4:]).all()
+    # Only the samples around the lost block are NaN
+    assert set(range(50, 60)) <= set(merged[lost, 4])
+    assert merged[lost, 4].min() >= 49 and merged[lost, 4].max() < 60
+
+
+def test_dropped_out_recorder_does_not_hold_back_the_others(merger):
+    for first_index in range(0, 50, BLOCK_SIZE):
+        _push(merger, "A", first_index)
+        _push(merger, "B", first_index)
+    number_of_blocks = len(merger.sink.blocks)
+    for first_index in range(50, 200, BLOCK_SIZE):
+        _push(merger, "A", first_index)
+    assert len(merger.sink.blocks) > number_of_blocks
+    assert not merger.streams["B"].is_active
+    last_block = merger.sink.blocks[-1]
+    assert np.isnan(last_block[:, 4:]).all()
+    assert np.isfinite(last_block[:, :4]).all()
+
+
+def test_recorder_that_never_starts_does_not_hold_back_the_others(merger):
+    for first_index in range(0, 200, BLOCK_SIZE):
+        _push(merger, "A", first_index)
+    merged = np.concatenate(merger.sink.blocks)
+    # The output starts once the dropout timeout passed
+    assert len(merged) >= 100
+    assert np.isfinite(merged[:, :4]).all()
+    assert np.isnan(merged[:, 4:]).all()
+    # The recorder is merged once it starts
+    for first_index in range(200, 300, BLOCK_SIZE):
+        _push(merger, "B", first_index)
+        _push(merger, "A", first_index)
+    assert np.isfinite(merger.sink.blocks[-1]).all()
@@ -0,0 +1,103 @@
+import os
+import sqlite3
+
+import pytest
+
+from application.Views.classes.storage import recording_catalog
+from application.Views.classes.storage.recording_catalog import (
+    CATALOG_DATABASE_FILENAME, RecordingCatalog, is_corrupt_database_error)
+
+# File extensions of recordings in the tests
+EXTENSIONS = [".poly5", ".edf"]
+
+
+def _touch(path, size=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as recording_file:
+        recording_file.write(bytes(size))
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RecordingCatalog(str(tmp_path), EXTENSIONS)
+    yield catalog
+    catalog.close()
+
+
+def test_refresh_indexes_recordings_in_subdirectories(tmp_path, catalog):
+    _touch(str(tmp_path / "S01_a.poly5"))
+    _touch(str(tmp_path / "study" / "S02_b.EDF"))
+    _touch(str(tmp_path / "notes.txt"))
+    assert catalog.refresh() == 2
+    assert catalog.count() == 2
+    assert sorted(catalog.get_directories()) == [
+        str(tmp_path), str(tmp_path / "study")]
+    # Nothing changed, so nothing is listed again
+    assert catalog.refresh() == 0
+
+
+def test_refresh_removes_deleted_recordings(tmp_path, catalog):
+    _touch(str(tmp_path / "study" / "S01_a.poly5"))
+    catalog.refresh()
+    os.remove(tmp_path / "study" / "S01_a.poly5")
+    os.rmdir(tmp_path / "study")
+    assert catalog.refresh() == 1
+    assert catalog.count() == 0
+    assert catalog.get_directories() == [str(tmp_path)]
+
+
+def test_search_and_sort(tmp_path, catalog):
+    _touch(str(tmp_path / "S01_a.poly5"), size=10)
+    _touch(str(tmp_path / "S02_b.edf"), size=20)
+    catalog.refresh()
+    assert [row["name"] for row in catalog.search("S02")] == ["S02_b.edf"]
+    assert [row["name"] for row in catalog.search(
+        sort_column="size", descending=False)] == ["S01_a.poly5",
+                                                   "S02_b.edf"]
+    assert [row["subject"] for row in catalog.search("poly5")] == ["S01"]
+
+
+def test_metadata_is_kept_on_refresh(tmp_path, catalog):
+    path = str(tmp_path / "S01_a.poly5")
+    _touch(path)
+    catalog.refresh()
+    catalog.update_recording_metadata(path, subject="Alice", duration=60.0,
+                                      devices=["A", "B"])
+    _touch(path, size=100)
+    catalog.refresh(full=True)
+    row = catalog.search("Alice")[0]
+    assert (row["duration"], row["devices"], row["size"]) == (60.0, "A, B",
+                                                              100)
+
+
+def test_damaged_catalog_is_rebuilt(tmp_path):
+    (tmp_path / CATALOG_DATABASE_FILENAME).write_bytes(b"garbage" * 200)
+    _touch(str(tmp_path / "S01_a.poly5"))
+    catalog = RecordingCatalog(str(tmp_path), EXTENSIONS)
+    assert catalog.refresh() == 1
+    catalog.close()
+
+
+def test_locked_catalog_is_not_removed(monkeypatch, tmp_path):
+    monkeypatch.setattr(recording_catalog, "DATABASE_BUSY_TIMEOUT", 0.1)
+    database_path = str(tmp_path / CATALOG_DATABASE_FILENAME)
+    RecordingCatalog(str(tmp_path), EXTENSIONS).close()
+    connection = sqlite3.connect(database_path)
+    connection.execute("BEGIN EXCLUSIVE")
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            RecordingCatalog(str(tmp_path), EXTENSIONS,
+                             database_path=database_path)
+    finally:
+        connection.rollback()
+        connection.close()
+    assert os.path.exists(database_path)
+    RecordingCatalog(str(tmp_path), EXTENSIONS).close()
+
+
+@pytest.mark.parametrize("error, is_corrupt", [
+    (sqlite3.DatabaseError("file is not a database"), True),
+    (sqlite3.DatabaseError("database disk image is malformed"), True),
+    (sqlite3.OperationalError("database is locked"), False)])
+def test_is_corrupt_database_error(error, is_corrupt):
+    assert is_corrupt_database_error(error) is is_corrupt
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from application.Views.classes.pipeline.sample_ring_buffer import (
+    HEADER_PENDING_WRITE_END, SampleRingBuffer)
+
+
+def make_block(start: int, number_of_samples: int,
+               number_of_channels: int = 2) -> np.ndarray:
+    return np.repeat(np.arange(start, start + number_of_samples,
+                               dtype=np.float32)[:, np.newaxis],
+                     number_of_channels, axis=1)
+
+
+def test_read_returns_the_written_samples_across_the_wrap():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    reader = ring_buffer.create_reader()
+    ring_buffer.write_block(make_block(0, 7))
+    assert np.array_equal(np.concatenate(reader.read()), make_block(0, 7))
+    ring_buffer.write_block(make_block(7, 6))
+    views = reader.read()
+    assert len(views) == 2
+    assert np.array_equal(np.concatenate(views), make_block(7, 6))
+
+
+def test_readers_have_independent_cursors():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    first = ring_buffer.create_reader()
+    ring_buffer.write_block(make_block(0, 4))
+    second = ring_buffer.create_reader(from_start=True)
+    assert np.concatenate(first.read(max_samples=3)).shape[0] == 3
+    assert np.concatenate(second.read()).shape[0] == 4
+    assert np.concatenate(first.read()).shape[0] == 1
+
+
+def test_overrun_is_reported_per_reader():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    lost = []
+    slow = ring_buffer.create_reader(on_overrun=lost.append)
+    fast = ring_buffer.create_reader()
+    for start in range(0, 25, 5):
+        ring_buffer.write_block(make_block(start, 5))
+        fast.read()
+    samples = np.concatenate(slow.read())
+    assert lost == [15]
+    assert slow.lost_samples == 15
+    assert fast.overrun_count == 0
+    assert np.array_equal(samples, make_block(15, 10))
+
+
+def test_block_larger_than_capacity_keeps_newest_samples():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    ring_buffer.write_block(make_block(0, 25))
+    reader = ring_buffer.create_reader(from_start=True)
+    assert ring_buffer.get_write_index() == 25
+    assert np.array_equal(np.concatenate(reader.read()), make_block(15, 10))
+
+
+def test_read_latest_skips_without_overrun():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    reader = ring_buffer.create_reader()
+    ring_buffer.write_block(make_block(0, 30))
+    samples = np.concatenate(reader.read_latest(4))
+    assert np.array_equal(samples, make_block(26, 4))
+    assert reader.overrun_count == 0
+
+
+def test_last_read_is_invalid_once_overwritten():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    reader = ring_buffer.create_reader()
+    ring_buffer.write_block(make_block(0, 8))
+    reader.read()
+    assert reader.is_last_read_valid()
+    ring_buffer.write_block(make_block(8, 3))
+    assert not reader.is_last_read_valid()
+
+
+def test_write_in_progress_invalidates_overlapping_read():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    reader = ring_buffer.create_reader()
+    ring_buffer.write_block(make_block(0, 8))
+    reader.read()
+    # A write of 3 samples has published its end but is still copying, so
+    # the write index did not move yet
+    ring_buffer._header[HEADER_PENDING_WRITE_END] = 11
+    assert ring_buffer.get_write_index() == 8
+    assert not reader.is_last_read_valid()
+
+
+def test_shared_buffer_is_attached_by_name():
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=3,
+                                   shared=True)
+    try:
+        attached = SampleRingBuffer.attach(ring_buffer.get_name())
+        reader = attached.create_reader()
+        ring_buffer.write_block(make_block(0, 5, number_of_channels=3))
+        assert attached.capacity == 10
+        assert attached.number_of_channels == 3
+        assert np.array_equal(np.concatenate(reader.read()),
+                              make_block(0, 5, number_of_channels=3))
+        reader = None
+        attached.close()
+    finally:
+        ring_buffer.close(unlink=True)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 10])
+def test_stream_of_blocks_is_read_in_order(block_size):
+    ring_buffer = SampleRingBuffer(capacity=10, number_of_channels=2)
+    reader = ring_buffer.create_reader()
+    received = []
+    for start in range(0, 100, block_size):
+        ring_buffer.write_block(make_block(start, block_size))
+        received.extend(np.concatenate(reader.read())[:, 0])
+    expected = np.arange(len(received), dtype=np.float32)
+    assert np.array_equal(received, expected)
@@ -0,0 +1,109 @@
+import json
+import time
+
+import pytest
+
+from application.Views.classes.storage.settings_store import (
+    DEFAULT_PROFILE_NAME, SETTINGS_SCHEMA_VERSION, SettingsStore)
+
+# Write delay of the stores in the tests, in seconds
+WRITE_DELAY = 0.05
+
+
+@pytest.fixture
+def settings_path(tmp_path):
+    return str(tmp_path / "settings" / "file_management_settings.json")
+
+
+def _wait_for_writes(store, number_of_writes, timeout=2.0):
+    end_time = time.monotonic() + timeout
+    while store.number_of_writes < number_of_writes:
+        assert time.monotonic() < end_time, "the settings were not written"
+        time.sleep(0.01)
+
+
+def test_defaults_and_changes(settings_path):
+    store = SettingsStore(settings_path, defaults={"filename": "rec"},
+                          write_delay=WRITE_DELAY)
+    try:
+        assert store.get("filename") == "rec"
+        assert store.get("unknown", 3) == 3
+        # Setting the value that is shown already is not a change
+        assert not store.set("filename", "rec")
+        assert store.set("filename", "sub")
+        assert store.update({"filename": "sub", "folder": "/data"}) == [
+            "folder"]
+        assert store.get_all() == {"filename": "sub", "folder": "/data"}
+    finally:
+        store.close()
+
+
+def test_changes_are_written_once_idle(settings_path):
+    store = SettingsStore(settings_path, write_delay=WRITE_DELAY)
+    try:
+        for index in range(20):
+            store.set("filename", f"rec{index}")
+        _wait_for_writes(store, 1)
+        assert store.number_of_writes == 1
+        with open(settings_path) as settings_file:
+            data = json.load(settings_file)
+        assert data["version"] == SETTINGS_SCHEMA_VERSION
+        assert data["profiles"][DEFAULT_PROFILE_NAME] == {
+            "filename": "rec19"}
+    finally:
+        store.close()
+
+
+def test_profiles_are_restored(settings_path):
+    store = SettingsStore(settings_path, write_delay=WRITE_DELAY)
+    store.set("filename", "default")
+    # A new profile starts as a copy of the active profile
+    assert store.switch_profile("Study A") == {"filename": "default"}
+    store.set("filename", "study")
+    store.close()
+
+    store = SettingsStore(settings_path, write_delay=WRITE_DELAY)
+    try:
+        assert store.active_profile == "Study A"
+        assert store.get_profile_names() == [DEFAULT_PROFILE_NAME,
+                                             "Study A"]
+        assert store.get("filename") == "study"
+        assert store.switch_profile(DEFAULT_PROFILE_NAME) == {
+            "filename": "default"}
+        with pytest.raises(ValueError):
+            store.delete_profile(DEFAULT_PROFILE_NAME)
+        with pytest.raises(ValueError):
+            store.switch_profile("  ")
+        store.delete_profile("Study A")
+        assert store.get_profile_names() == [DEFAULT_PROFILE_NAME]
+    finally:
+        store.close()
+
+
+def test_settings_of_newer_version_are_not_overwritten(settings_path,
+                                                        tmp_path):
+    (tmp_path / "settings").mkdir()
+    content = json.dumps({"version": SETTINGS_SCHEMA_VERSION + 1,
+                          "profiles": {DEFAULT_PROFILE_NAME: {"a": 1}}})
+    with open(settings_path, "w") as settings_file:
+        settings_file.write(content)
+
+    store = SettingsStore(settings_path, write_delay=WRITE_DELAY)
+    assert store.is_read_only
+    assert store.get("a") == 1
+    store.set("a", 2)
+    store.close()
+    with open(settings_path) as settings_file:
+        assert settings_file.read() == content
+
+
+def test_damaged_settings_file_uses_defaults(settings_path, tmp_path):
+    (tmp_path / "settings").mkdir()
+    with open(settings_path, "w") as settings_file:
+        settings_file.write("{damaged")
+    store = SettingsStore(settings_path, defaults={"filename": "rec"})
+    try:
+        assert store.get_all() == {"filename": "rec"}
+        assert store.active_profile == DEFAULT_PROFILE_NAME
+    finally:
+        store.close()
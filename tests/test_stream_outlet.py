@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from application.Views.classes.pipeline import stream_outlet
+from application.Views.classes.pipeline.stream_outlet import (
+    OUTLET_STATE_FAILED, OUTLET_STATE_STOPPED, OUTLET_STATE_STREAMING,
+    OutletSettings, OutletStatistics, StreamInlet, StreamOutlet,
+    find_streams)
+
+# Names of the channels of the streams in the tests
+CHANNEL_NAMES = ["A-1", "A-2", "A-3"]
+
+
+@pytest.fixture(autouse=True)
+def stream_directory(monkeypatch, tmp_path):
+    """
+    Announce the streams of the tests in a directory of their own.
+    """
+    monkeypatch.setattr(stream_outlet, "STREAM_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+def _samples(start, number_of_samples):
+    return (np.arange(start, start + number_of_samples, dtype=np.float32)
+            [:, None] * np.ones(len(CHANNEL_NAMES), dtype=np.float32))
+
+
+def test_inlet_receives_published_chunks():
+    outlet = StreamOutlet(OutletSettings(stream_name="test", chunk_size=8,
+                                         max_chunk_delay=10.0),
+                          CHANNEL_NAMES, 1000.0)
+    try:
+        inlet = StreamInlet("test")
+        assert inlet.channel_names == CHANNEL_NAMES
+        outlet.write_block(_samples(0, 20))
+        # Only the complete chunks are published
+        assert np.array_equal(inlet.pull_chunk(), _samples(0, 16))
+        outlet.flush()
+        assert np.array_equal(inlet.pull_chunk(), _samples(16, 4))
+        assert outlet.get_statistics()["chunks"] == 3
+        assert outlet.get_statistics()["samples"] == 20
+        assert inlet.latency.count == 3
+        inlet.close()
+    finally:
+        outlet.close()
+    assert find_streams() == []
+
+
+def test_incomplete_chunk_is_published_after_delay():
+    outlet = StreamOutlet(OutletSettings(stream_name="slow", chunk_size=64,
+                                         max_chunk_delay=0.0),
+                          CHANNEL_NAMES, 10.0)
+    try:
+        outlet.write_block(_samples(0, 2))
+        assert outlet.number_of_samples == 2
+    finally:
+        outlet.close()
+
+
+def test_samples_overwritten_while_pulled_are_dropped():
+    # A stream of 10 Hz holds 100 samples
+    outlet = StreamOutlet(OutletSettings(stream_name="overrun", chunk_size=10,
+                                         max_chunk_delay=10.0),
+                          CHANNEL_NAMES, 10.0)
+    try:
+        inlet = StreamInlet("overrun")
+        outlet.write_block(_samples(0, 50))
+        read = inlet.reader.read
+
+        def read_while_publishing(max_samples=None):
+            # The outlet overwrites the 20 oldest samples of the views
+            # before the inlet copied them
+            views = read(max_samples)
+            outlet.write_block(_samples(50, 70))
+            return views
+
+        inlet.reader.read = read_while_publishing
+        assert np.array_equal(inlet.pull_chunk(), _samples(20, 30))
+        assert inlet.reader.lost_samples == 20
+        inlet.close()
+    finally:
+        outlet.close()
+
+
+def test_stream_is_announced():
+    outlet = StreamOutlet(OutletSettings(stream_name="announced"),
+                          CHANNEL_NAMES, 500.0)
+    try:
+        descriptions = find_streams()
+        assert [description["name"] for description in descriptions] == [
+            "announced"]
+        assert descriptions[0]["sample_rate"] == 500.0
+    finally:
+        outlet.close()
+
+
+def test_unavailable_transport_is_rejected():
+    with pytest.raises(ValueError):
+        StreamOutlet(OutletSettings(transport="unknown"), CHANNEL_NAMES,
+                     1000.0)
+
+
+def test_missing_stream_is_reported():
+    with pytest.raises(LookupError):
+        StreamInlet("missing")
+
+
+def test_statistics_are_shared():
+    statistics = OutletStatistics()
+    reader = OutletStatistics(statistics.get_name())
+    outlet = StreamOutlet(OutletSettings(stream_name="statistics",
+                                         chunk_size=4),
+                          CHANNEL_NAMES, 1000.0)
+    try:
+        assert reader.get_statistics()["state"] == OUTLET_STATE_STOPPED
+        outlet.write_block(_samples(0, 8))
+        statistics.publish(outlet)
+        shared = reader.get_statistics()
+        assert shared["state"] == OUTLET_STATE_STREAMING
+        assert (shared["samples"], shared["chunks"]) == (8, 2)
+        assert shared["batching_latency"] == outlet.get_statistics()[
+            "batching_latency"]
+        statistics.publish(None, OUTLET_STATE_FAILED)
+        assert reader.get_statistics()["state"] == OUTLET_STATE_FAILED
+        assert reader.get_statistics()["chunks"] == 0
+    finally:
+        outlet.close()
+        reader.close()
+        statistics.close(unlink=True)